@@ -16,8 +16,12 @@ F_s = number of sounding fields (or "variables" or "channels")
 C = number of radar field/height pairs
 """
 
+import sys
 import copy
+import time
+import Queue
 import pickle
+import threading
 import numpy
 import netCDF4
 import keras.losses
@@ -27,8 +31,10 @@ import keras.callbacks
 from gewittergefahr.deep_learning import deep_learning_utils as dl_utils
 from gewittergefahr.deep_learning import keras_metrics
 from gewittergefahr.deep_learning import training_validation_io as trainval_io
+from gewittergefahr.deep_learning import testing_io
 from gewittergefahr.deep_learning import input_examples
 from gewittergefahr.gg_io import netcdf_io
+from gewittergefahr.gg_utils import model_evaluation as model_eval
 from gewittergefahr.gg_utils import file_system_utils
 from gewittergefahr.gg_utils import error_checking
 
@@ -73,6 +79,9 @@ REQUIRED_METADATA_KEYS = [
 
 DEFAULT_TARGET_NAME = 'tornado_lead-time=0000-3600sec_distance=00000-10000m'
 
+DEFAULT_NUM_EXAMPLES_PER_BATCH = 1000
+DEFAULT_NUM_DICTS_TO_PREFETCH = 1
+
 STORM_OBJECT_DIMENSION_KEY = 'storm_object'
 FEATURE_DIMENSION_KEY = 'feature'
 SPATIAL_DIMENSION_KEYS = [
@@ -195,6 +204,84 @@ def _get_checkpoint_object(
         period=1)
 
 
+def _prefetch_storm_object_dicts(generator_object, queue_object):
+    """Reads storm objects from generator and puts them in queue.
+
+    This method is meant to run in a background thread, so that reading the
+    next set of storm objects overlaps with applying the model to the current
+    set.  When the generator is exhausted, this method puts None in the queue.
+    If the generator raises an exception, this method puts the exception info
+    (the tuple returned by `sys.exc_info`) in the queue, so that the exception
+    can be re-raised with its original traceback.
+
+    :param generator_object: Generator created by
+        `testing_io.example_generator_2d_or_3d` or
+        `testing_io.example_generator_2d3d_myrorss`.
+    :param queue_object: Instance of `Queue.Queue`.
+    """
+
+    try:
+        for this_storm_object_dict in generator_object:
+            queue_object.put(this_storm_object_dict)
+    except Exception:
+        queue_object.put(sys.exc_info())
+
+    queue_object.put(None)
+
+
+def _apply_cnn_to_input_matrices(
+        model_object, list_of_input_matrices, use_2d3d_convolution,
+        return_features, output_layer_name, num_examples_per_batch):
+    """Applies CNN to one set of input matrices.
+
+    :param model_object: See doc for `apply_2d_cnn`.
+    :param list_of_input_matrices: List of input matrices, in the format
+        created by `testing_io.example_generator_2d_or_3d` or
+        `testing_io.example_generator_2d3d_myrorss`.
+    :param use_2d3d_convolution: Boolean flag.  If True, the model was trained
+        with `train_cnn_2d3d_myrorss`.
+    :param return_features: See doc for `apply_2d_cnn`.
+    :param output_layer_name: Same.
+    :param num_examples_per_batch: Same.
+    :return: output_matrix: Either feature matrix or class-probability matrix
+        (see doc for `apply_2d_cnn`).
+    """
+
+    if use_2d3d_convolution:
+        if len(list_of_input_matrices) == 3:
+            sounding_matrix = list_of_input_matrices[2]
+        else:
+            sounding_matrix = None
+
+        return apply_2d3d_cnn(
+            model_object=model_object,
+            reflectivity_image_matrix_dbz=list_of_input_matrices[0],
+            az_shear_image_matrix_s01=list_of_input_matrices[1],
+            sounding_matrix=sounding_matrix, return_features=return_features,
+            output_layer_name=output_layer_name,
+            num_examples_per_batch=num_examples_per_batch)
+
+    if len(list_of_input_matrices) == 2:
+        sounding_matrix = list_of_input_matrices[1]
+    else:
+        sounding_matrix = None
+
+    num_radar_dimensions = len(list_of_input_matrices[0].shape) - 2
+    if num_radar_dimensions == 2:
+        return apply_2d_cnn(
+            model_object=model_object,
+            radar_image_matrix=list_of_input_matrices[0],
+            sounding_matrix=sounding_matrix, return_features=return_features,
+            output_layer_name=output_layer_name,
+            num_examples_per_batch=num_examples_per_batch)
+
+    return apply_3d_cnn(
+        model_object=model_object, radar_image_matrix=list_of_input_matrices[0],
+        sounding_matrix=sounding_matrix, return_features=return_features,
+        output_layer_name=output_layer_name,
+        num_examples_per_batch=num_examples_per_batch)
+
+
 def model_to_feature_generator(model_object, output_layer_name):
     """Reduces Keras model from predictor to feature-generator.
 
@@ -460,7 +547,8 @@ def train_cnn_2d3d_myrorss(
 
 def apply_2d_cnn(
         model_object, radar_image_matrix, sounding_matrix=None,
-        return_features=False, output_layer_name=None):
+        return_features=False, output_layer_name=None,
+        num_examples_per_batch=DEFAULT_NUM_EXAMPLES_PER_BATCH):
     """Applies CNN to 2-D radar images.
 
     :param model_object: Trained instance of `keras.models.Model` or
@@ -474,6 +562,8 @@ def apply_2d_cnn(
         will return probabilistic predictions.
     :param output_layer_name: [used only if return_features = True]
         Name of layer for which features will be returned.
+    :param num_examples_per_batch: Number of examples per batch.  The model
+        will be applied to one batch at a time, which limits memory usage.
 
     If return_features = True...
 
@@ -494,6 +584,8 @@ def apply_2d_cnn(
         max_num_dimensions=4)
 
     error_checking.assert_is_boolean(return_features)
+    error_checking.assert_is_integer(num_examples_per_batch)
+    error_checking.assert_is_greater(num_examples_per_batch, 0)
     num_examples = radar_image_matrix.shape[0]
 
     if sounding_matrix is not None:
@@ -505,17 +597,19 @@ def apply_2d_cnn(
             model_object=model_object, output_layer_name=output_layer_name)
         if sounding_matrix is None:
             return intermediate_model_object.predict(
-                radar_image_matrix, batch_size=num_examples)
+                radar_image_matrix, batch_size=num_examples_per_batch)
 
         return intermediate_model_object.predict(
-            [radar_image_matrix, sounding_matrix], batch_size=num_examples)
+            [radar_image_matrix, sounding_matrix],
+            batch_size=num_examples_per_batch)
 
     if sounding_matrix is None:
         these_probabilities = model_object.predict(
-            radar_image_matrix, batch_size=num_examples)
+            radar_image_matrix, batch_size=num_examples_per_batch)
     else:
         these_probabilities = model_object.predict(
-            [radar_image_matrix, sounding_matrix], batch_size=num_examples)
+            [radar_image_matrix, sounding_matrix],
+            batch_size=num_examples_per_batch)
 
     if these_probabilities.shape[-1] > 1:
         return these_probabilities
@@ -527,7 +621,8 @@ def apply_2d_cnn(
 
 def apply_3d_cnn(
         model_object, radar_image_matrix, sounding_matrix=None,
-        return_features=False, output_layer_name=None):
+        return_features=False, output_layer_name=None,
+        num_examples_per_batch=DEFAULT_NUM_EXAMPLES_PER_BATCH):
     """Applies CNN to 3-D radar images.
 
     :param model_object: Trained instance of `keras.models.Model` or
@@ -537,6 +632,7 @@ def apply_3d_cnn(
     :param sounding_matrix: See doc for `apply_2d_cnn`.
     :param return_features: Same.
     :param output_layer_name: Same.
+    :param num_examples_per_batch: Same.
 
     If return_features = True...
 
@@ -552,6 +648,8 @@ def apply_3d_cnn(
         max_num_dimensions=5)
 
     error_checking.assert_is_boolean(return_features)
+    error_checking.assert_is_integer(num_examples_per_batch)
+    error_checking.assert_is_greater(num_examples_per_batch, 0)
     num_examples = radar_image_matrix.shape[0]
 
     if sounding_matrix is not None:
@@ -563,17 +661,19 @@ def apply_3d_cnn(
             model_object=model_object, output_layer_name=output_layer_name)
         if sounding_matrix is None:
             return intermediate_model_object.predict(
-                radar_image_matrix, batch_size=num_examples)
+                radar_image_matrix, batch_size=num_examples_per_batch)
 
         return intermediate_model_object.predict(
-            [radar_image_matrix, sounding_matrix], batch_size=num_examples)
+            [radar_image_matrix, sounding_matrix],
+            batch_size=num_examples_per_batch)
 
     if sounding_matrix is None:
         these_probabilities = model_object.predict(
-            radar_image_matrix, batch_size=num_examples)
+            radar_image_matrix, batch_size=num_examples_per_batch)
     else:
         these_probabilities = model_object.predict(
-            [radar_image_matrix, sounding_matrix], batch_size=num_examples)
+            [radar_image_matrix, sounding_matrix],
+            batch_size=num_examples_per_batch)
 
     if these_probabilities.shape[-1] > 1:
         return these_probabilities
@@ -585,7 +685,8 @@ def apply_3d_cnn(
 
 def apply_2d3d_cnn(
         model_object, reflectivity_image_matrix_dbz, az_shear_image_matrix_s01,
-        sounding_matrix=None, return_features=False, output_layer_name=None):
+        sounding_matrix=None, return_features=False, output_layer_name=None,
+        num_examples_per_batch=DEFAULT_NUM_EXAMPLES_PER_BATCH):
     """Applies CNN to both 2-D and 3-D radar images.
 
     M = number of rows in each reflectivity image
@@ -600,6 +701,7 @@ def apply_2d3d_cnn(
     :param sounding_matrix: See doc for `apply_2d_cnn`.
     :param return_features: Same.
     :param output_layer_name: Same.
+    :param num_examples_per_batch: Same.
 
     If return_features = True...
 
@@ -619,6 +721,8 @@ def apply_2d3d_cnn(
 
     num_examples = reflectivity_image_matrix_dbz.shape[0]
     error_checking.assert_is_boolean(return_features)
+    error_checking.assert_is_integer(num_examples_per_batch)
+    error_checking.assert_is_greater(num_examples_per_batch, 0)
 
     expected_dimensions = numpy.array(
         reflectivity_image_matrix_dbz.shape[:-1] + (1,))
@@ -626,7 +730,7 @@ def apply_2d3d_cnn(
         reflectivity_image_matrix_dbz, exact_dimensions=expected_dimensions)
 
     expected_dimensions = numpy.array(
-        (num_examples,) + az_shear_image_matrix_s01[1:])
+        (num_examples,) + az_shear_image_matrix_s01.shape[1:])
     error_checking.assert_is_numpy_array(
         az_shear_image_matrix_s01, exact_dimensions=expected_dimensions)
 
@@ -641,22 +745,22 @@ def apply_2d3d_cnn(
             return intermediate_model_object.predict(
                 [reflectivity_image_matrix_dbz,
                  az_shear_image_matrix_s01],
-                batch_size=num_examples)
+                batch_size=num_examples_per_batch)
 
         return intermediate_model_object.predict(
             [reflectivity_image_matrix_dbz, az_shear_image_matrix_s01,
              sounding_matrix],
-            batch_size=num_examples)
+            batch_size=num_examples_per_batch)
 
     if sounding_matrix is None:
         these_probabilities = model_object.predict(
             [reflectivity_image_matrix_dbz, az_shear_image_matrix_s01],
-            batch_size=num_examples)
+            batch_size=num_examples_per_batch)
     else:
         these_probabilities = model_object.predict(
             [reflectivity_image_matrix_dbz, az_shear_image_matrix_s01,
              sounding_matrix],
-            batch_size=num_examples)
+            batch_size=num_examples_per_batch)
 
     if these_probabilities.shape[-1] > 1:
         return these_probabilities
@@ -666,6 +770,132 @@ def apply_2d3d_cnn(
     return numpy.hstack((1. - these_probabilities, these_probabilities))
 
 
+def apply_cnn_to_generator(
+        model_object, generator_object, use_2d3d_convolution, output_file_name,
+        return_features=False, output_layer_name=None,
+        num_examples_per_batch=DEFAULT_NUM_EXAMPLES_PER_BATCH,
+        num_dicts_to_prefetch=DEFAULT_NUM_DICTS_TO_PREFETCH,
+        evaluation_accumulator_dict=None):
+    """Applies CNN to all storm objects from a generator.
+
+    Storm objects are read by a background thread, so that reading overlaps
+    with inference.  The model is applied to fixed-size batches, and outputs
+    are appended to the output file after each set of storm objects, so that
+    neither inputs nor outputs for the full dataset are ever held in memory.
+
+    :param model_object: See doc for `apply_2d_cnn`.
+    :param generator_object: Generator created by
+        `testing_io.example_generator_2d_or_3d` or
+        `testing_io.example_generator_2d3d_myrorss`.
+    :param use_2d3d_convolution: Boolean flag.  If True, the model was trained
+        with `train_cnn_2d3d_myrorss`.
+    :param output_file_name: Path to output file.  Outputs (either features or
+        class probabilities) will be written here by `write_features` and can
+        be read by `read_features`.
+    :param return_features: See doc for `apply_2d_cnn`.
+    :param output_layer_name: Same.
+    :param num_examples_per_batch: Same.
+    :param num_dicts_to_prefetch: Max number of storm-object dictionaries
+        (yielded by the generator) to read ahead of the model.
+    :param evaluation_accumulator_dict: Dictionary created by
+        `model_evaluation.create_accumulator`.  If specified, each set of
+        predictions will be added to this accumulator (by
+        `model_evaluation.update_accumulator`) as soon as it is computed.  This
+        works only for binary classification with `return_features = False`.
+    :return: num_examples: Number of examples (storm objects) processed.
+    :return: num_examples_per_second: Throughput (number of examples processed
+        per second, including time spent waiting for input).
+    :raises: ValueError: if `evaluation_accumulator_dict` is specified and the
+        model does not output probabilities for binary classification.
+    :raises: ValueError: if the generator yields no storm objects (in which
+        case no output file is written).
+    """
+
+    error_checking.assert_is_boolean(use_2d3d_convolution)
+    error_checking.assert_is_string(output_file_name)
+    error_checking.assert_is_integer(num_dicts_to_prefetch)
+    error_checking.assert_is_greater(num_dicts_to_prefetch, 0)
+    if evaluation_accumulator_dict is not None and return_features:
+        raise ValueError(
+            'Cannot evaluate predictions when `return_features = True`.')
+
+    queue_object = Queue.Queue(maxsize=num_dicts_to_prefetch)
+    thread_object = threading.Thread(
+        target=_prefetch_storm_object_dicts,
+        args=(generator_object, queue_object))
+    thread_object.daemon = True
+    thread_object.start()
+
+    num_examples = 0
+    start_time_unix_sec = time.time()
+
+    while True:
+        this_storm_object_dict = queue_object.get()
+        if this_storm_object_dict is None:
+            break
+        if isinstance(this_storm_object_dict, tuple):
+            this_type, this_value, this_traceback = this_storm_object_dict
+            raise this_type, this_value, this_traceback
+
+        this_output_matrix = _apply_cnn_to_input_matrices(
+            model_object=model_object,
+            list_of_input_matrices=this_storm_object_dict[
+                testing_io.INPUT_MATRICES_KEY],
+            use_2d3d_convolution=use_2d3d_convolution,
+            return_features=return_features,
+            output_layer_name=output_layer_name,
+            num_examples_per_batch=num_examples_per_batch)
+
+        this_target_array = this_storm_object_dict[testing_io.TARGET_ARRAY_KEY]
+        if len(this_target_array.shape) == 2:
+            these_target_values = numpy.argmax(this_target_array, axis=1)
+            this_num_classes = this_target_array.shape[1]
+        else:
+            these_target_values = this_target_array + 0
+            this_num_classes = 2
+
+        write_features(
+            netcdf_file_name=output_file_name,
+            feature_matrix=this_output_matrix,
+            target_values=these_target_values, num_classes=this_num_classes,
+            append_to_file=num_examples > 0)
+
+        if evaluation_accumulator_dict is not None:
+            if this_num_classes != 2:
+                error_string = (
+                    'Predictions can be evaluated only for binary '
+                    'classification, not {0:d}-class classification.'
+                ).format(this_num_classes)
+
+                raise ValueError(error_string)
+
+            model_eval.update_accumulator(
+                accumulator_dict=evaluation_accumulator_dict,
+                forecast_probabilities=this_output_matrix[:, -1],
+                observed_labels=these_target_values)
+
+        num_examples += this_output_matrix.shape[0]
+        this_elapsed_time_sec = time.time() - start_time_unix_sec
+        print (
+            'Have applied model to {0:d} examples ({1:.1f} examples per '
+            'second)...'
+        ).format(num_examples, num_examples / this_elapsed_time_sec)
+
+    thread_object.join()
+
+    if num_examples == 0:
+        error_string = (
+            'Generator yielded no storm objects, so no outputs were written to '
+            '"{0:s}".'
+        ).format(output_file_name)
+
+        raise ValueError(error_string)
+
+    num_examples_per_second = num_examples / (
+        time.time() - start_time_unix_sec)
+    return num_examples, num_examples_per_second
+
+
 def write_features(
         netcdf_file_name, feature_matrix, target_values, num_classes,
         append_to_file=False):
@@ -739,10 +969,12 @@ def write_features(
     netcdf_dataset.close()
 
 
-def read_features(netcdf_file_name):
+def read_features(netcdf_file_name, example_indices=None):
     """Reads features (activations of intermediate layer) from NetCDF file.
 
     :param netcdf_file_name: Path to input file.
+    :param example_indices: 1-D numpy array with indices of examples to read
+        (must be sorted).  If None, will read all examples.
     :return: feature_matrix: E-by-Z numpy array of features.
     :return: target_values: length-E numpy array of target values.  All in
         0...(K - 1), where K = number of classes.
@@ -752,11 +984,42 @@ def read_features(netcdf_file_name):
     netcdf_dataset = netcdf_io.open_netcdf(
         netcdf_file_name=netcdf_file_name, raise_error_if_fails=True)
 
-    feature_matrix = numpy.array(
-        netcdf_dataset.variables[FEATURE_MATRIX_KEY][:])
+    if example_indices is None:
+        feature_matrix = numpy.array(
+            netcdf_dataset.variables[FEATURE_MATRIX_KEY][:])
+        target_values = numpy.array(
+            netcdf_dataset.variables[TARGET_VALUES_KEY][:], dtype=int)
+    else:
+        error_checking.assert_is_integer_numpy_array(example_indices)
+        error_checking.assert_is_numpy_array(example_indices, num_dimensions=1)
+        error_checking.assert_is_geq_numpy_array(numpy.diff(example_indices), 1)
+
+        feature_matrix = numpy.array(
+            netcdf_dataset.variables[FEATURE_MATRIX_KEY][example_indices, ...])
+        target_values = numpy.array(
+            netcdf_dataset.variables[TARGET_VALUES_KEY][example_indices],
+            dtype=int)
+
+    num_classes = getattr(netcdf_dataset, NUM_CLASSES_KEY)
+    netcdf_dataset.close()
+
+    return feature_matrix, target_values, num_classes
+
+
+def read_feature_targets(netcdf_file_name):
+    """Reads target values (but not features) from file with features.
+
+    :param netcdf_file_name: Path to input file (written by `write_features`).
+    :return: target_values: See doc for `read_features`.
+    :return: num_classes: Same.
+    """
+
+    netcdf_dataset = netcdf_io.open_netcdf(
+        netcdf_file_name=netcdf_file_name, raise_error_if_fails=True)
+
     target_values = numpy.array(
         netcdf_dataset.variables[TARGET_VALUES_KEY][:], dtype=int)
     num_classes = getattr(netcdf_dataset, NUM_CLASSES_KEY)
     netcdf_dataset.close()
 
-    return feature_matrix, target_values, num_classes
+    return target_values, num_classes
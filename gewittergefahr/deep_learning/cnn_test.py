@@ -0,0 +1,165 @@
+"""Unit tests for cnn.py."""
+
+import sys
+import os.path
+import shutil
+import tempfile
+import traceback
+import unittest
+import numpy
+import keras
+from gewittergefahr.deep_learning import cnn
+from gewittergefahr.deep_learning import testing_io
+
+TOLERANCE = 1e-5
+
+# The following constants are used to test apply_2d_cnn and
+# apply_cnn_to_generator.
+NUM_EXAMPLES = 7
+NUM_EXAMPLES_PER_BATCH = 3
+RADAR_IMAGE_MATRIX = numpy.random.RandomState(6695).normal(
+    size=(NUM_EXAMPLES, 8, 8, 2))
+TARGET_VALUES = numpy.array([0, 1, 1, 0, 0, 1, 0], dtype=int)
+FIRST_INDICES_FROM_GENERATOR = numpy.array([0, 1, 2, 3], dtype=int)
+SECOND_INDICES_FROM_GENERATOR = numpy.array([4, 5, 6], dtype=int)
+
+
+def _create_model():
+    """Creates small CNN for testing.
+
+    :return: model_object: Instance of `keras.models.Model`.
+    """
+
+    input_layer_object = keras.layers.Input(shape=RADAR_IMAGE_MATRIX.shape[1:])
+    layer_object = keras.layers.Conv2D(
+        filters=3, kernel_size=(3, 3), activation='relu'
+    )(input_layer_object)
+
+    layer_object = keras.layers.Flatten()(layer_object)
+    layer_object = keras.layers.Dense(1, activation='sigmoid')(layer_object)
+
+    return keras.models.Model(
+        inputs=input_layer_object, outputs=layer_object)
+
+
+MODEL_OBJECT = _create_model()
+
+
+def _storm_object_generator(raise_error=False):
+    """Mimics `testing_io.example_generator_2d_or_3d`.
+
+    :param raise_error: Boolean flag.  If True, will raise an error after the
+        first set of storm objects.
+    :return: storm_object_dict: See doc for
+        `testing_io.example_generator_2d_or_3d`.
+    :raises: ValueError: if `raise_error = True`.
+    """
+
+    for these_indices in [FIRST_INDICES_FROM_GENERATOR,
+                          SECOND_INDICES_FROM_GENERATOR]:
+        yield {
+            testing_io.INPUT_MATRICES_KEY:
+                [RADAR_IMAGE_MATRIX[these_indices, ...]],
+            testing_io.TARGET_ARRAY_KEY: TARGET_VALUES[these_indices]
+        }
+
+        if raise_error:
+            raise ValueError('Error in generator.')
+
+
+def _empty_generator():
+    """Generator that yields nothing.
+
+    :return: storm_object_dict: Never returned.
+    """
+
+    return
+    yield
+
+
+class CnnTests(unittest.TestCase):
+    """Each method is a unit test for cnn.py."""
+
+    def setUp(self):
+        """Creates temporary directory for output files."""
+
+        self.output_dir_name = tempfile.mkdtemp()
+        self.output_file_name = os.path.join(
+            self.output_dir_name, 'predictions.nc')
+
+    def tearDown(self):
+        """Deletes temporary directory."""
+
+        shutil.rmtree(self.output_dir_name)
+
+    def test_apply_2d_cnn_batched(self):
+        """Ensures that apply_2d_cnn does not depend on batch size."""
+
+        this_batched_matrix = cnn.apply_2d_cnn(
+            model_object=MODEL_OBJECT, radar_image_matrix=RADAR_IMAGE_MATRIX,
+            num_examples_per_batch=NUM_EXAMPLES_PER_BATCH)
+        this_unbatched_matrix = cnn.apply_2d_cnn(
+            model_object=MODEL_OBJECT, radar_image_matrix=RADAR_IMAGE_MATRIX,
+            num_examples_per_batch=NUM_EXAMPLES)
+
+        self.assertTrue(this_batched_matrix.shape == (NUM_EXAMPLES, 2))
+        self.assertTrue(numpy.allclose(
+            this_batched_matrix, this_unbatched_matrix, atol=TOLERANCE))
+
+    def test_apply_cnn_to_generator(self):
+        """Ensures correct output from apply_cnn_to_generator.
+
+        Outputs from all sets of storm objects should be written to the file,
+        in order.
+        """
+
+        this_num_examples = cnn.apply_cnn_to_generator(
+            model_object=MODEL_OBJECT,
+            generator_object=_storm_object_generator(),
+            use_2d3d_convolution=False, output_file_name=self.output_file_name,
+            num_examples_per_batch=NUM_EXAMPLES_PER_BATCH)[0]
+
+        this_probability_matrix, these_target_values = cnn.read_features(
+            self.output_file_name)[:2]
+        this_expected_matrix = cnn.apply_2d_cnn(
+            model_object=MODEL_OBJECT, radar_image_matrix=RADAR_IMAGE_MATRIX)
+
+        self.assertTrue(this_num_examples == NUM_EXAMPLES)
+        self.assertTrue(numpy.allclose(
+            this_probability_matrix, this_expected_matrix, atol=TOLERANCE))
+        self.assertTrue(numpy.array_equal(these_target_values, TARGET_VALUES))
+
+    def test_apply_cnn_to_generator_error(self):
+        """Ensures that apply_cnn_to_generator re-raises generator errors.
+
+        The traceback should include the frame in which the generator raised
+        the error.
+        """
+
+        with self.assertRaises(ValueError):
+            try:
+                cnn.apply_cnn_to_generator(
+                    model_object=MODEL_OBJECT,
+                    generator_object=_storm_object_generator(raise_error=True),
+                    use_2d3d_convolution=False,
+                    output_file_name=self.output_file_name)
+            except ValueError:
+                these_function_names = [
+                    t[2] for t in traceback.extract_tb(sys.exc_info()[2])
+                ]
+                self.assertTrue(
+                    '_storm_object_generator' in these_function_names)
+                raise
+
+    def test_apply_cnn_to_generator_empty(self):
+        """Ensures that apply_cnn_to_generator errors on empty generator."""
+
+        with self.assertRaises(ValueError):
+            cnn.apply_cnn_to_generator(
+                model_object=MODEL_OBJECT, generator_object=_empty_generator(),
+                use_2d3d_convolution=False,
+                output_file_name=self.output_file_name)
+
+
+if __name__ == '__main__':
+    unittest.main()
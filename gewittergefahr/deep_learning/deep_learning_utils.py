@@ -55,6 +55,14 @@ VALID_NORMALIZATION_TYPE_STRINGS = [
 DEFAULT_MIN_NORMALIZED_VALUE = -1.
 DEFAULT_MAX_NORMALIZED_VALUE = 1.
 
+NUM_VALUES_KEY = 'num_values'
+MEAN_VALUE_KEY = 'mean_value'
+SUM_OF_SQUARED_DEVIATIONS_KEY = 'sum_of_squared_deviations'
+
+BIN_WIDTHS_KEY = 'bin_widths'
+FIRST_BIN_INDICES_KEY = 'first_bin_indices'
+BIN_COUNTS_KEY = 'bin_counts'
+
 
 def _check_normalization_type(normalization_type_string):
     """Ensures that normalization type is valid.
@@ -913,6 +921,290 @@ def sample_by_class(
     return indices_to_keep
 
 
+def update_z_score_params(z_score_param_dict, new_data_matrix):
+    """Updates running estimates of mean and standard deviation.
+
+    Estimates are updated for all channels (the last axis of `new_data_matrix`)
+    at once, using the pairwise algorithm of Chan et al. (1979), which is
+    numerically stable.
+
+    C = number of channels
+
+    :param z_score_param_dict: Dictionary with the following keys.  If None,
+        will be initialized from `new_data_matrix`.
+    z_score_param_dict['num_values']: length-C numpy array with number of values
+        on which current estimates are based.
+    z_score_param_dict['mean_value']: length-C numpy array with current means.
+    z_score_param_dict['sum_of_squared_deviations']: length-C numpy array with
+        current sums of squared deviations from the mean.
+
+    :param new_data_matrix: numpy array with new values.  The last axis must
+        have length C.
+    :return: z_score_param_dict: Same as input, but with new estimates.
+    """
+
+    error_checking.assert_is_numpy_array(new_data_matrix)
+    error_checking.assert_is_geq(len(new_data_matrix.shape), 1)
+
+    num_channels = new_data_matrix.shape[-1]
+    new_data_matrix = numpy.reshape(
+        new_data_matrix, (-1, num_channels)).astype(float)
+    new_mean_values = numpy.mean(new_data_matrix, axis=0)
+
+    new_param_dict = {
+        NUM_VALUES_KEY: numpy.full(num_channels, new_data_matrix.shape[0]),
+        MEAN_VALUE_KEY: new_mean_values,
+        SUM_OF_SQUARED_DEVIATIONS_KEY: numpy.sum(
+            (new_data_matrix - new_mean_values) ** 2, axis=0)
+    }
+
+    if z_score_param_dict is None:
+        return new_param_dict
+
+    return merge_z_score_params(z_score_param_dict, new_param_dict)
+
+
+def merge_z_score_params(first_z_score_param_dict, second_z_score_param_dict):
+    """Merges two sets of running estimates for mean and standard deviation.
+
+    This allows estimates from different subsets of the data (e.g., different
+    files processed by different workers) to be combined exactly.
+
+    :param first_z_score_param_dict: Dictionary created by
+        `update_z_score_params`.
+    :param second_z_score_param_dict: Same.
+    :return: z_score_param_dict: Merged dictionary.
+    """
+
+    if first_z_score_param_dict is None:
+        return copy.deepcopy(second_z_score_param_dict)
+    if second_z_score_param_dict is None:
+        return copy.deepcopy(first_z_score_param_dict)
+
+    first_counts = first_z_score_param_dict[NUM_VALUES_KEY].astype(float)
+    second_counts = second_z_score_param_dict[NUM_VALUES_KEY].astype(float)
+    total_counts = first_counts + second_counts
+    total_counts_for_division = numpy.maximum(total_counts, 1.)
+
+    mean_differences = (
+        second_z_score_param_dict[MEAN_VALUE_KEY] -
+        first_z_score_param_dict[MEAN_VALUE_KEY]
+    )
+
+    return {
+        NUM_VALUES_KEY: total_counts.astype(int),
+        MEAN_VALUE_KEY: (
+            first_z_score_param_dict[MEAN_VALUE_KEY] +
+            mean_differences * second_counts / total_counts_for_division
+        ),
+        SUM_OF_SQUARED_DEVIATIONS_KEY: (
+            first_z_score_param_dict[SUM_OF_SQUARED_DEVIATIONS_KEY] +
+            second_z_score_param_dict[SUM_OF_SQUARED_DEVIATIONS_KEY] +
+            mean_differences ** 2 * first_counts * second_counts /
+            total_counts_for_division
+        )
+    }
+
+
+def get_z_score_params(z_score_param_dict):
+    """Returns mean and standard deviation for each channel.
+
+    C = number of channels
+
+    :param z_score_param_dict: Dictionary created by `update_z_score_params`.
+    :return: mean_values: length-C numpy array of means.
+    :return: standard_deviations: length-C numpy array of standard deviations
+        (with one degree of freedom removed).
+    """
+
+    num_values = z_score_param_dict[NUM_VALUES_KEY].astype(float)
+    standard_deviations = numpy.sqrt(
+        z_score_param_dict[SUM_OF_SQUARED_DEVIATIONS_KEY] /
+        numpy.maximum(num_values - 1, 1.)
+    )
+
+    return z_score_param_dict[MEAN_VALUE_KEY] + 0., standard_deviations
+
+
+def update_histograms(histogram_dict, new_data_matrix, bin_widths):
+    """Updates running histograms (used to estimate percentiles).
+
+    Each value is assigned to the bin centered on the nearest multiple of the
+    bin width for its channel.  Bins for all channels are counted with one call
+    to `numpy.bincount`.  Non-finite values (NaN and infinity) are ignored.  If
+    a channel has no finite values, its histogram is empty.
+
+    C = number of channels
+
+    :param histogram_dict: Dictionary with the following keys.  If None, will
+        be initialized from `new_data_matrix`.
+    histogram_dict['bin_widths']: length-C numpy array of bin widths.
+    histogram_dict['first_bin_indices']: length-C numpy array with index of
+        first bin (bin center divided by bin width) for each channel.
+    histogram_dict['bin_counts']: length-C list, where each element is a 1-D
+        numpy array with number of values in each bin.
+
+    :param new_data_matrix: numpy array with new values.  The last axis must
+        have length C.
+    :param bin_widths: length-C numpy array of bin widths.
+    :return: histogram_dict: Same as input, but with new counts.
+    """
+
+    error_checking.assert_is_numpy_array(new_data_matrix)
+    num_channels = new_data_matrix.shape[-1]
+
+    error_checking.assert_is_greater_numpy_array(bin_widths, 0.)
+    error_checking.assert_is_numpy_array(
+        bin_widths, exact_dimensions=numpy.array([num_channels]))
+
+    data_matrix = numpy.reshape(new_data_matrix, (-1, num_channels))
+    finite_flag_matrix = numpy.isfinite(data_matrix)
+    bin_index_matrix = numpy.round(
+        numpy.where(finite_flag_matrix, data_matrix, 0.) / bin_widths
+    ).astype(int)
+
+    first_bin_indices = numpy.min(
+        numpy.where(finite_flag_matrix, bin_index_matrix,
+                    numpy.iinfo(int).max),
+        axis=0)
+    last_bin_indices = numpy.max(
+        numpy.where(finite_flag_matrix, bin_index_matrix,
+                    numpy.iinfo(int).min),
+        axis=0)
+
+    empty_channel_flags = numpy.invert(numpy.any(finite_flag_matrix, axis=0))
+    first_bin_indices[empty_channel_flags] = 0
+    last_bin_indices[empty_channel_flags] = -1
+
+    num_bins_by_channel = last_bin_indices - (first_bin_indices - 1)
+    channel_offsets = numpy.concatenate((
+        numpy.array([0], dtype=int), numpy.cumsum(num_bins_by_channel)[:-1]
+    ))
+
+    all_bin_counts = numpy.bincount(
+        (bin_index_matrix - first_bin_indices + channel_offsets)[
+            finite_flag_matrix],
+        minlength=numpy.sum(num_bins_by_channel))
+
+    new_histogram_dict = {
+        BIN_WIDTHS_KEY: bin_widths + 0.,
+        FIRST_BIN_INDICES_KEY: first_bin_indices,
+        BIN_COUNTS_KEY: numpy.split(
+            all_bin_counts, numpy.cumsum(num_bins_by_channel)[:-1])
+    }
+
+    if histogram_dict is None:
+        return new_histogram_dict
+
+    return merge_histograms(histogram_dict, new_histogram_dict)
+
+
+def merge_histograms(first_histogram_dict, second_histogram_dict):
+    """Merges two sets of running histograms.
+
+    :param first_histogram_dict: Dictionary created by `update_histograms`.
+    :param second_histogram_dict: Same.
+    :return: histogram_dict: Merged dictionary.
+    :raises: ValueError: if the two dictionaries have different bin widths.
+    """
+
+    if first_histogram_dict is None:
+        return copy.deepcopy(second_histogram_dict)
+    if second_histogram_dict is None:
+        return copy.deepcopy(first_histogram_dict)
+
+    if not numpy.allclose(first_histogram_dict[BIN_WIDTHS_KEY],
+                          second_histogram_dict[BIN_WIDTHS_KEY]):
+        error_string = (
+            'Bin widths in first ({0:s}) and second ({1:s}) dictionaries do '
+            'not match.'
+        ).format(str(first_histogram_dict[BIN_WIDTHS_KEY]),
+                 str(second_histogram_dict[BIN_WIDTHS_KEY]))
+
+        raise ValueError(error_string)
+
+    num_channels = len(first_histogram_dict[BIN_WIDTHS_KEY])
+    first_bin_indices = numpy.full(num_channels, -1, dtype=int)
+    list_of_bin_counts = [None] * num_channels
+
+    for k in range(num_channels):
+        these_dicts = [
+            d for d in [first_histogram_dict, second_histogram_dict]
+            if len(d[BIN_COUNTS_KEY][k]) > 0
+        ]
+
+        if len(these_dicts) == 0:
+            first_bin_indices[k] = 0
+            list_of_bin_counts[k] = numpy.array([], dtype=int)
+            continue
+
+        these_first_indices = numpy.array(
+            [d[FIRST_BIN_INDICES_KEY][k] for d in these_dicts], dtype=int)
+        these_last_indices = these_first_indices + numpy.array(
+            [len(d[BIN_COUNTS_KEY][k]) for d in these_dicts], dtype=int)
+
+        first_bin_indices[k] = numpy.min(these_first_indices)
+        list_of_bin_counts[k] = numpy.full(
+            numpy.max(these_last_indices) - first_bin_indices[k], 0, dtype=int)
+
+        for this_dict, this_first_index, this_last_index in zip(
+                these_dicts, these_first_indices, these_last_indices):
+            list_of_bin_counts[k][
+                (this_first_index - first_bin_indices[k]):
+                (this_last_index - first_bin_indices[k])
+            ] += this_dict[BIN_COUNTS_KEY][k]
+
+    return {
+        BIN_WIDTHS_KEY: first_histogram_dict[BIN_WIDTHS_KEY] + 0.,
+        FIRST_BIN_INDICES_KEY: first_bin_indices,
+        BIN_COUNTS_KEY: list_of_bin_counts
+    }
+
+
+def get_percentiles(histogram_dict, percentile_level):
+    """Estimates one percentile for each channel from running histograms.
+
+    C = number of channels
+
+    :param histogram_dict: Dictionary created by `update_histograms`.
+    :param percentile_level: Percentile level (from 0...100).
+    :return: percentiles: length-C numpy array of percentiles.  This is NaN for
+        channels with empty histograms.
+    """
+
+    error_checking.assert_is_geq(percentile_level, 0.)
+    error_checking.assert_is_leq(percentile_level, 100.)
+
+    num_channels = len(histogram_dict[BIN_WIDTHS_KEY])
+    percentiles = numpy.full(num_channels, numpy.nan)
+
+    for k in range(num_channels):
+        these_counts = histogram_dict[BIN_COUNTS_KEY][k]
+        these_bin_indices = numpy.where(these_counts > 0)[0]
+        these_counts = these_counts[these_bin_indices]
+        these_bin_centers = histogram_dict[BIN_WIDTHS_KEY][k] * (
+            these_bin_indices + histogram_dict[FIRST_BIN_INDICES_KEY][k]
+        ).astype(float)
+
+        this_num_values = numpy.sum(these_counts)
+        if this_num_values == 0:
+            continue
+
+        if this_num_values == 1:
+            percentiles[k] = these_bin_centers[0]
+            continue
+
+        these_percentile_levels = 100 * (
+            (numpy.cumsum(these_counts).astype(float) - 1) /
+            (this_num_values - 1)
+        )
+
+        percentiles[k] = numpy.interp(
+            percentile_level, these_percentile_levels, these_bin_centers)
+
+    return percentiles
+
+
 def write_normalization_params(
         pickle_file_name, radar_table_no_height, radar_table_with_height,
         sounding_table_no_height, sounding_table_with_height):
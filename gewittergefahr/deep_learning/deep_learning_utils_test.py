@@ -471,6 +471,154 @@ WIND_INDICES_TO_KEEP = numpy.array(
      16, 24, 25, 26, 5, 6, 8, 21, 28, 32], dtype=int)
 
 
+# The following constants are used to test update_z_score_params,
+# merge_z_score_params, and get_z_score_params.
+FIRST_MATRIX_FOR_Z_SCORES = numpy.array([[0, 10],
+                                         [1, 20],
+                                         [2, 30],
+                                         [3, 40]], dtype=float)
+SECOND_MATRIX_FOR_Z_SCORES = numpy.array([[4, 50],
+                                          [5, 60]], dtype=float)
+
+FIRST_Z_SCORE_DICT = {
+    dl_utils.NUM_VALUES_KEY: numpy.array([4, 4], dtype=int),
+    dl_utils.MEAN_VALUE_KEY: numpy.array([1.5, 25.]),
+    dl_utils.SUM_OF_SQUARED_DEVIATIONS_KEY: numpy.array([5., 500.])
+}
+SECOND_Z_SCORE_DICT = {
+    dl_utils.NUM_VALUES_KEY: numpy.array([2, 2], dtype=int),
+    dl_utils.MEAN_VALUE_KEY: numpy.array([4.5, 55.]),
+    dl_utils.SUM_OF_SQUARED_DEVIATIONS_KEY: numpy.array([0.5, 50.])
+}
+MERGED_Z_SCORE_DICT = {
+    dl_utils.NUM_VALUES_KEY: numpy.array([6, 6], dtype=int),
+    dl_utils.MEAN_VALUE_KEY: numpy.array([2.5, 35.]),
+    dl_utils.SUM_OF_SQUARED_DEVIATIONS_KEY: numpy.array([17.5, 1750.])
+}
+
+MERGED_MEAN_VALUES = numpy.array([2.5, 35.])
+MERGED_STANDARD_DEVIATIONS = numpy.std(
+    numpy.concatenate(
+        (FIRST_MATRIX_FOR_Z_SCORES, SECOND_MATRIX_FOR_Z_SCORES), axis=0),
+    axis=0, ddof=1)
+
+# The following constants are used to test update_histograms, merge_histograms,
+# and get_percentiles.
+HISTOGRAM_BIN_WIDTHS = numpy.array([0.001, 5.])
+MATRIX_FOR_HISTOGRAMS = numpy.transpose(numpy.vstack((
+    numpy.array([0.001] * 5 + [0.002] * 3 + [0.004] * 7 + [0.006] * 2),
+    numpy.linspace(-10, 70, num=17)
+)))
+NUM_ROWS_IN_FIRST_HISTOGRAM = 8
+
+FIRST_HISTOGRAM_DICT = {
+    dl_utils.BIN_WIDTHS_KEY: HISTOGRAM_BIN_WIDTHS,
+    dl_utils.FIRST_BIN_INDICES_KEY: numpy.array([1, -2], dtype=int),
+    dl_utils.BIN_COUNTS_KEY: [
+        numpy.array([5, 3], dtype=int), numpy.full(8, 1, dtype=int)
+    ]
+}
+SECOND_HISTOGRAM_DICT = {
+    dl_utils.BIN_WIDTHS_KEY: HISTOGRAM_BIN_WIDTHS,
+    dl_utils.FIRST_BIN_INDICES_KEY: numpy.array([4, 6], dtype=int),
+    dl_utils.BIN_COUNTS_KEY: [
+        numpy.array([7, 0, 2], dtype=int), numpy.full(9, 1, dtype=int)
+    ]
+}
+MERGED_HISTOGRAM_DICT = {
+    dl_utils.BIN_WIDTHS_KEY: HISTOGRAM_BIN_WIDTHS,
+    dl_utils.FIRST_BIN_INDICES_KEY: numpy.array([1, -2], dtype=int),
+    dl_utils.BIN_COUNTS_KEY: [
+        numpy.array([5, 3, 0, 7, 0, 2], dtype=int), numpy.full(17, 1, dtype=int)
+    ]
+}
+
+MATRIX_FOR_HISTOGRAMS_WITH_NAN = numpy.transpose(numpy.vstack((
+    numpy.array([0.001, numpy.nan, 0.002, numpy.inf, 0.001, 0.002, 0.001]),
+    numpy.full(7, numpy.nan)
+)))
+HISTOGRAM_DICT_WITH_NAN = {
+    dl_utils.BIN_WIDTHS_KEY: HISTOGRAM_BIN_WIDTHS,
+    dl_utils.FIRST_BIN_INDICES_KEY: numpy.array([1, 0], dtype=int),
+    dl_utils.BIN_COUNTS_KEY: [
+        numpy.array([3, 2], dtype=int), numpy.array([], dtype=int)
+    ]
+}
+MERGED_HISTOGRAM_DICT_WITH_NAN = {
+    dl_utils.BIN_WIDTHS_KEY: HISTOGRAM_BIN_WIDTHS,
+    dl_utils.FIRST_BIN_INDICES_KEY: numpy.array([1, -2], dtype=int),
+    dl_utils.BIN_COUNTS_KEY: [
+        numpy.array([8, 5], dtype=int), numpy.full(8, 1, dtype=int)
+    ]
+}
+PERCENTILES_WITH_NAN = numpy.array([0.001, numpy.nan])
+
+SMALL_PERCENTILE_LEVEL = 3.125
+MEDIUM_PERCENTILE_LEVEL = 43.75
+LARGE_PERCENTILE_LEVEL = 93.75
+
+SMALL_PERCENTILES = numpy.array([0.001, -7.5])
+MEDIUM_PERCENTILES = numpy.array([0.002, 25.])
+LARGE_PERCENTILES = numpy.array([0.005, 65.])
+
+
+def _compare_z_score_dicts(first_z_score_dict, second_z_score_dict):
+    """Compares two dictionaries with z-score parameters.
+
+    :param first_z_score_dict: First dictionary.
+    :param second_z_score_dict: Second dictionary.
+    :return: are_dicts_equal: Boolean flag.
+    """
+
+    if set(first_z_score_dict.keys()) != set(second_z_score_dict.keys()):
+        return False
+
+    for this_key in first_z_score_dict:
+        if this_key == dl_utils.NUM_VALUES_KEY:
+            if not numpy.array_equal(first_z_score_dict[this_key],
+                                     second_z_score_dict[this_key]):
+                return False
+        else:
+            if not numpy.allclose(first_z_score_dict[this_key],
+                                  second_z_score_dict[this_key],
+                                  atol=TOLERANCE):
+                return False
+
+    return True
+
+
+def _compare_histogram_dicts(first_histogram_dict, second_histogram_dict):
+    """Compares two dictionaries with histograms.
+
+    :param first_histogram_dict: First dictionary.
+    :param second_histogram_dict: Second dictionary.
+    :return: are_dicts_equal: Boolean flag.
+    """
+
+    if set(first_histogram_dict.keys()) != set(second_histogram_dict.keys()):
+        return False
+
+    if not numpy.allclose(first_histogram_dict[dl_utils.BIN_WIDTHS_KEY],
+                          second_histogram_dict[dl_utils.BIN_WIDTHS_KEY],
+                          atol=TOLERANCE):
+        return False
+
+    if not numpy.array_equal(
+            first_histogram_dict[dl_utils.FIRST_BIN_INDICES_KEY],
+            second_histogram_dict[dl_utils.FIRST_BIN_INDICES_KEY]):
+        return False
+
+    first_counts = first_histogram_dict[dl_utils.BIN_COUNTS_KEY]
+    second_counts = second_histogram_dict[dl_utils.BIN_COUNTS_KEY]
+    if len(first_counts) != len(second_counts):
+        return False
+
+    for k in range(len(first_counts)):
+        if not numpy.array_equal(first_counts[k], second_counts[k]):
+            return False
+
+    return True
+
 def _compare_lists_of_metpy_dicts(first_list_of_dicts, second_list_of_dicts):
     """Compares two lists of MetPy dictionaries.
 
@@ -1172,6 +1320,171 @@ class DeepLearningUtilsTests(unittest.TestCase):
 
         self.assertTrue(numpy.array_equal(these_indices, WIND_INDICES_TO_KEEP))
 
+    def test_update_z_score_params_new(self):
+        """Ensures correct output from update_z_score_params.
+
+        In this case, there are no existing estimates.
+        """
+
+        this_z_score_dict = dl_utils.update_z_score_params(
+            z_score_param_dict=None,
+            new_data_matrix=FIRST_MATRIX_FOR_Z_SCORES)
+
+        self.assertTrue(_compare_z_score_dicts(
+            this_z_score_dict, FIRST_Z_SCORE_DICT))
+
+    def test_update_z_score_params_existing(self):
+        """Ensures correct output from update_z_score_params.
+
+        In this case, existing estimates are updated.
+        """
+
+        this_z_score_dict = dl_utils.update_z_score_params(
+            z_score_param_dict=copy.deepcopy(FIRST_Z_SCORE_DICT),
+            new_data_matrix=SECOND_MATRIX_FOR_Z_SCORES)
+
+        self.assertTrue(_compare_z_score_dicts(
+            this_z_score_dict, MERGED_Z_SCORE_DICT))
+
+    def test_merge_z_score_params(self):
+        """Ensures correct output from merge_z_score_params."""
+
+        this_z_score_dict = dl_utils.merge_z_score_params(
+            copy.deepcopy(FIRST_Z_SCORE_DICT),
+            copy.deepcopy(SECOND_Z_SCORE_DICT))
+
+        self.assertTrue(_compare_z_score_dicts(
+            this_z_score_dict, MERGED_Z_SCORE_DICT))
+
+    def test_get_z_score_params(self):
+        """Ensures correct output from get_z_score_params."""
+
+        these_means, these_standard_deviations = dl_utils.get_z_score_params(
+            MERGED_Z_SCORE_DICT)
+
+        self.assertTrue(numpy.allclose(
+            these_means, MERGED_MEAN_VALUES, atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            these_standard_deviations, MERGED_STANDARD_DEVIATIONS,
+            atol=TOLERANCE))
+
+    def test_update_histograms_new(self):
+        """Ensures correct output from update_histograms.
+
+        In this case, there are no existing histograms.
+        """
+
+        this_histogram_dict = dl_utils.update_histograms(
+            histogram_dict=None,
+            new_data_matrix=
+            MATRIX_FOR_HISTOGRAMS[:NUM_ROWS_IN_FIRST_HISTOGRAM, ...],
+            bin_widths=HISTOGRAM_BIN_WIDTHS)
+
+        self.assertTrue(_compare_histogram_dicts(
+            this_histogram_dict, FIRST_HISTOGRAM_DICT))
+
+    def test_update_histograms_existing(self):
+        """Ensures correct output from update_histograms.
+
+        In this case, existing histograms are updated.
+        """
+
+        this_histogram_dict = dl_utils.update_histograms(
+            histogram_dict=copy.deepcopy(FIRST_HISTOGRAM_DICT),
+            new_data_matrix=
+            MATRIX_FOR_HISTOGRAMS[NUM_ROWS_IN_FIRST_HISTOGRAM:, ...],
+            bin_widths=HISTOGRAM_BIN_WIDTHS)
+
+        self.assertTrue(_compare_histogram_dicts(
+            this_histogram_dict, MERGED_HISTOGRAM_DICT))
+
+    def test_update_histograms_nan(self):
+        """Ensures correct output from update_histograms.
+
+        In this case, the new data contain non-finite values, which should be
+        ignored, and one channel is all NaN.
+        """
+
+        this_histogram_dict = dl_utils.update_histograms(
+            histogram_dict=None, new_data_matrix=MATRIX_FOR_HISTOGRAMS_WITH_NAN,
+            bin_widths=HISTOGRAM_BIN_WIDTHS)
+
+        self.assertTrue(_compare_histogram_dicts(
+            this_histogram_dict, HISTOGRAM_DICT_WITH_NAN))
+
+    def test_update_histograms_nan_existing(self):
+        """Ensures correct output from update_histograms.
+
+        In this case, existing histograms are updated with data containing
+        non-finite values.
+        """
+
+        this_histogram_dict = dl_utils.update_histograms(
+            histogram_dict=copy.deepcopy(FIRST_HISTOGRAM_DICT),
+            new_data_matrix=MATRIX_FOR_HISTOGRAMS_WITH_NAN,
+            bin_widths=HISTOGRAM_BIN_WIDTHS)
+
+        self.assertTrue(_compare_histogram_dicts(
+            this_histogram_dict, MERGED_HISTOGRAM_DICT_WITH_NAN))
+
+    def test_get_percentiles_nan(self):
+        """Ensures correct output from get_percentiles.
+
+        In this case, one histogram is empty, because the channel had only NaN.
+        """
+
+        these_percentiles = dl_utils.get_percentiles(
+            histogram_dict=HISTOGRAM_DICT_WITH_NAN, percentile_level=50.)
+        self.assertTrue(numpy.allclose(
+            these_percentiles, PERCENTILES_WITH_NAN, atol=TOLERANCE,
+            equal_nan=True))
+
+    def test_merge_histograms(self):
+        """Ensures correct output from merge_histograms."""
+
+        this_histogram_dict = dl_utils.merge_histograms(
+            copy.deepcopy(SECOND_HISTOGRAM_DICT),
+            copy.deepcopy(FIRST_HISTOGRAM_DICT))
+
+        self.assertTrue(_compare_histogram_dicts(
+            this_histogram_dict, MERGED_HISTOGRAM_DICT))
+
+    def test_get_percentiles_small(self):
+        """Ensures correct output from get_percentiles.
+
+        In this case, percentile level is small.
+        """
+
+        these_percentiles = dl_utils.get_percentiles(
+            histogram_dict=MERGED_HISTOGRAM_DICT,
+            percentile_level=SMALL_PERCENTILE_LEVEL)
+        self.assertTrue(numpy.allclose(
+            these_percentiles, SMALL_PERCENTILES, atol=TOLERANCE))
+
+    def test_get_percentiles_medium(self):
+        """Ensures correct output from get_percentiles.
+
+        In this case, percentile level is medium.
+        """
+
+        these_percentiles = dl_utils.get_percentiles(
+            histogram_dict=MERGED_HISTOGRAM_DICT,
+            percentile_level=MEDIUM_PERCENTILE_LEVEL)
+        self.assertTrue(numpy.allclose(
+            these_percentiles, MEDIUM_PERCENTILES, atol=TOLERANCE))
+
+    def test_get_percentiles_large(self):
+        """Ensures correct output from get_percentiles.
+
+        In this case, percentile level is large.
+        """
+
+        these_percentiles = dl_utils.get_percentiles(
+            histogram_dict=MERGED_HISTOGRAM_DICT,
+            percentile_level=LARGE_PERCENTILE_LEVEL)
+        self.assertTrue(numpy.allclose(
+            these_percentiles, LARGE_PERCENTILES, atol=TOLERANCE))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -21,6 +21,9 @@ from gewittergefahr.deep_learning import training_validation_io as trainval_io
 DEFAULT_IDEAL_ACTIVATION = 2.
 DEFAULT_LEARNING_RATE = 0.01
 DEFAULT_NUM_ITERATIONS = 200
+DEFAULT_NUM_STARTS = 1
+DEFAULT_PATIENCE = None
+DEFAULT_MIN_LOSS_DECREASE = 0.
 
 MODEL_FILE_NAME_KEY = 'model_file_name'
 NUM_ITERATIONS_KEY = 'num_iterations'
@@ -39,13 +42,42 @@ CONSTANT_INIT_FUNCTION_NAME = 'constant'
 CLIMO_INIT_FUNCTION_NAME = 'climo'
 
 
+def _create_optimization_function(model_object, loss_tensor):
+    """Creates function that computes loss and gradients.
+
+    :param model_object: Instance of `keras.models.Model`.
+    :param loss_tensor: Keras tensor defining the loss function.
+    :return: optimization_function: Compiled Keras function.  Input is a list of
+        input matrices (see doc for `_do_gradient_descent`) plus the learning
+        phase (0).  Output is a list with the loss, followed by normalized
+        gradients for each input matrix.
+    """
+
+    if isinstance(model_object.input, list):
+        list_of_input_tensors = model_object.input
+    else:
+        list_of_input_tensors = [model_object.input]
+
+    list_of_gradient_tensors = K.gradients(loss_tensor, list_of_input_tensors)
+    num_input_tensors = len(list_of_input_tensors)
+    for i in range(num_input_tensors):
+        list_of_gradient_tensors[i] /= K.maximum(
+            K.sqrt(K.mean(list_of_gradient_tensors[i] ** 2)),
+            K.epsilon())
+
+    return K.function(
+        list_of_input_tensors + [K.learning_phase()],
+        ([loss_tensor] + list_of_gradient_tensors))
+
+
 def _do_gradient_descent(
-        model_object, loss_tensor, init_function_or_matrices, num_iterations,
-        learning_rate):
+        model_object, optimization_function, init_function_or_matrices,
+        num_iterations, learning_rate):
     """Does gradient descent for feature optimization.
 
     :param model_object: Instance of `keras.models.Model`.
-    :param loss_tensor: Keras tensor defining the loss function.
+    :param optimization_function: Function created by
+        `_create_optimization_function`.
     :param init_function_or_matrices: Either a function or a list of numpy
         arrays.
 
@@ -72,16 +104,7 @@ def _do_gradient_descent(
     else:
         list_of_input_tensors = [model_object.input]
 
-    list_of_gradient_tensors = K.gradients(loss_tensor, list_of_input_tensors)
     num_input_tensors = len(list_of_input_tensors)
-    for i in range(num_input_tensors):
-        list_of_gradient_tensors[i] /= K.maximum(
-            K.sqrt(K.mean(list_of_gradient_tensors[i] ** 2)),
-            K.epsilon())
-
-    inputs_to_loss_and_gradients = K.function(
-        list_of_input_tensors + [K.learning_phase()],
-        ([loss_tensor] + list_of_gradient_tensors))
 
     if isinstance(init_function_or_matrices, list):
         list_of_optimized_input_matrices = copy.deepcopy(
@@ -98,7 +121,7 @@ def _do_gradient_descent(
                 these_dimensions)
 
     for j in range(num_iterations):
-        these_outputs = inputs_to_loss_and_gradients(
+        these_outputs = optimization_function(
             list_of_optimized_input_matrices + [0])
 
         if numpy.mod(j, 100) == 0:
@@ -114,6 +137,167 @@ def _do_gradient_descent(
     return list_of_optimized_input_matrices
 
 
+def _create_batched_optimization_function(
+        model_object, component_type_string, target_class, layer_name,
+        ideal_activation, stat_function_for_neuron_activations):
+    """Creates function that computes loss and gradients for many rows.
+
+    Each row (example) of the input matrices is optimized for its own model
+    component.  The total loss is the sum of per-row losses, so the gradient for
+    each row depends only on that row's loss.
+
+    R = number of rows
+
+    :param model_object: See doc for `optimize_input_for_many_components`.
+    :param component_type_string: Same.
+    :param target_class: Same.
+    :param layer_name: Same.
+    :param ideal_activation: Same.
+    :param stat_function_for_neuron_activations: Same.
+    :return: optimization_function: Compiled Keras function.  Input is a list of
+        input matrices (each with R rows), followed by the component mask (only
+        if component type is "neuron" or "channel"; see
+        `_create_component_mask`), followed by the learning phase (0).  Output
+        is a list with the length-R numpy array of losses, followed by
+        normalized gradients for each input matrix.
+    """
+
+    if isinstance(model_object.input, list):
+        list_of_input_tensors = model_object.input
+    else:
+        list_of_input_tensors = [model_object.input]
+
+    list_of_mask_tensors = []
+
+    if (component_type_string ==
+            model_interpretation.CLASS_COMPONENT_TYPE_STRING):
+        output_tensor = model_object.layers[-1].output
+        num_output_neurons = output_tensor.get_shape().as_list()[-1]
+
+        if num_output_neurons == 1:
+            if target_class == 1:
+                loss_tensor = (output_tensor[..., 0] - 1) ** 2
+            else:
+                loss_tensor = output_tensor[..., 0] ** 2
+        else:
+            loss_tensor = (output_tensor[..., target_class] - 1) ** 2
+
+    else:
+        output_tensor = model_object.get_layer(name=layer_name).output
+        num_output_dimensions = K.ndim(output_tensor)
+
+        if (component_type_string ==
+                model_interpretation.NEURON_COMPONENT_TYPE_STRING):
+            mask_tensor = K.placeholder(
+                shape=(None,) + tuple(output_tensor.get_shape().as_list()[1:])
+            )
+
+            activation_tensor = K.sum(
+                output_tensor * mask_tensor,
+                axis=range(1, num_output_dimensions))
+
+            if ideal_activation is None:
+                loss_tensor = (
+                    -K.sign(activation_tensor) * activation_tensor ** 2)
+            else:
+                loss_tensor = (activation_tensor - ideal_activation) ** 2
+
+        else:
+            mask_tensor = K.placeholder(
+                shape=(None, output_tensor.get_shape().as_list()[-1])
+            )
+
+            this_mask_tensor = mask_tensor
+            for _ in range(num_output_dimensions - 2):
+                this_mask_tensor = K.expand_dims(this_mask_tensor, axis=1)
+
+            activation_tensor = K.sum(output_tensor * this_mask_tensor, axis=-1)
+            if num_output_dimensions > 2:
+                activation_tensor = stat_function_for_neuron_activations(
+                    activation_tensor,
+                    axis=range(1, num_output_dimensions - 1))
+
+            if ideal_activation is None:
+                loss_tensor = -K.abs(activation_tensor)
+            else:
+                loss_tensor = K.abs(activation_tensor - ideal_activation)
+
+        list_of_mask_tensors = [mask_tensor]
+
+    list_of_gradient_tensors = K.gradients(
+        K.sum(loss_tensor), list_of_input_tensors)
+
+    for i in range(len(list_of_input_tensors)):
+        these_axes = range(1, K.ndim(list_of_gradient_tensors[i]))
+        list_of_gradient_tensors[i] /= K.maximum(
+            K.sqrt(K.mean(
+                list_of_gradient_tensors[i] ** 2, axis=these_axes,
+                keepdims=True
+            )),
+            K.epsilon()
+        )
+
+    return K.function(
+        list_of_input_tensors + list_of_mask_tensors + [K.learning_phase()],
+        ([loss_tensor] + list_of_gradient_tensors))
+
+
+def _create_component_mask(
+        model_object, component_type_string, layer_name, neuron_index_matrix,
+        channel_indices, num_starts):
+    """Creates mask that assigns each row to one model component.
+
+    C = number of model components
+    S = number of starts (initializations) per component
+    R = number of rows = C * S
+
+    :param model_object: See doc for `optimize_input_for_many_components`.
+    :param component_type_string: Same.
+    :param layer_name: Same.
+    :param neuron_index_matrix: Same.
+    :param channel_indices: Same.
+    :param num_starts: Same.
+    :return: mask_matrix: numpy array, where the first axis has length R.  If
+        component type is "neuron", mask_matrix[r, ...] has the same shape as
+        one example in the layer output and is 1 only at the neuron for the
+        [r]th row.  If component type is "channel", mask_matrix is R x N (N =
+        number of channels in layer), where mask_matrix[r, :] is 1 only at the
+        channel for the [r]th row.  If component type is "class", this is None.
+    """
+
+    if (component_type_string ==
+            model_interpretation.CLASS_COMPONENT_TYPE_STRING):
+        return None
+
+    these_dimensions = model_object.get_layer(
+        name=layer_name).output.get_shape().as_list()[1:]
+
+    if (component_type_string ==
+            model_interpretation.NEURON_COMPONENT_TYPE_STRING):
+        num_components = neuron_index_matrix.shape[0]
+        mask_matrix = numpy.full(
+            [num_components * num_starts] + these_dimensions, 0.)
+
+        for j in range(num_components):
+            for k in range(num_starts):
+                mask_matrix[
+                    (j * num_starts + k,) + tuple(neuron_index_matrix[j, :])
+                ] = 1.
+
+        return mask_matrix
+
+    num_components = len(channel_indices)
+    mask_matrix = numpy.full(
+        (num_components * num_starts, these_dimensions[-1]), 0.)
+
+    for j in range(num_components):
+        mask_matrix[
+            (j * num_starts):((j + 1) * num_starts), channel_indices[j]
+        ] = 1.
+
+    return mask_matrix
+
+
 def check_metadata(
         num_iterations, learning_rate, component_type_string, target_class=None,
         layer_name=None, ideal_activation=None, neuron_index_matrix=None,
@@ -424,19 +608,39 @@ def optimize_input_for_class(
 
     if num_output_neurons == 1:
         error_checking.assert_is_leq(target_class, 1)
-        if target_class == 1:
-            loss_tensor = K.mean(
-                (model_object.layers[-1].output[..., 0] - 1) ** 2)
-        else:
-            loss_tensor = K.mean(
-                model_object.layers[-1].output[..., 0] ** 2)
     else:
         error_checking.assert_is_less_than(target_class, num_output_neurons)
-        loss_tensor = K.mean(
-            (model_object.layers[-1].output[..., target_class] - 1) ** 2)
+
+    def create_optimization_function():
+        """Creates optimization function for the target class.
+
+        :return: optimization_function: See doc for
+            `_create_optimization_function`.
+        """
+
+        if num_output_neurons == 1:
+            if target_class == 1:
+                loss_tensor = K.mean(
+                    (model_object.layers[-1].output[..., 0] - 1) ** 2)
+            else:
+                loss_tensor = K.mean(
+                    model_object.layers[-1].output[..., 0] ** 2)
+        else:
+            loss_tensor = K.mean(
+                (model_object.layers[-1].output[..., target_class] - 1) ** 2)
+
+        return _create_optimization_function(
+            model_object=model_object, loss_tensor=loss_tensor)
+
+    optimization_function = model_interpretation.get_cached_function(
+        model_object=model_object,
+        key_tuple=(model_interpretation.OPTIMIZATION_FUNCTION_TYPE_STRING,
+                   model_interpretation.CLASS_COMPONENT_TYPE_STRING,
+                   target_class),
+        create_function=create_optimization_function)
 
     return _do_gradient_descent(
-        model_object=model_object, loss_tensor=loss_tensor,
+        model_object=model_object, optimization_function=optimization_function,
         init_function_or_matrices=init_function_or_matrices,
         num_iterations=num_iterations, learning_rate=learning_rate)
 
@@ -475,22 +679,40 @@ def optimize_input_for_neuron_activation(
 
     neuron_indices_as_tuple = (0,) + tuple(neuron_indices)
 
-    if ideal_activation is None:
-        loss_tensor = -(
-            K.sign(
+    def create_optimization_function():
+        """Creates optimization function for the given neuron.
+
+        :return: optimization_function: See doc for
+            `_create_optimization_function`.
+        """
+
+        if ideal_activation is None:
+            loss_tensor = -(
+                K.sign(
+                    model_object.get_layer(name=layer_name).output[
+                        neuron_indices_as_tuple]) *
                 model_object.get_layer(name=layer_name).output[
-                    neuron_indices_as_tuple]) *
-            model_object.get_layer(name=layer_name).output[
-                neuron_indices_as_tuple] ** 2
-        )
-    else:
-        loss_tensor = (
-            model_object.get_layer(name=layer_name).output[
-                neuron_indices_as_tuple] -
-            ideal_activation) ** 2
+                    neuron_indices_as_tuple] ** 2
+            )
+        else:
+            loss_tensor = (
+                model_object.get_layer(name=layer_name).output[
+                    neuron_indices_as_tuple] -
+                ideal_activation) ** 2
+
+        return _create_optimization_function(
+            model_object=model_object, loss_tensor=loss_tensor)
+
+    optimization_function = model_interpretation.get_cached_function(
+        model_object=model_object,
+        key_tuple=(model_interpretation.OPTIMIZATION_FUNCTION_TYPE_STRING,
+                   model_interpretation.NEURON_COMPONENT_TYPE_STRING,
+                   layer_name, tuple(neuron_indices.tolist()),
+                   ideal_activation),
+        create_function=create_optimization_function)
 
     return _do_gradient_descent(
-        model_object=model_object, loss_tensor=loss_tensor,
+        model_object=model_object, optimization_function=optimization_function,
         init_function_or_matrices=init_function_or_matrices,
         num_iterations=num_iterations, learning_rate=learning_rate)
 
@@ -539,24 +761,235 @@ def optimize_input_for_channel_activation(
         layer_name=layer_name, ideal_activation=ideal_activation,
         channel_indices=numpy.array([channel_index]))
 
-    if ideal_activation is None:
-        loss_tensor = -K.abs(stat_function_for_neuron_activations(
-            model_object.get_layer(name=layer_name).output[
-                0, ..., channel_index]))
-    else:
-        error_checking.assert_is_greater(ideal_activation, 0.)
-        loss_tensor = K.abs(
-            stat_function_for_neuron_activations(
+    def create_optimization_function():
+        """Creates optimization function for the given channel.
+
+        :return: optimization_function: See doc for
+            `_create_optimization_function`.
+        """
+
+        if ideal_activation is None:
+            loss_tensor = -K.abs(stat_function_for_neuron_activations(
                 model_object.get_layer(name=layer_name).output[
-                    0, ..., channel_index]) -
-            ideal_activation)
+                    0, ..., channel_index]))
+        else:
+            loss_tensor = K.abs(
+                stat_function_for_neuron_activations(
+                    model_object.get_layer(name=layer_name).output[
+                        0, ..., channel_index]) -
+                ideal_activation)
+
+        return _create_optimization_function(
+            model_object=model_object, loss_tensor=loss_tensor)
+
+    optimization_function = model_interpretation.get_cached_function(
+        model_object=model_object,
+        key_tuple=(model_interpretation.OPTIMIZATION_FUNCTION_TYPE_STRING,
+                   model_interpretation.CHANNEL_COMPONENT_TYPE_STRING,
+                   layer_name, channel_index, ideal_activation,
+                   stat_function_for_neuron_activations),
+        create_function=create_optimization_function)
 
     return _do_gradient_descent(
-        model_object=model_object, loss_tensor=loss_tensor,
+        model_object=model_object, optimization_function=optimization_function,
         init_function_or_matrices=init_function_or_matrices,
         num_iterations=num_iterations, learning_rate=learning_rate)
 
 
+def optimize_input_for_many_components(
+        model_object, component_type_string, init_function_or_matrices,
+        target_class=None, layer_name=None, neuron_index_matrix=None,
+        channel_indices=None, stat_function_for_neuron_activations=None,
+        num_starts=DEFAULT_NUM_STARTS, num_iterations=DEFAULT_NUM_ITERATIONS,
+        learning_rate=DEFAULT_LEARNING_RATE,
+        ideal_activation=DEFAULT_IDEAL_ACTIVATION, patience=DEFAULT_PATIENCE,
+        min_loss_decrease=DEFAULT_MIN_LOSS_DECREASE):
+    """Optimizes synthetic inputs for many components and/or starts at once.
+
+    All inputs are stacked along the batch axis and optimized in one graph,
+    with one row per component and start.  This is much faster than calling
+    `optimize_input_for_neuron_activation` or
+    `optimize_input_for_channel_activation` once per component.
+
+    C = number of model components (1 if component type is "class")
+    S = number of starts (initializations) per component
+    R = number of rows = C * S
+
+    Rows are sorted first by component, then by start.  In other words, rows
+    j * S ... (j + 1) * S - 1 are for the [j]th component.
+
+    If `patience is not None`, each row stops early if its loss has not
+    decreased by more than `min_loss_decrease` for `patience` iterations.  By
+    default there is no early stopping, so all rows run for `num_iterations`.
+
+    :param model_object: Instance of `keras.models.Model`.
+    :param component_type_string: Component type (must be accepted by
+        `model_interpretation.check_component_type`).
+    :param init_function_or_matrices: See doc for `_do_gradient_descent`.  If
+        list of numpy arrays, the first axis of each must have length 1 (in
+        which case it will be used for all rows) or R.
+    :param target_class: [used only if component_type_string = "class"]
+        See doc for `optimize_input_for_class`.
+    :param layer_name: [used only if component_type_string = "neuron" or
+        "channel"] Name of layer containing the relevant neurons or channels.
+    :param neuron_index_matrix: [used only if component_type_string = "neuron"]
+        C-by-? numpy array, where neuron_index_matrix[j, :] contains array
+        indices of the [j]th neuron.
+    :param channel_indices: [used only if component_type_string = "channel"]
+        length-C numpy array of channel indices.
+    :param stat_function_for_neuron_activations:
+        [used only if component_type_string = "channel"]
+        See doc for `optimize_input_for_channel_activation`.  This function
+        must also take the keyword argument `axis`, as do `keras.backend.max`
+        and `keras.backend.mean`.
+    :param num_starts: Number of starts (initializations) per component.
+    :param num_iterations: See doc for `_do_gradient_descent`.
+    :param learning_rate: Same.
+    :param ideal_activation: See doc for `optimize_input_for_neuron_activation`
+        or `optimize_input_for_channel_activation`.
+    :param patience: See general discussion above.  If None, there will be no
+        early stopping.
+    :param min_loss_decrease: See general discussion above.
+    :return: list_of_optimized_input_matrices: length-T list of optimized input
+        matrices (numpy arrays), where T = number of input tensors to the model.
+        The first axis of each has length R.
+    :return: final_losses: length-R numpy array of final losses.
+    """
+
+    if (component_type_string ==
+            model_interpretation.NEURON_COMPONENT_TYPE_STRING):
+        neuron_index_matrix = numpy.array(neuron_index_matrix, dtype=int)
+
+    num_components = check_metadata(
+        num_iterations=num_iterations, learning_rate=learning_rate,
+        component_type_string=component_type_string, target_class=target_class,
+        layer_name=layer_name, ideal_activation=ideal_activation,
+        neuron_index_matrix=neuron_index_matrix,
+        channel_indices=channel_indices)
+
+    error_checking.assert_is_integer(num_starts)
+    error_checking.assert_is_greater(num_starts, 0)
+    error_checking.assert_is_geq(min_loss_decrease, 0.)
+    if patience is not None:
+        error_checking.assert_is_integer(patience)
+        error_checking.assert_is_greater(patience, 0)
+
+    if (component_type_string ==
+            model_interpretation.CLASS_COMPONENT_TYPE_STRING):
+        num_output_neurons = model_object.layers[
+            -1].output.get_shape().as_list()[-1]
+
+        if num_output_neurons == 1:
+            error_checking.assert_is_leq(target_class, 1)
+        else:
+            error_checking.assert_is_less_than(target_class, num_output_neurons)
+
+    def create_optimization_function():
+        """Creates batched optimization function.
+
+        :return: optimization_function: See doc for
+            `_create_batched_optimization_function`.
+        """
+
+        return _create_batched_optimization_function(
+            model_object=model_object,
+            component_type_string=component_type_string,
+            target_class=target_class, layer_name=layer_name,
+            ideal_activation=ideal_activation,
+            stat_function_for_neuron_activations=
+            stat_function_for_neuron_activations)
+
+    # The component mask is an input to the function, so one function works
+    # for all components in the layer.
+    optimization_function = model_interpretation.get_cached_function(
+        model_object=model_object,
+        key_tuple=(model_interpretation.OPTIMIZATION_FUNCTION_TYPE_STRING,
+                   'batched', component_type_string, target_class, layer_name,
+                   ideal_activation, stat_function_for_neuron_activations),
+        create_function=create_optimization_function)
+
+    mask_matrix = _create_component_mask(
+        model_object=model_object, component_type_string=component_type_string,
+        layer_name=layer_name, neuron_index_matrix=neuron_index_matrix,
+        channel_indices=channel_indices, num_starts=num_starts)
+
+    # Initialize input matrices.
+    if isinstance(model_object.input, list):
+        list_of_input_tensors = model_object.input
+    else:
+        list_of_input_tensors = [model_object.input]
+
+    num_input_tensors = len(list_of_input_tensors)
+    num_rows = num_components * num_starts
+
+    if isinstance(init_function_or_matrices, list):
+        list_of_optimized_input_matrices = [
+            numpy.repeat(a, num_rows, axis=0) if a.shape[0] == 1
+            else a.astype(float)
+            for a in init_function_or_matrices
+        ]
+    else:
+        list_of_optimized_input_matrices = [None] * num_input_tensors
+
+        for i in range(num_input_tensors):
+            these_dimensions = numpy.array(
+                [num_rows] + list_of_input_tensors[i].get_shape().as_list()[1:],
+                dtype=int)
+
+            list_of_optimized_input_matrices[i] = init_function_or_matrices(
+                these_dimensions)
+
+    # Do gradient descent.
+    final_losses = numpy.full(num_rows, numpy.nan)
+    lowest_losses = numpy.full(num_rows, numpy.inf)
+    num_iters_without_decrease = numpy.full(num_rows, 0, dtype=int)
+    active_rows = numpy.linspace(0, num_rows - 1, num=num_rows, dtype=int)
+
+    for j in range(num_iterations):
+        these_inputs = [a[active_rows, ...]
+                        for a in list_of_optimized_input_matrices]
+        if mask_matrix is not None:
+            these_inputs.append(mask_matrix[active_rows, ...])
+
+        these_outputs = optimization_function(these_inputs + [0])
+        final_losses[active_rows] = these_outputs[0]
+
+        if numpy.mod(j, 100) == 0:
+            print (
+                'Mean loss at iteration {0:d} of {1:d} ({2:d} active rows): '
+                '{3:.2e}'
+            ).format(j + 1, num_iterations, len(active_rows),
+                     numpy.mean(these_outputs[0]))
+
+        for i in range(num_input_tensors):
+            list_of_optimized_input_matrices[i][active_rows, ...] -= (
+                these_outputs[i + 1] * learning_rate)
+
+        if patience is None:
+            continue
+
+        these_decrease_flags = (
+            final_losses[active_rows] <
+            lowest_losses[active_rows] - min_loss_decrease
+        )
+        num_iters_without_decrease[active_rows] += 1
+        num_iters_without_decrease[active_rows[these_decrease_flags]] = 0
+        lowest_losses[active_rows] = numpy.minimum(
+            lowest_losses[active_rows], final_losses[active_rows])
+
+        active_rows = active_rows[
+            num_iters_without_decrease[active_rows] < patience]
+
+        if len(active_rows) == 0:
+            print 'All rows stopped early after {0:d} iterations.'.format(j + 1)
+            break
+
+    print 'Mean loss after optimization: {0:.2e}'.format(
+        numpy.mean(final_losses))
+
+    return list_of_optimized_input_matrices, final_losses
+
+
 def write_file(
         pickle_file_name, list_of_optimized_input_matrices, model_file_name,
         init_function_name_or_matrices, num_iterations, learning_rate,
@@ -3,9 +3,12 @@
 import unittest
 import numpy
 import pandas
+import keras
+from keras import backend as K
 from gewittergefahr.gg_utils import radar_utils
 from gewittergefahr.gg_utils import soundings
 from gewittergefahr.deep_learning import feature_optimization
+from gewittergefahr.deep_learning import model_interpretation
 from gewittergefahr.deep_learning import deep_learning_utils as dl_utils
 from gewittergefahr.deep_learning import training_validation_io as trainval_io
 
@@ -169,10 +172,77 @@ INIT_RADAR_MATRIX_5D = numpy.stack(
     (THIS_MATRIX_FIELD1, THIS_MATRIX_FIELD2), axis=-1)
 INIT_RADAR_MATRIX_5D = numpy.expand_dims(INIT_RADAR_MATRIX_5D, axis=0)
 
+# The following constants are used to test optimize_input_for_many_components.
+BATCHED_TOLERANCE = 1e-4
+NUM_STARTS = 2
+NUM_ITERATIONS = 20
+LEARNING_RATE = 0.01
+INIT_MATRICES_FOR_MODEL = [
+    numpy.random.RandomState(6695).normal(size=(1, 6, 6, 2))
+]
+
+TARGET_CLASS = 1
+DENSE_LAYER_NAME = 'dense_for_optimization_test'
+NEURON_INDEX_MATRIX = numpy.array([[1], [3]], dtype=int)
+CONV_LAYER_NAME = 'conv_for_optimization_test'
+CHANNEL_INDICES = numpy.array([0, 2], dtype=int)
+
+
+def _create_model():
+    """Creates small CNN for testing.
+
+    :return: model_object: Instance of `keras.models.Model`.
+    """
+
+    input_layer_object = keras.layers.Input(
+        shape=INIT_MATRICES_FOR_MODEL[0].shape[1:])
+    layer_object = keras.layers.Conv2D(
+        filters=3, kernel_size=(3, 3), activation='tanh', name=CONV_LAYER_NAME
+    )(input_layer_object)
+
+    layer_object = keras.layers.Flatten()(layer_object)
+    layer_object = keras.layers.Dense(
+        4, activation='tanh', name=DENSE_LAYER_NAME
+    )(layer_object)
+    layer_object = keras.layers.Dense(1, activation='sigmoid')(layer_object)
+
+    return keras.models.Model(
+        inputs=input_layer_object, outputs=layer_object)
+
+
+MODEL_OBJECT = _create_model()
+
 
 class FeatureOptimizationTests(unittest.TestCase):
     """Each method is a unit test for feature_optimization.py."""
 
+    def tearDown(self):
+        """Clears cache of compiled functions."""
+
+        model_interpretation.clear_function_cache()
+
+    def _compare_batched_and_unbatched(
+            self, list_of_batched_matrices, list_of_unbatched_matrices_by_comp):
+        """Compares results of batched and one-at-a-time optimization.
+
+        :param list_of_batched_matrices: List of matrices returned by
+            `feature_optimization.optimize_input_for_many_components`.
+        :param list_of_unbatched_matrices_by_comp: 1-D list, where the [j]th
+            item is the list of matrices returned by the one-component method
+            for the [j]th component.
+        """
+
+        for j in range(len(list_of_unbatched_matrices_by_comp)):
+            for k in range(NUM_STARTS):
+                self.assertTrue(numpy.allclose(
+                    list_of_batched_matrices[0][j * NUM_STARTS + k, ...],
+                    list_of_unbatched_matrices_by_comp[j][0][0, ...],
+                    atol=BATCHED_TOLERANCE))
+
+        self.assertFalse(numpy.allclose(
+            list_of_batched_matrices[0][0, ...], INIT_MATRICES_FOR_MODEL[0][0],
+            atol=BATCHED_TOLERANCE))
+
     def test_create_gaussian_initializer_3d(self):
         """Ensures correct output from create_gaussian_initializer.
 
@@ -343,6 +413,95 @@ class FeatureOptimizationTests(unittest.TestCase):
         this_matrix = this_init_function(ARRAY_DIMENSIONS_2D)
         self.assertTrue(this_matrix is None)
 
+    def test_optimize_input_for_many_components_class(self):
+        """Ensures correct output from optimize_input_for_many_components.
+
+        In this case, the component type is "class".  Each start should give
+        the same result as `optimize_input_for_class`.
+        """
+
+        these_batched_matrices = (
+            feature_optimization.optimize_input_for_many_components(
+                model_object=MODEL_OBJECT,
+                component_type_string=
+                model_interpretation.CLASS_COMPONENT_TYPE_STRING,
+                init_function_or_matrices=INIT_MATRICES_FOR_MODEL,
+                target_class=TARGET_CLASS, num_starts=NUM_STARTS,
+                num_iterations=NUM_ITERATIONS, learning_rate=LEARNING_RATE)[0]
+        )
+
+        these_unbatched_matrices = (
+            feature_optimization.optimize_input_for_class(
+                model_object=MODEL_OBJECT, target_class=TARGET_CLASS,
+                init_function_or_matrices=INIT_MATRICES_FOR_MODEL,
+                num_iterations=NUM_ITERATIONS, learning_rate=LEARNING_RATE)
+        )
+
+        self._compare_batched_and_unbatched(
+            these_batched_matrices, [these_unbatched_matrices])
+
+    def test_optimize_input_for_many_components_neuron(self):
+        """Ensures correct output from optimize_input_for_many_components.
+
+        In this case, the component type is "neuron".  Each start should give
+        the same result as `optimize_input_for_neuron_activation`.
+        """
+
+        these_batched_matrices = (
+            feature_optimization.optimize_input_for_many_components(
+                model_object=MODEL_OBJECT,
+                component_type_string=
+                model_interpretation.NEURON_COMPONENT_TYPE_STRING,
+                init_function_or_matrices=INIT_MATRICES_FOR_MODEL,
+                layer_name=DENSE_LAYER_NAME,
+                neuron_index_matrix=NEURON_INDEX_MATRIX, num_starts=NUM_STARTS,
+                num_iterations=NUM_ITERATIONS, learning_rate=LEARNING_RATE)[0]
+        )
+
+        these_unbatched_matrices_by_comp = [
+            feature_optimization.optimize_input_for_neuron_activation(
+                model_object=MODEL_OBJECT, layer_name=DENSE_LAYER_NAME,
+                neuron_indices=these_indices,
+                init_function_or_matrices=INIT_MATRICES_FOR_MODEL,
+                num_iterations=NUM_ITERATIONS, learning_rate=LEARNING_RATE)
+            for these_indices in NEURON_INDEX_MATRIX
+        ]
+
+        self._compare_batched_and_unbatched(
+            these_batched_matrices, these_unbatched_matrices_by_comp)
+
+    def test_optimize_input_for_many_components_channel(self):
+        """Ensures correct output from optimize_input_for_many_components.
+
+        In this case, the component type is "channel".  Each start should give
+        the same result as `optimize_input_for_channel_activation`.
+        """
+
+        these_batched_matrices = (
+            feature_optimization.optimize_input_for_many_components(
+                model_object=MODEL_OBJECT,
+                component_type_string=
+                model_interpretation.CHANNEL_COMPONENT_TYPE_STRING,
+                init_function_or_matrices=INIT_MATRICES_FOR_MODEL,
+                layer_name=CONV_LAYER_NAME, channel_indices=CHANNEL_INDICES,
+                stat_function_for_neuron_activations=K.max,
+                num_starts=NUM_STARTS, num_iterations=NUM_ITERATIONS,
+                learning_rate=LEARNING_RATE)[0]
+        )
+
+        these_unbatched_matrices_by_comp = [
+            feature_optimization.optimize_input_for_channel_activation(
+                model_object=MODEL_OBJECT, layer_name=CONV_LAYER_NAME,
+                channel_index=this_index,
+                init_function_or_matrices=INIT_MATRICES_FOR_MODEL,
+                stat_function_for_neuron_activations=K.max,
+                num_iterations=NUM_ITERATIONS, learning_rate=LEARNING_RATE)
+            for this_index in CHANNEL_INDICES
+        ]
+
+        self._compare_batched_and_unbatched(
+            these_batched_matrices, these_unbatched_matrices_by_comp)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -16,6 +16,7 @@ DEFAULT_MAX_TREE_DEPTH = 3
 DEFAULT_FRACTION_OF_EXAMPLES_PER_TREE = 1. - numpy.exp(-1.)
 DEFAULT_FRACTION_OF_FEATURES_PER_SPLIT = 1.
 DEFAULT_L2_WEIGHT = 0.001
+DEFAULT_NUM_EXAMPLES_PER_CHUNK = 10000
 
 NUM_CLASSES_KEY = 'num_classes'
 NUM_TREES_KEY = 'num_trees'
@@ -176,6 +177,142 @@ def apply_model(model_object, feature_matrix):
     return model_object.predict_proba(feature_matrix)
 
 
+def stream_features_to_memmap(
+        feature_file_names, memmap_file_name, keep_fraction_by_class=None,
+        num_examples_per_chunk=DEFAULT_NUM_EXAMPLES_PER_CHUNK,
+        random_seed=None):
+    """Streams features from many files into one memory-mapped matrix.
+
+    Features are read `num_examples_per_chunk` at a time and appended to a raw
+    float32 file, so that at most one chunk is held in memory.  Features with
+    spatial dimensions are flattened, so the output can be used directly by
+    `train_model`.
+
+    E = number of examples kept
+    Z = number of features
+    K = number of classes
+
+    :param feature_file_names: 1-D list of paths to input files (readable by
+        `cnn.read_features`).
+    :param memmap_file_name: Path to output file (raw float32 matrix).  Will be
+        overwritten if it already exists.
+    :param keep_fraction_by_class: length-K numpy array, where
+        keep_fraction_by_class[k] is the fraction of examples in the [k]th class
+        to keep (randomly chosen).  If None, will keep all examples.
+    :param num_examples_per_chunk: Number of examples to read at once.
+    :param random_seed: Random seed (used only if
+        `keep_fraction_by_class is not None`).
+    :return: feature_matrix: E-by-Z instance of `numpy.memmap` (read-only,
+        float32).
+    :return: target_values: length-E numpy array of target values.
+    :return: num_classes: Number of classes.
+    :raises: ValueError: if input files do not all have the same number of
+        classes or features.
+    :raises: ValueError: if no examples are kept.
+    """
+
+    # Imported here, rather than at the top of the module, so that this module
+    # does not pull in Keras.
+    from gewittergefahr.deep_learning import cnn
+
+    error_checking.assert_is_string_list(feature_file_names)
+    error_checking.assert_is_numpy_array(
+        numpy.array(feature_file_names), num_dimensions=1)
+    error_checking.assert_is_string(memmap_file_name)
+    error_checking.assert_is_integer(num_examples_per_chunk)
+    error_checking.assert_is_greater(num_examples_per_chunk, 0)
+
+    random_state_object = numpy.random.RandomState(random_seed)
+
+    num_classes = None
+    num_features = None
+    num_examples_kept = 0
+    target_values = numpy.array([], dtype=int)
+
+    file_system_utils.mkdir_recursive_if_necessary(file_name=memmap_file_name)
+    memmap_file_handle = open(memmap_file_name, 'wb')
+
+    for this_file_name in feature_file_names:
+        print 'Reading target values from: "{0:s}"...'.format(this_file_name)
+        these_target_values, this_num_classes = cnn.read_feature_targets(
+            this_file_name)
+
+        if num_classes is None:
+            num_classes = this_num_classes + 0
+
+            if keep_fraction_by_class is not None:
+                error_checking.assert_is_numpy_array(
+                    keep_fraction_by_class,
+                    exact_dimensions=numpy.array([num_classes]))
+                error_checking.assert_is_geq_numpy_array(
+                    keep_fraction_by_class, 0.)
+                error_checking.assert_is_leq_numpy_array(
+                    keep_fraction_by_class, 1.)
+
+        if this_num_classes != num_classes:
+            memmap_file_handle.close()
+
+            error_string = (
+                'File "{0:s}" has {1:d} classes (expected {2:d}).'
+            ).format(this_file_name, this_num_classes, num_classes)
+            raise ValueError(error_string)
+
+        if keep_fraction_by_class is None:
+            these_indices = numpy.linspace(
+                0, len(these_target_values) - 1,
+                num=len(these_target_values), dtype=int)
+        else:
+            these_indices = numpy.where(
+                random_state_object.uniform(size=len(these_target_values)) <
+                keep_fraction_by_class[these_target_values]
+            )[0]
+
+        print 'Keeping {0:d} of {1:d} examples...'.format(
+            len(these_indices), len(these_target_values))
+
+        for i in range(0, len(these_indices), num_examples_per_chunk):
+            this_feature_matrix = cnn.read_features(
+                netcdf_file_name=this_file_name,
+                example_indices=these_indices[i:(i + num_examples_per_chunk)]
+            )[0]
+
+            this_feature_matrix = numpy.reshape(
+                this_feature_matrix, (this_feature_matrix.shape[0], -1))
+
+            if num_features is None:
+                num_features = this_feature_matrix.shape[1]
+
+            if this_feature_matrix.shape[1] != num_features:
+                memmap_file_handle.close()
+
+                error_string = (
+                    'File "{0:s}" has {1:d} features (expected {2:d}).'
+                ).format(this_file_name, this_feature_matrix.shape[1],
+                         num_features)
+                raise ValueError(error_string)
+
+            this_feature_matrix.astype(numpy.float32).tofile(
+                memmap_file_handle)
+
+        num_examples_kept += len(these_indices)
+        target_values = numpy.concatenate((
+            target_values, these_target_values[these_indices]))
+
+    memmap_file_handle.close()
+
+    if num_examples_kept == 0:
+        raise ValueError('No examples were kept.')
+
+    print (
+        'Memory-mapping {0:d}-by-{1:d} feature matrix from: "{2:s}"...'
+    ).format(num_examples_kept, num_features, memmap_file_name)
+    feature_matrix = numpy.memmap(
+        memmap_file_name, dtype=numpy.float32, mode='r',
+        shape=(num_examples_kept, num_features))
+
+    return feature_matrix, target_values, num_classes
+
+
 def write_model(model_object, pickle_file_name):
     """Writes model to Pickle file.
 
@@ -221,7 +358,7 @@ def write_model_metadata(
     :param num_iters_for_early_stopping: [may be None]
         See documentation for `train_model`.
     :param training_file_name: Path to file with training data (readable by
-        `cnn.read_features`).
+        `cnn.read_features`).  May also be a list of such paths.
     :param validation_file_name: [may be None]
         Path to file with validation data (readable by `cnn.read_features`).
     :param pickle_file_name: Path to output file.
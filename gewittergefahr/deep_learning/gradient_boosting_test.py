@@ -0,0 +1,144 @@
+"""Unit tests for gradient_boosting.py."""
+
+import os.path
+import shutil
+import tempfile
+import unittest
+import numpy
+from gewittergefahr.deep_learning import cnn
+from gewittergefahr.deep_learning import gradient_boosting
+
+TOLERANCE = 1e-6
+
+# The following constants are used to test stream_features_to_memmap.
+NUM_CLASSES = 2
+NUM_EXAMPLES_PER_CHUNK = 2
+RANDOM_SEED = 6695
+KEEP_FRACTION_BY_CLASS = numpy.array([0.5, 1.])
+
+FEATURE_MATRICES_BY_FILE = [
+    numpy.random.RandomState(1).normal(size=(7, 12)),
+    numpy.random.RandomState(2).normal(size=(5, 12))
+]
+TARGET_VALUES_BY_FILE = [
+    numpy.array([0, 1, 1, 0, 0, 1, 0], dtype=int),
+    numpy.array([1, 0, 0, 0, 1], dtype=int)
+]
+
+
+class GradientBoostingTests(unittest.TestCase):
+    """Each method is a unit test for gradient_boosting.py."""
+
+    def setUp(self):
+        """Writes feature files to temporary directory."""
+
+        self.directory_name = tempfile.mkdtemp()
+        self.feature_file_names = []
+
+        for k in range(len(FEATURE_MATRICES_BY_FILE)):
+            this_file_name = os.path.join(
+                self.directory_name, 'features{0:d}.nc'.format(k))
+
+            cnn.write_features(
+                netcdf_file_name=this_file_name,
+                feature_matrix=FEATURE_MATRICES_BY_FILE[k],
+                target_values=TARGET_VALUES_BY_FILE[k],
+                num_classes=NUM_CLASSES)
+            self.feature_file_names.append(this_file_name)
+
+        self.memmap_file_name = os.path.join(
+            self.directory_name, 'features.dat')
+
+    def tearDown(self):
+        """Deletes temporary directory."""
+
+        shutil.rmtree(self.directory_name)
+
+    def _read_with_cnn(self, example_indices_by_file):
+        """Reads features with `cnn.read_features` and flattens them.
+
+        :param example_indices_by_file: 1-D list (one item per file), where
+            each item is a 1-D numpy array of example indices.
+        :return: feature_matrix: 2-D numpy array of features.
+        :return: target_values: 1-D numpy array of target values.
+        """
+
+        list_of_feature_matrices = []
+        list_of_target_arrays = []
+
+        for k in range(len(self.feature_file_names)):
+            this_feature_matrix, these_target_values = cnn.read_features(
+                netcdf_file_name=self.feature_file_names[k],
+                example_indices=example_indices_by_file[k]
+            )[:2]
+
+            list_of_feature_matrices.append(numpy.reshape(
+                this_feature_matrix, (this_feature_matrix.shape[0], -1)))
+            list_of_target_arrays.append(these_target_values)
+
+        return (numpy.concatenate(list_of_feature_matrices, axis=0),
+                numpy.concatenate(list_of_target_arrays))
+
+    def test_stream_features_to_memmap_all(self):
+        """Ensures correct output from stream_features_to_memmap.
+
+        In this case, all examples are kept.
+        """
+
+        (this_feature_matrix, these_target_values, this_num_classes
+        ) = gradient_boosting.stream_features_to_memmap(
+            feature_file_names=self.feature_file_names,
+            memmap_file_name=self.memmap_file_name,
+            num_examples_per_chunk=NUM_EXAMPLES_PER_CHUNK)
+
+        this_expected_matrix, these_expected_values = self._read_with_cnn(
+            [numpy.linspace(0, len(t) - 1, num=len(t), dtype=int)
+             for t in TARGET_VALUES_BY_FILE]
+        )
+
+        self.assertTrue(this_num_classes == NUM_CLASSES)
+        self.assertTrue(numpy.allclose(
+            this_feature_matrix, this_expected_matrix, atol=TOLERANCE))
+        self.assertTrue(numpy.array_equal(
+            these_target_values, these_expected_values))
+
+    def test_stream_features_to_memmap_subset(self):
+        """Ensures correct output from stream_features_to_memmap.
+
+        In this case, examples are subsampled by class, so features are read
+        with `example_indices`.
+        """
+
+        (this_feature_matrix, these_target_values, this_num_classes
+        ) = gradient_boosting.stream_features_to_memmap(
+            feature_file_names=self.feature_file_names,
+            memmap_file_name=self.memmap_file_name,
+            keep_fraction_by_class=KEEP_FRACTION_BY_CLASS,
+            num_examples_per_chunk=NUM_EXAMPLES_PER_CHUNK,
+            random_seed=RANDOM_SEED)
+
+        this_random_state_object = numpy.random.RandomState(RANDOM_SEED)
+        these_indices_by_file = [
+            numpy.where(
+                this_random_state_object.uniform(size=len(t)) <
+                KEEP_FRACTION_BY_CLASS[t]
+            )[0]
+            for t in TARGET_VALUES_BY_FILE
+        ]
+
+        this_expected_matrix, these_expected_values = self._read_with_cnn(
+            these_indices_by_file)
+
+        self.assertTrue(this_num_classes == NUM_CLASSES)
+        self.assertTrue(
+            this_feature_matrix.shape[0] <
+            sum([len(t) for t in TARGET_VALUES_BY_FILE])
+        )
+        self.assertTrue(numpy.allclose(
+            this_feature_matrix, this_expected_matrix, atol=TOLERANCE))
+        self.assertTrue(numpy.array_equal(
+            these_target_values, these_expected_values))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,8 +16,11 @@ F_s = number of sounding fields (or "variables" or "channels")
 C = number of radar field/height pairs
 """
 
+import os
 import glob
+import json
 import os.path
+import multiprocessing
 import numpy
 import netCDF4
 from gewittergefahr.gg_utils import radar_utils
@@ -37,6 +40,7 @@ TIME_FORMAT_IN_FILE_NAMES = '%Y-%m-%d-%H%M%S'
 
 DEFAULT_NUM_EXAMPLES_PER_OUT_CHUNK = 8
 DEFAULT_NUM_EXAMPLES_PER_OUT_FILE = 128
+PARTIAL_FILE_SUFFIX = '.partial'
 NUM_BATCHES_PER_DIRECTORY = 1000
 
 AZIMUTHAL_SHEAR_FIELD_NAMES = [
@@ -89,6 +93,13 @@ STORM_ID_CHAR_DIM_KEY = 'storm_id_character'
 RADAR_FIELD_CHAR_DIM_KEY = 'radar_field_name_character'
 SOUNDING_FIELD_CHAR_DIM_KEY = 'sounding_field_name_character'
 
+SHARD_METADATA_FILE_NAME = 'metadata.json'
+SHARD_MATRIX_NAMES_KEY = 'matrix_names'
+SHARD_MATRIX_KEYS = [
+    RADAR_IMAGE_MATRIX_KEY, REFL_IMAGE_MATRIX_KEY, AZ_SHEAR_IMAGE_MATRIX_KEY,
+    SOUNDING_MATRIX_KEY
+]
+
 RADAR_FIELD_KEY = 'radar_field_name'
 OPERATION_NAME_KEY = 'operation_name'
 MIN_HEIGHT_KEY = 'min_height_m_agl'
@@ -514,6 +525,130 @@ def _create_2d3d_examples_myrorss(
     return example_dict
 
 
+def _create_examples_one_spc_date(argument_tuple):
+    """Creates input examples for one SPC date.
+
+    T = number of file times on the SPC date
+
+    Examples are written to a temporary file, which is renamed to the final
+    output file once all file times have been processed.  Thus, if the final
+    output file exists, it is complete.
+
+    :param argument_tuple: Tuple with the following items.
+    argument_tuple[0] = output_file_name: Path to output file (will be written
+        by `write_example_file`).
+    argument_tuple[1] = target_name: See doc for `create_examples`.
+    argument_tuple[2] = storm_ids: 1-D list of storm IDs to use (strings).
+    argument_tuple[3] = storm_times_unix_sec: 1-D numpy array of valid times
+        for storm objects to use.
+    argument_tuple[4] = target_values: 1-D numpy array of target values for
+        storm objects to use.
+    argument_tuple[5] = radar_file_name_matrix: See doc for `create_examples`.
+        Length of the first axis is T.
+    argument_tuple[6] = reflectivity_file_name_matrix: Same.
+    argument_tuple[7] = az_shear_file_name_matrix: Same.
+    argument_tuple[8] = sounding_file_names: length-T list of paths to sounding
+        files (may be None).
+    """
+
+    (output_file_name, target_name, storm_ids, storm_times_unix_sec,
+     target_values, radar_file_name_matrix, reflectivity_file_name_matrix,
+     az_shear_file_name_matrix, sounding_file_names) = argument_tuple
+
+    partial_file_name = '{0:s}{1:s}'.format(
+        output_file_name, PARTIAL_FILE_SUFFIX)
+    if os.path.isfile(partial_file_name):
+        os.remove(partial_file_name)
+
+    if radar_file_name_matrix is None:
+        num_file_times = reflectivity_file_name_matrix.shape[0]
+    else:
+        num_file_times = radar_file_name_matrix.shape[0]
+
+    for i in range(num_file_times):
+        if radar_file_name_matrix is None:
+            this_file_name = reflectivity_file_name_matrix[i, 0]
+        else:
+            this_file_name = numpy.ravel(radar_file_name_matrix[i, ...])[0]
+
+        this_time_unix_sec, this_spc_date_string = (
+            storm_images.image_file_name_to_time(this_file_name)
+        )
+
+        if this_time_unix_sec is None:
+            this_first_time_unix_sec = (
+                time_conversion.get_start_of_spc_date(this_spc_date_string)
+            )
+            this_last_time_unix_sec = (
+                time_conversion.get_end_of_spc_date(this_spc_date_string)
+            )
+        else:
+            this_first_time_unix_sec = this_time_unix_sec + 0
+            this_last_time_unix_sec = this_time_unix_sec + 0
+
+        these_indices = numpy.where(
+            numpy.logical_and(
+                storm_times_unix_sec >= this_first_time_unix_sec,
+                storm_times_unix_sec <= this_last_time_unix_sec)
+        )[0]
+        if len(these_indices) == 0:
+            continue
+
+        these_storm_ids = [storm_ids[m] for m in these_indices]
+        these_storm_times_unix_sec = storm_times_unix_sec[these_indices]
+        these_target_values = target_values[these_indices]
+
+        if sounding_file_names is None:
+            this_sounding_file_name = None
+        else:
+            this_sounding_file_name = sounding_file_names[i]
+
+        if radar_file_name_matrix is None:
+            this_example_dict = _create_2d3d_examples_myrorss(
+                azimuthal_shear_file_names=az_shear_file_name_matrix[
+                    i, ...].tolist(),
+                reflectivity_file_names=reflectivity_file_name_matrix[
+                    i, ...].tolist(),
+                storm_ids=these_storm_ids,
+                storm_times_unix_sec=these_storm_times_unix_sec,
+                target_values=these_target_values,
+                sounding_file_name=this_sounding_file_name,
+                sounding_field_names=None)
+        elif len(radar_file_name_matrix.shape) == 3:
+            this_example_dict = _create_3d_examples(
+                radar_file_name_matrix=radar_file_name_matrix[i, ...],
+                storm_ids=these_storm_ids,
+                storm_times_unix_sec=these_storm_times_unix_sec,
+                target_values=these_target_values,
+                sounding_file_name=this_sounding_file_name,
+                sounding_field_names=None)
+        else:
+            this_example_dict = _create_2d_examples(
+                radar_file_names=radar_file_name_matrix[i, ...].tolist(),
+                storm_ids=these_storm_ids,
+                storm_times_unix_sec=these_storm_times_unix_sec,
+                target_values=these_target_values,
+                sounding_file_name=this_sounding_file_name,
+                sounding_field_names=None)
+
+        print '\n'
+        if this_example_dict is None:
+            continue
+
+        this_example_dict.update({TARGET_NAME_KEY: target_name})
+
+        print 'Writing examples to: "{0:s}"...'.format(partial_file_name)
+        write_example_file(
+            netcdf_file_name=partial_file_name,
+            example_dict=this_example_dict,
+            append_to_file=os.path.isfile(partial_file_name)
+        )
+
+    if os.path.isfile(partial_file_name):
+        print 'Moving finished file to: "{0:s}"...'.format(output_file_name)
+        os.rename(partial_file_name, output_file_name)
+
+
 def _read_metadata_from_example_file(netcdf_file_name, include_soundings):
     """Reads metadata from file with input examples.
 
@@ -687,6 +822,212 @@ def _filter_examples_by_class(
     return indices_to_keep
 
 
+def _find_examples_to_read(
+        storm_times_unix_sec, target_values, first_time_to_keep_unix_sec,
+        last_time_to_keep_unix_sec, class_to_num_examples_dict):
+    """Finds examples to read, based on valid time and target class.
+
+    E = number of examples
+
+    :param storm_times_unix_sec: length-E numpy array of valid times.
+    :param target_values: length-E numpy array of target values (integer class
+        labels).
+    :param first_time_to_keep_unix_sec: See doc for `read_example_file`.
+    :param last_time_to_keep_unix_sec: Same.
+    :param class_to_num_examples_dict: Same.
+    :return: example_indices_to_keep: 1-D numpy array with indices of examples
+        to keep.  These are all integers in [0, E - 1].
+    """
+
+    if first_time_to_keep_unix_sec is None:
+        first_time_to_keep_unix_sec = 0
+    if last_time_to_keep_unix_sec is None:
+        last_time_to_keep_unix_sec = int(1e12)
+
+    error_checking.assert_is_integer(first_time_to_keep_unix_sec)
+    error_checking.assert_is_integer(last_time_to_keep_unix_sec)
+    error_checking.assert_is_geq(
+        last_time_to_keep_unix_sec, first_time_to_keep_unix_sec)
+
+    example_indices_to_keep = numpy.where(numpy.logical_and(
+        storm_times_unix_sec >= first_time_to_keep_unix_sec,
+        storm_times_unix_sec <= last_time_to_keep_unix_sec
+    ))[0]
+
+    subindices_to_keep = _filter_examples_by_class(
+        target_values=target_values[example_indices_to_keep],
+        class_to_num_examples_dict=class_to_num_examples_dict)
+
+    return example_indices_to_keep[subindices_to_keep]
+
+
+def _subset_predictors(
+        example_dict, variable_dict, example_indices_to_keep,
+        include_soundings, radar_field_names_to_keep,
+        radar_heights_to_keep_m_agl, sounding_field_names_to_keep,
+        sounding_heights_to_keep_m_agl, num_rows_to_keep, num_columns_to_keep):
+    """Reads predictors for the given examples, fields, and heights.
+
+    :param example_dict: Dictionary with metadata and target values (in the
+        format returned by `read_example_file`) for all examples in the file.
+    :param variable_dict: Dictionary with predictor matrices, laid out as in
+        the NetCDF file.  This may be `netCDF4.Dataset.variables` or a
+        dictionary of memory-mapped arrays (see `read_example_shard`).  In
+        either case, only the desired examples are read from disk.
+    :param example_indices_to_keep: 1-D numpy array with indices of examples to
+        keep.
+    :param include_soundings: See doc for `read_example_file`.
+    :param radar_field_names_to_keep: Same.
+    :param radar_heights_to_keep_m_agl: Same.
+    :param sounding_field_names_to_keep: Same.
+    :param sounding_heights_to_keep_m_agl: Same.
+    :param num_rows_to_keep: Same.
+    :param num_columns_to_keep: Same.
+    :return: example_dict: See doc for `write_example_file`.
+    """
+
+    example_dict[STORM_IDS_KEY] = [
+        example_dict[STORM_IDS_KEY][k] for k in example_indices_to_keep
+    ]
+    example_dict[STORM_TIMES_KEY] = example_dict[STORM_TIMES_KEY][
+        example_indices_to_keep]
+    example_dict[TARGET_VALUES_KEY] = example_dict[TARGET_VALUES_KEY][
+        example_indices_to_keep]
+
+    # Subset radar fields and heights.
+    if radar_field_names_to_keep is None:
+        radar_field_names_to_keep = example_dict[RADAR_FIELDS_KEY] + []
+    if radar_heights_to_keep_m_agl is None:
+        radar_heights_to_keep_m_agl = example_dict[RADAR_HEIGHTS_KEY] + 0
+
+    error_checking.assert_is_numpy_array(
+        numpy.array(radar_field_names_to_keep), num_dimensions=1)
+    radar_heights_to_keep_m_agl = numpy.round(
+        radar_heights_to_keep_m_agl).astype(int)
+    error_checking.assert_is_numpy_array(
+        radar_heights_to_keep_m_agl, num_dimensions=1)
+
+    if RADAR_IMAGE_MATRIX_KEY in variable_dict:
+        radar_image_matrix = variable_dict[RADAR_IMAGE_MATRIX_KEY][
+            example_indices_to_keep, ...]
+        num_radar_dimensions = len(radar_image_matrix.shape) - 2
+
+        if num_radar_dimensions == 2:
+            these_indices = [
+                numpy.where(numpy.logical_and(
+                    example_dict[RADAR_FIELDS_KEY] == f,
+                    example_dict[RADAR_HEIGHTS_KEY] == h
+                ))[0][0]
+                for f, h in
+                zip(radar_field_names_to_keep, radar_heights_to_keep_m_agl)
+            ]
+
+            these_indices = numpy.array(these_indices, dtype=int)
+            radar_image_matrix = radar_image_matrix[..., these_indices]
+        else:
+            these_field_indices = numpy.array([
+                example_dict[RADAR_FIELDS_KEY].index(f)
+                for f in radar_field_names_to_keep
+            ], dtype=int)
+            radar_image_matrix = radar_image_matrix[..., these_field_indices]
+
+            these_height_indices = numpy.array([
+                numpy.where(example_dict[RADAR_HEIGHTS_KEY] == h)[0][0]
+                for h in radar_heights_to_keep_m_agl
+            ], dtype=int)
+            radar_image_matrix = radar_image_matrix[
+                ..., these_height_indices, :]
+
+        radar_image_matrix = storm_images.downsize_storm_images(
+            storm_image_matrix=radar_image_matrix,
+            radar_field_name=radar_field_names_to_keep[0],
+            num_rows_to_keep=num_rows_to_keep,
+            num_columns_to_keep=num_columns_to_keep)
+
+        example_dict.update({RADAR_IMAGE_MATRIX_KEY: radar_image_matrix})
+
+    else:
+        reflectivity_image_matrix_dbz = variable_dict[REFL_IMAGE_MATRIX_KEY][
+            example_indices_to_keep, ...]
+        reflectivity_image_matrix_dbz = numpy.expand_dims(
+            reflectivity_image_matrix_dbz, axis=-1)
+        az_shear_image_matrix_s01 = variable_dict[AZ_SHEAR_IMAGE_MATRIX_KEY][
+            example_indices_to_keep, ...]
+
+        these_height_indices = numpy.array([
+            numpy.where(example_dict[RADAR_HEIGHTS_KEY] == h)[0][0]
+            for h in radar_heights_to_keep_m_agl
+        ], dtype=int)
+        reflectivity_image_matrix_dbz = reflectivity_image_matrix_dbz[
+            ..., these_height_indices, :]
+
+        these_field_indices = numpy.array([
+            example_dict[RADAR_FIELDS_KEY].index(f)
+            for f in radar_field_names_to_keep
+        ], dtype=int)
+        az_shear_image_matrix_s01 = az_shear_image_matrix_s01[
+            ..., these_field_indices]
+
+        reflectivity_image_matrix_dbz = storm_images.downsize_storm_images(
+            storm_image_matrix=reflectivity_image_matrix_dbz,
+            radar_field_name=radar_utils.REFL_NAME,
+            num_rows_to_keep=num_rows_to_keep,
+            num_columns_to_keep=num_columns_to_keep)
+
+        az_shear_image_matrix_s01 = storm_images.downsize_storm_images(
+            storm_image_matrix=az_shear_image_matrix_s01,
+            radar_field_name=radar_field_names_to_keep[0],
+            num_rows_to_keep=num_rows_to_keep,
+            num_columns_to_keep=num_columns_to_keep)
+
+        example_dict.update({
+            REFL_IMAGE_MATRIX_KEY: reflectivity_image_matrix_dbz,
+            AZ_SHEAR_IMAGE_MATRIX_KEY: az_shear_image_matrix_s01
+        })
+
+    example_dict[RADAR_FIELDS_KEY] = radar_field_names_to_keep
+    example_dict[RADAR_HEIGHTS_KEY] = radar_heights_to_keep_m_agl
+
+    if not include_soundings:
+        return example_dict
+
+    # Subset sounding fields and heights.
+    if sounding_field_names_to_keep is None:
+        sounding_field_names_to_keep = example_dict[SOUNDING_FIELDS_KEY] + []
+    if sounding_heights_to_keep_m_agl is None:
+        sounding_heights_to_keep_m_agl = example_dict[SOUNDING_HEIGHTS_KEY] + 0
+
+    error_checking.assert_is_numpy_array(
+        numpy.array(sounding_field_names_to_keep), num_dimensions=1)
+    sounding_heights_to_keep_m_agl = numpy.round(
+        sounding_heights_to_keep_m_agl).astype(int)
+    error_checking.assert_is_numpy_array(
+        sounding_heights_to_keep_m_agl, num_dimensions=1)
+
+    sounding_matrix = variable_dict[SOUNDING_MATRIX_KEY][
+        example_indices_to_keep, ...]
+
+    these_field_indices = numpy.array([
+        example_dict[SOUNDING_FIELDS_KEY].index(f)
+        for f in sounding_field_names_to_keep
+    ], dtype=int)
+    sounding_matrix = sounding_matrix[..., these_field_indices]
+
+    these_height_indices = numpy.array([
+        numpy.where(example_dict[SOUNDING_HEIGHTS_KEY] == h)[0][0]
+        for h in sounding_heights_to_keep_m_agl
+    ], dtype=int)
+    sounding_matrix = sounding_matrix[..., these_height_indices, :]
+
+    example_dict.update({
+        SOUNDING_FIELDS_KEY: sounding_field_names_to_keep,
+        SOUNDING_HEIGHTS_KEY: sounding_heights_to_keep_m_agl,
+        SOUNDING_MATRIX_KEY: sounding_matrix
+    })
+
+    return example_dict
+
+
 def _file_name_to_batch_number(example_file_name):
     """Parses batch number from file.
 
@@ -1714,173 +2055,408 @@ def read_example_file(
                         dtype=int)
     })
 
-    # Subset by time.
-    if first_time_to_keep_unix_sec is None:
-        first_time_to_keep_unix_sec = 0
-    if last_time_to_keep_unix_sec is None:
-        last_time_to_keep_unix_sec = int(1e12)
-
-    error_checking.assert_is_integer(first_time_to_keep_unix_sec)
-    error_checking.assert_is_integer(last_time_to_keep_unix_sec)
-    error_checking.assert_is_geq(
-        last_time_to_keep_unix_sec, first_time_to_keep_unix_sec)
-
-    example_indices_to_keep = numpy.where(numpy.logical_and(
-        example_dict[STORM_TIMES_KEY] >= first_time_to_keep_unix_sec,
-        example_dict[STORM_TIMES_KEY] <= last_time_to_keep_unix_sec
-    ))[0]
-
-    subindices_to_keep = _filter_examples_by_class(
-        target_values=example_dict[TARGET_VALUES_KEY][example_indices_to_keep],
+    example_indices_to_keep = _find_examples_to_read(
+        storm_times_unix_sec=example_dict[STORM_TIMES_KEY],
+        target_values=example_dict[TARGET_VALUES_KEY],
+        first_time_to_keep_unix_sec=first_time_to_keep_unix_sec,
+        last_time_to_keep_unix_sec=last_time_to_keep_unix_sec,
         class_to_num_examples_dict=class_to_num_examples_dict)
-    example_indices_to_keep = example_indices_to_keep[subindices_to_keep]
+
     if len(example_indices_to_keep) == 0:
+        netcdf_dataset.close()
         return None
 
-    example_dict[STORM_IDS_KEY] = [
-        example_dict[STORM_IDS_KEY][k] for k in example_indices_to_keep
-    ]
-    example_dict[STORM_TIMES_KEY] = example_dict[STORM_TIMES_KEY][
-        example_indices_to_keep]
-    example_dict[TARGET_VALUES_KEY] = example_dict[TARGET_VALUES_KEY][
-        example_indices_to_keep]
+    example_dict = _subset_predictors(
+        example_dict=example_dict, variable_dict=netcdf_dataset.variables,
+        example_indices_to_keep=example_indices_to_keep,
+        include_soundings=include_soundings,
+        radar_field_names_to_keep=radar_field_names_to_keep,
+        radar_heights_to_keep_m_agl=radar_heights_to_keep_m_agl,
+        sounding_field_names_to_keep=sounding_field_names_to_keep,
+        sounding_heights_to_keep_m_agl=sounding_heights_to_keep_m_agl,
+        num_rows_to_keep=num_rows_to_keep,
+        num_columns_to_keep=num_columns_to_keep)
 
-    # Subset radar fields and heights.
-    if radar_field_names_to_keep is None:
-        radar_field_names_to_keep = example_dict[RADAR_FIELDS_KEY] + []
-    if radar_heights_to_keep_m_agl is None:
-        radar_heights_to_keep_m_agl = example_dict[RADAR_HEIGHTS_KEY] + 0
+    netcdf_dataset.close()
+    return example_dict
 
-    error_checking.assert_is_numpy_array(
-        numpy.array(radar_field_names_to_keep), num_dimensions=1)
-    radar_heights_to_keep_m_agl = numpy.round(
-        radar_heights_to_keep_m_agl).astype(int)
-    error_checking.assert_is_numpy_array(
-        radar_heights_to_keep_m_agl, num_dimensions=1)
 
-    if RADAR_IMAGE_MATRIX_KEY in netcdf_dataset.variables:
-        radar_image_matrix = netcdf_dataset.variables[RADAR_IMAGE_MATRIX_KEY][
-            example_indices_to_keep, ...]
-        num_radar_dimensions = len(radar_image_matrix.shape) - 2
+def find_example_shard(
+        top_directory_name, shuffled=True, spc_date_string=None,
+        batch_number=None, raise_error_if_missing=True):
+    """Looks for shard with input examples.
 
-        if num_radar_dimensions == 2:
-            these_indices = [
-                numpy.where(numpy.logical_and(
-                    example_dict[RADAR_FIELDS_KEY] == f,
-                    example_dict[RADAR_HEIGHTS_KEY] == h
-                ))[0][0]
-                for f, h in
-                zip(radar_field_names_to_keep, radar_heights_to_keep_m_agl)
-            ]
+    A "shard" is the flat, uncompressed version of one example file (see
+    `write_example_shard`).  Shards are organized exactly like example files,
+    except that each shard is a directory rather than a NetCDF file.
 
-            these_indices = numpy.array(these_indices, dtype=int)
-            radar_image_matrix = radar_image_matrix[..., these_indices]
-        else:
-            these_field_indices = numpy.array([
-                example_dict[RADAR_FIELDS_KEY].index(f)
-                for f in radar_field_names_to_keep
-            ], dtype=int)
-            radar_image_matrix = radar_image_matrix[..., these_field_indices]
+    :param top_directory_name: See doc for `find_example_file`.
+    :param shuffled: Same.
+    :param spc_date_string: Same.
+    :param batch_number: Same.
+    :param raise_error_if_missing: Boolean flag.  If shard is missing and
+        `raise_error_if_missing = True`, this method will error out.
+    :return: shard_dir_name: Path to shard.  If shard is missing and
+        `raise_error_if_missing = False`, this is the *expected* path.
+    :raises: ValueError: if shard is missing and
+        `raise_error_if_missing = True`.
+    """
 
-            these_height_indices = numpy.array([
-                numpy.where(example_dict[RADAR_HEIGHTS_KEY] == h)[0][0]
-                for h in radar_heights_to_keep_m_agl
-            ], dtype=int)
-            radar_image_matrix = radar_image_matrix[
-                ..., these_height_indices, :]
+    error_checking.assert_is_boolean(raise_error_if_missing)
 
-        radar_image_matrix = storm_images.downsize_storm_images(
-            storm_image_matrix=radar_image_matrix,
-            radar_field_name=radar_field_names_to_keep[0],
-            num_rows_to_keep=num_rows_to_keep,
-            num_columns_to_keep=num_columns_to_keep)
+    example_file_name = find_example_file(
+        top_directory_name=top_directory_name, shuffled=shuffled,
+        spc_date_string=spc_date_string, batch_number=batch_number,
+        raise_error_if_missing=False)
+    shard_dir_name = os.path.splitext(example_file_name)[0]
 
-        example_dict.update({RADAR_IMAGE_MATRIX_KEY: radar_image_matrix})
+    metadata_file_name = '{0:s}/{1:s}'.format(
+        shard_dir_name, SHARD_METADATA_FILE_NAME)
+
+    if raise_error_if_missing and not os.path.isfile(metadata_file_name):
+        error_string = 'Cannot find shard.  Expected at: "{0:s}"'.format(
+            shard_dir_name)
+        raise ValueError(error_string)
+
+    return shard_dir_name
 
+
+def write_example_shard(shard_dir_name, example_dict):
+    """Writes input examples to shard.
+
+    The shard is a directory with one uncompressed .npy file per predictor
+    matrix, plus a JSON file with metadata, storm IDs, storm times, and target
+    values.  Predictor matrices have the same layout as in NetCDF files (see
+    `write_example_file`), so they can be memory-mapped and read by
+    `read_example_shard` without decoding.
+
+    If the shard already exists, its JSON file is deleted before any .npy file
+    is rewritten, and the new JSON file is written last.  Thus, an incomplete
+    shard (e.g., from a job that died halfway through) is never mistaken for a
+    complete one.
+
+    :param shard_dir_name: Path to output directory.
+    :param example_dict: See doc for `write_example_file`.
+    """
+
+    file_system_utils.mkdir_recursive_if_necessary(
+        directory_name=shard_dir_name)
+    metadata_file_name = '{0:s}/{1:s}'.format(
+        shard_dir_name, SHARD_METADATA_FILE_NAME)
+
+    if os.path.isfile(metadata_file_name):
+        os.remove(metadata_file_name)
+
+    matrix_dict = {}
+    if RADAR_IMAGE_MATRIX_KEY in example_dict:
+        matrix_dict[RADAR_IMAGE_MATRIX_KEY] = example_dict[
+            RADAR_IMAGE_MATRIX_KEY]
     else:
-        reflectivity_image_matrix_dbz = netcdf_dataset.variables[
-            REFL_IMAGE_MATRIX_KEY][example_indices_to_keep, ...]
-        reflectivity_image_matrix_dbz = numpy.expand_dims(
-            reflectivity_image_matrix_dbz, axis=-1)
-        az_shear_image_matrix_s01 = netcdf_dataset.variables[
-            AZ_SHEAR_IMAGE_MATRIX_KEY][example_indices_to_keep, ...]
+        matrix_dict[REFL_IMAGE_MATRIX_KEY] = example_dict[
+            REFL_IMAGE_MATRIX_KEY][..., 0]
+        matrix_dict[AZ_SHEAR_IMAGE_MATRIX_KEY] = example_dict[
+            AZ_SHEAR_IMAGE_MATRIX_KEY]
 
-        these_height_indices = numpy.array([
-            numpy.where(example_dict[RADAR_HEIGHTS_KEY] == h)[0][0]
-            for h in radar_heights_to_keep_m_agl
-        ], dtype=int)
-        reflectivity_image_matrix_dbz = reflectivity_image_matrix_dbz[
-            ..., these_height_indices, :]
+    include_soundings = SOUNDING_MATRIX_KEY in example_dict
+    if include_soundings:
+        matrix_dict[SOUNDING_MATRIX_KEY] = example_dict[SOUNDING_MATRIX_KEY]
 
-        these_field_indices = numpy.array([
-            example_dict[RADAR_FIELDS_KEY].index(f)
-            for f in radar_field_names_to_keep
-        ], dtype=int)
-        az_shear_image_matrix_s01 = az_shear_image_matrix_s01[
-            ..., these_field_indices]
+    for this_key in matrix_dict:
+        this_file_name = '{0:s}/{1:s}.npy'.format(shard_dir_name, this_key)
+        print 'Writing "{0:s}" to: "{1:s}"...'.format(this_key, this_file_name)
 
-        reflectivity_image_matrix_dbz = storm_images.downsize_storm_images(
-            storm_image_matrix=reflectivity_image_matrix_dbz,
-            radar_field_name=radar_utils.REFL_NAME,
-            num_rows_to_keep=num_rows_to_keep,
-            num_columns_to_keep=num_columns_to_keep)
+        numpy.save(
+            this_file_name,
+            numpy.ascontiguousarray(matrix_dict[this_key], dtype=numpy.float32)
+        )
 
-        az_shear_image_matrix_s01 = storm_images.downsize_storm_images(
-            storm_image_matrix=az_shear_image_matrix_s01,
-            radar_field_name=radar_field_names_to_keep[0],
-            num_rows_to_keep=num_rows_to_keep,
-            num_columns_to_keep=num_columns_to_keep)
+    rotated_grid_spacing_metres = example_dict[ROTATED_GRID_SPACING_KEY]
+    if rotated_grid_spacing_metres is not None:
+        rotated_grid_spacing_metres = int(numpy.round(
+            rotated_grid_spacing_metres))
+
+    metadata_dict = {
+        TARGET_NAME_KEY: example_dict[TARGET_NAME_KEY],
+        ROTATED_GRIDS_KEY: bool(example_dict[ROTATED_GRIDS_KEY]),
+        ROTATED_GRID_SPACING_KEY: rotated_grid_spacing_metres,
+        STORM_IDS_KEY: [str(s) for s in example_dict[STORM_IDS_KEY]],
+        STORM_TIMES_KEY: numpy.array(
+            example_dict[STORM_TIMES_KEY], dtype=int).tolist(),
+        TARGET_VALUES_KEY: numpy.array(
+            example_dict[TARGET_VALUES_KEY], dtype=int).tolist(),
+        RADAR_FIELDS_KEY: [str(f) for f in example_dict[RADAR_FIELDS_KEY]],
+        RADAR_HEIGHTS_KEY: numpy.array(
+            example_dict[RADAR_HEIGHTS_KEY], dtype=int).tolist(),
+        SHARD_MATRIX_NAMES_KEY: matrix_dict.keys()
+    }
 
-        example_dict.update({
-            REFL_IMAGE_MATRIX_KEY: reflectivity_image_matrix_dbz,
-            AZ_SHEAR_IMAGE_MATRIX_KEY: az_shear_image_matrix_s01
+    if include_soundings:
+        metadata_dict.update({
+            SOUNDING_FIELDS_KEY:
+                [str(f) for f in example_dict[SOUNDING_FIELDS_KEY]],
+            SOUNDING_HEIGHTS_KEY: numpy.array(
+                example_dict[SOUNDING_HEIGHTS_KEY], dtype=int).tolist()
         })
 
-    example_dict[RADAR_FIELDS_KEY] = radar_field_names_to_keep
-    example_dict[RADAR_HEIGHTS_KEY] = radar_heights_to_keep_m_agl
+    print 'Writing metadata to: "{0:s}"...'.format(metadata_file_name)
 
-    if not include_soundings:
-        netcdf_dataset.close()
-        return example_dict
+    with open(metadata_file_name, 'w') as this_file_handle:
+        json.dump(metadata_dict, this_file_handle)
 
-    # Subset sounding fields and heights.
-    if sounding_field_names_to_keep is None:
-        sounding_field_names_to_keep = example_dict[SOUNDING_FIELDS_KEY] + []
-    if sounding_heights_to_keep_m_agl is None:
-        sounding_heights_to_keep_m_agl = example_dict[SOUNDING_HEIGHTS_KEY] + 0
 
-    error_checking.assert_is_numpy_array(
-        numpy.array(sounding_field_names_to_keep), num_dimensions=1)
-    sounding_heights_to_keep_m_agl = numpy.round(
-        sounding_heights_to_keep_m_agl).astype(int)
-    error_checking.assert_is_numpy_array(
-        sounding_heights_to_keep_m_agl, num_dimensions=1)
+def _read_shard_metadata(shard_dir_name, include_soundings):
+    """Reads metadata (JSON file) from shard.
 
-    sounding_matrix = netcdf_dataset.variables[SOUNDING_MATRIX_KEY][
-        example_indices_to_keep, ...]
+    :param shard_dir_name: See doc for `read_example_shard`.
+    :param include_soundings: Same.
+    :return: metadata_dict: See doc for `read_example_shard` with
+        `metadata_only = True`.
+    """
 
-    these_field_indices = numpy.array([
-        example_dict[SOUNDING_FIELDS_KEY].index(f)
-        for f in sounding_field_names_to_keep
-    ], dtype=int)
-    sounding_matrix = sounding_matrix[..., these_field_indices]
+    metadata_file_name = '{0:s}/{1:s}'.format(
+        shard_dir_name, SHARD_METADATA_FILE_NAME)
+    with open(metadata_file_name, 'r') as this_file_handle:
+        orig_metadata_dict = json.load(this_file_handle)
 
-    these_height_indices = numpy.array([
-        numpy.where(example_dict[SOUNDING_HEIGHTS_KEY] == h)[0][0]
-        for h in sounding_heights_to_keep_m_agl
-    ], dtype=int)
-    sounding_matrix = sounding_matrix[..., these_height_indices, :]
+    include_soundings = (
+        include_soundings and SOUNDING_MATRIX_KEY in
+        orig_metadata_dict[SHARD_MATRIX_NAMES_KEY]
+    )
 
-    example_dict.update({
-        SOUNDING_FIELDS_KEY: sounding_field_names_to_keep,
-        SOUNDING_HEIGHTS_KEY: sounding_heights_to_keep_m_agl,
-        SOUNDING_MATRIX_KEY: sounding_matrix
-    })
+    metadata_dict = {
+        TARGET_NAME_KEY: str(orig_metadata_dict[TARGET_NAME_KEY]),
+        ROTATED_GRIDS_KEY: orig_metadata_dict[ROTATED_GRIDS_KEY],
+        ROTATED_GRID_SPACING_KEY: orig_metadata_dict[ROTATED_GRID_SPACING_KEY],
+        STORM_IDS_KEY: [str(s) for s in orig_metadata_dict[STORM_IDS_KEY]],
+        STORM_TIMES_KEY:
+            numpy.array(orig_metadata_dict[STORM_TIMES_KEY], dtype=int),
+        TARGET_VALUES_KEY:
+            numpy.array(orig_metadata_dict[TARGET_VALUES_KEY], dtype=int),
+        RADAR_FIELDS_KEY:
+            [str(f) for f in orig_metadata_dict[RADAR_FIELDS_KEY]],
+        RADAR_HEIGHTS_KEY:
+            numpy.array(orig_metadata_dict[RADAR_HEIGHTS_KEY], dtype=int),
+        SHARD_MATRIX_NAMES_KEY: [
+            str(m) for m in orig_metadata_dict[SHARD_MATRIX_NAMES_KEY]
+            if include_soundings or m != SOUNDING_MATRIX_KEY
+        ]
+    }
+
+    if include_soundings:
+        metadata_dict.update({
+            SOUNDING_FIELDS_KEY:
+                [str(f) for f in orig_metadata_dict[SOUNDING_FIELDS_KEY]],
+            SOUNDING_HEIGHTS_KEY: numpy.array(
+                orig_metadata_dict[SOUNDING_HEIGHTS_KEY], dtype=int)
+        })
+
+    return metadata_dict
+
+
+def memory_map_example_shard(shard_dir_name, metadata_dict):
+    """Memory-maps predictor matrices in shard.
+
+    This method does not read the JSON file.  Each memory-mapped array holds an
+    open file descriptor until it is garbage-collected, so callers that handle
+    many shards should not keep all of them mapped at once.
+
+    :param shard_dir_name: See doc for `read_example_shard`.
+    :param metadata_dict: Dictionary returned by `read_example_shard` with
+        `metadata_only = True`.  Only the matrices listed in
+        metadata_dict['matrix_names'] are memory-mapped.
+    :return: variable_dict: Dictionary, where each key is a predictor-matrix
+        name (e.g., "radar_image_matrix") and each value is the memory-mapped
+        array.
+    """
+
+    variable_dict = {}
+    for this_key in metadata_dict[SHARD_MATRIX_NAMES_KEY]:
+        variable_dict[this_key] = numpy.load(
+            '{0:s}/{1:s}.npy'.format(shard_dir_name, this_key), mmap_mode='r')
+
+    return variable_dict
+
+
+def open_example_shard(shard_dir_name, include_soundings=True):
+    """Opens shard for repeated reading.
+
+    The JSON file is read and decoded once, and each predictor matrix is
+    memory-mapped once.  Examples can then be read with
+    `read_examples_from_open_shard`, without touching the JSON file again.
+
+    :param shard_dir_name: See doc for `read_example_shard`.
+    :param include_soundings: Same.
+    :return: metadata_dict: Dictionary returned by `read_example_shard` with
+        `metadata_only = True`.
+    :return: variable_dict: See doc for `memory_map_example_shard`.
+    """
+
+    error_checking.assert_is_boolean(include_soundings)
+
+    metadata_dict = _read_shard_metadata(
+        shard_dir_name=shard_dir_name, include_soundings=include_soundings)
+    variable_dict = memory_map_example_shard(
+        shard_dir_name=shard_dir_name, metadata_dict=metadata_dict)
+
+    return metadata_dict, variable_dict
+
+
+def read_examples_from_open_shard(
+        metadata_dict, variable_dict, example_indices_to_keep,
+        radar_field_names_to_keep=None, radar_heights_to_keep_m_agl=None,
+        sounding_field_names_to_keep=None, sounding_heights_to_keep_m_agl=None,
+        num_rows_to_keep=None, num_columns_to_keep=None):
+    """Reads the given examples from a shard opened by `open_example_shard`.
+
+    The inputs may also come from `read_example_shard` with
+    `metadata_only = True` and `memory_map_example_shard`.  Neither input
+    dictionary is modified, so they can be reused for any number of reads.
+
+    :param metadata_dict: See doc for `open_example_shard`.
+    :param variable_dict: Same.
+    :param example_indices_to_keep: 1-D numpy array with indices of examples to
+        read.  Examples are returned in this order.
+    :param radar_field_names_to_keep: See doc for `read_example_file`.
+    :param radar_heights_to_keep_m_agl: Same.
+    :param sounding_field_names_to_keep: Same.
+    :param sounding_heights_to_keep_m_agl: Same.
+    :param num_rows_to_keep: Same.
+    :param num_columns_to_keep: Same.
+    :return: example_dict: See doc for `write_example_file`.
+    """
+
+    num_examples = len(metadata_dict[STORM_IDS_KEY])
+
+    error_checking.assert_is_integer_numpy_array(example_indices_to_keep)
+    error_checking.assert_is_numpy_array(
+        example_indices_to_keep, num_dimensions=1)
+    error_checking.assert_is_geq_numpy_array(example_indices_to_keep, 0)
+    error_checking.assert_is_less_than_numpy_array(
+        example_indices_to_keep, num_examples)
+
+    # Reading in sorted order makes reads from the memory-mapped arrays
+    # sequential.  The original order is restored at the end.
+    sort_indices = numpy.argsort(example_indices_to_keep, kind='mergesort')
+    unsort_indices = numpy.empty_like(sort_indices)
+    unsort_indices[sort_indices] = numpy.linspace(
+        0, len(sort_indices) - 1, num=len(sort_indices), dtype=int)
+
+    # `_subset_predictors` replaces values in the dictionary, so give it a
+    # shallow copy.
+    example_dict = metadata_dict.copy()
+    example_dict.pop(SHARD_MATRIX_NAMES_KEY, None)
+
+    example_dict = _subset_predictors(
+        example_dict=example_dict, variable_dict=variable_dict,
+        example_indices_to_keep=example_indices_to_keep[sort_indices],
+        include_soundings=SOUNDING_MATRIX_KEY in variable_dict,
+        radar_field_names_to_keep=radar_field_names_to_keep,
+        radar_heights_to_keep_m_agl=radar_heights_to_keep_m_agl,
+        sounding_field_names_to_keep=sounding_field_names_to_keep,
+        sounding_heights_to_keep_m_agl=sounding_heights_to_keep_m_agl,
+        num_rows_to_keep=num_rows_to_keep,
+        num_columns_to_keep=num_columns_to_keep)
+
+    example_dict[STORM_IDS_KEY] = [
+        example_dict[STORM_IDS_KEY][k] for k in unsort_indices
+    ]
+
+    for this_key in [STORM_TIMES_KEY, TARGET_VALUES_KEY, RADAR_IMAGE_MATRIX_KEY,
+                     REFL_IMAGE_MATRIX_KEY, AZ_SHEAR_IMAGE_MATRIX_KEY,
+                     SOUNDING_MATRIX_KEY]:
+        if this_key not in example_dict:
+            continue
+
+        example_dict[this_key] = example_dict[this_key][unsort_indices, ...]
 
-    netcdf_dataset.close()
     return example_dict
 
 
+def read_example_shard(
+        shard_dir_name, metadata_only=False, include_soundings=True,
+        example_indices_to_keep=None, radar_field_names_to_keep=None,
+        radar_heights_to_keep_m_agl=None, sounding_field_names_to_keep=None,
+        sounding_heights_to_keep_m_agl=None, first_time_to_keep_unix_sec=None,
+        last_time_to_keep_unix_sec=None, num_rows_to_keep=None,
+        num_columns_to_keep=None, class_to_num_examples_dict=None):
+    """Reads input examples from shard.
+
+    Predictor matrices are memory-mapped, so only the desired examples are
+    read from disk (and nothing is decoded).  To read from the same shard many
+    times, use `open_example_shard` and `read_examples_from_open_shard`
+    instead.
+
+    :param shard_dir_name: Path to shard (directory created by
+        `write_example_shard`).
+    :param metadata_only: Boolean flag.  If True, this method will read only
+        the JSON file (see output doc).
+    :param include_soundings: See doc for `read_example_file`.
+    :param example_indices_to_keep: 1-D numpy array with indices of examples to
+        read.  If None, will read all examples.  These are applied before
+        filtering by time and class.  Examples are returned in the order given
+        by this array.
+    :param radar_field_names_to_keep: See doc for `read_example_file`.
+    :param radar_heights_to_keep_m_agl: Same.
+    :param sounding_field_names_to_keep: Same.
+    :param sounding_heights_to_keep_m_agl: Same.
+    :param first_time_to_keep_unix_sec: Same.
+    :param last_time_to_keep_unix_sec: Same.
+    :param num_rows_to_keep: Same.
+    :param num_columns_to_keep: Same.
+    :param class_to_num_examples_dict: Same.
+    :return: example_dict: See doc for `write_example_file`.  If
+        `metadata_only = True`, this contains the keys returned by
+        `read_example_file` with `metadata_only = True`, plus key
+        "target_values" (because target values are stored in the JSON file) and
+        key "matrix_names" (list of predictor matrices to read).
+    """
+
+    error_checking.assert_is_boolean(metadata_only)
+    error_checking.assert_is_boolean(include_soundings)
+
+    metadata_dict = _read_shard_metadata(
+        shard_dir_name=shard_dir_name, include_soundings=include_soundings)
+    if metadata_only:
+        return metadata_dict
+
+    num_examples = len(metadata_dict[STORM_IDS_KEY])
+    if example_indices_to_keep is None:
+        example_indices_to_keep = numpy.linspace(
+            0, num_examples - 1, num=num_examples, dtype=int)
+
+    error_checking.assert_is_integer_numpy_array(example_indices_to_keep)
+    error_checking.assert_is_numpy_array(
+        example_indices_to_keep, num_dimensions=1)
+    error_checking.assert_is_geq_numpy_array(example_indices_to_keep, 0)
+    error_checking.assert_is_less_than_numpy_array(
+        example_indices_to_keep, num_examples)
+
+    subindices_to_keep = _find_examples_to_read(
+        storm_times_unix_sec=metadata_dict[STORM_TIMES_KEY][
+            example_indices_to_keep],
+        target_values=metadata_dict[TARGET_VALUES_KEY][example_indices_to_keep],
+        first_time_to_keep_unix_sec=first_time_to_keep_unix_sec,
+        last_time_to_keep_unix_sec=last_time_to_keep_unix_sec,
+        class_to_num_examples_dict=class_to_num_examples_dict)
+
+    example_indices_to_keep = example_indices_to_keep[
+        numpy.sort(subindices_to_keep)]
+    if len(example_indices_to_keep) == 0:
+        return None
+
+    return read_examples_from_open_shard(
+        metadata_dict=metadata_dict,
+        variable_dict=memory_map_example_shard(
+            shard_dir_name=shard_dir_name, metadata_dict=metadata_dict),
+        example_indices_to_keep=example_indices_to_keep,
+        radar_field_names_to_keep=radar_field_names_to_keep,
+        radar_heights_to_keep_m_agl=radar_heights_to_keep_m_agl,
+        sounding_field_names_to_keep=sounding_field_names_to_keep,
+        sounding_heights_to_keep_m_agl=sounding_heights_to_keep_m_agl,
+        num_rows_to_keep=num_rows_to_keep,
+        num_columns_to_keep=num_columns_to_keep)
+
+
 def reduce_examples_3d_to_2d(example_dict, list_of_operation_dicts):
     """Reduces examples from 3-D to 2-D.
 
@@ -1985,7 +2561,8 @@ def create_examples(
         target_file_names, target_name, num_examples_per_in_file,
         top_output_dir_name, radar_file_name_matrix=None,
         reflectivity_file_name_matrix=None, az_shear_file_name_matrix=None,
-        class_to_sampling_fraction_dict=None, sounding_file_names=None):
+        class_to_sampling_fraction_dict=None, sounding_file_names=None,
+        num_processes=1, overwrite_existing_files=True):
     """Creates many input examples.
 
     If `radar_file_name_matrix is None`, both `reflectivity_file_name_matrix`
@@ -2016,6 +2593,14 @@ def create_examples(
     :param sounding_file_names: length-D list of paths to sounding files (will
         be read by `soundings.read_soundings`).  If
         `sounding_file_names is None`, examples will not include soundings.
+    :param num_processes: Number of worker processes.  Work is partitioned by
+        SPC date, and each worker creates the output file for one SPC date at a
+        time.
+    :param overwrite_existing_files: Boolean flag.  If True, will overwrite
+        existing output files.  If False, will skip SPC dates for which the
+        output file already exists, which allows an interrupted run to be
+        restarted.  Output files are renamed to their final location only
+        once complete, so an existing output file is never partial.
     """
 
     if radar_file_name_matrix is None:
@@ -2047,6 +2632,9 @@ def create_examples(
 
     error_checking.assert_is_integer(num_examples_per_in_file)
     error_checking.assert_is_geq(num_examples_per_in_file, 1)
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_geq(num_processes, 1)
+    error_checking.assert_is_boolean(overwrite_existing_files)
 
     storm_ids = []
     storm_times_unix_sec = numpy.array([], dtype=int)
@@ -2104,102 +2692,82 @@ def create_examples(
             unique_counts[k], unique_target_values[k])
     print '\n'
 
-    first_spc_date_string = time_conversion.time_to_spc_date_string(
-        numpy.min(storm_times_unix_sec))
-    last_spc_date_string = time_conversion.time_to_spc_date_string(
-        numpy.max(storm_times_unix_sec))
-    spc_date_strings = time_conversion.get_spc_dates_in_range(
-        first_spc_date_string=first_spc_date_string,
-        last_spc_date_string=last_spc_date_string)
-
-    spc_date_to_out_file_dict = {}
-    for this_spc_date_string in spc_date_strings:
-        this_file_name = find_example_file(
-            top_directory_name=top_output_dir_name, shuffled=False,
-            spc_date_string=this_spc_date_string,
-            raise_error_if_missing=False)
-
-        if os.path.isfile(this_file_name):
-            os.remove(this_file_name)
-
-        spc_date_to_out_file_dict[this_spc_date_string] = this_file_name
+    file_time_indices_by_spc_date = {}
 
     for i in range(num_file_times):
         if radar_file_name_matrix is None:
-            this_file_name = reflectivity_file_name_matrix[0, 0]
+            this_file_name = reflectivity_file_name_matrix[i, 0]
         else:
             this_file_name = numpy.ravel(radar_file_name_matrix[i, ...])[0]
 
-        this_time_unix_sec, this_spc_date_string = (
-            storm_images.image_file_name_to_time(this_file_name)
-        )
+        this_spc_date_string = storm_images.image_file_name_to_time(
+            this_file_name)[1]
 
-        if this_time_unix_sec is None:
-            this_first_time_unix_sec = (
-                time_conversion.get_start_of_spc_date(this_spc_date_string)
-            )
-            this_last_time_unix_sec = (
-                time_conversion.get_end_of_spc_date(this_spc_date_string)
-            )
-        else:
-            this_first_time_unix_sec = this_time_unix_sec + 0
-            this_last_time_unix_sec = this_time_unix_sec + 0
+        if this_spc_date_string not in file_time_indices_by_spc_date:
+            file_time_indices_by_spc_date[this_spc_date_string] = []
+        file_time_indices_by_spc_date[this_spc_date_string].append(i)
 
-        these_indices = numpy.where(
-            numpy.logical_and(
-                storm_times_unix_sec >= this_first_time_unix_sec,
-                storm_times_unix_sec <= this_last_time_unix_sec)
-        )[0]
-        if len(these_indices) == 0:
-            continue
+    list_of_argument_tuples = []
 
-        these_storm_ids = [storm_ids[m] for m in these_indices]
-        these_storm_times_unix_sec = storm_times_unix_sec[these_indices]
-        these_target_values = target_values[these_indices]
+    for this_spc_date_string in sorted(file_time_indices_by_spc_date.keys()):
+        this_output_file_name = find_example_file(
+            top_directory_name=top_output_dir_name, shuffled=False,
+            spc_date_string=this_spc_date_string,
+            raise_error_if_missing=False)
 
-        if sounding_file_names is None:
-            this_sounding_file_name = None
-        else:
-            this_sounding_file_name = sounding_file_names[i]
+        if os.path.isfile(this_output_file_name):
+            if not overwrite_existing_files:
+                print 'Output file already exists, skipping: "{0:s}"'.format(
+                    this_output_file_name)
+                continue
+
+            os.remove(this_output_file_name)
+
+        these_file_time_indices = numpy.array(
+            file_time_indices_by_spc_date[this_spc_date_string], dtype=int)
+
+        these_storm_indices = numpy.where(numpy.logical_and(
+            storm_times_unix_sec >=
+            time_conversion.get_start_of_spc_date(this_spc_date_string),
+            storm_times_unix_sec <=
+            time_conversion.get_end_of_spc_date(this_spc_date_string)
+        ))[0]
 
         if radar_file_name_matrix is None:
-            this_example_dict = _create_2d3d_examples_myrorss(
-                azimuthal_shear_file_names=az_shear_file_name_matrix[
-                    i, ...].tolist(),
-                reflectivity_file_names=reflectivity_file_name_matrix[
-                    i, ...].tolist(),
-                storm_ids=these_storm_ids,
-                storm_times_unix_sec=these_storm_times_unix_sec,
-                target_values=these_target_values,
-                sounding_file_name=this_sounding_file_name,
-                sounding_field_names=None)
-        elif num_file_dimensions == 3:
-            this_example_dict = _create_3d_examples(
-                radar_file_name_matrix=radar_file_name_matrix[i, ...],
-                storm_ids=these_storm_ids,
-                storm_times_unix_sec=these_storm_times_unix_sec,
-                target_values=these_target_values,
-                sounding_file_name=this_sounding_file_name,
-                sounding_field_names=None)
+            this_radar_file_name_matrix = None
+            this_refl_file_name_matrix = reflectivity_file_name_matrix[
+                these_file_time_indices, ...]
+            this_az_shear_file_name_matrix = az_shear_file_name_matrix[
+                these_file_time_indices, ...]
         else:
-            this_example_dict = _create_2d_examples(
-                radar_file_names=radar_file_name_matrix[i, ...].tolist(),
-                storm_ids=these_storm_ids,
-                storm_times_unix_sec=these_storm_times_unix_sec,
-                target_values=these_target_values,
-                sounding_file_name=this_sounding_file_name,
-                sounding_field_names=None)
+            this_radar_file_name_matrix = radar_file_name_matrix[
+                these_file_time_indices, ...]
+            this_refl_file_name_matrix = None
+            this_az_shear_file_name_matrix = None
 
-        print '\n'
-        if this_example_dict is None:
-            continue
+        if sounding_file_names is None:
+            these_sounding_file_names = None
+        else:
+            these_sounding_file_names = [
+                sounding_file_names[m] for m in these_file_time_indices
+            ]
 
-        this_example_dict.update({TARGET_NAME_KEY: target_name})
-        this_output_file_name = spc_date_to_out_file_dict[this_spc_date_string]
+        list_of_argument_tuples.append((
+            this_output_file_name, target_name,
+            [storm_ids[m] for m in these_storm_indices],
+            storm_times_unix_sec[these_storm_indices],
+            target_values[these_storm_indices],
+            this_radar_file_name_matrix, this_refl_file_name_matrix,
+            this_az_shear_file_name_matrix, these_sounding_file_names
+        ))
 
-        print 'Writing examples to: "{0:s}"...'.format(this_output_file_name)
-        write_example_file(
-            netcdf_file_name=this_output_file_name,
-            example_dict=this_example_dict,
-            append_to_file=os.path.isfile(this_output_file_name)
-        )
+    if num_processes == 1:
+        for this_argument_tuple in list_of_argument_tuples:
+            _create_examples_one_spc_date(this_argument_tuple)
+    else:
+        pool_object = multiprocessing.Pool(processes=num_processes)
+        pool_object.map(
+            _create_examples_one_spc_date, list_of_argument_tuples,
+            chunksize=1)
+        pool_object.close()
+        pool_object.join()
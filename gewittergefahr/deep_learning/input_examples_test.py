@@ -1,6 +1,8 @@
 """Unit tests for input_examples.py."""
 
 import copy
+import shutil
+import tempfile
 import unittest
 import numpy
 from gewittergefahr.gg_utils import radar_utils
@@ -136,6 +138,24 @@ EXAMPLE_DICT_3D_SUBSET[
     input_examples.RADAR_IMAGE_MATRIX_KEY
 ] = THIS_RADAR_IMAGE_MATRIX[INDICES_TO_KEEP, ...]
 
+# The following constants are used to test write_example_shard and
+# read_example_shard.
+SHARD_INDICES_TO_KEEP = numpy.array([3, 1], dtype=int)
+
+EXAMPLE_DICT_3D_SHARD_SUBSET = copy.deepcopy(EXAMPLE_DICT_3D_ORIG)
+EXAMPLE_DICT_3D_SHARD_SUBSET[
+    input_examples.STORM_IDS_KEY
+] = [STORM_IDS[k] for k in SHARD_INDICES_TO_KEEP]
+EXAMPLE_DICT_3D_SHARD_SUBSET[
+    input_examples.STORM_TIMES_KEY
+] = STORM_TIMES_UNIX_SEC[SHARD_INDICES_TO_KEEP]
+EXAMPLE_DICT_3D_SHARD_SUBSET[
+    input_examples.TARGET_VALUES_KEY
+] = TARGET_VALUES[SHARD_INDICES_TO_KEEP]
+EXAMPLE_DICT_3D_SHARD_SUBSET[
+    input_examples.RADAR_IMAGE_MATRIX_KEY
+] = THIS_RADAR_IMAGE_MATRIX[SHARD_INDICES_TO_KEEP, ...]
+
 THESE_FIELD_NAMES = [
     radar_utils.LOW_LEVEL_SHEAR_NAME, radar_utils.MID_LEVEL_SHEAR_NAME
 ]
@@ -280,8 +300,8 @@ MIN_DIFF_REFL_MATRIX_DB = numpy.stack(
     axis=0
 ).astype(float)
 
-# The following constants are used to test find_example_file and
-# _file_name_to_batch_number.
+# The following constants are used to test find_example_file,
+# find_example_shard, and _file_name_to_batch_number.
 TOP_DIRECTORY_NAME = 'foo'
 BATCH_NUMBER = 1967
 SPC_DATE_STRING = '19670502'
@@ -290,6 +310,10 @@ EXAMPLE_FILE_NAME_SHUFFLED = (
     'foo/batches0001000-0001999/input_examples_batch0001967.nc')
 EXAMPLE_FILE_NAME_UNSHUFFLED = 'foo/1967/input_examples_19670502.nc'
 
+SHARD_DIR_NAME_SHUFFLED = (
+    'foo/batches0001000-0001999/input_examples_batch0001967')
+SHARD_DIR_NAME_UNSHUFFLED = 'foo/1967/input_examples_19670502'
+
 
 def _compare_radar_image_dicts(first_radar_image_dict, second_radar_image_dict):
     """Compares two dictionaries with storm-centered radar images.
@@ -573,6 +597,104 @@ class InputExamplesTests(unittest.TestCase):
 
         self.assertTrue(this_file_name == EXAMPLE_FILE_NAME_UNSHUFFLED)
 
+    def test_find_example_shard_shuffled(self):
+        """Ensures correct output from find_example_shard.
+
+        In this case the hypothetical shard is temporally shuffled.
+        """
+
+        this_dir_name = input_examples.find_example_shard(
+            top_directory_name=TOP_DIRECTORY_NAME, shuffled=True,
+            batch_number=BATCH_NUMBER, raise_error_if_missing=False)
+
+        self.assertTrue(this_dir_name == SHARD_DIR_NAME_SHUFFLED)
+
+    def test_find_example_shard_unshuffled(self):
+        """Ensures correct output from find_example_shard.
+
+        In this case the hypothetical shard is *not* temporally shuffled.
+        """
+
+        this_dir_name = input_examples.find_example_shard(
+            top_directory_name=TOP_DIRECTORY_NAME, shuffled=False,
+            spc_date_string=SPC_DATE_STRING, raise_error_if_missing=False)
+
+        self.assertTrue(this_dir_name == SHARD_DIR_NAME_UNSHUFFLED)
+
+    def test_write_and_read_example_shard_all(self):
+        """Ensures that read_example_shard inverts write_example_shard.
+
+        In this case, all examples are read.
+        """
+
+        this_shard_dir_name = tempfile.mkdtemp()
+
+        try:
+            input_examples.write_example_shard(
+                shard_dir_name=this_shard_dir_name,
+                example_dict=EXAMPLE_DICT_3D_ORIG)
+            this_example_dict = input_examples.read_example_shard(
+                this_shard_dir_name)
+        finally:
+            shutil.rmtree(this_shard_dir_name)
+
+        self.assertTrue(_compare_example_dicts(
+            this_example_dict, EXAMPLE_DICT_3D_ORIG))
+
+    def test_write_and_read_example_shard_subset(self):
+        """Ensures that read_example_shard inverts write_example_shard.
+
+        In this case, only a subset of examples is read, and they should be
+        returned in the order requested (not sorted order).
+        """
+
+        this_shard_dir_name = tempfile.mkdtemp()
+
+        try:
+            input_examples.write_example_shard(
+                shard_dir_name=this_shard_dir_name,
+                example_dict=EXAMPLE_DICT_3D_ORIG)
+            this_example_dict = input_examples.read_example_shard(
+                this_shard_dir_name,
+                example_indices_to_keep=SHARD_INDICES_TO_KEEP)
+        finally:
+            shutil.rmtree(this_shard_dir_name)
+
+        self.assertTrue(_compare_example_dicts(
+            this_example_dict, EXAMPLE_DICT_3D_SHARD_SUBSET))
+
+    def test_read_examples_from_open_shard(self):
+        """Ensures correct output from read_examples_from_open_shard.
+
+        The same open shard is read twice, which should give the same result
+        (i.e., the cached metadata should not be modified by the first read).
+        """
+
+        this_shard_dir_name = tempfile.mkdtemp()
+
+        try:
+            input_examples.write_example_shard(
+                shard_dir_name=this_shard_dir_name,
+                example_dict=EXAMPLE_DICT_3D_ORIG)
+            this_metadata_dict, this_variable_dict = (
+                input_examples.open_example_shard(this_shard_dir_name)
+            )
+
+            for _ in range(2):
+                this_example_dict = (
+                    input_examples.read_examples_from_open_shard(
+                        metadata_dict=this_metadata_dict,
+                        variable_dict=this_variable_dict,
+                        example_indices_to_keep=SHARD_INDICES_TO_KEEP)
+                )
+
+                self.assertTrue(_compare_example_dicts(
+                    this_example_dict, EXAMPLE_DICT_3D_SHARD_SUBSET))
+
+            del this_variable_dict
+        finally:
+            shutil.rmtree(this_shard_dir_name)
+
     def test_file_name_to_batch_number_shuffled(self):
         """Ensures correct output from _file_name_to_batch_number.
 
@@ -30,6 +30,26 @@ FALSE_ALARM_INDICES_KEY = 'false_alarm_indices'
 CORRECT_NULL_INDICES_KEY = 'correct_null_indices'
 
 
+def _create_activation_function(model_object, output_tensor):
+    """Creates function that computes activation.
+
+    :param model_object: Instance of `keras.models.Model`.
+    :param output_tensor: Keras tensor with activation to compute.
+    :return: activation_function: Compiled Keras function.  Input is a list of
+        input matrices (see doc for `get_class_activation_for_examples`) plus
+        the learning phase (0).  Output is a length-1 list, containing the
+        activation for each example.
+    """
+
+    if isinstance(model_object.input, list):
+        list_of_input_tensors = model_object.input
+    else:
+        list_of_input_tensors = [model_object.input]
+
+    return K.function(
+        list_of_input_tensors + [K.learning_phase()], [output_tensor])
+
+
 def check_metadata(
         component_type_string, target_class=None, layer_name=None,
         neuron_index_matrix=None, channel_indices=None):
@@ -102,27 +122,38 @@ def get_class_activation_for_examples(
         component_type_string=model_interpretation.CLASS_COMPONENT_TYPE_STRING,
         target_class=target_class)
 
-    if isinstance(model_object.input, list):
-        list_of_input_tensors = model_object.input
-    else:
-        list_of_input_tensors = [model_object.input]
-
     num_output_neurons = model_object.layers[-1].output.get_shape().as_list()[
         -1]
 
     if num_output_neurons == 1:
         error_checking.assert_is_leq(target_class, 1)
-        if target_class == 1:
-            output_tensor = model_object.layers[-1].output[..., 0]
-        else:
-            output_tensor = 1. - model_object.layers[-1].output[..., 0]
     else:
         error_checking.assert_is_less_than(target_class, num_output_neurons)
-        output_tensor = model_object.layers[-1].output[..., target_class]
 
-    activation_function = K.function(
-        list_of_input_tensors + [K.learning_phase()],
-        [output_tensor])
+    def create_activation_function():
+        """Creates activation function for the target class.
+
+        :return: activation_function: See doc for
+            `_create_activation_function`.
+        """
+
+        if num_output_neurons == 1:
+            if target_class == 1:
+                output_tensor = model_object.layers[-1].output[..., 0]
+            else:
+                output_tensor = 1. - model_object.layers[-1].output[..., 0]
+        else:
+            output_tensor = model_object.layers[-1].output[..., target_class]
+
+        return _create_activation_function(
+            model_object=model_object, output_tensor=output_tensor)
+
+    activation_function = model_interpretation.get_cached_function(
+        model_object=model_object,
+        key_tuple=(model_interpretation.ACTIVATION_FUNCTION_TYPE_STRING,
+                   model_interpretation.CLASS_COMPONENT_TYPE_STRING,
+                   target_class),
+        create_function=create_activation_function)
 
     return activation_function(list_of_input_matrices + [0])[0]
 
@@ -148,14 +179,25 @@ def get_neuron_activation_for_examples(
         layer_name=layer_name,
         neuron_index_matrix=numpy.expand_dims(neuron_indices, axis=0))
 
-    if isinstance(model_object.input, list):
-        list_of_input_tensors = model_object.input
-    else:
-        list_of_input_tensors = [model_object.input]
+    def create_activation_function():
+        """Creates activation function for the given neuron.
+
+        :return: activation_function: See doc for
+            `_create_activation_function`.
+        """
 
-    activation_function = K.function(
-        list_of_input_tensors + [K.learning_phase()],
-        [model_object.get_layer(name=layer_name).output[..., neuron_indices]])
+        return _create_activation_function(
+            model_object=model_object,
+            output_tensor=model_object.get_layer(name=layer_name).output[
+                ..., neuron_indices]
+        )
+
+    activation_function = model_interpretation.get_cached_function(
+        model_object=model_object,
+        key_tuple=(model_interpretation.ACTIVATION_FUNCTION_TYPE_STRING,
+                   model_interpretation.NEURON_COMPONENT_TYPE_STRING,
+                   layer_name, tuple(neuron_indices.tolist())),
+        create_function=create_activation_function)
 
     return activation_function(list_of_input_matrices + [0])[0]
 
@@ -187,17 +229,27 @@ def get_channel_activation_for_examples(
         model_interpretation.CHANNEL_COMPONENT_TYPE_STRING,
         layer_name=layer_name, channel_indices=numpy.array([channel_index]))
 
-    if isinstance(model_object.input, list):
-        list_of_input_tensors = model_object.input
-    else:
-        list_of_input_tensors = [model_object.input]
-
-    activation_function = K.function(
-        list_of_input_tensors + [K.learning_phase()],
-        [stat_function_for_neuron_activations(
-            model_object.get_layer(name=layer_name).output[..., channel_index])
-        ]
-    )
+    def create_activation_function():
+        """Creates activation function for the given channel.
+
+        :return: activation_function: See doc for
+            `_create_activation_function`.
+        """
+
+        return _create_activation_function(
+            model_object=model_object,
+            output_tensor=stat_function_for_neuron_activations(
+                model_object.get_layer(name=layer_name).output[
+                    ..., channel_index])
+        )
+
+    activation_function = model_interpretation.get_cached_function(
+        model_object=model_object,
+        key_tuple=(model_interpretation.ACTIVATION_FUNCTION_TYPE_STRING,
+                   model_interpretation.CHANNEL_COMPONENT_TYPE_STRING,
+                   layer_name, channel_index,
+                   stat_function_for_neuron_activations),
+        create_function=create_activation_function)
 
     return activation_function(list_of_input_matrices + [0])[0]
 
@@ -1,5 +1,6 @@
 """Helper methods for model interpretation."""
 
+import collections
 import numpy
 from gewittergefahr.gg_utils import radar_utils
 from gewittergefahr.gg_utils import error_checking
@@ -22,6 +23,16 @@ STORM_IDS_KEY = 'storm_ids'
 STORM_TIMES_KEY = 'storm_times_unix_sec'
 SOUNDING_PRESSURES_KEY = 'sounding_pressure_matrix_pascals'
 
+SALIENCY_FUNCTION_TYPE_STRING = 'saliency'
+ACTIVATION_FUNCTION_TYPE_STRING = 'activation'
+OPTIMIZATION_FUNCTION_TYPE_STRING = 'optimization'
+
+DEFAULT_MAX_CACHE_SIZE = 100
+
+# Compiled Keras functions (see `get_cached_function`), ordered from least to
+# most recently used.
+_FUNCTION_CACHE_DICT = collections.OrderedDict()
+
 
 def check_component_type(component_type_string):
     """Ensures that model-component type is valid.
@@ -124,6 +135,80 @@ def model_component_to_string(
     return verbose_string, abbrev_string
 
 
+def get_cached_function(
+        model_object, key_tuple, create_function,
+        max_cache_size=DEFAULT_MAX_CACHE_SIZE):
+    """Returns compiled Keras function from cache (creating it if necessary).
+
+    Creating a Keras function (with `keras.backend.gradients` and
+    `keras.backend.function`) adds nodes to the TensorFlow graph, so doing this
+    every time a model component is interpreted makes the graph grow without
+    bound.  This method creates each function only once.
+
+    If the cache contains more than `max_cache_size` functions, the least
+    recently used are dropped.  If the TensorFlow graph is reset (e.g., by
+    `keras.backend.clear_session`), call `clear_function_cache` first.
+
+    :param model_object: Instance of `keras.models.Model`.
+    :param key_tuple: Tuple that identifies the function for the given model.
+        This should contain the function type (e.g., "saliency") and all
+        metadata that define the model component (component type, target class,
+        layer name, neuron indices, channel index, etc.).  All items must be
+        hashable.
+    :param create_function: Function with no input arguments that creates the
+        compiled function.  This is called only if the function is not already
+        in the cache.
+    :param max_cache_size: Max number of functions in cache.
+    :return: compiled_function: Compiled function (output of `create_function`).
+    """
+
+    error_checking.assert_is_integer(max_cache_size)
+    error_checking.assert_is_greater(max_cache_size, 0)
+
+    # Each entry holds a reference to its model, so the model cannot be
+    # garbage-collected (and its ID reused by another model) while the entry is
+    # in the cache.
+    this_key = (id(model_object),) + tuple(key_tuple)
+
+    if this_key in _FUNCTION_CACHE_DICT:
+        this_model_object, this_function = _FUNCTION_CACHE_DICT.pop(this_key)
+        _FUNCTION_CACHE_DICT[this_key] = (this_model_object, this_function)
+        return this_function
+
+    compiled_function = create_function()
+    _FUNCTION_CACHE_DICT[this_key] = (model_object, compiled_function)
+
+    while len(_FUNCTION_CACHE_DICT) > max_cache_size:
+        _FUNCTION_CACHE_DICT.popitem(last=False)
+
+    return compiled_function
+
+
+def clear_function_cache(model_object=None):
+    """Removes compiled functions from cache.
+
+    :param model_object: Instance of `keras.models.Model`.  Only functions for
+        this model will be removed.  If None, all functions will be removed.
+    """
+
+    if model_object is None:
+        _FUNCTION_CACHE_DICT.clear()
+        return
+
+    for this_key in _FUNCTION_CACHE_DICT.keys():
+        if _FUNCTION_CACHE_DICT[this_key][0] is model_object:
+            del _FUNCTION_CACHE_DICT[this_key]
+
+
+def get_num_cached_functions():
+    """Returns number of compiled functions in cache.
+
+    :return: num_functions: Number of functions.
+    """
+
+    return len(_FUNCTION_CACHE_DICT)
+
+
 def sort_neurons_by_weight(model_object, layer_name):
     """Sorts neurons of the given layer in descending order by weight.
 
@@ -16,6 +16,9 @@ CHANNEL_OPTIMIZN_ABBREV_STRING = 'layer=average-pooling2d-3_channel8'
 NEURON_OPTIMIZN_VERBOSE_STRING = 'Layer "average_pooling2d_3"; neuron (0, 3, 1)'
 NEURON_OPTIMIZN_ABBREV_STRING = 'layer=average-pooling2d-3_neuron0,3,1'
 
+# The following constants are used to test get_cached_function.
+MAX_CACHE_SIZE = 2
+
 
 class ModelInterpretationTests(unittest.TestCase):
     """Each method is a unit test for model_interpretation.py."""
@@ -68,6 +71,54 @@ class ModelInterpretationTests(unittest.TestCase):
         self.assertTrue(this_verbose_string == CHANNEL_OPTIMIZN_VERBOSE_STRING)
         self.assertTrue(this_abbrev_string == CHANNEL_OPTIMIZN_ABBREV_STRING)
 
+    def test_get_cached_function(self):
+        """Ensures correct output from get_cached_function."""
+
+        model_interpretation.clear_function_cache()
+        first_model_object = object()
+        second_model_object = object()
+        num_functions_created = [0]
+
+        def create_function():
+            """Creates dummy function (and counts creations)."""
+
+            num_functions_created[0] += 1
+            return lambda x: x + num_functions_created[0]
+
+        first_function = model_interpretation.get_cached_function(
+            model_object=first_model_object, key_tuple=('a', 1),
+            create_function=create_function, max_cache_size=MAX_CACHE_SIZE)
+        self.assertTrue(model_interpretation.get_cached_function(
+            model_object=first_model_object, key_tuple=('a', 1),
+            create_function=create_function, max_cache_size=MAX_CACHE_SIZE
+        ) is first_function)
+        self.assertTrue(num_functions_created[0] == 1)
+
+        # Same key with different model should create new function.
+        model_interpretation.get_cached_function(
+            model_object=second_model_object, key_tuple=('a', 1),
+            create_function=create_function, max_cache_size=MAX_CACHE_SIZE)
+        self.assertTrue(num_functions_created[0] == 2)
+
+        # Adding third function should drop least recently used (first).
+        model_interpretation.get_cached_function(
+            model_object=second_model_object, key_tuple=('b', 1),
+            create_function=create_function, max_cache_size=MAX_CACHE_SIZE)
+        self.assertTrue(
+            model_interpretation.get_num_cached_functions() == MAX_CACHE_SIZE)
+
+        model_interpretation.get_cached_function(
+            model_object=first_model_object, key_tuple=('a', 1),
+            create_function=create_function, max_cache_size=MAX_CACHE_SIZE)
+        self.assertTrue(num_functions_created[0] == 4)
+
+        model_interpretation.clear_function_cache(
+            model_object=second_model_object)
+        self.assertTrue(model_interpretation.get_num_cached_functions() == 1)
+
+        model_interpretation.clear_function_cache()
+        self.assertTrue(model_interpretation.get_num_cached_functions() == 0)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -13,8 +13,11 @@ Lakshmanan, V., C. Karstens, J. Krause, K. Elmore, A. Ryzhkov, and S. Berkseth,
 
 import copy
 import pickle
+import threading
+import multiprocessing.pool
 import numpy
 import keras.utils
+from keras import backend as K
 from gewittergefahr.gg_utils import file_system_utils
 from gewittergefahr.gg_utils import error_checking
 from gewittergefahr.deep_learning import cnn
@@ -22,6 +25,9 @@ from gewittergefahr.deep_learning import cnn
 MIN_PROBABILITY = 1e-15
 MAX_PROBABILITY = 1. - MIN_PROBABILITY
 
+DEFAULT_CONFIDENCE_LEVEL = 0.95
+LARGE_INTEGER = int(1e9)
+
 # Mandatory keys in result dictionary (see `write_results`).
 SELECTED_PREDICTORS_KEY = 'selected_predictor_name_by_step'
 HIGHEST_COSTS_KEY = 'highest_cost_by_step'
@@ -35,6 +41,212 @@ STORM_IDS_KEY = 'storm_ids'
 STORM_TIMES_KEY = 'storm_times_unix_sec'
 TARGET_VALUES_KEY = 'target_values'
 
+# Keys added to result dictionary iff `num_bootstrap_reps > 0` (see
+# `run_permutation_test`).
+ORIGINAL_COST_INTERVAL_KEY = 'original_cost_interval'
+HIGHEST_COST_INTERVALS_KEY = 'highest_cost_interval_by_step'
+STEP1_COST_INTERVALS_KEY = 'cost_intervals_step1'
+
+# State of each worker thread (see `_init_worker`).
+_WORKER_STATE = threading.local()
+
+
+def _apply_prediction_function(
+        prediction_function, model_object, list_of_input_matrices,
+        num_examples_per_batch):
+    """Applies prediction function to one batch of examples at a time.
+
+    :param prediction_function: See doc for `run_permutation_test`.
+    :param model_object: Same.
+    :param list_of_input_matrices: Same.
+    :param num_examples_per_batch: Same.
+    :return: class_probability_matrix: Output from `prediction_function`, with
+        all batches concatenated along the first axis.
+    """
+
+    num_examples = list_of_input_matrices[0].shape[0]
+    if num_examples_per_batch is None or num_examples_per_batch >= num_examples:
+        return prediction_function(model_object, list_of_input_matrices)
+
+    class_probability_matrix = None
+
+    for i in range(0, num_examples, num_examples_per_batch):
+        these_indices = numpy.linspace(
+            i, min([i + num_examples_per_batch, num_examples]) - 1,
+            num=min([num_examples_per_batch, num_examples - i]), dtype=int)
+
+        this_probability_matrix = prediction_function(
+            model_object,
+            [a[these_indices, ...] for a in list_of_input_matrices]
+        )
+
+        if class_probability_matrix is None:
+            class_probability_matrix = numpy.full(
+                (num_examples,) + this_probability_matrix.shape[1:], numpy.nan)
+
+        class_probability_matrix[these_indices, ...] = this_probability_matrix
+
+    return class_probability_matrix
+
+
+def _evaluate_one_predictor(
+        model_object, list_of_input_matrices, target_values,
+        prediction_function, cost_function, matrix_index, predictor_index,
+        random_seeds, num_examples_per_batch, bootstrap_index_matrix):
+    """Computes cost after permuting one predictor.
+
+    R = number of repetitions
+    B = number of bootstrap replicates
+
+    :param model_object: See doc for `run_permutation_test`.
+    :param list_of_input_matrices: Same.
+    :param target_values: Same.
+    :param prediction_function: Same.
+    :param cost_function: Same.
+    :param matrix_index: Index of matrix containing the predictor.  If None, no
+        predictor will be permuted (this is used to compute the original cost).
+    :param predictor_index: Index of predictor in the matrix (last axis).
+    :param random_seeds: length-R numpy array of random seeds (one for each
+        repetition of the permutation).
+    :param num_examples_per_batch: See doc for `run_permutation_test`.
+    :param bootstrap_index_matrix: B-by-E numpy array of example indices (one
+        row for each bootstrap replicate).  May be None.
+    :return: costs: length-R numpy array of costs.
+    :return: bootstrap_costs: numpy array (length R * B) of costs for bootstrap
+        replicates.  If `bootstrap_index_matrix is None`, this is None.
+    """
+
+    num_repetitions = len(random_seeds)
+    costs = numpy.full(num_repetitions, numpy.nan)
+
+    if bootstrap_index_matrix is None:
+        bootstrap_cost_matrix = None
+    else:
+        bootstrap_cost_matrix = numpy.full(
+            (num_repetitions, bootstrap_index_matrix.shape[0]), numpy.nan)
+
+    for r in range(num_repetitions):
+        if matrix_index is None:
+            these_input_matrices = list_of_input_matrices
+        else:
+            these_input_matrices = permute_one_predictor(
+                list_of_input_matrices=list_of_input_matrices,
+                matrix_index=matrix_index, predictor_index=predictor_index,
+                random_seed=random_seeds[r]
+            )[0]
+
+        this_probability_matrix = _apply_prediction_function(
+            prediction_function=prediction_function, model_object=model_object,
+            list_of_input_matrices=these_input_matrices,
+            num_examples_per_batch=num_examples_per_batch)
+
+        if bootstrap_index_matrix is not None:
+            for b in range(bootstrap_index_matrix.shape[0]):
+                these_indices = bootstrap_index_matrix[b, :]
+                bootstrap_cost_matrix[r, b] = cost_function(
+                    target_values[these_indices],
+                    this_probability_matrix[these_indices, ...])
+
+        costs[r] = cost_function(target_values, this_probability_matrix)
+
+    if bootstrap_cost_matrix is None:
+        return costs, None
+
+    return costs, numpy.ravel(bootstrap_cost_matrix)
+
+
+def _init_worker(
+        model_file_name, list_of_input_matrices, target_values,
+        prediction_function, cost_function, num_examples_per_batch,
+        bootstrap_index_matrix):
+    """Initializes worker thread.
+
+    Each worker reads its own copy of the model into its own TensorFlow graph
+    and session, so that workers do not contend for one graph.
+
+    :param model_file_name: See doc for `run_permutation_test`.
+    :param list_of_input_matrices: Same.
+    :param target_values: Same.
+    :param prediction_function: Same.
+    :param cost_function: Same.
+    :param num_examples_per_batch: Same.
+    :param bootstrap_index_matrix: See doc for `_evaluate_one_predictor`.
+    """
+
+    _WORKER_STATE.graph_object = K.tf.Graph()
+
+    with _WORKER_STATE.graph_object.as_default():
+        _WORKER_STATE.session_object = K.tf.Session(
+            graph=_WORKER_STATE.graph_object)
+
+        with _WORKER_STATE.session_object.as_default():
+            _WORKER_STATE.model_object = cnn.read_model(model_file_name)
+
+    _WORKER_STATE.list_of_input_matrices = list(list_of_input_matrices)
+    _WORKER_STATE.num_permanent_permutations = 0
+    _WORKER_STATE.target_values = target_values
+    _WORKER_STATE.prediction_function = prediction_function
+    _WORKER_STATE.cost_function = cost_function
+    _WORKER_STATE.num_examples_per_batch = num_examples_per_batch
+    _WORKER_STATE.bootstrap_index_matrix = bootstrap_index_matrix
+
+
+def _evaluate_one_predictor_in_worker(argument_tuple):
+    """Computes cost after permuting one predictor (in worker thread).
+
+    :param argument_tuple: Tuple with the following items.
+    argument_tuple[0] = permanent_permutations: 1-D list of permutations
+        (predictors left permuted at previous steps).  Each item is a tuple
+        with (matrix_index, predictor_index, random_seed).
+    argument_tuple[1] = matrix_index: See doc for `_evaluate_one_predictor`.
+    argument_tuple[2] = predictor_index: Same.
+    argument_tuple[3] = random_seeds: Same.
+    :return: costs: See doc for `_evaluate_one_predictor`.
+    :return: bootstrap_costs: Same.
+    """
+
+    (permanent_permutations, matrix_index, predictor_index, random_seeds
+    ) = argument_tuple
+
+    # Bring this worker's copy of the inputs up to date with the main thread.
+    num_done = _WORKER_STATE.num_permanent_permutations
+
+    for this_permutation in permanent_permutations[num_done:]:
+        _WORKER_STATE.list_of_input_matrices = permute_one_predictor(
+            list_of_input_matrices=_WORKER_STATE.list_of_input_matrices,
+            matrix_index=this_permutation[0],
+            predictor_index=this_permutation[1],
+            random_seed=this_permutation[2]
+        )[0]
+
+    _WORKER_STATE.num_permanent_permutations = len(permanent_permutations)
+
+    with _WORKER_STATE.graph_object.as_default():
+        with _WORKER_STATE.session_object.as_default():
+            return _evaluate_one_predictor(
+                model_object=_WORKER_STATE.model_object,
+                list_of_input_matrices=_WORKER_STATE.list_of_input_matrices,
+                target_values=_WORKER_STATE.target_values,
+                prediction_function=_WORKER_STATE.prediction_function,
+                cost_function=_WORKER_STATE.cost_function,
+                matrix_index=matrix_index, predictor_index=predictor_index,
+                random_seeds=random_seeds,
+                num_examples_per_batch=_WORKER_STATE.num_examples_per_batch,
+                bootstrap_index_matrix=_WORKER_STATE.bootstrap_index_matrix)
+
+
+def _get_cost_interval(bootstrap_costs, confidence_level):
+    """Returns confidence interval for cost.
+
+    :param bootstrap_costs: 1-D numpy array of costs from bootstrap replicates.
+    :param confidence_level: Confidence level (in range 0...1).
+    :return: cost_interval: length-2 numpy array with [min, max] of interval.
+    """
+
+    return numpy.percentile(
+        bootstrap_costs,
+        [50 * (1. - confidence_level), 50 * (1. + confidence_level)])
+
 
 def prediction_function_2d_cnn(model_object, list_of_input_matrices):
     """Prediction function for 2-D GewitterGefahr CNN.
@@ -145,9 +357,60 @@ def cross_entropy_function(
     ) / num_examples
 
 
+def permute_one_predictor(
+        list_of_input_matrices, matrix_index, predictor_index,
+        random_seed=None):
+    """Permutes values of one predictor within each example.
+
+    The spatial map (or profile) of the given predictor is shuffled separately
+    for each example.  All examples are shuffled at once, with one batched
+    gather.
+
+    :param list_of_input_matrices: See doc for `run_permutation_test`.
+    :param matrix_index: Index of matrix containing the predictor.
+    :param predictor_index: Index of predictor in the matrix (last axis).
+    :param random_seed: Random seed.  Using the same seed will produce the same
+        permutation.
+    :return: list_of_input_matrices: Same as input, except that values of the
+        given predictor are permuted.  Only the [q]th matrix (where
+        q = `matrix_index`) is copied; the others are shared with the input
+        list.
+    :return: permuted_values: numpy array of permuted values for the given
+        predictor.  Dimensions are those of the [q]th matrix without the last
+        axis.
+    """
+
+    predictor_matrix = list_of_input_matrices[matrix_index]
+    num_examples = predictor_matrix.shape[0]
+
+    these_values = numpy.reshape(
+        predictor_matrix[..., predictor_index], (num_examples, -1))
+
+    random_state_object = numpy.random.RandomState(random_seed)
+    permuted_index_matrix = numpy.argsort(
+        random_state_object.rand(*these_values.shape), axis=1)
+
+    permuted_values = numpy.reshape(
+        these_values[
+            numpy.arange(num_examples)[:, numpy.newaxis], permuted_index_matrix
+        ],
+        predictor_matrix.shape[:-1]
+    )
+
+    list_of_input_matrices = list(list_of_input_matrices)
+    list_of_input_matrices[matrix_index] = predictor_matrix + 0
+    list_of_input_matrices[matrix_index][
+        ..., predictor_index] = permuted_values
+
+    return list_of_input_matrices, permuted_values
+
+
 def run_permutation_test(
         model_object, list_of_input_matrices, predictor_names_by_matrix,
-        target_values, prediction_function, cost_function):
+        target_values, prediction_function, cost_function,
+        num_examples_per_batch=None, num_repetitions=1, num_bootstrap_reps=0,
+        confidence_level=DEFAULT_CONFIDENCE_LEVEL, num_threads=1,
+        model_file_name=None):
     """Runs the permutation test.
 
     N = number of input matrices
@@ -185,6 +448,24 @@ def run_permutation_test(
     Input: class_probability_matrix: Output from `prediction_function`.
     Output: cost: Scalar value.
 
+    :param num_examples_per_batch: Number of examples per batch.  Predictions
+        will be generated for one batch at a time, which bounds memory usage.
+        If None, will generate predictions for all examples at once.
+    :param num_repetitions: Number of times to permute each predictor at each
+        step.  The cost for each predictor is averaged over repetitions.
+    :param num_bootstrap_reps: Number of bootstrap replicates (resamplings of
+        the examples), used to create confidence intervals for costs.  If 0,
+        will not create confidence intervals.
+    :param confidence_level: [used only if `num_bootstrap_reps > 0`]
+        Confidence level (in range 0...1).
+    :param num_threads: Number of worker threads.  If > 1, candidate
+        predictors at each step will be evaluated in parallel, with each worker
+        holding its own copy of the model (in its own TensorFlow graph).
+        Threads are used instead of processes because TensorFlow cannot be used
+        in a process forked after TensorFlow has been initialized.
+    :param model_file_name: [used only if `num_threads > 1`]
+        Path to model file (will be read by `cnn.read_model` in each worker).
+
     :return: result_dict: Dictionary with the following keys.  S = number of
         steps (loops through predictor variables) taken by algorithm.  P = total
         number of predictors.
@@ -198,6 +479,15 @@ def run_permutation_test(
         permuting at step 1.  These represent results of the Breiman version of
         the permutation test.
 
+    If `num_bootstrap_reps > 0`, will also contain the following keys.
+
+    result_dict['original_cost_interval']: length-2 numpy array with confidence
+        interval for original cost.
+    result_dict['highest_cost_interval_by_step']: S-by-2 numpy array with
+        confidence interval for cost at each step.
+    result_dict['cost_intervals_step1']: P-by-2 numpy array with confidence
+        interval for each cost after permuting at step 1.
+
     :raises: ValueError: if length of `list_of_input_matrices` != length of
         `predictor_names_by_matrix`.
     :raises: ValueError: if any input matrix has < 3 dimensions.
@@ -244,96 +534,175 @@ def run_permutation_test(
             list_of_input_matrices[q],
             exact_dimensions=these_expected_dimensions)
 
+    error_checking.assert_is_integer(num_repetitions)
+    error_checking.assert_is_greater(num_repetitions, 0)
+    error_checking.assert_is_integer(num_bootstrap_reps)
+    error_checking.assert_is_geq(num_bootstrap_reps, 0)
+    error_checking.assert_is_integer(num_threads)
+    error_checking.assert_is_greater(num_threads, 0)
+
+    if num_examples_per_batch is not None:
+        error_checking.assert_is_integer(num_examples_per_batch)
+        error_checking.assert_is_greater(num_examples_per_batch, 0)
+
+    # Worker threads may use the global random-number generator (e.g., Keras
+    # does when building a model), so all random numbers used here come from a
+    # private generator.  This makes results independent of `num_threads`.
+    random_state_object = numpy.random.RandomState(
+        numpy.random.randint(0, high=LARGE_INTEGER))
+
+    if num_bootstrap_reps > 0:
+        error_checking.assert_is_greater(confidence_level, 0.)
+        error_checking.assert_is_less_than(confidence_level, 1.)
+
+        bootstrap_index_matrix = random_state_object.randint(
+            0, high=num_examples, size=(num_bootstrap_reps, num_examples))
+    else:
+        bootstrap_index_matrix = None
+
+    if num_threads > 1:
+        error_checking.assert_is_string(model_file_name)
+
+        pool_object = multiprocessing.pool.ThreadPool(
+            processes=num_threads, initializer=_init_worker,
+            initargs=(model_file_name, list_of_input_matrices, target_values,
+                      prediction_function, cost_function,
+                      num_examples_per_batch, bootstrap_index_matrix)
+        )
+    else:
+        pool_object = None
+
     # Get original cost (with no permutation).
-    class_probability_matrix = prediction_function(
-        model_object, list_of_input_matrices)
-    original_cost = cost_function(target_values, class_probability_matrix)
+    these_costs, these_bootstrap_costs = _evaluate_one_predictor(
+        model_object=model_object,
+        list_of_input_matrices=list_of_input_matrices,
+        target_values=target_values, prediction_function=prediction_function,
+        cost_function=cost_function, matrix_index=None, predictor_index=None,
+        random_seeds=numpy.array([0], dtype=int),
+        num_examples_per_batch=num_examples_per_batch,
+        bootstrap_index_matrix=bootstrap_index_matrix)
+
+    original_cost = these_costs[0]
     print 'Original cost (no permutation): {0:.4e}'.format(original_cost)
 
+    if bootstrap_index_matrix is not None:
+        original_cost_interval = _get_cost_interval(
+            bootstrap_costs=these_bootstrap_costs,
+            confidence_level=confidence_level)
+
     remaining_predictor_names_by_matrix = copy.deepcopy(
         predictor_names_by_matrix)
+    permanent_permutations = []
     step_num = 0
 
     selected_predictor_name_by_step = []
     highest_cost_by_step = []
+    highest_cost_interval_by_step = []
     predictor_names_step1 = []
     costs_step1 = []
+    cost_intervals_step1 = []
 
     while True:
         print '\n'
         step_num += 1
 
-        highest_cost = -numpy.inf
-        best_matrix_index = None
-        best_predictor_name = None
-        best_predictor_permuted_values = None
-
-        stopping_criterion = True
-
-        for q in range(num_input_matrices):
-            if len(remaining_predictor_names_by_matrix[q]) == 0:
-                continue
-
-            for this_predictor_name in remaining_predictor_names_by_matrix[q]:
-                stopping_criterion = False
-
-                print (
-                    'Trying predictor "{0:s}" at step {1:d} of permutation '
-                    'test...'
-                ).format(this_predictor_name, step_num)
-
-                these_input_matrices = copy.deepcopy(list_of_input_matrices)
-                this_predictor_index = predictor_names_by_matrix[q].index(
-                    this_predictor_name)
-
-                # Shuffle map for `this_predictor_name` within each example.
-                for i in range(num_examples):
-                    these_input_matrices[q][
-                        i, ..., this_predictor_index
-                    ] = numpy.random.permutation(
-                        these_input_matrices[q][i, ..., this_predictor_index])
+        # Each candidate is a tuple with (matrix index, predictor name).
+        candidate_tuples = [
+            (q, n) for q in range(num_input_matrices)
+            for n in remaining_predictor_names_by_matrix[q]
+        ]
 
-                this_probability_matrix = prediction_function(
-                    model_object, these_input_matrices)
-                this_cost = cost_function(
-                    target_values, this_probability_matrix)
+        if len(candidate_tuples) == 0:  # No more predictors to permute.
+            break
 
-                print 'Resulting cost = {0:.4e}'.format(this_cost)
+        random_seed_matrix = random_state_object.randint(
+            0, high=LARGE_INTEGER, size=(len(candidate_tuples), num_repetitions)
+        )
 
-                if step_num == 1:
-                    predictor_names_step1.append(this_predictor_name)
-                    costs_step1.append(this_cost)
+        list_of_argument_tuples = [
+            (permanent_permutations, candidate_tuples[k][0],
+             predictor_names_by_matrix[candidate_tuples[k][0]].index(
+                 candidate_tuples[k][1]),
+             random_seed_matrix[k, :])
+            for k in range(len(candidate_tuples))
+        ]
+
+        print (
+            'Trying {0:d} predictors at step {1:d} of permutation test...'
+        ).format(len(candidate_tuples), step_num)
+
+        if pool_object is None:
+            list_of_result_tuples = [
+                _evaluate_one_predictor(
+                    model_object=model_object,
+                    list_of_input_matrices=list_of_input_matrices,
+                    target_values=target_values,
+                    prediction_function=prediction_function,
+                    cost_function=cost_function, matrix_index=a[1],
+                    predictor_index=a[2], random_seeds=a[3],
+                    num_examples_per_batch=num_examples_per_batch,
+                    bootstrap_index_matrix=bootstrap_index_matrix)
+                for a in list_of_argument_tuples
+            ]
+        else:
+            list_of_result_tuples = pool_object.map(
+                _evaluate_one_predictor_in_worker, list_of_argument_tuples,
+                chunksize=1)
+
+        these_costs = numpy.array(
+            [numpy.mean(r[0]) for r in list_of_result_tuples])
+
+        for k in range(len(candidate_tuples)):
+            print 'Cost for predictor "{0:s}" = {1:.4e}'.format(
+                candidate_tuples[k][1], these_costs[k])
+
+            if step_num != 1:
+                continue
 
-                if this_cost < highest_cost:
-                    continue
+            predictor_names_step1.append(candidate_tuples[k][1])
+            costs_step1.append(these_costs[k])
 
-                highest_cost = this_cost + 0.
-                best_matrix_index = q + 0
-                best_predictor_name = this_predictor_name + ''
-                best_predictor_permuted_values = these_input_matrices[q][
-                    ..., this_predictor_index]
+            if bootstrap_index_matrix is not None:
+                cost_intervals_step1.append(_get_cost_interval(
+                    bootstrap_costs=list_of_result_tuples[k][1],
+                    confidence_level=confidence_level))
 
-        if stopping_criterion:  # No more predictors to permute.
-            break
+        # In case of ties, the last predictor wins.
+        best_index = len(these_costs) - 1 - numpy.argmax(these_costs[::-1])
+        best_matrix_index, best_predictor_name = candidate_tuples[best_index]
 
         selected_predictor_name_by_step.append(best_predictor_name)
-        highest_cost_by_step.append(highest_cost)
+        highest_cost_by_step.append(these_costs[best_index])
+
+        if bootstrap_index_matrix is not None:
+            highest_cost_interval_by_step.append(_get_cost_interval(
+                bootstrap_costs=list_of_result_tuples[best_index][1],
+                confidence_level=confidence_level))
 
         # Remove best predictor from list.
         remaining_predictor_names_by_matrix[best_matrix_index].remove(
             best_predictor_name)
 
-        # Leave values of best predictor permuted.
-        this_best_predictor_index = predictor_names_by_matrix[
-            best_matrix_index].index(best_predictor_name)
-        list_of_input_matrices[best_matrix_index][
-            ..., this_best_predictor_index
-        ] = best_predictor_permuted_values
+        # Leave values of best predictor permuted (as in the first repetition).
+        this_permutation = list_of_argument_tuples[best_index][1:3] + (
+            random_seed_matrix[best_index, 0],)
+        permanent_permutations = permanent_permutations + [this_permutation]
+
+        list_of_input_matrices = permute_one_predictor(
+            list_of_input_matrices=list_of_input_matrices,
+            matrix_index=this_permutation[0],
+            predictor_index=this_permutation[1],
+            random_seed=this_permutation[2]
+        )[0]
 
         print 'Best predictor = "{0:s}" ... new cost = {1:.4e}'.format(
-            best_predictor_name, highest_cost)
+            best_predictor_name, these_costs[best_index])
+
+    if pool_object is not None:
+        pool_object.close()
+        pool_object.join()
 
-    return {
+    result_dict = {
         SELECTED_PREDICTORS_KEY: selected_predictor_name_by_step,
         HIGHEST_COSTS_KEY: numpy.array(highest_cost_by_step),
         ORIGINAL_COST_KEY: original_cost,
@@ -341,6 +710,16 @@ def run_permutation_test(
         STEP1_COSTS_KEY: numpy.array(costs_step1)
     }
 
+    if bootstrap_index_matrix is not None:
+        result_dict.update({
+            ORIGINAL_COST_INTERVAL_KEY: original_cost_interval,
+            HIGHEST_COST_INTERVALS_KEY: numpy.array(
+                highest_cost_interval_by_step),
+            STEP1_COST_INTERVALS_KEY: numpy.array(cost_intervals_step1)
+        })
+
+    return result_dict
+
 
 def write_results(result_dict, pickle_file_name):
     """Writes results to Pickle file.
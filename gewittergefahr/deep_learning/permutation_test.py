@@ -42,6 +42,17 @@ TERNARY_PROBABILITY_MATRIX = numpy.array([[0, 0, 1],
 TERNARY_CROSS_ENTROPY = sklearn_cross_entropy(
     TERNARY_TARGET_VALUES, TERNARY_PROBABILITY_MATRIX)
 
+# The following constants are used to test permute_one_predictor.
+FIRST_PREDICTOR_MATRIX = numpy.reshape(
+    numpy.linspace(0, 59, num=60), (3, 5, 2, 2))
+SECOND_PREDICTOR_MATRIX = numpy.reshape(
+    numpy.linspace(100, 117, num=18), (3, 6, 1))
+LIST_OF_INPUT_MATRICES = [FIRST_PREDICTOR_MATRIX, SECOND_PREDICTOR_MATRIX]
+
+PERMUTED_MATRIX_INDEX = 0
+PERMUTED_PREDICTOR_INDEX = 1
+RANDOM_SEED = 6695
+
 
 class PermutationTests(unittest.TestCase):
     """Each method is a unit test for permutation.py."""
@@ -72,6 +83,48 @@ class PermutationTests(unittest.TestCase):
         self.assertTrue(numpy.isclose(
             this_cross_entropy, TERNARY_CROSS_ENTROPY, atol=XENTROPY_TOLERANCE))
 
+    def test_permute_one_predictor(self):
+        """Ensures correct output from permute_one_predictor."""
+
+        these_input_matrices, these_permuted_values = (
+            permutation.permute_one_predictor(
+                list_of_input_matrices=LIST_OF_INPUT_MATRICES,
+                matrix_index=PERMUTED_MATRIX_INDEX,
+                predictor_index=PERMUTED_PREDICTOR_INDEX,
+                random_seed=RANDOM_SEED)
+        )
+
+        this_orig_matrix = FIRST_PREDICTOR_MATRIX[..., PERMUTED_PREDICTOR_INDEX]
+        self.assertFalse(numpy.allclose(
+            these_permuted_values, this_orig_matrix))
+
+        # Values should be shuffled only within each example.
+        for i in range(this_orig_matrix.shape[0]):
+            self.assertTrue(numpy.allclose(
+                numpy.sort(numpy.ravel(these_permuted_values[i, ...])),
+                numpy.sort(numpy.ravel(this_orig_matrix[i, ...]))
+            ))
+
+        self.assertTrue(numpy.allclose(
+            these_input_matrices[0][..., PERMUTED_PREDICTOR_INDEX],
+            these_permuted_values
+        ))
+        self.assertTrue(numpy.allclose(
+            these_input_matrices[0][..., 0], FIRST_PREDICTOR_MATRIX[..., 0]
+        ))
+        self.assertTrue(numpy.allclose(
+            these_input_matrices[1], SECOND_PREDICTOR_MATRIX))
+
+        # Same seed should produce same permutation.
+        these_new_permuted_values = permutation.permute_one_predictor(
+            list_of_input_matrices=LIST_OF_INPUT_MATRICES,
+            matrix_index=PERMUTED_MATRIX_INDEX,
+            predictor_index=PERMUTED_PREDICTOR_INDEX, random_seed=RANDOM_SEED
+        )[1]
+
+        self.assertTrue(numpy.allclose(
+            these_permuted_values, these_new_permuted_values))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -21,18 +21,60 @@ CHANNEL_INDEX_KEY = 'channel_index'
 SOUNDING_PRESSURES_KEY = 'sounding_pressure_matrix_pascals'
 
 
+def _create_saliency_function(model_object, loss_tensor, normalize_per_example):
+    """Creates function that computes saliency maps.
+
+    :param model_object: Instance of `keras.models.Model`.
+    :param loss_tensor: Keras tensor defining the loss function.  This must be a
+        sum over examples, so that the gradient for each example depends only on
+        that example.
+    :param normalize_per_example: Boolean flag.  If True, gradients for each
+        example will be divided by their standard deviation (over that example
+        only).  If False, all gradients will be divided by their standard
+        deviation over the whole batch, which makes results depend on the batch.
+    :return: saliency_function: Compiled Keras function.  Input is a list of
+        input matrices (see doc for `_do_saliency_calculations`) plus the
+        learning phase (0).  Output is a list of normalized gradients, one for
+        each input matrix.
+    """
+
+    if isinstance(model_object.input, list):
+        list_of_input_tensors = model_object.input
+    else:
+        list_of_input_tensors = [model_object.input]
+
+    list_of_gradient_tensors = K.gradients(loss_tensor, list_of_input_tensors)
+    num_input_tensors = len(list_of_input_tensors)
+
+    for i in range(num_input_tensors):
+        if normalize_per_example:
+            these_axes = range(1, K.ndim(list_of_gradient_tensors[i]))
+            this_stdev_tensor = K.std(
+                list_of_gradient_tensors[i], axis=these_axes, keepdims=True)
+        else:
+            this_stdev_tensor = K.std(list_of_gradient_tensors[i])
+
+        list_of_gradient_tensors[i] /= K.maximum(
+            this_stdev_tensor, K.epsilon())
+
+    return K.function(
+        list_of_input_tensors + [K.learning_phase()], list_of_gradient_tensors)
+
+
 def _do_saliency_calculations(
-        model_object, loss_tensor, list_of_input_matrices):
+        saliency_function, list_of_input_matrices, num_examples_per_batch):
     """Does saliency calculations.
 
     T = number of input tensors to the model
     E = number of examples (storm objects)
 
-    :param model_object: Instance of `keras.models.Model`.
-    :param loss_tensor: Keras tensor defining the loss function.
+    :param saliency_function: Function created by `_create_saliency_function`.
     :param list_of_input_matrices: length-T list of numpy arrays, comprising one
         or more examples (storm objects).  list_of_input_matrices[i] must have
         the same dimensions as the [i]th input tensor to the model.
+    :param num_examples_per_batch: Number of examples per batch.  Saliency maps
+        will be computed for one batch at a time, which bounds memory usage.  If
+        None, all examples will be done at once.
     :return: list_of_saliency_matrices: length-T list of numpy arrays,
         comprising the saliency map for each example.
         list_of_saliency_matrices[i] has the same dimensions as
@@ -40,23 +82,37 @@ def _do_saliency_calculations(
         which is the gradient of the loss function with respect to x.
     """
 
-    if isinstance(model_object.input, list):
-        list_of_input_tensors = model_object.input
+    num_examples = list_of_input_matrices[0].shape[0]
+    if num_examples_per_batch is None:
+        num_examples_per_batch = num_examples + 0
     else:
-        list_of_input_tensors = [model_object.input]
+        error_checking.assert_is_integer(num_examples_per_batch)
+        error_checking.assert_is_greater(num_examples_per_batch, 0)
 
-    list_of_gradient_tensors = K.gradients(loss_tensor, list_of_input_tensors)
-    num_input_tensors = len(list_of_input_tensors)
-    for i in range(num_input_tensors):
-        list_of_gradient_tensors[i] /= K.maximum(
-            K.std(list_of_gradient_tensors[i]), K.epsilon())
+    list_of_saliency_matrices = None
 
-    inputs_to_gradients_function = K.function(
-        list_of_input_tensors + [K.learning_phase()], list_of_gradient_tensors)
-    list_of_saliency_matrices = inputs_to_gradients_function(
-        list_of_input_matrices + [0])
-    for i in range(num_input_tensors):
-        list_of_saliency_matrices[i] *= -1
+    for i in range(0, num_examples, num_examples_per_batch):
+        this_last_index = min([i + num_examples_per_batch, num_examples])
+
+        if num_examples > num_examples_per_batch:
+            print (
+                'Computing saliency maps for examples {0:d}-{1:d} of '
+                '{2:d}...'
+            ).format(i + 1, this_last_index, num_examples)
+
+        these_saliency_matrices = saliency_function(
+            [a[i:this_last_index, ...] for a in list_of_input_matrices] + [0]
+        )
+
+        if list_of_saliency_matrices is None:
+            list_of_saliency_matrices = [
+                numpy.full((num_examples,) + a.shape[1:], numpy.nan)
+                for a in these_saliency_matrices
+            ]
+
+        for k in range(len(list_of_saliency_matrices)):
+            list_of_saliency_matrices[k][i:this_last_index, ...] = (
+                -1 * these_saliency_matrices[k])
 
     return list_of_saliency_matrices
 
@@ -104,13 +160,17 @@ def check_metadata(
 
 
 def get_saliency_maps_for_class_activation(
-        model_object, target_class, list_of_input_matrices):
+        model_object, target_class, list_of_input_matrices,
+        normalize_per_example=False, num_examples_per_batch=None):
     """For each input example, creates saliency map for prob of target class.
 
     :param model_object: Instance of `keras.models.Model`.
     :param target_class: Saliency maps will be created for this class.  Must be
         an integer in 0...(K - 1), where K = number of classes.
     :param list_of_input_matrices: See doc for `_do_saliency_calculations`.
+    :param normalize_per_example: See doc for `_create_saliency_function`.
+    :param num_examples_per_batch: See doc for `_do_saliency_calculations`.
+        If `normalize_per_example = False`, results depend on batch size.
     :return: list_of_saliency_matrices: See doc for `_do_saliency_calculations`.
     """
 
@@ -123,24 +183,47 @@ def get_saliency_maps_for_class_activation(
 
     if num_output_neurons == 1:
         error_checking.assert_is_leq(target_class, 1)
-        if target_class == 1:
-            loss_tensor = K.mean(
-                (model_object.layers[-1].output[..., 0] - 1) ** 2)
-        else:
-            loss_tensor = K.mean(model_object.layers[-1].output[..., 0] ** 2)
     else:
         error_checking.assert_is_less_than(target_class, num_output_neurons)
-        loss_tensor = K.mean(
-            (model_object.layers[-1].output[..., target_class] - 1) ** 2)
+
+    def create_saliency_function():
+        """Creates saliency function for the target class.
+
+        :return: saliency_function: See doc for `_create_saliency_function`.
+        """
+
+        if num_output_neurons == 1:
+            if target_class == 1:
+                loss_tensor = K.sum(
+                    (model_object.layers[-1].output[..., 0] - 1) ** 2)
+            else:
+                loss_tensor = K.sum(
+                    model_object.layers[-1].output[..., 0] ** 2)
+        else:
+            loss_tensor = K.sum(
+                (model_object.layers[-1].output[..., target_class] - 1) ** 2)
+
+        return _create_saliency_function(
+            model_object=model_object, loss_tensor=loss_tensor,
+            normalize_per_example=normalize_per_example)
+
+    saliency_function = model_interpretation.get_cached_function(
+        model_object=model_object,
+        key_tuple=(model_interpretation.SALIENCY_FUNCTION_TYPE_STRING,
+                   model_interpretation.CLASS_COMPONENT_TYPE_STRING,
+                   target_class, normalize_per_example),
+        create_function=create_saliency_function)
 
     return _do_saliency_calculations(
-        model_object=model_object, loss_tensor=loss_tensor,
-        list_of_input_matrices=list_of_input_matrices)
+        saliency_function=saliency_function,
+        list_of_input_matrices=list_of_input_matrices,
+        num_examples_per_batch=num_examples_per_batch)
 
 
 def get_saliency_maps_for_neuron_activation(
         model_object, layer_name, neuron_indices, list_of_input_matrices,
-        ideal_activation=DEFAULT_IDEAL_ACTIVATION):
+        ideal_activation=DEFAULT_IDEAL_ACTIVATION, normalize_per_example=False,
+        num_examples_per_batch=None):
     """For each input example, creates saliency map for activatn of one neuron.
 
     :param model_object: Instance of `keras.models.Model`.
@@ -148,7 +231,7 @@ def get_saliency_maps_for_neuron_activation(
     :param neuron_indices: 1-D numpy array with indices of the relevant neuron.
         Must have length K - 1, where K = number of dimensions in layer output.
         The first dimension of the layer output is the example dimension, for
-        which the index in this case is always 0.
+        which all indices are used (one saliency map per example).
     :param list_of_input_matrices: See doc for `_do_saliency_calculations`.
     :param ideal_activation: The loss function will be
         (neuron_activation - ideal_activation)** 2.  If
@@ -156,6 +239,9 @@ def get_saliency_maps_for_neuron_activation(
         -sign(neuron_activation) * neuron_activation**2, or the negative signed
         square of neuron_activation, so that loss always decreases as
         neuron_activation increases.
+    :param normalize_per_example: See doc for `_create_saliency_function`.
+    :param num_examples_per_batch: See doc for `_do_saliency_calculations`.
+        If `normalize_per_example = False`, results depend on batch size.
     :return: list_of_saliency_matrices: See doc for `_do_saliency_calculations`.
     """
 
@@ -164,29 +250,45 @@ def get_saliency_maps_for_neuron_activation(
         layer_name=layer_name, ideal_activation=ideal_activation,
         neuron_indices=neuron_indices)
 
-    if ideal_activation is None:
-        loss_tensor = (
-            -K.sign(
-                model_object.get_layer(name=layer_name).output[
-                    0, ..., neuron_indices]) *
-            model_object.get_layer(name=layer_name).output[
-                0, ..., neuron_indices] ** 2
-        )
-    else:
-        loss_tensor = (
-            model_object.get_layer(name=layer_name).output[
-                0, ..., neuron_indices] -
-            ideal_activation) ** 2
+    def create_saliency_function():
+        """Creates saliency function for the given neuron.
+
+        :return: saliency_function: See doc for `_create_saliency_function`.
+        """
+
+        activation_tensor = model_object.get_layer(name=layer_name).output[
+            (slice(None),) + tuple([int(i) for i in neuron_indices])
+        ]
+
+        if ideal_activation is None:
+            loss_tensor = K.sum(
+                -K.sign(activation_tensor) * activation_tensor ** 2)
+        else:
+            loss_tensor = K.sum((activation_tensor - ideal_activation) ** 2)
+
+        return _create_saliency_function(
+            model_object=model_object, loss_tensor=loss_tensor,
+            normalize_per_example=normalize_per_example)
+
+    saliency_function = model_interpretation.get_cached_function(
+        model_object=model_object,
+        key_tuple=(model_interpretation.SALIENCY_FUNCTION_TYPE_STRING,
+                   model_interpretation.NEURON_COMPONENT_TYPE_STRING,
+                   layer_name, tuple(neuron_indices.tolist()),
+                   ideal_activation, normalize_per_example),
+        create_function=create_saliency_function)
 
     return _do_saliency_calculations(
-        model_object=model_object, loss_tensor=loss_tensor,
-        list_of_input_matrices=list_of_input_matrices)
+        saliency_function=saliency_function,
+        list_of_input_matrices=list_of_input_matrices,
+        num_examples_per_batch=num_examples_per_batch)
 
 
 def get_saliency_maps_for_channel_activation(
         model_object, layer_name, channel_index, list_of_input_matrices,
         stat_function_for_neuron_activations,
-        ideal_activation=DEFAULT_IDEAL_ACTIVATION):
+        ideal_activation=DEFAULT_IDEAL_ACTIVATION, normalize_per_example=False,
+        num_examples_per_batch=None):
     """For each input example, creates saliency map for activatn of one channel.
 
     :param model_object: Instance of `keras.models.Model`.
@@ -200,10 +302,14 @@ def get_saliency_maps_for_channel_activation(
         an infinite number of ways to maximize the "channel activation," because
         there is an infinite number of ways to define "channel activation".
         This function must take a Keras tensor (containing neuron activations)
-        and return a single number.  Some examples are `keras.backend.max` and
+        and an `axis` argument, and reduce the tensor along the given axes.  It
+        is applied to all axes except the example axis, so it returns one number
+        per example.  Some examples are `keras.backend.max` and
         `keras.backend.mean`.
     :param ideal_activation: See doc for
         `get_saliency_maps_for_neuron_activation`.
+    :param normalize_per_example: Same.
+    :param num_examples_per_batch: Same.
     :return: list_of_saliency_matrices: See doc for `_do_saliency_calculations`.
     """
 
@@ -213,21 +319,42 @@ def get_saliency_maps_for_channel_activation(
         layer_name=layer_name, ideal_activation=ideal_activation,
         channel_index=channel_index)
 
-    if ideal_activation is None:
-        loss_tensor = -K.abs(stat_function_for_neuron_activations(
-            model_object.get_layer(name=layer_name).output[
-                0, ..., channel_index]))
-    else:
-        error_checking.assert_is_greater(ideal_activation, 0.)
-        loss_tensor = K.abs(
-            stat_function_for_neuron_activations(
-                model_object.get_layer(name=layer_name).output[
-                    0, ..., channel_index]) -
-            ideal_activation)
+    def create_saliency_function():
+        """Creates saliency function for the given channel.
+
+        :return: saliency_function: See doc for `_create_saliency_function`.
+        """
+
+        activation_tensor = model_object.get_layer(name=layer_name).output[
+            ..., channel_index]
+
+        num_dimensions = len(activation_tensor.get_shape().as_list())
+        if num_dimensions > 1:
+            activation_tensor = stat_function_for_neuron_activations(
+                activation_tensor, axis=range(1, num_dimensions))
+
+        if ideal_activation is None:
+            loss_tensor = K.sum(-K.abs(activation_tensor))
+        else:
+            loss_tensor = K.sum(K.abs(activation_tensor - ideal_activation))
+
+        return _create_saliency_function(
+            model_object=model_object, loss_tensor=loss_tensor,
+            normalize_per_example=normalize_per_example)
+
+    saliency_function = model_interpretation.get_cached_function(
+        model_object=model_object,
+        key_tuple=(model_interpretation.SALIENCY_FUNCTION_TYPE_STRING,
+                   model_interpretation.CHANNEL_COMPONENT_TYPE_STRING,
+                   layer_name, channel_index, ideal_activation,
+                   stat_function_for_neuron_activations,
+                   normalize_per_example),
+        create_function=create_saliency_function)
 
     return _do_saliency_calculations(
-        model_object=model_object, loss_tensor=loss_tensor,
-        list_of_input_matrices=list_of_input_matrices)
+        saliency_function=saliency_function,
+        list_of_input_matrices=list_of_input_matrices,
+        num_examples_per_batch=num_examples_per_batch)
 
 
 def write_file(
@@ -235,12 +362,17 @@ def write_file(
         model_file_name, storm_ids, storm_times_unix_sec, component_type_string,
         target_class=None, layer_name=None, ideal_activation=None,
         neuron_indices=None, channel_index=None,
-        sounding_pressure_matrix_pascals=None):
+        sounding_pressure_matrix_pascals=None, append=False):
     """Writes saliency maps to Pickle file.
 
     Specifically, this method writes saliency maps for many storm objects and
     one model component.
 
+    If `append = True`, saliency maps will be appended to the file as a new
+    chunk.  This allows saliency maps to be written incrementally, without
+    holding all of them in memory.  All chunks in one file should be for the
+    same model component.
+
     T = number of input tensors to the model
     E = number of examples (storm objects) for which saliency maps were computed
     H = number of height levels per sounding
@@ -264,6 +396,8 @@ def write_file(
     :param sounding_pressure_matrix_pascals: E-by-H numpy array of pressure
         levels in soundings.  Useful only when the model input contains
         soundings with no pressure, because it is needed to plot soundings.
+    :param append: Boolean flag.  If True, will append to existing file.  If
+        False, will overwrite any existing file.
     :raises: ValueError: if `list_of_input_matrices` and
         `list_of_saliency_matrices` have different dimensions.
     """
@@ -283,6 +417,7 @@ def write_file(
         storm_times_unix_sec, exact_dimensions=numpy.array([num_storm_objects]))
 
     error_checking.assert_is_string(model_file_name)
+    error_checking.assert_is_boolean(append)
     error_checking.assert_is_list(list_of_input_matrices)
     error_checking.assert_is_list(list_of_saliency_matrices)
     num_input_matrices = len(list_of_input_matrices)
@@ -332,7 +467,11 @@ def write_file(
     }
 
     file_system_utils.mkdir_recursive_if_necessary(file_name=pickle_file_name)
-    pickle_file_handle = open(pickle_file_name, 'wb')
+    if append:
+        pickle_file_handle = open(pickle_file_name, 'ab')
+    else:
+        pickle_file_handle = open(pickle_file_name, 'wb')
+
     pickle.dump(list_of_input_matrices, pickle_file_handle)
     pickle.dump(list_of_saliency_matrices, pickle_file_handle)
     pickle.dump(metadata_dict, pickle_file_handle)
@@ -342,6 +481,9 @@ def write_file(
 def read_file(pickle_file_name):
     """Reads saliency maps from Pickle file.
 
+    If the file contains many chunks (see `write_file`), they will be
+    concatenated along the example axis.
+
     :param pickle_file_name: Path to input file.
     :return: list_of_input_matrices: See doc for `write_file`.
     :return: list_of_saliency_matrices: Same.
@@ -362,6 +504,34 @@ def read_file(pickle_file_name):
     list_of_input_matrices = pickle.load(pickle_file_handle)
     list_of_saliency_matrices = pickle.load(pickle_file_handle)
     metadata_dict = pickle.load(pickle_file_handle)
+
+    while True:
+        try:
+            these_input_matrices = pickle.load(pickle_file_handle)
+        except EOFError:
+            break
+
+        these_saliency_matrices = pickle.load(pickle_file_handle)
+        this_metadata_dict = pickle.load(pickle_file_handle)
+
+        for k in range(len(list_of_input_matrices)):
+            list_of_input_matrices[k] = numpy.concatenate(
+                (list_of_input_matrices[k], these_input_matrices[k]), axis=0)
+            list_of_saliency_matrices[k] = numpy.concatenate(
+                (list_of_saliency_matrices[k], these_saliency_matrices[k]),
+                axis=0)
+
+        metadata_dict[STORM_IDS_KEY] += this_metadata_dict[STORM_IDS_KEY]
+        metadata_dict[STORM_TIMES_KEY] = numpy.concatenate((
+            metadata_dict[STORM_TIMES_KEY], this_metadata_dict[STORM_TIMES_KEY]
+        ))
+
+        if metadata_dict[SOUNDING_PRESSURES_KEY] is not None:
+            metadata_dict[SOUNDING_PRESSURES_KEY] = numpy.concatenate(
+                (metadata_dict[SOUNDING_PRESSURES_KEY],
+                 this_metadata_dict[SOUNDING_PRESSURES_KEY]),
+                axis=0)
+
     pickle_file_handle.close()
 
     return list_of_input_matrices, list_of_saliency_matrices, metadata_dict
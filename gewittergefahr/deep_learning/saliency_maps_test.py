@@ -0,0 +1,194 @@
+"""Unit tests for saliency_maps.py."""
+
+import os.path
+import shutil
+import tempfile
+import unittest
+import numpy
+import keras
+from keras import backend as K
+from gewittergefahr.deep_learning import saliency_maps
+from gewittergefahr.deep_learning import model_interpretation
+
+TOLERANCE = 1e-5
+
+# The following constants are used to test the saliency functions.
+NUM_EXAMPLES = 5
+NUM_EXAMPLES_PER_BATCH = 2
+INPUT_MATRIX = numpy.random.RandomState(6695).normal(
+    size=(NUM_EXAMPLES, 8, 2))
+
+TARGET_CLASS = 1
+DENSE_LAYER_NAME = 'dense_for_saliency_test'
+NEURON_INDICES = numpy.array([2], dtype=int)
+CONV_LAYER_NAME = 'conv_for_saliency_test'
+CHANNEL_INDEX = 1
+
+# The following constants are used to test write_file and read_file.
+STORM_IDS_CHUNK1 = ['a', 'b']
+STORM_TIMES_CHUNK1_UNIX_SEC = numpy.array([0, 300], dtype=int)
+STORM_IDS_CHUNK2 = ['c']
+STORM_TIMES_CHUNK2_UNIX_SEC = numpy.array([600], dtype=int)
+
+INPUT_MATRIX_CHUNK1 = numpy.array([[1., 2.], [3., 4.]])
+INPUT_MATRIX_CHUNK2 = numpy.array([[5., 6.]])
+SALIENCY_MATRIX_CHUNK1 = numpy.array([[0.1, 0.2], [0.3, 0.4]])
+SALIENCY_MATRIX_CHUNK2 = numpy.array([[0.5, 0.6]])
+
+MODEL_FILE_NAME = 'foo.h5'
+
+
+def _create_model():
+    """Creates small CNN for testing.
+
+    :return: model_object: Instance of `keras.models.Model`.
+    """
+
+    input_layer_object = keras.layers.Input(shape=INPUT_MATRIX.shape[1:])
+    layer_object = keras.layers.Conv1D(
+        filters=3, kernel_size=3, activation='tanh', name=CONV_LAYER_NAME
+    )(input_layer_object)
+
+    layer_object = keras.layers.Flatten()(layer_object)
+    layer_object = keras.layers.Dense(
+        4, activation='tanh', name=DENSE_LAYER_NAME
+    )(layer_object)
+    layer_object = keras.layers.Dense(2, activation='softmax')(layer_object)
+
+    return keras.models.Model(
+        inputs=input_layer_object, outputs=layer_object)
+
+
+MODEL_OBJECT = _create_model()
+
+
+class SaliencyMapsTests(unittest.TestCase):
+    """Each method is a unit test for saliency_maps.py."""
+
+    def tearDown(self):
+        """Clears cache of compiled functions."""
+
+        model_interpretation.clear_function_cache()
+
+    def _compare_batched_and_unbatched(self, saliency_function, **kwargs):
+        """Compares saliency maps computed in batches and one at a time.
+
+        :param saliency_function: Saliency method (e.g.,
+            `saliency_maps.get_saliency_maps_for_class_activation`).
+        :param kwargs: Keyword arguments for `saliency_function`.
+        """
+
+        this_batched_matrix = saliency_function(
+            model_object=MODEL_OBJECT, list_of_input_matrices=[INPUT_MATRIX],
+            normalize_per_example=True,
+            num_examples_per_batch=NUM_EXAMPLES_PER_BATCH, **kwargs)[0]
+
+        this_unbatched_matrix = numpy.concatenate([
+            saliency_function(
+                model_object=MODEL_OBJECT,
+                list_of_input_matrices=[INPUT_MATRIX[[i], ...]],
+                normalize_per_example=True, num_examples_per_batch=1,
+                **kwargs)[0]
+            for i in range(NUM_EXAMPLES)
+        ], axis=0)
+
+        self.assertTrue(numpy.all(
+            numpy.std(this_unbatched_matrix, axis=(1, 2)) > 0.5))
+        self.assertTrue(numpy.allclose(
+            this_batched_matrix, this_unbatched_matrix, atol=TOLERANCE))
+
+    def test_class_activation_batched(self):
+        """Ensures that get_saliency_maps_for_class_activation does not depend
+        on batch size.
+        """
+
+        self._compare_batched_and_unbatched(
+            saliency_function=
+            saliency_maps.get_saliency_maps_for_class_activation,
+            target_class=TARGET_CLASS)
+
+    def test_neuron_activation_batched(self):
+        """Ensures that get_saliency_maps_for_neuron_activation does not depend
+        on batch size.
+        """
+
+        self._compare_batched_and_unbatched(
+            saliency_function=
+            saliency_maps.get_saliency_maps_for_neuron_activation,
+            layer_name=DENSE_LAYER_NAME, neuron_indices=NEURON_INDICES)
+
+    def test_channel_activation_batched(self):
+        """Ensures that get_saliency_maps_for_channel_activation does not depend
+        on batch size.
+        """
+
+        self._compare_batched_and_unbatched(
+            saliency_function=
+            saliency_maps.get_saliency_maps_for_channel_activation,
+            layer_name=CONV_LAYER_NAME, channel_index=CHANNEL_INDEX,
+            stat_function_for_neuron_activations=K.max)
+
+    def test_normalize_per_example(self):
+        """Ensures that normalize_per_example gives unit stdev per example."""
+
+        this_saliency_matrix = (
+            saliency_maps.get_saliency_maps_for_neuron_activation(
+                model_object=MODEL_OBJECT, layer_name=DENSE_LAYER_NAME,
+                neuron_indices=NEURON_INDICES,
+                list_of_input_matrices=[INPUT_MATRIX],
+                normalize_per_example=True)[0]
+        )
+
+        self.assertTrue(numpy.allclose(
+            numpy.std(this_saliency_matrix, axis=(1, 2)),
+            numpy.full(NUM_EXAMPLES, 1.), atol=1e-3))
+
+    def test_write_and_read_file_append(self):
+        """Ensures that read_file concatenates chunks from write_file."""
+
+        this_directory_name = tempfile.mkdtemp()
+        this_file_name = os.path.join(this_directory_name, 'saliency.p')
+
+        try:
+            for k in range(2):
+                saliency_maps.write_file(
+                    pickle_file_name=this_file_name,
+                    list_of_input_matrices=[
+                        [INPUT_MATRIX_CHUNK1, INPUT_MATRIX_CHUNK2][k]],
+                    list_of_saliency_matrices=[
+                        [SALIENCY_MATRIX_CHUNK1, SALIENCY_MATRIX_CHUNK2][k]],
+                    model_file_name=MODEL_FILE_NAME,
+                    storm_ids=[STORM_IDS_CHUNK1, STORM_IDS_CHUNK2][k],
+                    storm_times_unix_sec=[
+                        STORM_TIMES_CHUNK1_UNIX_SEC,
+                        STORM_TIMES_CHUNK2_UNIX_SEC][k],
+                    component_type_string=
+                    model_interpretation.CLASS_COMPONENT_TYPE_STRING,
+                    target_class=TARGET_CLASS, append=k > 0)
+
+            (these_input_matrices, these_saliency_matrices, this_metadata_dict
+            ) = saliency_maps.read_file(this_file_name)
+        finally:
+            shutil.rmtree(this_directory_name)
+
+        self.assertTrue(numpy.allclose(
+            these_input_matrices[0],
+            numpy.concatenate((INPUT_MATRIX_CHUNK1, INPUT_MATRIX_CHUNK2)),
+            atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            these_saliency_matrices[0],
+            numpy.concatenate((SALIENCY_MATRIX_CHUNK1, SALIENCY_MATRIX_CHUNK2)),
+            atol=TOLERANCE))
+
+        self.assertTrue(
+            this_metadata_dict[saliency_maps.STORM_IDS_KEY] ==
+            STORM_IDS_CHUNK1 + STORM_IDS_CHUNK2)
+        self.assertTrue(numpy.array_equal(
+            this_metadata_dict[saliency_maps.STORM_TIMES_KEY],
+            numpy.concatenate((STORM_TIMES_CHUNK1_UNIX_SEC,
+                               STORM_TIMES_CHUNK2_UNIX_SEC))
+        ))
+
+
+if __name__ == '__main__':
+    unittest.main()
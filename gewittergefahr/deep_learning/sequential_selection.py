@@ -3,10 +3,14 @@
 Sequential (forward or backward) selection is explained in Section xxx of Webb (yyyy).
 """
 
+import os
 import copy
 import pickle
+import threading
+import multiprocessing.pool
 import numpy
 import keras.utils
+from keras import backend as K
 from gewittergefahr.gg_utils import file_system_utils
 from gewittergefahr.gg_utils import error_checking
 from gewittergefahr.deep_learning import cnn_architecture
@@ -21,6 +25,12 @@ NUM_STEPS_FOR_DECREASE_KEY = 'num_steps_for_loss_decrease'
 SELECTED_PREDICTORS_KEY = 'selected_predictor_name_by_step'
 LOWEST_COSTS_KEY = 'lowest_cost_by_step'
 
+PREDICTOR_NAMES_KEY = 'predictor_names_by_matrix'
+COST_BY_SUBSET_KEY = 'cost_by_predictor_subset'
+
+# State of each worker thread (see `_init_worker`).
+_WORKER_STATE = threading.local()
+
 
 def _check_input_args(
         list_of_training_matrices, training_target_values,
@@ -229,6 +239,216 @@ def _eval_sfs_stopping_criterion(
     return lowest_cost_by_step[-1] > max_new_loss
 
 
+def _evaluate_one_subset(
+        list_of_training_matrices, training_target_values,
+        list_of_validation_matrices, validation_target_values,
+        predictor_names_by_matrix, model_builder, training_function,
+        desired_predictor_names):
+    """Trains model with one subset of predictors and returns the cost.
+
+    :param list_of_training_matrices: See doc for `_check_input_args`.
+    :param training_target_values: Same.
+    :param list_of_validation_matrices: Same.
+    :param validation_target_values: Same.
+    :param predictor_names_by_matrix: Same.
+    :param model_builder: See doc for `run_sfs`.
+    :param training_function: Same.
+    :param desired_predictor_names: 1-D list with names of predictors to use.
+    :return: cost: Lowest validation loss over all epochs.
+    """
+
+    these_training_matrices, these_validation_matrices = (
+        _subset_input_matrices(
+            list_of_training_matrices=list_of_training_matrices,
+            list_of_validation_matrices=list_of_validation_matrices,
+            predictor_names_by_matrix=predictor_names_by_matrix,
+            desired_predictor_names=desired_predictor_names)
+    )
+
+    model_object = model_builder(these_training_matrices)
+
+    history_object = training_function(
+        model_object=model_object,
+        list_of_training_matrices=these_training_matrices,
+        training_target_values=training_target_values,
+        list_of_validation_matrices=these_validation_matrices,
+        validation_target_values=validation_target_values)
+    print SEPARATOR_STRING
+
+    return numpy.nanmin(history_object.history['val_loss'])
+
+
+def _init_worker(
+        list_of_training_matrices, training_target_values,
+        list_of_validation_matrices, validation_target_values,
+        predictor_names_by_matrix, model_builder, training_function):
+    """Initializes worker thread.
+
+    :param list_of_training_matrices: See doc for `_check_input_args`.
+    :param training_target_values: Same.
+    :param list_of_validation_matrices: Same.
+    :param validation_target_values: Same.
+    :param predictor_names_by_matrix: Same.
+    :param model_builder: See doc for `run_sfs`.
+    :param training_function: Same.
+    """
+
+    _WORKER_STATE.list_of_training_matrices = list_of_training_matrices
+    _WORKER_STATE.training_target_values = training_target_values
+    _WORKER_STATE.list_of_validation_matrices = list_of_validation_matrices
+    _WORKER_STATE.validation_target_values = validation_target_values
+    _WORKER_STATE.predictor_names_by_matrix = predictor_names_by_matrix
+    _WORKER_STATE.model_builder = model_builder
+    _WORKER_STATE.training_function = training_function
+
+
+def _evaluate_one_subset_in_worker(desired_predictor_names):
+    """Trains model with one subset of predictors (in worker thread).
+
+    Each model is built in its own TensorFlow graph and session, so that
+    workers do not contend for one graph and finished models can be freed.
+
+    :param desired_predictor_names: See doc for `_evaluate_one_subset`.
+    :return: desired_predictor_names: Same as input.
+    :return: cost: See doc for `_evaluate_one_subset`.
+    """
+
+    graph_object = K.tf.Graph()
+
+    with graph_object.as_default():
+        with K.tf.Session(graph=graph_object) as session_object, \
+                session_object.as_default():
+            cost = _evaluate_one_subset(
+                list_of_training_matrices=
+                _WORKER_STATE.list_of_training_matrices,
+                training_target_values=_WORKER_STATE.training_target_values,
+                list_of_validation_matrices=
+                _WORKER_STATE.list_of_validation_matrices,
+                validation_target_values=
+                _WORKER_STATE.validation_target_values,
+                predictor_names_by_matrix=
+                _WORKER_STATE.predictor_names_by_matrix,
+                model_builder=_WORKER_STATE.model_builder,
+                training_function=_WORKER_STATE.training_function,
+                desired_predictor_names=desired_predictor_names)
+
+    return desired_predictor_names, cost
+
+
+def _evaluate_subsets(
+        list_of_predictor_subsets, cost_by_predictor_subset, pool_object,
+        evaluation_kwargs, checkpoint_file_name, checkpoint_dict):
+    """Evaluates all candidate subsets at one step of sequential selection.
+
+    Subsets already in `cost_by_predictor_subset` are not re-evaluated, and
+    subsets with the same predictors (in any order) are evaluated only once.
+    New costs are added to `cost_by_predictor_subset` and, if
+    `checkpoint_file_name is not None`, the checkpoint file is rewritten after
+    each one.
+
+    N = number of candidate subsets
+
+    :param list_of_predictor_subsets: length-N list, where each item is a 1-D
+        list of predictor names.
+    :param cost_by_predictor_subset: Dictionary, where each key is a frozenset
+        of predictor names and each value is the corresponding cost.
+    :param pool_object: Instance of `multiprocessing.pool.ThreadPool` (if None,
+        subsets will be evaluated in the main thread).
+    :param evaluation_kwargs: Dictionary of keyword arguments for
+        `_evaluate_one_subset`, excluding `desired_predictor_names`.  Used only
+        if `pool_object is None`.
+    :param checkpoint_file_name: See doc for `run_sfs`.
+    :param checkpoint_dict: Dictionary to write to checkpoint file (see doc for
+        `_write_checkpoint`).  Must contain `cost_by_predictor_subset`.
+    :return: costs: length-N numpy array of costs.
+    """
+
+    new_predictor_subsets = []
+    new_subsets_as_sets = set()
+
+    for this_subset in list_of_predictor_subsets:
+        if frozenset(this_subset) in cost_by_predictor_subset:
+            print 'Cost for predictors {0:s} is already known.'.format(
+                str(this_subset))
+            continue
+
+        if frozenset(this_subset) in new_subsets_as_sets:
+            continue
+
+        new_predictor_subsets.append(this_subset)
+        new_subsets_as_sets.add(frozenset(this_subset))
+
+    if pool_object is None:
+        result_iterator = (
+            (s, _evaluate_one_subset(desired_predictor_names=s,
+                                     **evaluation_kwargs))
+            for s in new_predictor_subsets
+        )
+    else:
+        result_iterator = pool_object.imap_unordered(
+            _evaluate_one_subset_in_worker, new_predictor_subsets, chunksize=1)
+
+    for this_subset, this_cost in result_iterator:
+        print 'Validation loss with predictors {0:s} = {1:.4e}'.format(
+            str(this_subset), this_cost)
+        print SEPARATOR_STRING
+
+        cost_by_predictor_subset[frozenset(this_subset)] = this_cost
+        if checkpoint_file_name is not None:
+            _write_checkpoint(checkpoint_dict=checkpoint_dict,
+                              pickle_file_name=checkpoint_file_name)
+
+    return numpy.array([
+        cost_by_predictor_subset[frozenset(s)]
+        for s in list_of_predictor_subsets
+    ])
+
+
+def _write_checkpoint(checkpoint_dict, pickle_file_name):
+    """Writes checkpoint for sequential selection to Pickle file.
+
+    The file is written under a temporary name and then renamed, so that an
+    interrupted write never corrupts an existing checkpoint.
+
+    :param checkpoint_dict: Dictionary with the following keys.
+    checkpoint_dict['predictor_names_by_matrix']: See doc for
+        `_check_input_args`.
+    checkpoint_dict['selected_predictor_name_by_step']: See doc for `run_sfs`.
+    checkpoint_dict['lowest_cost_by_step']: Same.
+    checkpoint_dict['cost_by_predictor_subset']: See doc for
+        `_evaluate_subsets`.
+    :param pickle_file_name: Path to output file.
+    """
+
+    temp_file_name = '{0:s}.tmp'.format(pickle_file_name)
+    write_results(result_dict=checkpoint_dict, pickle_file_name=temp_file_name)
+    os.rename(temp_file_name, pickle_file_name)
+
+
+def _read_checkpoint(pickle_file_name, predictor_names_by_matrix):
+    """Reads checkpoint for sequential selection from Pickle file.
+
+    :param pickle_file_name: Path to input file.
+    :param predictor_names_by_matrix: See doc for `_check_input_args`.
+    :return: checkpoint_dict: See doc for `_write_checkpoint`.
+    :raises: ValueError: if the checkpoint was created with different
+        predictors.
+    """
+
+    checkpoint_dict = read_results(pickle_file_name)
+
+    if checkpoint_dict[PREDICTOR_NAMES_KEY] != predictor_names_by_matrix:
+        error_string = (
+            'Checkpoint file ("{0:s}") was created with different predictors.  '
+            'Expected {1:s}, got {2:s}.'
+        ).format(pickle_file_name, str(predictor_names_by_matrix),
+                 str(checkpoint_dict[PREDICTOR_NAMES_KEY]))
+
+        raise ValueError(error_string)
+
+    return checkpoint_dict
+
+
 def create_training_function(num_training_examples_per_batch, num_epochs):
     """Creates training function.
 
@@ -434,7 +654,8 @@ def run_sfs(
         list_of_validation_matrices, validation_target_values,
         predictor_names_by_matrix, model_builder, training_function,
         min_loss_decrease=None, min_percentage_loss_decrease=None,
-        num_steps_for_loss_decrease=DEFAULT_NUM_STEPS_FOR_LOSS_DECREASE):
+        num_steps_for_loss_decrease=DEFAULT_NUM_STEPS_FOR_LOSS_DECREASE,
+        num_threads=1, checkpoint_file_name=None):
     """Runs sequential forward selection (SFS).
 
     :param list_of_training_matrices: See doc for `_check_input_args`.
@@ -471,6 +692,14 @@ def run_sfs(
         `num_steps_for_loss_decrease` steps of sequential selection, the
         algorithm will stop.
     :param num_steps_for_loss_decrease: See above.
+    :param num_threads: Number of worker threads.  If > 1, candidate predictors
+        at each step will be evaluated concurrently, each model in its own
+        TensorFlow graph and session.  In this case `model_builder` and
+        `training_function` must be thread-safe.
+    :param checkpoint_file_name: Path to checkpoint file (Pickle).  If None,
+        progress will not be checkpointed.  Otherwise, the file is rewritten
+        after each candidate is evaluated, and if it already exists when this
+        method is called, selection resumes from where it left off.
 
     :return: result_dict: Dictionary with the following keys.  P = number of
         predictors in final model.
@@ -492,73 +721,94 @@ def run_sfs(
         validation_target_values=validation_target_values,
         predictor_names_by_matrix=predictor_names_by_matrix)
 
-    remaining_predictor_names_by_matrix = copy.deepcopy(
-        predictor_names_by_matrix)
+    error_checking.assert_is_integer(num_threads)
+    error_checking.assert_is_greater(num_threads, 0)
 
-    selected_predictor_name_by_step = []
-    lowest_cost_by_step = []
+    if (checkpoint_file_name is not None and
+            os.path.isfile(checkpoint_file_name)):
+        print 'Reading checkpoint from: "{0:s}"...'.format(
+            checkpoint_file_name)
+        checkpoint_dict = _read_checkpoint(
+            pickle_file_name=checkpoint_file_name,
+            predictor_names_by_matrix=predictor_names_by_matrix)
+    else:
+        checkpoint_dict = {
+            PREDICTOR_NAMES_KEY: copy.deepcopy(predictor_names_by_matrix),
+            SELECTED_PREDICTORS_KEY: [],
+            LOWEST_COSTS_KEY: [],
+            COST_BY_SUBSET_KEY: {}
+        }
+
+    selected_predictor_name_by_step = checkpoint_dict[SELECTED_PREDICTORS_KEY]
+    lowest_cost_by_step = checkpoint_dict[LOWEST_COSTS_KEY]
+    cost_by_predictor_subset = checkpoint_dict[COST_BY_SUBSET_KEY]
+
+    remaining_predictor_names_by_matrix = [
+        [n for n in these_names if n not in selected_predictor_name_by_step]
+        for these_names in predictor_names_by_matrix
+    ]
+
+    evaluation_kwargs = {
+        'list_of_training_matrices': list_of_training_matrices,
+        'training_target_values': training_target_values,
+        'list_of_validation_matrices': list_of_validation_matrices,
+        'validation_target_values': validation_target_values,
+        'predictor_names_by_matrix': predictor_names_by_matrix,
+        'model_builder': model_builder,
+        'training_function': training_function
+    }
+
+    if num_threads > 1:
+        pool_object = multiprocessing.pool.ThreadPool(
+            processes=num_threads, initializer=_init_worker,
+            initargs=(list_of_training_matrices, training_target_values,
+                      list_of_validation_matrices, validation_target_values,
+                      predictor_names_by_matrix, model_builder,
+                      training_function)
+        )
+    else:
+        pool_object = None
 
-    step_num = 0
+    step_num = len(selected_predictor_name_by_step)
     num_input_matrices = len(list_of_training_matrices)
 
     while True:
         print '\n'
         step_num += 1
 
-        lowest_cost = numpy.inf
-        best_matrix_index = None
-        best_predictor_name = None
-
-        any_predictors_left = False
+        candidate_matrix_indices = []
+        candidate_predictor_names = []
 
         for q in range(num_input_matrices):
-            if len(remaining_predictor_names_by_matrix[q]) == 0:
-                continue
-
             for this_predictor_name in remaining_predictor_names_by_matrix[q]:
-                any_predictors_left = True
-
-                print (
-                    'Trying predictor "{0:s}" at step {1:d} of SFS... '
-                ).format(this_predictor_name, step_num)
-                print SEPARATOR_STRING
-
-                these_training_matrices, these_validation_matrices = (
-                    _subset_input_matrices(
-                        list_of_training_matrices=list_of_training_matrices,
-                        list_of_validation_matrices=list_of_validation_matrices,
-                        predictor_names_by_matrix=predictor_names_by_matrix,
-                        desired_predictor_names=
-                        selected_predictor_name_by_step + [this_predictor_name]
-                    )
-                )
-
-                this_model_object = model_builder(these_training_matrices)
-
-                this_history_object = training_function(
-                    model_object=this_model_object,
-                    list_of_training_matrices=these_training_matrices,
-                    training_target_values=training_target_values,
-                    list_of_validation_matrices=these_validation_matrices,
-                    validation_target_values=validation_target_values)
-                print SEPARATOR_STRING
-
-                this_cost = numpy.nanmin(
-                    this_history_object.history['val_loss'])
-                print 'Validation loss after adding "{0:s}" = {1:.4e}'.format(
-                    this_predictor_name, this_cost)
-                print SEPARATOR_STRING
-
-                if this_cost > lowest_cost:
-                    continue
-
-                lowest_cost = this_cost + 0.
-                best_matrix_index = q + 0
-                best_predictor_name = this_predictor_name + ''
-
-        if not any_predictors_left:
+                candidate_matrix_indices.append(q)
+                candidate_predictor_names.append(this_predictor_name)
+
+        if len(candidate_predictor_names) == 0:
             break
 
+        print 'Trying {0:d} predictors at step {1:d} of SFS...'.format(
+            len(candidate_predictor_names), step_num)
+        print SEPARATOR_STRING
+
+        candidate_costs = _evaluate_subsets(
+            list_of_predictor_subsets=[
+                selected_predictor_name_by_step + [n]
+                for n in candidate_predictor_names
+            ],
+            cost_by_predictor_subset=cost_by_predictor_subset,
+            pool_object=pool_object, evaluation_kwargs=evaluation_kwargs,
+            checkpoint_file_name=checkpoint_file_name,
+            checkpoint_dict=checkpoint_dict)
+
+        # In case of a tie, the last candidate wins.
+        best_index = (
+            len(candidate_costs) - 1 - numpy.argmin(candidate_costs[::-1])
+        )
+        lowest_cost = candidate_costs[best_index]
+        best_matrix_index = candidate_matrix_indices[best_index]
+        best_predictor_name = candidate_predictor_names[best_index]
+
         stopping_criterion = _eval_sfs_stopping_criterion(
             min_loss_decrease=min_loss_decrease,
             min_percentage_loss_decrease=min_percentage_loss_decrease,
@@ -573,9 +823,17 @@ def run_sfs(
         remaining_predictor_names_by_matrix[best_matrix_index].remove(
             best_predictor_name)
 
+        if checkpoint_file_name is not None:
+            _write_checkpoint(checkpoint_dict=checkpoint_dict,
+                              pickle_file_name=checkpoint_file_name)
+
         print 'Best predictor = "{0:s}" ... new cost = {1:.4e}'.format(
             best_predictor_name, lowest_cost)
 
+    if pool_object is not None:
+        pool_object.close()
+        pool_object.join()
+
     return {
         MIN_DECREASE_KEY: min_loss_decrease,
         MIN_PERCENT_DECREASE_KEY: min_percentage_loss_decrease,
@@ -1,5 +1,6 @@
 """Unit tests for sequential_selection.py."""
 
+import copy
 import unittest
 import numpy
 from gewittergefahr.deep_learning import sequential_selection
@@ -62,6 +63,11 @@ LOWEST_COST_BY_STEP_FIRST = numpy.array(
 LOWEST_COST_BY_STEP_SECOND = numpy.array(
     [0.9, 0.75, 0.7, 0.69, 0.689, 0.687, 0.686, 0.685, 0.683])
 
+# The following constants are used to test _evaluate_subsets.
+LIST_OF_PREDICTOR_SUBSETS = [['a', '4'], ['b'], ['4', 'a'], ['c', '2', '5']]
+COST_BY_PREDICTOR_SUBSET_KNOWN = {frozenset(['b']): -1.}
+SUBSET_COSTS = numpy.array([2, -1, 2, 3], dtype=float)
+
 
 def _compare_lists_of_matrices(first_list_of_matrices, second_list_of_matrices):
     """Compares two lists of matrices (numpy arrays).
@@ -89,6 +95,35 @@ def _compare_lists_of_matrices(first_list_of_matrices, second_list_of_matrices):
     return True
 
 
+class _FakeHistory(object):
+    """Mimics `keras.callbacks.History`."""
+
+    def __init__(self, history):
+        self.history = history
+
+
+def _fake_model_builder(list_of_input_matrices):
+    """Fake model builder (returns number of channels in each matrix).
+
+    :param list_of_input_matrices: See doc for
+        `sequential_selection.create_model_builder_2d`.
+    :return: num_channels_by_matrix: 1-D list of integers.
+    """
+
+    return [m.shape[-1] for m in list_of_input_matrices]
+
+
+def _fake_training_function(model_object, **kwargs):
+    """Fake training function (loss = total number of channels).
+
+    :param model_object: Output from `_fake_model_builder`.
+    :param kwargs: Ignored.
+    :return: history_object: Instance of `_FakeHistory`.
+    """
+
+    return _FakeHistory({'val_loss': [numpy.nan, float(sum(model_object))]})
+
+
 class SequentialSelectionTests(unittest.TestCase):
     """Each method is a unit test for sequential_selection.py."""
 
@@ -212,6 +247,42 @@ class SequentialSelectionTests(unittest.TestCase):
 
         self.assertFalse(this_flag)
 
+    def test_evaluate_subsets(self):
+        """Ensures correct output from _evaluate_subsets.
+
+        In this case, the cost of one subset is already known, so it should not
+        be recomputed.  The first and third subsets contain the same
+        predictors, so only one of them should be evaluated.
+        """
+
+        these_training_calls = []
+
+        def this_training_function(model_object, **kwargs):
+            these_training_calls.append(model_object)
+            return _fake_training_function(model_object, **kwargs)
+
+        this_cost_dict = copy.deepcopy(COST_BY_PREDICTOR_SUBSET_KNOWN)
+        this_evaluation_kwargs = {
+            'list_of_training_matrices': LIST_OF_TRAINING_MATRICES,
+            'training_target_values': numpy.full(100, 0, dtype=int),
+            'list_of_validation_matrices': LIST_OF_VALIDATION_MATRICES,
+            'validation_target_values': numpy.full(100, 0, dtype=int),
+            'predictor_names_by_matrix': PREDICTOR_NAMES_BY_MATRIX,
+            'model_builder': _fake_model_builder,
+            'training_function': this_training_function
+        }
+
+        these_costs = sequential_selection._evaluate_subsets(
+            list_of_predictor_subsets=LIST_OF_PREDICTOR_SUBSETS,
+            cost_by_predictor_subset=this_cost_dict, pool_object=None,
+            evaluation_kwargs=this_evaluation_kwargs,
+            checkpoint_file_name=None, checkpoint_dict=None)
+
+        self.assertTrue(numpy.allclose(
+            these_costs, SUBSET_COSTS, atol=TOLERANCE))
+        self.assertTrue(len(this_cost_dict.keys()) == 3)
+        self.assertTrue(len(these_training_calls) == 2)
+
 
 if __name__ == '__main__':
     unittest.main()
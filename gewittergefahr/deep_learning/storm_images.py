@@ -1163,10 +1163,8 @@ def extract_storm_images_myrorss_or_mrms(
     num_refl_heights_asl = len(reflectivity_heights_m_asl)
 
     # Find input files.
-    spc_date_strings = [
-        time_conversion.time_to_spc_date_string(t)
-        for t in storm_object_table[tracking_utils.SPC_DATE_COLUMN].values
-    ]
+    spc_date_strings = time_conversion.times_to_spc_date_strings(
+        storm_object_table[tracking_utils.SPC_DATE_COLUMN].values)
 
     input_file_dict = myrorss_and_mrms_io.find_many_raw_files(
         desired_times_unix_sec=
@@ -1499,10 +1497,8 @@ def extract_storm_images_gridrad(
         time_conversion.unix_sec_to_string(t, TIME_FORMAT)
         for t in valid_times_unix_sec
     ]
-    valid_spc_dates_unix_sec = numpy.array([
-        time_conversion.time_to_spc_date_unix_sec(t)
-        for t in valid_times_unix_sec
-    ], dtype=int)
+    valid_spc_dates_unix_sec = time_conversion.times_to_spc_dates_unix_sec(
+        valid_times_unix_sec)
 
     # Find input files.
     num_times = len(valid_times_unix_sec)
@@ -2295,10 +2291,8 @@ def find_many_files_gridrad(
             all_times_unix_sec <= end_time_unix_sec))[0]
         all_times_unix_sec = all_times_unix_sec[good_indices]
 
-        all_spc_date_strings = [
-            time_conversion.time_to_spc_date_string(t)
-            for t in all_times_unix_sec
-        ]
+        all_spc_date_strings = time_conversion.times_to_spc_date_strings(
+            all_times_unix_sec)
     else:
         first_spc_date_string = time_conversion.time_to_spc_date_string(
             start_time_unix_sec)
@@ -2308,10 +2302,8 @@ def find_many_files_gridrad(
             first_spc_date_string=first_spc_date_string,
             last_spc_date_string=last_spc_date_string)
 
-        all_times_unix_sec = numpy.array([
-            time_conversion.spc_date_string_to_unix_sec(s)
-            for s in all_spc_date_strings
-        ], dtype=int)
+        all_times_unix_sec = time_conversion.spc_date_strings_to_unix_sec(
+            all_spc_date_strings)
 
     file_dict = {
         RADAR_FIELD_NAMES_KEY: radar_field_names,
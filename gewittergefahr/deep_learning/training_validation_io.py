@@ -14,6 +14,7 @@ F_s = number of sounding fields (or "variables" or "channels")
 C = number of radar field/height pairs
 """
 
+import collections
 import numpy
 import keras
 from gewittergefahr.deep_learning import deep_learning_utils as dl_utils
@@ -72,6 +73,10 @@ DEFAULT_AUGMENTATION_OPTION_DICT = {
 
 DEFAULT_GENERATOR_OPTION_DICT.update(DEFAULT_AUGMENTATION_OPTION_DICT)
 
+# Max number of shards memory-mapped at once by `shard_generator_2d_or_3d`.
+# Each memory-mapped matrix holds an open file descriptor.
+MAX_NUM_OPEN_SHARDS = 100
+
 
 def _get_num_ex_per_batch_by_class(
         num_examples_per_batch, target_name, class_to_sampling_fraction_dict):
@@ -882,3 +887,251 @@ def example_generator_2d3d_myrorss(option_dict):
             yield (list_of_predictor_matrices, target_array)
         else:
             yield (list_of_predictor_matrices[:-1], target_array)
+
+
+def _get_open_shard(shard_dir_name, metadata_dict, open_shard_dict):
+    """Returns memory-mapped predictor matrices for shard.
+
+    `open_shard_dict` is a least-recently-used cache.  If it contains more than
+    `MAX_NUM_OPEN_SHARDS` shards, the least recently used are unmapped (which
+    closes their file descriptors).
+
+    :param shard_dir_name: Path to shard.
+    :param metadata_dict: Dictionary returned by
+        `input_examples.read_example_shard` with `metadata_only = True`.
+    :param open_shard_dict: Cache (instance of `collections.OrderedDict`),
+        where each key is a shard path and each value is a dictionary returned
+        by `input_examples.memory_map_example_shard`.
+    :return: variable_dict: Dictionary returned by
+        `input_examples.memory_map_example_shard`.
+    """
+
+    if shard_dir_name in open_shard_dict:
+        variable_dict = open_shard_dict.pop(shard_dir_name)
+        open_shard_dict[shard_dir_name] = variable_dict
+        return variable_dict
+
+    variable_dict = input_examples.memory_map_example_shard(
+        shard_dir_name=shard_dir_name, metadata_dict=metadata_dict)
+    open_shard_dict[shard_dir_name] = variable_dict
+
+    while len(open_shard_dict) > MAX_NUM_OPEN_SHARDS:
+        open_shard_dict.popitem(last=False)
+
+    return variable_dict
+
+
+def shard_generator_2d_or_3d(option_dict):
+    """Generates examples with either all 2-D or all 3-D radar images.
+
+    This is the same as `example_generator_2d_or_3d`, except that it reads from
+    shards (created by `input_examples.write_example_shard`) rather than NetCDF
+    files.  Since shards are memory-mapped, each batch is drawn from *all*
+    examples in all shards, and only examples in the batch are read from disk.
+
+    :param option_dict: See doc for `example_generator_2d_or_3d`.  The only
+        difference is that option_dict['example_file_names'] should contain
+        paths to shards (see `input_examples.find_example_shard`), rather than
+        NetCDF files.  Also, if option_dict['loop_thru_files_once'] = True, this
+        generator will go through all examples exactly once, in random order and
+        without class-conditional sampling.
+
+    :return: radar_image_matrix: See doc for `example_generator_2d_or_3d`.
+    :return: target_array: Same.
+    :return: predictor_list: Same.
+    """
+
+    option_dict = check_generator_input_args(option_dict)
+
+    shard_dir_names = option_dict[EXAMPLE_FILES_KEY]
+    num_examples_per_batch = option_dict[NUM_EXAMPLES_PER_BATCH_KEY]
+    binarize_target = option_dict[BINARIZE_TARGET_KEY]
+    loop_thru_files_once = option_dict[LOOP_ONCE_KEY]
+
+    radar_field_names = option_dict[RADAR_FIELDS_KEY]
+    radar_heights_m_agl = option_dict[RADAR_HEIGHTS_KEY]
+    sounding_field_names = option_dict[SOUNDING_FIELDS_KEY]
+    sounding_heights_m_agl = option_dict[SOUNDING_HEIGHTS_KEY]
+    first_storm_time_unix_sec = option_dict[FIRST_STORM_TIME_KEY]
+    last_storm_time_unix_sec = option_dict[LAST_STORM_TIME_KEY]
+    num_grid_rows = option_dict[NUM_ROWS_KEY]
+    num_grid_columns = option_dict[NUM_COLUMNS_KEY]
+
+    refl_masking_threshold_dbz = option_dict[REFLECTIVITY_MASK_KEY]
+    normalization_type_string = option_dict[NORMALIZATION_TYPE_KEY]
+    normalization_param_file_name = option_dict[NORMALIZATION_FILE_KEY]
+    min_normalized_value = option_dict[MIN_NORMALIZED_VALUE_KEY]
+    max_normalized_value = option_dict[MAX_NORMALIZED_VALUE_KEY]
+
+    class_to_sampling_fraction_dict = option_dict[SAMPLING_FRACTIONS_KEY]
+
+    if first_storm_time_unix_sec is None:
+        first_storm_time_unix_sec = 0
+    if last_storm_time_unix_sec is None:
+        last_storm_time_unix_sec = int(1e12)
+
+    # Index all examples in the given time period.  This requires only the
+    # JSON file from each shard, which is decoded once and kept for every
+    # batch.  Predictor matrices are memory-mapped only when a batch needs them,
+    # and at most `MAX_NUM_OPEN_SHARDS` shards are mapped at once.
+    shard_indices = numpy.array([], dtype=int)
+    example_indices = numpy.array([], dtype=int)
+    target_values = numpy.array([], dtype=int)
+    target_name = None
+
+    list_of_metadata_dicts = []
+    open_shard_dict = collections.OrderedDict()
+
+    for i in range(len(shard_dir_names)):
+        print 'Reading metadata from: "{0:s}"...'.format(shard_dir_names[i])
+        this_example_dict = input_examples.read_example_shard(
+            shard_dir_name=shard_dir_names[i], metadata_only=True,
+            include_soundings=sounding_field_names is not None)
+        list_of_metadata_dicts.append(this_example_dict)
+
+        target_name = this_example_dict[input_examples.TARGET_NAME_KEY]
+        these_times_unix_sec = this_example_dict[
+            input_examples.STORM_TIMES_KEY]
+
+        these_indices = numpy.where(numpy.logical_and(
+            these_times_unix_sec >= first_storm_time_unix_sec,
+            these_times_unix_sec <= last_storm_time_unix_sec
+        ))[0]
+
+        shard_indices = numpy.concatenate((
+            shard_indices, numpy.full(len(these_indices), i, dtype=int)
+        ))
+        example_indices = numpy.concatenate((example_indices, these_indices))
+        target_values = numpy.concatenate((
+            target_values,
+            this_example_dict[input_examples.TARGET_VALUES_KEY][these_indices]
+        ))
+
+    num_examples_total = len(target_values)
+    print 'Number of examples in shards = {0:d}\n'.format(num_examples_total)
+    if num_examples_total == 0:
+        raise StopIteration
+
+    num_classes = target_val_utils.target_name_to_num_classes(
+        target_name=target_name, include_dead_storms=False)
+
+    permuted_indices = numpy.random.permutation(num_examples_total)
+    first_index_in_batch = 0
+
+    while True:
+        if loop_thru_files_once:
+            if first_index_in_batch >= num_examples_total:
+                raise StopIteration
+
+            batch_indices = permuted_indices[
+                first_index_in_batch:
+                (first_index_in_batch + num_examples_per_batch)
+            ]
+            first_index_in_batch += num_examples_per_batch
+
+        elif class_to_sampling_fraction_dict is None:
+            batch_indices = numpy.random.choice(
+                num_examples_total,
+                size=min([num_examples_per_batch, num_examples_total]),
+                replace=False)
+        else:
+            batch_indices = dl_utils.sample_by_class(
+                sampling_fraction_by_class_dict=class_to_sampling_fraction_dict,
+                target_name=target_name, target_values=target_values,
+                num_examples_total=num_examples_per_batch)
+
+            # Not enough examples in one class.  Since the whole population
+            # is sampled at once, this will not fix itself, so fall back to
+            # random sampling.
+            if batch_indices is None:
+                print (
+                    'Cannot sample by class (at least one class has no '
+                    'examples).  Sampling randomly instead.'
+                )
+
+                class_to_sampling_fraction_dict = None
+                batch_indices = numpy.random.choice(
+                    num_examples_total,
+                    size=min([num_examples_per_batch, num_examples_total]),
+                    replace=False)
+
+        list_of_radar_image_matrices = []
+        list_of_sounding_matrices = []
+        list_of_target_value_arrays = []
+
+        for this_shard_index in numpy.unique(shard_indices[batch_indices]):
+            these_indices = batch_indices[
+                shard_indices[batch_indices] == this_shard_index]
+
+            this_variable_dict = _get_open_shard(
+                shard_dir_name=shard_dir_names[this_shard_index],
+                metadata_dict=list_of_metadata_dicts[this_shard_index],
+                open_shard_dict=open_shard_dict)
+
+            this_example_dict = input_examples.read_examples_from_open_shard(
+                metadata_dict=list_of_metadata_dicts[this_shard_index],
+                variable_dict=this_variable_dict,
+                example_indices_to_keep=example_indices[these_indices],
+                radar_field_names_to_keep=radar_field_names,
+                radar_heights_to_keep_m_agl=radar_heights_m_agl,
+                sounding_field_names_to_keep=sounding_field_names,
+                sounding_heights_to_keep_m_agl=sounding_heights_m_agl,
+                num_rows_to_keep=num_grid_rows,
+                num_columns_to_keep=num_grid_columns)
+
+            list_of_radar_image_matrices.append(
+                this_example_dict[input_examples.RADAR_IMAGE_MATRIX_KEY])
+            list_of_target_value_arrays.append(
+                this_example_dict[input_examples.TARGET_VALUES_KEY])
+
+            if input_examples.SOUNDING_MATRIX_KEY in this_example_dict:
+                list_of_sounding_matrices.append(
+                    this_example_dict[input_examples.SOUNDING_MATRIX_KEY])
+
+        radar_image_matrix = numpy.concatenate(
+            list_of_radar_image_matrices, axis=0)
+        these_target_values = numpy.concatenate(list_of_target_value_arrays)
+
+        include_soundings = len(list_of_sounding_matrices) > 0
+        if include_soundings:
+            sounding_matrix = numpy.concatenate(
+                list_of_sounding_matrices, axis=0)
+        else:
+            sounding_matrix = None
+
+        num_radar_dimensions = len(radar_image_matrix.shape) - 2
+
+        if refl_masking_threshold_dbz is not None and num_radar_dimensions == 3:
+            radar_image_matrix = dl_utils.mask_low_reflectivity_pixels(
+                radar_image_matrix_3d=radar_image_matrix,
+                field_names=radar_field_names,
+                reflectivity_threshold_dbz=refl_masking_threshold_dbz)
+
+        if normalization_type_string is not None:
+            radar_image_matrix = dl_utils.normalize_radar_images(
+                radar_image_matrix=radar_image_matrix,
+                field_names=radar_field_names,
+                normalization_type_string=normalization_type_string,
+                normalization_param_file_name=normalization_param_file_name,
+                min_normalized_value=min_normalized_value,
+                max_normalized_value=max_normalized_value).astype('float32')
+
+            if include_soundings:
+                sounding_matrix = dl_utils.normalize_soundings(
+                    sounding_matrix=sounding_matrix,
+                    field_names=sounding_field_names,
+                    normalization_type_string=normalization_type_string,
+                    normalization_param_file_name=normalization_param_file_name,
+                    min_normalized_value=min_normalized_value,
+                    max_normalized_value=max_normalized_value).astype('float32')
+
+        list_of_predictor_matrices, target_array = _select_batch(
+            list_of_predictor_matrices=[radar_image_matrix, sounding_matrix],
+            target_values=these_target_values,
+            num_examples_per_batch=num_examples_per_batch,
+            binarize_target=binarize_target, num_classes=num_classes)
+
+        if include_soundings:
+            yield (list_of_predictor_matrices, target_array)
+        else:
+            yield (list_of_predictor_matrices[0], target_array)
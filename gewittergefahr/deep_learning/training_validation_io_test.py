@@ -1,7 +1,11 @@
 """Unit tests for training_validation_io.py."""
 
+import shutil
+import tempfile
 import unittest
 import numpy
+from gewittergefahr.gg_utils import radar_utils
+from gewittergefahr.deep_learning import input_examples
 from gewittergefahr.deep_learning import training_validation_io as trainval_io
 
 # TODO(thunderhoser): Variable names in this file are confusing.  I need to
@@ -42,6 +46,53 @@ WIND_TARGET_VALUES_ENOUGH[THESE_INDICES[30:70]] = 1
 WIND_TARGET_VALUES_ENOUGH[THESE_INDICES[70:]] = -2
 
 
+# The following constants are used to test shard_generator_2d_or_3d.
+NUM_SHARDS = 3
+NUM_EXAMPLES_PER_SHARD = 20
+NUM_EXAMPLES_PER_SHARD_BATCH = 32
+SHARD_RADAR_FIELD_NAMES = [radar_utils.REFL_NAME]
+SHARD_RADAR_HEIGHTS_M_AGL = numpy.array([1000, 2000], dtype=int)
+
+# Each example's radar image is filled with the example's global index, so
+# that generated examples can be matched to the original ones.
+SHARD_EXAMPLE_IDS = numpy.linspace(
+    0, NUM_SHARDS * NUM_EXAMPLES_PER_SHARD - 1,
+    num=NUM_SHARDS * NUM_EXAMPLES_PER_SHARD, dtype=int)
+SHARD_TARGET_VALUES = numpy.mod(SHARD_EXAMPLE_IDS, 2)
+
+
+def _create_shard_example_dict(shard_index):
+    """Creates example dictionary for one shard.
+
+    :param shard_index: Index of shard.
+    :return: example_dict: See doc for `input_examples.write_example_file`.
+    """
+
+    these_ids = SHARD_EXAMPLE_IDS[
+        (shard_index * NUM_EXAMPLES_PER_SHARD):
+        ((shard_index + 1) * NUM_EXAMPLES_PER_SHARD)
+    ]
+
+    this_radar_image_matrix = numpy.full(
+        (NUM_EXAMPLES_PER_SHARD, 4, 4, len(SHARD_RADAR_HEIGHTS_M_AGL),
+         len(SHARD_RADAR_FIELD_NAMES)),
+        0.)
+    this_radar_image_matrix += numpy.reshape(
+        these_ids, (NUM_EXAMPLES_PER_SHARD, 1, 1, 1, 1))
+
+    return {
+        input_examples.ROTATED_GRIDS_KEY: True,
+        input_examples.ROTATED_GRID_SPACING_KEY: 1500.,
+        input_examples.TARGET_NAME_KEY: TORNADO_TARGET_NAME,
+        input_examples.RADAR_FIELDS_KEY: SHARD_RADAR_FIELD_NAMES,
+        input_examples.RADAR_HEIGHTS_KEY: SHARD_RADAR_HEIGHTS_M_AGL,
+        input_examples.STORM_IDS_KEY: [str(i) for i in these_ids],
+        input_examples.STORM_TIMES_KEY: these_ids + 0,
+        input_examples.TARGET_VALUES_KEY: SHARD_TARGET_VALUES[these_ids],
+        input_examples.RADAR_IMAGE_MATRIX_KEY: this_radar_image_matrix
+    }
+
+
 class TrainingValidationIoTests(unittest.TestCase):
     """Each method is a unit test for training_validation_io.py."""
 
@@ -260,5 +311,67 @@ class TrainingValidationIoTests(unittest.TestCase):
         self.assertTrue(this_dict == {-2: 0, 0: 0, 1: 0, 2: 0})
 
 
+    def test_shard_generator_2d_or_3d(self):
+        """Ensures correct output from shard_generator_2d_or_3d.
+
+        In this case, the generator goes through all examples once, and only one
+        shard may be memory-mapped at a time.  Every example should be generated
+        exactly once, with the correct target value.
+        """
+
+        orig_max_num_open_shards = trainval_io.MAX_NUM_OPEN_SHARDS
+        trainval_io.MAX_NUM_OPEN_SHARDS = 1
+        top_shard_dir_name = tempfile.mkdtemp()
+
+        try:
+            these_shard_dir_names = []
+
+            for i in range(NUM_SHARDS):
+                these_shard_dir_names.append(
+                    '{0:s}/shard{1:d}'.format(top_shard_dir_name, i))
+                input_examples.write_example_shard(
+                    shard_dir_name=these_shard_dir_names[-1],
+                    example_dict=_create_shard_example_dict(i))
+
+            this_option_dict = {
+                trainval_io.EXAMPLE_FILES_KEY: these_shard_dir_names,
+                trainval_io.NUM_EXAMPLES_PER_BATCH_KEY:
+                    NUM_EXAMPLES_PER_SHARD_BATCH,
+                trainval_io.RADAR_FIELDS_KEY: SHARD_RADAR_FIELD_NAMES,
+                trainval_io.RADAR_HEIGHTS_KEY: SHARD_RADAR_HEIGHTS_M_AGL,
+                trainval_io.SOUNDING_FIELDS_KEY: None,
+                trainval_io.SOUNDING_HEIGHTS_KEY: None,
+                trainval_io.FIRST_STORM_TIME_KEY: None,
+                trainval_io.LAST_STORM_TIME_KEY: None,
+                trainval_io.NUM_ROWS_KEY: None,
+                trainval_io.NUM_COLUMNS_KEY: None,
+                trainval_io.NORMALIZATION_TYPE_KEY: None,
+                trainval_io.NORMALIZATION_FILE_KEY: None,
+                trainval_io.REFLECTIVITY_MASK_KEY: None,
+                trainval_io.LOOP_ONCE_KEY: True
+            }
+
+            these_example_ids = numpy.array([], dtype=int)
+            these_target_values = numpy.array([], dtype=int)
+
+            for this_radar_matrix, this_target_array in (
+                    trainval_io.shard_generator_2d_or_3d(this_option_dict)):
+                these_example_ids = numpy.concatenate((
+                    these_example_ids,
+                    numpy.round(this_radar_matrix[:, 0, 0, 0, 0]).astype(int)
+                ))
+                these_target_values = numpy.concatenate((
+                    these_target_values, this_target_array
+                ))
+        finally:
+            trainval_io.MAX_NUM_OPEN_SHARDS = orig_max_num_open_shards
+            shutil.rmtree(top_shard_dir_name)
+
+        self.assertTrue(numpy.array_equal(
+            numpy.sort(these_example_ids), SHARD_EXAMPLE_IDS))
+        self.assertTrue(numpy.array_equal(
+            these_target_values, SHARD_TARGET_VALUES[these_example_ids]))
+
+
 if __name__ == '__main__':
     unittest.main()
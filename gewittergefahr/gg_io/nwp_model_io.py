@@ -2,11 +2,13 @@
 
 import os
 import copy
+import json
 import numpy
 from gewittergefahr.gg_io import grib_io
 from gewittergefahr.gg_io import downloads
 from gewittergefahr.gg_utils import nwp_model_utils
 from gewittergefahr.gg_utils import time_conversion
+from gewittergefahr.gg_utils import file_system_utils
 from gewittergefahr.gg_utils import error_checking
 
 TIME_FORMAT_MONTH = '%Y%m'
@@ -14,6 +16,17 @@ TIME_FORMAT_DATE = '%Y%m%d'
 TIME_FORMAT_HOUR = '%Y%m%d_%H00'
 NARR_ID_FOR_FILE_NAMES = 'narr-a_221'
 
+FIELD_STORE_METADATA_FILE_NAME = 'metadata.json'
+FIELD_STORE_MATRIX_FILE_NAME = 'field_matrix.npy'
+
+MODEL_NAME_KEY = 'model_name'
+GRID_ID_KEY = 'grid_id'
+INIT_TIME_KEY = 'init_time_unix_sec'
+LEAD_TIME_KEY = 'lead_time_hours'
+FIELD_NAMES_KEY = 'field_names_grib1'
+PRESSURE_LEVELS_KEY = 'pressure_levels_mb'
+FIELD_MATRIX_KEY = 'field_matrix'
+
 
 def _lead_time_to_string(lead_time_hours):
     """Converts lead time from number to string.
@@ -352,3 +365,307 @@ def read_field_from_grib_file(
         temporary_dir_name=temporary_dir_name, wgrib_exe_name=wgrib_exe_name,
         wgrib2_exe_name=wgrib2_exe_name,
         raise_error_if_fails=raise_error_if_fails)
+
+
+def _field_name_to_store_indices(field_store_dict, field_name_grib1):
+    """Finds field in field store.
+
+    :param field_store_dict: Dictionary created by `read_field_store`.
+    :param field_name_grib1: Field name in grib1 format (example: 500-mb height
+        is "HGT:500 mb").
+    :return: field_index: Index of field (first axis of field matrix).  If the
+        field is not in the store, this is -1.
+    :return: pressure_level_index: Index of pressure level (second axis of
+        field matrix).  If the field is not in the store, this is -1.
+    """
+
+    field_name_parts = field_name_grib1.split(':')
+    if len(field_name_parts) != 2 or not field_name_parts[1].endswith(' mb'):
+        return -1, -1
+
+    try:
+        pressure_level_mb = int(field_name_parts[1].split()[0])
+    except ValueError:
+        return -1, -1
+
+    if field_name_parts[0] not in field_store_dict[FIELD_NAMES_KEY]:
+        return -1, -1
+
+    these_indices = numpy.where(
+        field_store_dict[PRESSURE_LEVELS_KEY] == pressure_level_mb)[0]
+    if len(these_indices) == 0:
+        return -1, -1
+
+    return (field_store_dict[FIELD_NAMES_KEY].index(field_name_parts[0]),
+            these_indices[0])
+
+
+def find_field_store(
+        top_directory_name, init_time_unix_sec, model_name, grid_id=None,
+        lead_time_hours=0, raise_error_if_missing=True):
+    """Finds field store.
+
+    A "field store" is the decoded, uncompressed version of one grib file (see
+    `write_field_store`).  Field stores are organized like grib files, except
+    that each store is a directory rather than a file.
+
+    :param top_directory_name: Name of top-level directory with field stores.
+    :param init_time_unix_sec: Model-initialization time.
+    :param model_name: See doc for `nwp_model_utils.check_grid_id`.
+    :param grid_id: Same.
+    :param lead_time_hours: Lead time.
+    :param raise_error_if_missing: Boolean flag.  If store is missing and
+        raise_error_if_missing = True, this method will error out.
+    :return: store_dir_name: Path to field store.  If store is missing and
+        raise_error_if_missing = False, this will be the *expected* path.
+    :raises: ValueError: if store is missing and raise_error_if_missing = True.
+    """
+
+    error_checking.assert_is_string(top_directory_name)
+    error_checking.assert_is_boolean(raise_error_if_missing)
+
+    if model_name == nwp_model_utils.NARR_MODEL_NAME:
+        lead_time_hours = 0
+
+    store_dir_name = '{0:s}/{1:s}/{2:s}_{3:s}_{4:s}'.format(
+        top_directory_name,
+        time_conversion.unix_sec_to_string(
+            init_time_unix_sec, TIME_FORMAT_MONTH),
+        _get_pathless_file_name_prefixes(
+            model_name=model_name, grid_id=grid_id)[0],
+        time_conversion.unix_sec_to_string(
+            init_time_unix_sec, TIME_FORMAT_HOUR),
+        _lead_time_to_string(lead_time_hours)
+    )
+
+    metadata_file_name = '{0:s}/{1:s}'.format(
+        store_dir_name, FIELD_STORE_METADATA_FILE_NAME)
+
+    if raise_error_if_missing and not os.path.isfile(metadata_file_name):
+        error_string = 'Cannot find field store.  Expected at: "{0:s}"'.format(
+            store_dir_name)
+        raise ValueError(error_string)
+
+    return store_dir_name
+
+
+def write_field_store(
+        store_dir_name, grib_file_name, field_names_grib1, pressure_levels_mb,
+        model_name, init_time_unix_sec, grid_id=None, lead_time_hours=0,
+        temporary_dir_name=None, wgrib_exe_name=grib_io.WGRIB_EXE_NAME_DEFAULT,
+        wgrib2_exe_name=grib_io.WGRIB2_EXE_NAME_DEFAULT,
+        raise_error_if_fails=True):
+    """Decodes isobaric fields from grib file and writes them to field store.
+
+    The store is a directory with one uncompressed .npy file, containing an
+    F-by-P-by-M-by-N array of 32-bit floats, plus a JSON file with metadata.
+    The .npy file can be memory-mapped and read by `read_field_store`, so
+    horizontal windows can be read without decoding the grib file again.
+    Since values are stored as 32-bit floats, they match those decoded from
+    the grib file only within float32 precision.
+
+    If the store already exists, its JSON file is deleted before the .npy file
+    is rewritten, and the new JSON file is written last.  Thus, an incomplete
+    store (e.g., from a job that died halfway through) is never mistaken for a
+    complete one.
+
+    F = number of fields
+    P = number of pressure levels
+    M = number of rows in grid
+    N = number of columns in grid
+
+    :param store_dir_name: Path to output directory.
+    :param grib_file_name: Path to input file.
+    :param field_names_grib1: length-F list of field names in grib1 format,
+        without pressure level (example: "HGT").
+    :param pressure_levels_mb: length-P numpy array of pressure levels
+        (integer millibars).
+    :param model_name: See doc for `nwp_model_utils.check_grid_id`.
+    :param init_time_unix_sec: Model-initialization time.
+    :param grid_id: See doc for `nwp_model_utils.check_grid_id`.
+    :param lead_time_hours: Lead time.
+    :param temporary_dir_name: See doc for `grib_io.read_field_from_grib_file`.
+    :param wgrib_exe_name: Same.
+    :param wgrib2_exe_name: Same.
+    :param raise_error_if_fails: Same.  If a field cannot be decoded and
+        `raise_error_if_fails = False`, it will be all NaN in the store.
+    """
+
+    error_checking.assert_is_string_list(field_names_grib1)
+    error_checking.assert_is_numpy_array(
+        numpy.array(field_names_grib1), num_dimensions=1)
+    error_checking.assert_is_integer_numpy_array(pressure_levels_mb)
+    error_checking.assert_is_numpy_array(pressure_levels_mb, num_dimensions=1)
+    error_checking.assert_is_integer(init_time_unix_sec)
+    error_checking.assert_is_integer(lead_time_hours)
+
+    num_grid_rows, num_grid_columns = nwp_model_utils.get_grid_dimensions(
+        model_name=model_name, grid_id=grid_id)
+    num_fields = len(field_names_grib1)
+    num_pressure_levels = len(pressure_levels_mb)
+
+    file_system_utils.mkdir_recursive_if_necessary(
+        directory_name=store_dir_name)
+    matrix_file_name = '{0:s}/{1:s}'.format(
+        store_dir_name, FIELD_STORE_MATRIX_FILE_NAME)
+    metadata_file_name = '{0:s}/{1:s}'.format(
+        store_dir_name, FIELD_STORE_METADATA_FILE_NAME)
+
+    if os.path.isfile(metadata_file_name):
+        os.remove(metadata_file_name)
+
+    field_matrix = numpy.lib.format.open_memmap(
+        matrix_file_name, mode='w+', dtype=numpy.float32,
+        shape=(num_fields, num_pressure_levels, num_grid_rows,
+               num_grid_columns)
+    )
+
+    for j in range(num_fields):
+        for k in range(num_pressure_levels):
+            this_field_name_grib1 = '{0:s}:{1:d} mb'.format(
+                field_names_grib1[j], pressure_levels_mb[k])
+
+            print 'Decoding "{0:s}" from: "{1:s}"...'.format(
+                this_field_name_grib1, grib_file_name)
+
+            this_data_matrix = read_field_from_grib_file(
+                grib_file_name=grib_file_name,
+                field_name_grib1=this_field_name_grib1, model_name=model_name,
+                grid_id=grid_id, temporary_dir_name=temporary_dir_name,
+                wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
+                raise_error_if_fails=raise_error_if_fails)
+
+            if this_data_matrix is None:
+                field_matrix[j, k, ...] = numpy.nan
+            else:
+                field_matrix[j, k, ...] = this_data_matrix
+
+    field_matrix.flush()
+    del field_matrix
+
+    metadata_dict = {
+        MODEL_NAME_KEY: model_name,
+        GRID_ID_KEY: grid_id,
+        INIT_TIME_KEY: init_time_unix_sec,
+        LEAD_TIME_KEY: lead_time_hours,
+        FIELD_NAMES_KEY: field_names_grib1,
+        PRESSURE_LEVELS_KEY: numpy.array(pressure_levels_mb, dtype=int).tolist()
+    }
+
+    print 'Writing metadata to: "{0:s}"...'.format(metadata_file_name)
+
+    with open(metadata_file_name, 'w') as this_file_handle:
+        json.dump(metadata_dict, this_file_handle)
+
+
+def read_field_store(store_dir_name):
+    """Reads field store.
+
+    :param store_dir_name: Path to field store (directory created by
+        `write_field_store`).
+    :return: field_store_dict: Dictionary with the following keys.
+    field_store_dict['model_name']: See doc for `write_field_store`.
+    field_store_dict['grid_id']: Same.
+    field_store_dict['init_time_unix_sec']: Same.
+    field_store_dict['lead_time_hours']: Same.
+    field_store_dict['field_names_grib1']: Same.
+    field_store_dict['pressure_levels_mb']: Same.
+    field_store_dict['field_matrix']: F-by-P-by-M-by-N numpy array (read-only
+        memory map, so nothing is read from disk until it is indexed).
+    """
+
+    metadata_file_name = '{0:s}/{1:s}'.format(
+        store_dir_name, FIELD_STORE_METADATA_FILE_NAME)
+    with open(metadata_file_name, 'r') as this_file_handle:
+        metadata_dict = json.load(this_file_handle)
+
+    grid_id = metadata_dict[GRID_ID_KEY]
+    if grid_id is not None:
+        grid_id = str(grid_id)
+
+    return {
+        MODEL_NAME_KEY: str(metadata_dict[MODEL_NAME_KEY]),
+        GRID_ID_KEY: grid_id,
+        INIT_TIME_KEY: metadata_dict[INIT_TIME_KEY],
+        LEAD_TIME_KEY: metadata_dict[LEAD_TIME_KEY],
+        FIELD_NAMES_KEY: [str(f) for f in metadata_dict[FIELD_NAMES_KEY]],
+        PRESSURE_LEVELS_KEY:
+            numpy.array(metadata_dict[PRESSURE_LEVELS_KEY], dtype=int),
+        FIELD_MATRIX_KEY: numpy.load(
+            '{0:s}/{1:s}'.format(store_dir_name, FIELD_STORE_MATRIX_FILE_NAME),
+            mmap_mode='r')
+    }
+
+
+def are_fields_in_store(field_store_dict, field_names_grib1):
+    """Indicates which fields are in field store.
+
+    F = number of fields
+
+    :param field_store_dict: Dictionary created by `read_field_store`.
+    :param field_names_grib1: length-F list of field names in grib1 format,
+        including pressure level (example: "HGT:500 mb").
+    :return: in_store_flags: length-F numpy array of Boolean flags.
+    """
+
+    return numpy.array([
+        _field_name_to_store_indices(
+            field_store_dict=field_store_dict, field_name_grib1=f)[0] >= 0
+        for f in field_names_grib1
+    ], dtype=bool)
+
+
+def read_window_from_field_store(
+        field_store_dict, field_names_grib1, first_row, last_row, first_column,
+        last_column):
+    """Reads horizontal window of many fields from field store.
+
+    Only the window is read from disk.
+
+    F = number of fields to read
+
+    :param field_store_dict: Dictionary created by `read_field_store`.
+    :param field_names_grib1: length-F list of field names in grib1 format,
+        including pressure level (example: "HGT:500 mb").
+    :param first_row: First row in window.
+    :param last_row: Last row in window.
+    :param first_column: First column in window.
+    :param last_column: Last column in window.
+    :return: field_cube: F-by-(last_row - first_row + 1)-by-
+        (last_column - first_column + 1) numpy array.  Fields that are not in
+        the store are all NaN.
+    """
+
+    num_grid_rows = field_store_dict[FIELD_MATRIX_KEY].shape[2]
+    num_grid_columns = field_store_dict[FIELD_MATRIX_KEY].shape[3]
+
+    error_checking.assert_is_integer(first_row)
+    error_checking.assert_is_geq(first_row, 0)
+    error_checking.assert_is_integer(last_row)
+    error_checking.assert_is_geq(last_row, first_row)
+    error_checking.assert_is_less_than(last_row, num_grid_rows)
+    error_checking.assert_is_integer(first_column)
+    error_checking.assert_is_geq(first_column, 0)
+    error_checking.assert_is_integer(last_column)
+    error_checking.assert_is_geq(last_column, first_column)
+    error_checking.assert_is_less_than(last_column, num_grid_columns)
+
+    num_fields = len(field_names_grib1)
+    field_cube = numpy.full(
+        (num_fields, last_row - first_row + 1, last_column - first_column + 1),
+        numpy.nan)
+
+    for j in range(num_fields):
+        this_field_index, this_level_index = _field_name_to_store_indices(
+            field_store_dict=field_store_dict,
+            field_name_grib1=field_names_grib1[j])
+
+        if this_field_index < 0:
+            continue
+
+        field_cube[j, ...] = field_store_dict[FIELD_MATRIX_KEY][
+            this_field_index, this_level_index, first_row:(last_row + 1),
+            first_column:(last_column + 1)
+        ]
+
+    return field_cube
@@ -1,6 +1,7 @@
 """Unit tests for nwp_model_io.py."""
 
 import unittest
+import numpy
 from gewittergefahr.gg_io import nwp_model_io
 from gewittergefahr.gg_utils import nwp_model_utils
 
@@ -32,6 +33,41 @@ GRIB_FILE_NAME_NARR = 'grib_files/201709/narr-a_221_20170921_0300_000.grb'
 GRIB_FILE_NAME_RAP130 = 'grib_files/201709/rap_130_20170921_0300_007.grb2'
 GRIB_FILE_NAME_RUC252 = 'grib_files/201709/ruc2_252_20170921_0300_007.grb'
 
+TOP_FIELD_STORE_DIR_NAME = 'field_stores'
+FIELD_STORE_DIR_NAME_NARR = 'field_stores/201709/narr-a_221_20170921_0300_000'
+FIELD_STORE_DIR_NAME_RAP130 = 'field_stores/201709/rap_130_20170921_0300_007'
+
+# The following constants are used to test _field_name_to_store_indices and
+# read_window_from_field_store.
+THIS_FIELD_MATRIX = numpy.reshape(
+    numpy.arange(2 * 3 * 4 * 5, dtype=numpy.float32), (2, 3, 4, 5))
+
+FIELD_STORE_DICT = {
+    nwp_model_io.FIELD_NAMES_KEY: ['HGT', 'TMP'],
+    nwp_model_io.PRESSURE_LEVELS_KEY: numpy.array([500, 700, 850], dtype=int),
+    nwp_model_io.FIELD_MATRIX_KEY: THIS_FIELD_MATRIX
+}
+
+FIELD_NAME_IN_STORE = 'TMP:700 mb'
+FIELD_INDEX_IN_STORE = 1
+LEVEL_INDEX_IN_STORE = 1
+FIELD_NAME_BAD_LEVEL = 'TMP:600 mb'
+FIELD_NAME_BAD_FIELD = 'RH:700 mb'
+FIELD_NAME_NOT_ISOBARIC = 'TMP:2 m above gnd'
+
+WINDOW_FIELD_NAMES_GRIB1 = ['TMP:700 mb', 'RH:700 mb', 'HGT:500 mb']
+IN_STORE_FLAGS = numpy.array([1, 0, 1], dtype=bool)
+FIRST_WINDOW_ROW = 1
+LAST_WINDOW_ROW = 2
+FIRST_WINDOW_COLUMN = 2
+LAST_WINDOW_COLUMN = 4
+
+THIS_NAN_MATRIX = numpy.full((2, 3), numpy.nan)
+WINDOW_FIELD_CUBE = numpy.stack((
+    THIS_FIELD_MATRIX[1, 1, 1:3, 2:5], THIS_NAN_MATRIX,
+    THIS_FIELD_MATRIX[0, 0, 1:3, 2:5]
+), axis=0)
+
 
 class NwpModelIoTests(unittest.TestCase):
     """Each method is a unit test for nwp_model_io.py."""
@@ -218,6 +254,101 @@ class NwpModelIoTests(unittest.TestCase):
             lead_time_hours=LEAD_TIME_HOURS, raise_error_if_missing=False)
         self.assertTrue(this_file_name == GRIB_FILE_NAME_RUC252)
 
+    def test_find_field_store_narr(self):
+        """Ensures correct output from find_field_store.
+
+        In this case, model is NARR.
+        """
+
+        this_dir_name = nwp_model_io.find_field_store(
+            top_directory_name=TOP_FIELD_STORE_DIR_NAME,
+            init_time_unix_sec=INIT_TIME_UNIX_SEC,
+            model_name=nwp_model_utils.NARR_MODEL_NAME,
+            lead_time_hours=LEAD_TIME_HOURS, raise_error_if_missing=False)
+        self.assertTrue(this_dir_name == FIELD_STORE_DIR_NAME_NARR)
+
+    def test_find_field_store_rap130(self):
+        """Ensures correct output from find_field_store.
+
+        In this case, model is RAP on the 130 grid.
+        """
+
+        this_dir_name = nwp_model_io.find_field_store(
+            top_directory_name=TOP_FIELD_STORE_DIR_NAME,
+            init_time_unix_sec=INIT_TIME_UNIX_SEC,
+            model_name=nwp_model_utils.RAP_MODEL_NAME,
+            grid_id=nwp_model_utils.ID_FOR_130GRID,
+            lead_time_hours=LEAD_TIME_HOURS, raise_error_if_missing=False)
+        self.assertTrue(this_dir_name == FIELD_STORE_DIR_NAME_RAP130)
+
+    def test_field_name_to_store_indices_found(self):
+        """Ensures correct output from _field_name_to_store_indices.
+
+        In this case, field is in the store.
+        """
+
+        this_field_index, this_level_index = (
+            nwp_model_io._field_name_to_store_indices(
+                field_store_dict=FIELD_STORE_DICT,
+                field_name_grib1=FIELD_NAME_IN_STORE)
+        )
+
+        self.assertTrue(this_field_index == FIELD_INDEX_IN_STORE)
+        self.assertTrue(this_level_index == LEVEL_INDEX_IN_STORE)
+
+    def test_field_name_to_store_indices_bad_level(self):
+        """Ensures correct output from _field_name_to_store_indices.
+
+        In this case, pressure level is not in the store.
+        """
+
+        self.assertTrue(nwp_model_io._field_name_to_store_indices(
+            field_store_dict=FIELD_STORE_DICT,
+            field_name_grib1=FIELD_NAME_BAD_LEVEL
+        ) == (-1, -1))
+
+    def test_field_name_to_store_indices_bad_field(self):
+        """Ensures correct output from _field_name_to_store_indices.
+
+        In this case, field is not in the store.
+        """
+
+        self.assertTrue(nwp_model_io._field_name_to_store_indices(
+            field_store_dict=FIELD_STORE_DICT,
+            field_name_grib1=FIELD_NAME_BAD_FIELD
+        ) == (-1, -1))
+
+    def test_field_name_to_store_indices_not_isobaric(self):
+        """Ensures correct output from _field_name_to_store_indices.
+
+        In this case, field is not on a pressure level.
+        """
+
+        self.assertTrue(nwp_model_io._field_name_to_store_indices(
+            field_store_dict=FIELD_STORE_DICT,
+            field_name_grib1=FIELD_NAME_NOT_ISOBARIC
+        ) == (-1, -1))
+
+    def test_are_fields_in_store(self):
+        """Ensures correct output from are_fields_in_store."""
+
+        these_flags = nwp_model_io.are_fields_in_store(
+            field_store_dict=FIELD_STORE_DICT,
+            field_names_grib1=WINDOW_FIELD_NAMES_GRIB1)
+        self.assertTrue(numpy.array_equal(these_flags, IN_STORE_FLAGS))
+
+    def test_read_window_from_field_store(self):
+        """Ensures correct output from read_window_from_field_store."""
+
+        this_field_cube = nwp_model_io.read_window_from_field_store(
+            field_store_dict=FIELD_STORE_DICT,
+            field_names_grib1=WINDOW_FIELD_NAMES_GRIB1,
+            first_row=FIRST_WINDOW_ROW, last_row=LAST_WINDOW_ROW,
+            first_column=FIRST_WINDOW_COLUMN, last_column=LAST_WINDOW_COLUMN)
+
+        self.assertTrue(numpy.allclose(
+            this_field_cube, WINDOW_FIELD_CUBE, atol=1e-6, equal_nan=True))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -442,15 +442,15 @@ def write_csv_file_for_amy(
         '= {1:d}'
     ).format(orig_num_storm_objects, num_storm_objects)
 
-    valid_time_strings = [
-        time_conversion.unix_sec_to_string(t, TIME_FORMAT_IN_AMY_FILES) for
-        t in storm_object_table[tracking_utils.TIME_COLUMN].values]
-    cell_start_time_strings = [
-        time_conversion.unix_sec_to_string(t, TIME_FORMAT_IN_AMY_FILES) for
-        t in storm_object_table[tracking_utils.CELL_START_TIME_COLUMN].values]
-    cell_end_time_strings = [
-        time_conversion.unix_sec_to_string(t, TIME_FORMAT_IN_AMY_FILES) for
-        t in storm_object_table[tracking_utils.CELL_END_TIME_COLUMN].values]
+    valid_time_strings = time_conversion.unix_sec_array_to_strings(
+        storm_object_table[tracking_utils.TIME_COLUMN].values,
+        TIME_FORMAT_IN_AMY_FILES)
+    cell_start_time_strings = time_conversion.unix_sec_array_to_strings(
+        storm_object_table[tracking_utils.CELL_START_TIME_COLUMN].values,
+        TIME_FORMAT_IN_AMY_FILES)
+    cell_end_time_strings = time_conversion.unix_sec_array_to_strings(
+        storm_object_table[tracking_utils.CELL_END_TIME_COLUMN].values,
+        TIME_FORMAT_IN_AMY_FILES)
 
     south_velocities_m_s01 = -1 * storm_object_table[
         tracking_utils.NORTH_VELOCITY_COLUMN].values
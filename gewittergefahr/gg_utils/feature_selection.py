@@ -14,6 +14,7 @@ Webb, A.R., 2003: "Statistical Pattern Recognition". John Wiley & Sons.
 """
 
 import copy
+import multiprocessing
 from itertools import combinations
 import numpy
 import pandas
@@ -65,10 +66,23 @@ TESTING_XENTROPY_KEY = 'testing_cross_entropy'
 TESTING_AUC_KEY = 'testing_auc'
 VALIDATION_COST_BY_STEP_KEY = 'validation_cost_by_step'
 
+TRAINING_MATRIX_KEY = 'training_matrix'
+TRAINING_LABELS_KEY = 'training_labels'
+VALIDATION_MATRIX_KEY = 'validation_matrix'
+VALIDATION_LABELS_KEY = 'validation_labels'
+FEATURE_TO_COLUMN_KEY = 'feature_name_to_column_index'
+ESTIMATOR_KEY = 'estimator_object'
+COST_FUNCTION_KEY = 'cost_function'
+NUM_PROCESSES_KEY = 'num_processes'
+COST_CACHE_KEY = 'subset_to_cost_dict'
+
 PERMUTATION_TYPE = 'permutation'
 FORWARD_SELECTION_TYPE = 'forward'
 BACKWARD_SELECTION_TYPE = 'backward'
 
+# Set in each worker process by `_init_worker`.
+_WORKER_SELECTION_DICT = None
+
 
 def _check_sequential_selection_inputs(
         training_table, validation_table, feature_names, target_name,
@@ -125,32 +139,240 @@ def _check_sequential_selection_inputs(
         training_table[target_name].values, 1)
 
 
+def _table_to_matrix(data_table, feature_names):
+    """Converts pandas DataFrame to contiguous float32 matrix.
+
+    E = number of examples
+    F = number of features
+
+    :param data_table: pandas DataFrame, where each row is one example.
+    :param feature_names: length-F list of features.  Each must be a column in
+        `data_table`.
+    :return: feature_matrix: E-by-F numpy array, where columns are in the same
+        order as `feature_names`.
+    """
+
+    return numpy.ascontiguousarray(
+        data_table[feature_names].values, dtype=numpy.float32)
+
+
+def _create_selection_dict(
+        training_table, validation_table, feature_names, target_name,
+        estimator_object, cost_function, num_processes):
+    """Creates dictionary used to evaluate subsets of features.
+
+    Each feature table is converted to one contiguous float32 matrix, so that
+    each subset of features can be chosen by column index, rather than by
+    column names in the DataFrame.  The dictionary also contains a cache of
+    validation costs, because some algorithms (especially the floating ones)
+    revisit the same subset many times.
+
+    :param training_table: See doc for `_check_sequential_selection_inputs`.
+    :param validation_table: Same.
+    :param feature_names: Same.
+    :param target_name: Same.
+    :param estimator_object: See doc for `_cost_one_subset`.
+    :param cost_function: Same.
+    :param num_processes: Number of processes used to evaluate subsets of
+        features.  If `num_processes > 1`, `estimator_object` and
+        `cost_function` must be picklable (e.g., `cost_function` may not be a
+        lambda function).
+    :return: selection_dict: Dictionary with the following keys.
+    selection_dict['training_matrix']: Training matrix (float32 numpy array,
+        where the [j]th column is the [j]th feature).
+    selection_dict['training_labels']: 1-D numpy array of training labels.
+    selection_dict['validation_matrix']: Same as "training_matrix" but for
+        validation data.
+    selection_dict['validation_labels']: Same as "training_labels" but for
+        validation data.
+    selection_dict['feature_name_to_column_index']: Dictionary, where each key
+        is a feature name and each value is the corresponding column index.
+    selection_dict['estimator_object']: See input doc.
+    selection_dict['cost_function']: See input doc.
+    selection_dict['num_processes']: See input doc.
+    selection_dict['subset_to_cost_dict']: Dictionary, where each key is a
+        frozenset of feature names and each value is the validation cost for
+        that subset.
+    """
+
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_geq(num_processes, 1)
+
+    return {
+        TRAINING_MATRIX_KEY: _table_to_matrix(training_table, feature_names),
+        TRAINING_LABELS_KEY: training_table[target_name].values,
+        VALIDATION_MATRIX_KEY: _table_to_matrix(
+            validation_table, feature_names),
+        VALIDATION_LABELS_KEY: validation_table[target_name].values,
+        FEATURE_TO_COLUMN_KEY: dict([
+            (feature_names[j], j) for j in range(len(feature_names))
+        ]),
+        ESTIMATOR_KEY: estimator_object,
+        COST_FUNCTION_KEY: cost_function,
+        NUM_PROCESSES_KEY: num_processes,
+        COST_CACHE_KEY: {}
+    }
+
+
+def _cost_one_subset(
+        training_matrix, training_labels, validation_matrix, validation_labels,
+        column_indices, estimator_object, cost_function):
+    """Trains model with one subset of features and computes validation cost.
+
+    E_t = number of training examples
+    E_v = number of validation examples
+    F = number of features
+
+    :param training_matrix: E_t-by-F numpy array of features.
+    :param training_labels: length-E_t numpy array of labels.
+    :param validation_matrix: E_v-by-F numpy array of features.
+    :param validation_labels: length-E_v numpy array of labels.
+    :param column_indices: 1-D numpy array with indices of features to use.
+    :param estimator_object: Instance of scikit-learn estimator.  Must implement
+        the methods `fit` and `predict_proba`.
+    :param cost_function: Cost function to be minimized by feature selection.
+        Inputs should be forecast_probabilities and observed_values (in that
+        order).  Output should be real-valued float.
+    :return: cost: Validation cost.
+    """
+
+    new_estimator_object = sklearn.base.clone(estimator_object)
+    new_estimator_object.fit(
+        training_matrix[:, column_indices], training_labels)
+
+    these_forecast_probabilities = new_estimator_object.predict_proba(
+        validation_matrix[:, column_indices])[:, 1]
+    return cost_function(these_forecast_probabilities, validation_labels)
+
+
+def _init_worker(selection_dict):
+    """Initializes worker process for `_cost_many_subsets_in_worker`.
+
+    With the default (fork) start method, this argument is inherited by the
+    worker rather than pickled, so the data are not copied for each task.
+
+    :param selection_dict: Dictionary created by `_create_selection_dict`.
+    """
+
+    global _WORKER_SELECTION_DICT
+    _WORKER_SELECTION_DICT = selection_dict
+
+
+def _cost_many_subsets_in_worker(list_of_column_index_arrays):
+    """Runs `_cost_one_subset` for many subsets in a worker process.
+
+    :param list_of_column_index_arrays: 1-D list, where each element is a numpy
+        array of column indices (input `column_indices` to `_cost_one_subset`).
+    :return: costs: 1-D numpy array of validation costs.
+    """
+
+    return numpy.array([
+        _cost_one_subset(
+            training_matrix=_WORKER_SELECTION_DICT[TRAINING_MATRIX_KEY],
+            training_labels=_WORKER_SELECTION_DICT[TRAINING_LABELS_KEY],
+            validation_matrix=_WORKER_SELECTION_DICT[VALIDATION_MATRIX_KEY],
+            validation_labels=_WORKER_SELECTION_DICT[VALIDATION_LABELS_KEY],
+            column_indices=these_column_indices,
+            estimator_object=_WORKER_SELECTION_DICT[ESTIMATOR_KEY],
+            cost_function=_WORKER_SELECTION_DICT[COST_FUNCTION_KEY])
+        for these_column_indices in list_of_column_index_arrays
+    ])
+
+
+def _find_min_cost_combo(selection_dict, combination_object, subset_function):
+    """Finds combination of features that leads to minimum validation cost.
+
+    :param selection_dict: Dictionary created by `_create_selection_dict`.
+    :param combination_object: Iterator over combinations of features (each
+        combination is a tuple of feature names).
+    :param subset_function: Function that converts a combination (list of
+        feature names) to the subset of features used to train the model.
+    :return: min_cost: Minimum validation cost.
+    :return: best_feature_names: List of features in the combination that
+        resulted in `min_cost`.  If there is a tie, this is the first such
+        combination.
+    """
+
+    subset_to_cost_dict = selection_dict[COST_CACHE_KEY]
+    feature_name_to_column_index = selection_dict[FEATURE_TO_COLUMN_KEY]
+
+    list_of_feature_combos = []
+    list_of_subset_keys = []
+    list_of_new_subset_keys = []
+    list_of_new_column_index_arrays = []
+
+    for this_tuple in combination_object:
+        these_feature_names = subset_function(list(this_tuple))
+        this_key = frozenset(these_feature_names)
+
+        list_of_feature_combos.append(list(this_tuple))
+        list_of_subset_keys.append(this_key)
+        if this_key in subset_to_cost_dict:
+            continue
+
+        # Placeholder, so that the same subset is not evaluated twice.
+        subset_to_cost_dict[this_key] = None
+        list_of_new_subset_keys.append(this_key)
+        list_of_new_column_index_arrays.append(numpy.sort(numpy.array(
+            [feature_name_to_column_index[n] for n in these_feature_names],
+            dtype=int
+        )))
+
+    num_processes = min([
+        selection_dict[NUM_PROCESSES_KEY], len(list_of_new_column_index_arrays)
+    ])
+
+    if num_processes <= 1:
+        new_costs = numpy.array([
+            _cost_one_subset(
+                training_matrix=selection_dict[TRAINING_MATRIX_KEY],
+                training_labels=selection_dict[TRAINING_LABELS_KEY],
+                validation_matrix=selection_dict[VALIDATION_MATRIX_KEY],
+                validation_labels=selection_dict[VALIDATION_LABELS_KEY],
+                column_indices=these_column_indices,
+                estimator_object=selection_dict[ESTIMATOR_KEY],
+                cost_function=selection_dict[COST_FUNCTION_KEY])
+            for these_column_indices in list_of_new_column_index_arrays
+        ])
+    else:
+        these_chunk_indices = numpy.array_split(
+            numpy.arange(len(list_of_new_column_index_arrays)),
+            num_processes)
+
+        pool_object = multiprocessing.Pool(
+            processes=num_processes, initializer=_init_worker,
+            initargs=(selection_dict,))
+        list_of_cost_arrays = pool_object.map(
+            _cost_many_subsets_in_worker,
+            [[list_of_new_column_index_arrays[k] for k in these_indices]
+             for these_indices in these_chunk_indices],
+            chunksize=1)
+        pool_object.close()
+        pool_object.join()
+
+        new_costs = numpy.concatenate(list_of_cost_arrays)
+
+    for this_key, this_cost in zip(list_of_new_subset_keys, new_costs):
+        subset_to_cost_dict[this_key] = this_cost
+
+    cost_by_feature_combo = numpy.array(
+        [subset_to_cost_dict[k] for k in list_of_subset_keys])
+    best_index = numpy.argmin(cost_by_feature_combo)
+    return cost_by_feature_combo[best_index], list_of_feature_combos[best_index]
+
+
 def _forward_selection_step(
-        training_table, validation_table, selected_feature_names,
-        remaining_feature_names, target_name, estimator_object, cost_function,
+        selection_dict, selected_feature_names, remaining_feature_names,
         num_features_to_add=1):
     """Performs one forward selection step (i.e., adds features to the model).
 
     The best set of L features is added to the model, where L >= 1.
 
-    Each member of `selected_feature_names` and `remaining_feature_names`, as
-    well as `target_name`, must be a column in both `training_table` and
-    `validation_table`.
-
-    :param training_table: pandas DataFrame, where each row is one training
-        example.
-    :param validation_table: pandas DataFrame, where each row is one validation
-        example.
+    :param selection_dict: Dictionary created by `_create_selection_dict`.
     :param selected_feature_names: 1-D list with names of selected features
         (those already in the model).
     :param remaining_feature_names: 1-D list with names of remaining features
         (those which may be added to the model).
-    :param target_name: Name of target variable (predictand).
-    :param estimator_object: Instance of scikit-learn estimator.  Must implement
-        the methods `fit` and `predict_proba`.
-    :param cost_function: Cost function to be minimized by feature selection.
-        Inputs should be forecast_probabilities and observed_values (in that
-        order).  Output should be real-valued float.
     :param num_features_to_add: Number of features to add (L in the above
         discussion).
     :return: min_cost: Minimum cost given by adding any set of L features from
@@ -159,57 +381,22 @@ def _forward_selection_step(
         resulted in `min_cost`.
     """
 
-    combination_object = combinations(
-        remaining_feature_names, num_features_to_add)
-    list_of_remaining_feature_combos = []
-    for this_tuple in list(combination_object):
-        list_of_remaining_feature_combos.append(list(this_tuple))
-
-    num_remaining_feature_combos = len(list_of_remaining_feature_combos)
-    cost_by_feature_combo = numpy.full(num_remaining_feature_combos, numpy.nan)
-
-    for j in range(num_remaining_feature_combos):
-        these_feature_names = (
-            selected_feature_names + list_of_remaining_feature_combos[j])
-
-        new_estimator_object = sklearn.base.clone(estimator_object)
-        new_estimator_object.fit(
-            training_table.as_matrix(columns=these_feature_names),
-            training_table[target_name].values)
-
-        these_forecast_probabilities = new_estimator_object.predict_proba(
-            validation_table.as_matrix(columns=these_feature_names))[:, 1]
-        cost_by_feature_combo[j] = cost_function(
-            these_forecast_probabilities,
-            validation_table[target_name].values)
-
-    min_cost = numpy.min(cost_by_feature_combo)
-    best_index = numpy.argmin(cost_by_feature_combo)
-    return min_cost, list_of_remaining_feature_combos[best_index]
+    return _find_min_cost_combo(
+        selection_dict=selection_dict,
+        combination_object=combinations(
+            remaining_feature_names, num_features_to_add),
+        subset_function=lambda c: selected_feature_names + c)
 
 
 def _backward_selection_step(
-        training_table, validation_table, selected_feature_names, target_name,
-        estimator_object, cost_function, num_features_to_remove=1):
+        selection_dict, selected_feature_names, num_features_to_remove=1):
     """Performs one backward selection step (removes features from the model).
 
     The worst set of R features is removed from the model, where R >= 1.
 
-    Each member of `selected_feature_names`, as well as `target_name`, must be a
-    column in both `training_table` and `validation_table`.
-
-    :param training_table: pandas DataFrame, where each row is one training
-        example.
-    :param validation_table: pandas DataFrame, where each row is one validation
-        example.
+    :param selection_dict: Dictionary created by `_create_selection_dict`.
     :param selected_feature_names: 1-D list with names of selected features
         (each of which may be removed from the model).
-    :param target_name: Name of target variable (predictand).
-    :param estimator_object: Instance of scikit-learn estimator.  Must implement
-        the methods `fit` and `predict_proba`.
-    :param cost_function: Cost function to be minimized by feature selection.
-        Inputs should be forecast_probabilities and observed_values (in that
-        order).  Output should be real-valued float.
     :param num_features_to_remove: Number of features to remove (R in the above
         discussion).
     :return: min_cost: Minimum cost given by removing any set of R features in
@@ -218,36 +405,13 @@ def _backward_selection_step(
         resulted in `min_cost`.
     """
 
-    combination_object = combinations(
-        selected_feature_names, num_features_to_remove)
-    list_of_selected_feature_combos = []
-    for this_tuple in list(combination_object):
-        list_of_selected_feature_combos.append(list(this_tuple))
-
-    num_selected_feature_combos = len(list_of_selected_feature_combos)
-    cost_by_feature_combo = numpy.full(num_selected_feature_combos, numpy.nan)
-
-    for j in range(num_selected_feature_combos):
-        these_feature_names = set(selected_feature_names)
-        for this_name in list_of_selected_feature_combos[j]:
-            these_feature_names.remove(this_name)
-        these_feature_names = list(these_feature_names)
-
-        new_estimator_object = sklearn.base.clone(estimator_object)
-        new_estimator_object.fit(
-            training_table.as_matrix(columns=these_feature_names),
-            training_table[target_name].values)
-
-        these_forecast_probabilities = (
-            new_estimator_object.predict_proba(validation_table.as_matrix(
-                columns=these_feature_names))[:, 1])
-        cost_by_feature_combo[j] = cost_function(
-            these_forecast_probabilities,
-            validation_table[target_name].values)
-
-    min_cost = numpy.min(cost_by_feature_combo)
-    worst_index = numpy.argmin(cost_by_feature_combo)
-    return min_cost, list_of_selected_feature_combos[worst_index]
+    return _find_min_cost_combo(
+        selection_dict=selection_dict,
+        combination_object=combinations(
+            selected_feature_names, num_features_to_remove),
+        subset_function=lambda c: [
+            n for n in selected_feature_names if n not in c
+        ])
 
 
 def _evaluate_feature_selection(
@@ -289,11 +453,11 @@ def _evaluate_feature_selection(
 
     new_estimator_object = sklearn.base.clone(estimator_object)
     new_estimator_object.fit(
-        training_table.as_matrix(columns=selected_feature_names),
+        _table_to_matrix(training_table, selected_feature_names),
         training_table[target_name].values)
 
     forecast_probs_for_validation = new_estimator_object.predict_proba(
-        validation_table.as_matrix(columns=selected_feature_names))[:, 1]
+        _table_to_matrix(validation_table, selected_feature_names))[:, 1]
     validation_cross_entropy = model_eval.get_cross_entropy(
         forecast_probs_for_validation,
         validation_table[target_name].values)
@@ -301,7 +465,7 @@ def _evaluate_feature_selection(
         validation_table[target_name].values, forecast_probs_for_validation)
 
     forecast_probs_for_testing = new_estimator_object.predict_proba(
-        testing_table.as_matrix(columns=selected_feature_names))[:, 1]
+        _table_to_matrix(testing_table, selected_feature_names))[:, 1]
     testing_cross_entropy = model_eval.get_cross_entropy(
         forecast_probs_for_testing, testing_table[target_name].values)
     testing_auc = sklearn.metrics.roc_auc_score(
@@ -434,7 +598,7 @@ def sequential_forward_selection(
         training_table, validation_table, testing_table, feature_names,
         target_name, estimator_object, cost_function=_get_cross_entropy,
         num_features_to_add_per_step=1, min_fractional_cost_decrease=
-        MIN_FRACTIONAL_COST_DECREASE_SFS_DEFAULT):
+        MIN_FRACTIONAL_COST_DECREASE_SFS_DEFAULT, num_processes=1):
     """Runs the SFS (sequential forward selection) algorithm.
 
     SFS is defined in Chapter 9 of Webb (2003).
@@ -455,6 +619,10 @@ def sequential_forward_selection(
     :param min_fractional_cost_decrease: Stopping criterion.  Once the
         fractional cost decrease over one step is <
         `min_fractional_cost_decrease`, SFS will stop.  Must be in range (0, 1).
+    :param num_processes: Number of processes used to evaluate candidate sets
+        of features at each step.  If 1, everything is done in the main
+        process.  If > 1, `estimator_object` and `cost_function` must be
+        picklable.
     :return: sfs_dictionary: Same as output from _evaluate_feature_selection,
         but with one additional key.
     sfs_dictionary['validation_cost_by_step']: length-f numpy array of
@@ -470,6 +638,12 @@ def sequential_forward_selection(
         target_name=target_name,
         num_features_to_add_per_step=num_features_to_add_per_step)
 
+    selection_dict = _create_selection_dict(
+        training_table=training_table, validation_table=validation_table,
+        feature_names=feature_names, target_name=target_name,
+        estimator_object=estimator_object, cost_function=cost_function,
+        num_processes=num_processes)
+
     error_checking.assert_is_greater(min_fractional_cost_decrease, 0.)
     error_checking.assert_is_less_than(min_fractional_cost_decrease, 1.)
 
@@ -490,11 +664,9 @@ def sequential_forward_selection(
                    num_remaining_features)
 
         min_new_cost, these_best_feature_names = _forward_selection_step(
-            training_table=training_table, validation_table=validation_table,
+            selection_dict=selection_dict,
             selected_feature_names=selected_feature_names,
             remaining_feature_names=remaining_feature_names,
-            target_name=target_name, estimator_object=estimator_object,
-            cost_function=cost_function,
             num_features_to_add=num_features_to_add_per_step)
 
         print ('Minimum cost ({0:.4f}) given by adding features shown below '
@@ -537,7 +709,7 @@ def sfs_with_backward_steps(
         num_features_to_add_per_forward_step=1,
         num_features_to_remove_per_backward_step=1,
         min_fractional_cost_decrease=
-        MIN_FRACTIONAL_COST_DECREASE_SFS_DEFAULT):
+        MIN_FRACTIONAL_COST_DECREASE_SFS_DEFAULT, num_processes=1):
     """Runs SFS (sequential forward selection) with backward steps.
 
     This method is called "plus-l-minus-r selection" in Chapter 9 of Webb
@@ -569,6 +741,7 @@ def sfs_with_backward_steps(
     :param min_fractional_cost_decrease: Stopping criterion.  Once the
         fractional cost decrease over a major step is <
         `min_fractional_cost_decrease`, SFS will stop.  Must be in range (0, 1).
+    :param num_processes: See doc for sequential_forward_selection.
     :return: sfs_dictionary: See doc for sequential_forward_selection.
     """
 
@@ -580,6 +753,12 @@ def sfs_with_backward_steps(
         num_features_to_remove_per_step=
         num_features_to_remove_per_backward_step)
 
+    selection_dict = _create_selection_dict(
+        training_table=training_table, validation_table=validation_table,
+        feature_names=feature_names, target_name=target_name,
+        estimator_object=estimator_object, cost_function=cost_function,
+        num_processes=num_processes)
+
     error_checking.assert_is_integer(num_forward_steps)
     error_checking.assert_is_geq(num_forward_steps, 1)
     error_checking.assert_is_integer(num_backward_steps)
@@ -625,12 +804,9 @@ def sfs_with_backward_steps(
                        num_remaining_features)
 
             min_new_cost, these_best_feature_names = _forward_selection_step(
-                training_table=training_table,
-                validation_table=validation_table,
+                selection_dict=selection_dict,
                 selected_feature_names=selected_feature_names,
                 remaining_feature_names=remaining_feature_names,
-                target_name=target_name, estimator_object=estimator_object,
-                cost_function=cost_function,
                 num_features_to_add=num_features_to_add_per_forward_step)
 
             print ('Minimum cost ({0:.4f}) given by adding features shown below'
@@ -656,11 +832,8 @@ def sfs_with_backward_steps(
                        num_features)
 
             min_new_cost, these_worst_feature_names = _backward_selection_step(
-                training_table=training_table,
-                validation_table=validation_table,
+                selection_dict=selection_dict,
                 selected_feature_names=selected_feature_names,
-                target_name=target_name, estimator_object=estimator_object,
-                cost_function=cost_function,
                 num_features_to_remove=num_features_to_remove_per_backward_step)
 
             print ('Minimum cost ({0:.4f}) given by removing features shown '
@@ -705,7 +878,7 @@ def floating_sfs(
         training_table, validation_table, testing_table, feature_names,
         target_name, estimator_object, cost_function=_get_cross_entropy,
         num_features_to_add_per_step=1, min_fractional_cost_decrease=
-        MIN_FRACTIONAL_COST_DECREASE_SFS_DEFAULT):
+        MIN_FRACTIONAL_COST_DECREASE_SFS_DEFAULT, num_processes=1):
     """Runs the SFFS (sequential forward floating selection) algorithm.
 
     SFFS is defined in Chapter 9 of Webb (2003).
@@ -722,6 +895,7 @@ def floating_sfs(
     :param num_features_to_add_per_step: Number of features to add at each step.
     :param min_fractional_cost_decrease: See doc for
         sequential_forward_selection.
+    :param num_processes: See doc for sequential_forward_selection.
     :return: sfs_dictionary: See doc for sequential_forward_selection.
     """
 
@@ -731,6 +905,12 @@ def floating_sfs(
         target_name=target_name,
         num_features_to_add_per_step=num_features_to_add_per_step)
 
+    selection_dict = _create_selection_dict(
+        training_table=training_table, validation_table=validation_table,
+        feature_names=feature_names, target_name=target_name,
+        estimator_object=estimator_object, cost_function=cost_function,
+        num_processes=num_processes)
+
     error_checking.assert_is_greater(min_fractional_cost_decrease, 0.)
     error_checking.assert_is_less_than(min_fractional_cost_decrease, 1.)
 
@@ -753,11 +933,9 @@ def floating_sfs(
                                       num_remaining_features)
 
         min_new_cost, these_best_feature_names = _forward_selection_step(
-            training_table=training_table, validation_table=validation_table,
+            selection_dict=selection_dict,
             selected_feature_names=selected_feature_names,
             remaining_feature_names=remaining_feature_names,
-            target_name=target_name, estimator_object=estimator_object,
-            cost_function=cost_function,
             num_features_to_add=num_features_to_add_per_step)
 
         print ('Minimum cost ({0:.4f}) given by adding features shown below '
@@ -794,11 +972,9 @@ def floating_sfs(
 
             min_new_cost, this_worst_feature_name_as_list = (
                 _backward_selection_step(
-                    training_table=training_table,
-                    validation_table=validation_table,
+                    selection_dict=selection_dict,
                     selected_feature_names=selected_feature_names,
-                    target_name=target_name, estimator_object=estimator_object,
-                    cost_function=cost_function, num_features_to_remove=1))
+                    num_features_to_remove=1))
             this_worst_feature_name = this_worst_feature_name_as_list[0]
 
             # Cannot remove feature that was just added in the forward step.
@@ -841,7 +1017,7 @@ def sequential_backward_selection(
         training_table, validation_table, testing_table, feature_names,
         target_name, estimator_object, cost_function=_get_cross_entropy,
         num_features_to_remove_per_step=1, min_fractional_cost_decrease=
-        MIN_FRACTIONAL_COST_DECREASE_SBS_DEFAULT):
+        MIN_FRACTIONAL_COST_DECREASE_SBS_DEFAULT, num_processes=1):
     """Runs the SBS (sequential backward selection) algorithm.
 
     SBS is defined in Chapter 9 of Webb (2003).
@@ -863,6 +1039,7 @@ def sequential_backward_selection(
         fractional cost decrease over one step is <
         `min_fractional_cost_decrease`, SBS will stop.  Must be in range
         (-1, 1).  If negative, cost may increase slightly without SBS stopping.
+    :param num_processes: See doc for sequential_forward_selection.
     :return: sbs_dictionary: Same as output from _evaluate_feature_selection,
         but with two additional keys.
     sbs_dictionary['removed_feature_names']: length-f list with names of
@@ -880,6 +1057,12 @@ def sequential_backward_selection(
         target_name=target_name,
         num_features_to_remove_per_step=num_features_to_remove_per_step)
 
+    selection_dict = _create_selection_dict(
+        training_table=training_table, validation_table=validation_table,
+        feature_names=feature_names, target_name=target_name,
+        estimator_object=estimator_object, cost_function=cost_function,
+        num_processes=num_processes)
+
     error_checking.assert_is_greater(min_fractional_cost_decrease, -1.)
     error_checking.assert_is_less_than(min_fractional_cost_decrease, 1.)
 
@@ -900,10 +1083,8 @@ def sequential_backward_selection(
                    num_selected_features)
 
         min_new_cost, these_worst_feature_names = _backward_selection_step(
-            training_table=training_table, validation_table=validation_table,
+            selection_dict=selection_dict,
             selected_feature_names=selected_feature_names,
-            target_name=target_name, estimator_object=estimator_object,
-            cost_function=cost_function,
             num_features_to_remove=num_features_to_remove_per_step)
 
         print ('Minimum cost ({0:.4f}) given by removing features shown below '
@@ -947,7 +1128,7 @@ def sbs_with_forward_steps(
         num_features_to_add_per_forward_step=1,
         num_features_to_remove_per_backward_step=1,
         min_fractional_cost_decrease=
-        MIN_FRACTIONAL_COST_DECREASE_SBS_DEFAULT):
+        MIN_FRACTIONAL_COST_DECREASE_SBS_DEFAULT, num_processes=1):
     """Runs SBS (sequential backward selection) with forward steps.
 
     This method is called "plus-l-minus-r selection" in Chapter 9 of Webb
@@ -980,6 +1161,7 @@ def sbs_with_forward_steps(
         fractional cost decrease over a major step is <
         `min_fractional_cost_decrease`, SBS will stop.  Must be in range
         (-1, 1).
+    :param num_processes: See doc for sequential_forward_selection.
     :return: sbs_dictionary: See documentation for
         sequential_backward_selection.
     """
@@ -992,6 +1174,12 @@ def sbs_with_forward_steps(
         num_features_to_remove_per_step=
         num_features_to_remove_per_backward_step)
 
+    selection_dict = _create_selection_dict(
+        training_table=training_table, validation_table=validation_table,
+        feature_names=feature_names, target_name=target_name,
+        estimator_object=estimator_object, cost_function=cost_function,
+        num_processes=num_processes)
+
     error_checking.assert_is_integer(num_forward_steps)
     error_checking.assert_is_geq(num_forward_steps, 1)
     error_checking.assert_is_integer(num_backward_steps)
@@ -1040,11 +1228,8 @@ def sbs_with_forward_steps(
                        num_selected_features)
 
             min_new_cost, these_worst_feature_names = _backward_selection_step(
-                training_table=training_table,
-                validation_table=validation_table,
+                selection_dict=selection_dict,
                 selected_feature_names=selected_feature_names,
-                target_name=target_name, estimator_object=estimator_object,
-                cost_function=cost_function,
                 num_features_to_remove=num_features_to_remove_per_backward_step)
 
             print ('Minimum cost ({0:.4f}) given by removing features shown '
@@ -1070,12 +1255,9 @@ def sbs_with_forward_steps(
                        num_features)
 
             min_new_cost, these_best_feature_names = _forward_selection_step(
-                training_table=training_table,
-                validation_table=validation_table,
+                selection_dict=selection_dict,
                 selected_feature_names=selected_feature_names,
                 remaining_feature_names=removed_feature_names,
-                target_name=target_name, estimator_object=estimator_object,
-                cost_function=cost_function,
                 num_features_to_add=num_features_to_add_per_forward_step)
 
             print ('Minimum cost ({0:.4f}) given by adding features shown below'
@@ -1123,7 +1305,7 @@ def floating_sbs(
         training_table, validation_table, testing_table, feature_names,
         target_name, estimator_object, cost_function=_get_cross_entropy,
         num_features_to_remove_per_step=1, min_fractional_cost_decrease=
-        MIN_FRACTIONAL_COST_DECREASE_SBS_DEFAULT):
+        MIN_FRACTIONAL_COST_DECREASE_SBS_DEFAULT, num_processes=1):
     """Runs the SBFS (sequential backward floating selection) algorithm.
 
     SBFS is defined in Chapter 9 of Webb (2003).
@@ -1141,6 +1323,7 @@ def floating_sbs(
         step.
     :param min_fractional_cost_decrease: See doc for
         sequential_backward_selection.
+    :param num_processes: See doc for sequential_forward_selection.
     :return: sbs_dictionary: See doc for sequential_backward_selection.
     """
 
@@ -1150,6 +1333,12 @@ def floating_sbs(
         target_name=target_name,
         num_features_to_remove_per_step=num_features_to_remove_per_step)
 
+    selection_dict = _create_selection_dict(
+        training_table=training_table, validation_table=validation_table,
+        feature_names=feature_names, target_name=target_name,
+        estimator_object=estimator_object, cost_function=cost_function,
+        num_processes=num_processes)
+
     error_checking.assert_is_greater(min_fractional_cost_decrease, -1.)
     error_checking.assert_is_less_than(min_fractional_cost_decrease, 1.)
 
@@ -1172,10 +1361,8 @@ def floating_sbs(
                    major_step_num, num_removed_features, num_selected_features)
 
         min_new_cost, these_worst_feature_names = _backward_selection_step(
-            training_table=training_table, validation_table=validation_table,
+            selection_dict=selection_dict,
             selected_feature_names=selected_feature_names,
-            target_name=target_name, estimator_object=estimator_object,
-            cost_function=cost_function,
             num_features_to_remove=num_features_to_remove_per_step)
 
         print ('Minimum cost ({0:.4f}) given by removing features shown below '
@@ -1212,12 +1399,10 @@ def floating_sbs(
 
             min_new_cost, this_best_feature_name_as_list = (
                 _forward_selection_step(
-                    training_table=training_table,
-                    validation_table=validation_table,
+                    selection_dict=selection_dict,
                     selected_feature_names=selected_feature_names,
                     remaining_feature_names=removed_feature_names,
-                    target_name=target_name, estimator_object=estimator_object,
-                    cost_function=cost_function, num_features_to_add=1))
+                    num_features_to_add=1))
             this_best_feature_name = this_best_feature_name_as_list[0]
 
             # Cannot add feature that was just removed in the backward step.
@@ -0,0 +1,147 @@
+"""Unit tests for feature_selection.py."""
+
+import copy
+import unittest
+from itertools import combinations
+import numpy
+import pandas
+from sklearn.linear_model import LogisticRegression
+from gewittergefahr.gg_utils import feature_selection
+
+TOLERANCE = 1e-6
+
+# The following constants are used to test _find_min_cost_combo and
+# sequential_forward_selection.
+NUM_TRAINING_EXAMPLES = 200
+NUM_VALIDATION_EXAMPLES = 100
+FEATURE_NAMES = ['foo', 'bar', 'moo', 'hal', 'bad']
+TARGET_NAME = 'label'
+NUM_FEATURES_PER_COMBO = 2
+NUM_PROCESSES = 2
+
+
+def _create_data_table(num_examples, random_seed):
+    """Creates table with features and binary labels.
+
+    The labels depend mostly on the first two features, so that some subsets
+    of features are much better than others.
+
+    :param num_examples: Number of examples.
+    :param random_seed: Random seed.
+    :return: data_table: pandas DataFrame, where each row is one example.
+    """
+
+    random_state_object = numpy.random.RandomState(random_seed)
+    feature_matrix = random_state_object.normal(
+        size=(num_examples, len(FEATURE_NAMES)))
+
+    these_logits = (
+        2 * feature_matrix[:, 0] - feature_matrix[:, 1] +
+        0.5 * random_state_object.normal(size=num_examples)
+    )
+
+    argument_dict = dict([
+        (FEATURE_NAMES[j], feature_matrix[:, j])
+        for j in range(len(FEATURE_NAMES))
+    ])
+    argument_dict[TARGET_NAME] = (these_logits > 0).astype(int)
+    return pandas.DataFrame.from_dict(argument_dict)
+
+
+TRAINING_TABLE = _create_data_table(
+    num_examples=NUM_TRAINING_EXAMPLES, random_seed=1)
+VALIDATION_TABLE = _create_data_table(
+    num_examples=NUM_VALIDATION_EXAMPLES, random_seed=2)
+TESTING_TABLE = _create_data_table(
+    num_examples=NUM_VALIDATION_EXAMPLES, random_seed=3)
+ESTIMATOR_OBJECT = LogisticRegression(solver='lbfgs')
+
+
+def _create_selection_dict(num_processes):
+    """Creates dictionary used to evaluate subsets of features.
+
+    :param num_processes: See doc for
+        `feature_selection._create_selection_dict`.
+    :return: selection_dict: Same.
+    """
+
+    return feature_selection._create_selection_dict(
+        training_table=TRAINING_TABLE, validation_table=VALIDATION_TABLE,
+        feature_names=FEATURE_NAMES, target_name=TARGET_NAME,
+        estimator_object=ESTIMATOR_OBJECT,
+        cost_function=feature_selection._get_cross_entropy,
+        num_processes=num_processes)
+
+
+class FeatureSelectionTests(unittest.TestCase):
+    """Each method is a unit test for feature_selection.py."""
+
+    def test_find_min_cost_combo_parallel(self):
+        """Ensures that _find_min_cost_combo does not depend on num_processes.
+
+        Subsets evaluated in worker processes should have the same costs, and
+        the same subset should be chosen, as in the main process.
+        """
+
+        this_serial_dict = _create_selection_dict(num_processes=1)
+        this_serial_cost, these_serial_names = (
+            feature_selection._find_min_cost_combo(
+                selection_dict=this_serial_dict,
+                combination_object=combinations(
+                    FEATURE_NAMES, NUM_FEATURES_PER_COMBO),
+                subset_function=lambda x: x)
+        )
+
+        this_parallel_dict = _create_selection_dict(
+            num_processes=NUM_PROCESSES)
+        this_parallel_cost, these_parallel_names = (
+            feature_selection._find_min_cost_combo(
+                selection_dict=this_parallel_dict,
+                combination_object=combinations(
+                    FEATURE_NAMES, NUM_FEATURES_PER_COMBO),
+                subset_function=lambda x: x)
+        )
+
+        self.assertTrue(these_parallel_names == these_serial_names)
+        self.assertTrue(set(these_serial_names) == set(FEATURE_NAMES[:2]))
+        self.assertTrue(numpy.isclose(
+            this_parallel_cost, this_serial_cost, atol=TOLERANCE))
+
+        this_serial_cache = this_serial_dict[feature_selection.COST_CACHE_KEY]
+        this_parallel_cache = this_parallel_dict[
+            feature_selection.COST_CACHE_KEY]
+        self.assertTrue(
+            set(this_parallel_cache.keys()) == set(this_serial_cache.keys()))
+
+        for this_key in this_serial_cache:
+            self.assertTrue(numpy.isclose(
+                this_parallel_cache[this_key], this_serial_cache[this_key],
+                atol=TOLERANCE))
+
+    def test_sequential_forward_selection_parallel(self):
+        """Ensures that sequential_forward_selection does not depend on
+        num_processes.
+        """
+
+        these_dicts = [
+            feature_selection.sequential_forward_selection(
+                training_table=TRAINING_TABLE,
+                validation_table=VALIDATION_TABLE,
+                testing_table=TESTING_TABLE,
+                feature_names=copy.deepcopy(FEATURE_NAMES),
+                target_name=TARGET_NAME, estimator_object=ESTIMATOR_OBJECT,
+                num_processes=n)
+            for n in [1, NUM_PROCESSES]
+        ]
+
+        self.assertTrue(
+            these_dicts[1][feature_selection.SELECTED_FEATURES_KEY] ==
+            these_dicts[0][feature_selection.SELECTED_FEATURES_KEY])
+        self.assertTrue(numpy.allclose(
+            these_dicts[1][feature_selection.VALIDATION_COST_BY_STEP_KEY],
+            these_dicts[0][feature_selection.VALIDATION_COST_BY_STEP_KEY],
+            atol=TOLERANCE))
+
+
+if __name__ == '__main__':
+    unittest.main()
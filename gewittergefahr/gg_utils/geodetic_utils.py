@@ -1,6 +1,8 @@
 """Methods for geodetic calculations."""
 
 import os
+import zipfile
+import collections
 import numpy
 import srtm
 import geopy
@@ -25,6 +27,26 @@ EITHER_SIGN_LONGITUDE_ARG = 'either'
 VALID_LONGITUDE_SIGN_ARGS = [
     POSITIVE_LONGITUDE_ARG, NEGATIVE_LONGITUDE_ARG, EITHER_SIGN_LONGITUDE_ARG]
 
+NEAREST_INTERP_METHOD = 'nearest'
+BILINEAR_INTERP_METHOD = 'bilinear'
+VALID_ELEVATION_INTERP_METHODS = [
+    NEAREST_INTERP_METHOD, BILINEAR_INTERP_METHOD]
+
+MIN_VALID_ELEVATION_M_ASL = -1000.
+MAX_VALID_ELEVATION_M_ASL = 10000.
+
+GRID_TOP_LATITUDE_KEY = 'top_latitude_deg'
+GRID_LEFT_LONGITUDE_KEY = 'left_longitude_deg'
+GRID_POINTS_PER_DEGREE_KEY = 'grid_points_per_degree'
+ELEVATION_MATRIX_KEY = 'elevation_matrix_m_asl'
+
+# Elevation tiles already read, keyed by (working directory, tile name) and
+# ordered from least to most recently used.  Each value is a 2-D numpy array
+# (held in memory) or None (if the tile does not exist, e.g. over ocean).  At
+# most `MAX_NUM_CACHED_TILES` tiles are kept.
+MAX_NUM_CACHED_TILES = 50
+_ELEVATION_TILE_CACHE = collections.OrderedDict()
+
 
 class ElevationFileHandler:
     """File-handler for elevation data.
@@ -100,35 +122,249 @@ class ElevationFileHandler:
             return f.read()
 
 
-def _get_elevation(
-        latitude_deg, longitude_deg, srtm_data_object=None,
-        working_dir_name=None):
-    """Gets elevation at a single point.
+def _get_tile_name(latitude_deg, longitude_deg):
+    """Returns name of elevation tile containing the given point.
 
     WARNING: Input longitudes in western hemisphere must be negative.
 
-    If `srtm_data_object is None`, it will be created on the fly.
+    This method mimics `GeoElevationData.get_file_name` in the `srtm` package.
 
     :param latitude_deg: Latitude (deg N).
     :param longitude_deg: Longitude (deg E).
-    :param srtm_data_object: Instance of `srtm.data.GeoElevationData`.
+    :return: tile_name: Pathless name of tile file (e.g., "N35W098.hgt").
+    """
+
+    return '{0:s}{1:02d}{2:s}{3:03d}.hgt'.format(
+        'N' if latitude_deg >= 0 else 'S',
+        int(numpy.absolute(numpy.floor(latitude_deg))),
+        'E' if longitude_deg >= 0 else 'W',
+        int(numpy.absolute(numpy.floor(longitude_deg)))
+    )
+
+
+def _read_elevation_tile(
+        tile_name, working_dir_name=None, allow_download=False):
+    """Reads elevation tile into 2-D array.
+
+    Tiles are read into memory once and then cached.  If the cache contains
+    more than `MAX_NUM_CACHED_TILES` tiles, the least recently used are
+    dropped.  If the tile is not in the working directory (either zipped or
+    unzipped), it is treated as missing, unless `allow_download = True`, in
+    which case the `srtm` package will try to retrieve it.
+
+    :param tile_name: Pathless name of tile file (e.g., "N35W098.hgt").
     :param working_dir_name: See doc for `__init__` in class
         `ElevationFileHandler`.
-    :return: elevation_m_asl: Elevation (metres above sea level).
-    :return: srtm_data_object: Instance of `srtm.data.GeoElevationData`.
+    :param allow_download: Boolean flag.  If True, tiles missing from the
+        working directory will be downloaded.
+    :return: elevation_matrix_m_asl: M-by-M numpy array of elevations (metres
+        above sea level), where the first row is the northernmost.  If the tile
+        does not exist (or is not local and `allow_download = False`), this is
+        None.
     """
 
-    if srtm_data_object is None:
-        srtm_data_object = srtm.get_data(
-            file_handler=ElevationFileHandler(working_dir_name))
+    file_handler_object = ElevationFileHandler(working_dir_name)
+    cache_key = (file_handler_object.get_srtm_dir(), tile_name)
 
-    elevation_m_asl = srtm_data_object.get_elevation(
-        latitude=latitude_deg, longitude=longitude_deg)
+    if cache_key in _ELEVATION_TILE_CACHE:
+        elevation_matrix_m_asl = _ELEVATION_TILE_CACHE.pop(cache_key)
+        _ELEVATION_TILE_CACHE[cache_key] = elevation_matrix_m_asl
+        return elevation_matrix_m_asl
 
-    # TODO(thunderhoser): I am concerned about this hack.
-    if elevation_m_asl is None:
-        elevation_m_asl = 0.
-    return elevation_m_asl, srtm_data_object
+    full_file_name = '{0:s}/{1:s}'.format(
+        file_handler_object.get_srtm_dir(), tile_name)
+
+    if os.path.isfile(full_file_name):
+        elevation_matrix_m_asl = numpy.fromfile(full_file_name, dtype='>i2')
+    else:
+        if os.path.isfile(full_file_name + '.zip'):
+            zip_file_object = zipfile.ZipFile(full_file_name + '.zip')
+            file_contents = zip_file_object.read(
+                zip_file_object.infolist()[0])
+            zip_file_object.close()
+        elif not allow_download:
+            # Not cached, so that a later call with `allow_download = True`
+            # can still retrieve the tile.
+            return None
+        else:
+            srtm_data_object = srtm.get_data(file_handler=file_handler_object)
+
+            if tile_name in (srtm_data_object.srtm1_files.keys() +
+                             srtm_data_object.srtm3_files.keys()):
+                file_contents = srtm_data_object.retrieve_or_load_file_data(
+                    tile_name)
+            else:
+                file_contents = None
+
+        if file_contents:
+            elevation_matrix_m_asl = numpy.frombuffer(
+                file_contents, dtype='>i2')
+        else:
+            elevation_matrix_m_asl = None
+
+    if elevation_matrix_m_asl is not None:
+        num_rows = int(numpy.round(numpy.sqrt(elevation_matrix_m_asl.size)))
+        elevation_matrix_m_asl = numpy.reshape(
+            elevation_matrix_m_asl, (num_rows, num_rows))
+
+    _ELEVATION_TILE_CACHE[cache_key] = elevation_matrix_m_asl
+
+    while len(_ELEVATION_TILE_CACHE) > MAX_NUM_CACHED_TILES:
+        _ELEVATION_TILE_CACHE.popitem(last=False)
+
+    return elevation_matrix_m_asl
+
+
+def _interp_elevations_from_grid(
+        elevation_matrix_m_asl, top_latitude_deg, left_longitude_deg,
+        grid_points_per_degree, latitudes_deg, longitudes_deg,
+        interp_method=NEAREST_INTERP_METHOD):
+    """Interpolates elevations from equidistant lat-long grid to points.
+
+    With nearest-neighbour interpolation, this method chooses the same grid
+    point as `GeoElevationFile.get_elevation` in the `srtm` package (the one to
+    the north-west of the query point).  With bilinear interpolation, invalid
+    grid points (voids) are ignored and the weights of the other surrounding
+    grid points are renormalized.
+
+    M = number of rows in grid
+    N = number of columns in grid
+    P = number of points
+
+    :param elevation_matrix_m_asl: M-by-N numpy array of elevations (metres
+        above sea level), where the first row is the northernmost.
+    :param top_latitude_deg: Latitude of first row (deg N).
+    :param left_longitude_deg: Longitude of first column (deg E).
+    :param grid_points_per_degree: Number of grid points per degree of latitude
+        or longitude (inverse of grid spacing).
+    :param latitudes_deg: length-P numpy array of latitudes (deg N).
+    :param longitudes_deg: length-P numpy array of longitudes (deg E).
+    :param interp_method: Interpolation method (must be accepted by
+        `check_elevation_interp_method`).
+    :return: elevations_m_asl: length-P numpy array of elevations (metres above
+        sea level).  Invalid values (NaN or outside the range
+        `MIN_VALID_ELEVATION_M_ASL`...`MAX_VALID_ELEVATION_M_ASL`) are NaN.
+        With bilinear interpolation, elevation is NaN only if all four
+        surrounding grid points are invalid.
+    """
+
+    def _find_invalid_values(input_values):
+        with numpy.errstate(invalid='ignore'):
+            return numpy.invert(numpy.logical_and(
+                input_values >= MIN_VALID_ELEVATION_M_ASL,
+                input_values <= MAX_VALID_ELEVATION_M_ASL
+            ))
+
+    num_rows = elevation_matrix_m_asl.shape[0]
+    num_columns = elevation_matrix_m_asl.shape[1]
+
+    row_indices = (top_latitude_deg - latitudes_deg) * grid_points_per_degree
+    column_indices = (
+        (longitudes_deg - left_longitude_deg) * grid_points_per_degree
+    )
+
+    if interp_method == NEAREST_INTERP_METHOD:
+        row_indices = numpy.clip(
+            numpy.floor(row_indices).astype(int), 0, num_rows - 1)
+        column_indices = numpy.clip(
+            numpy.floor(column_indices).astype(int), 0, num_columns - 1)
+
+        elevations_m_asl = elevation_matrix_m_asl[
+            row_indices, column_indices
+        ].astype(float)
+
+        elevations_m_asl[_find_invalid_values(elevations_m_asl)] = numpy.nan
+        return elevations_m_asl
+
+    top_row_indices = numpy.clip(
+        numpy.floor(row_indices).astype(int), 0, num_rows - 2)
+    left_column_indices = numpy.clip(
+        numpy.floor(column_indices).astype(int), 0, num_columns - 2)
+
+    row_weights = numpy.clip(row_indices - top_row_indices, 0., 1.)
+    column_weights = numpy.clip(
+        column_indices - left_column_indices, 0., 1.)
+
+    sum_of_weighted_values = numpy.full(len(latitudes_deg), 0.)
+    sum_of_weights = numpy.full(len(latitudes_deg), 0.)
+
+    for i in range(2):
+        these_row_weights = row_weights if i == 1 else 1. - row_weights
+
+        for j in range(2):
+            these_weights = these_row_weights * (
+                column_weights if j == 1 else 1. - column_weights
+            )
+            these_values = elevation_matrix_m_asl[
+                top_row_indices + i, left_column_indices + j
+            ].astype(float)
+
+            these_invalid_flags = _find_invalid_values(these_values)
+            these_weights[these_invalid_flags] = 0.
+            these_values[these_invalid_flags] = 0.
+
+            sum_of_weighted_values += these_weights * these_values
+            sum_of_weights += these_weights
+
+    elevations_m_asl = numpy.full(len(latitudes_deg), numpy.nan)
+    good_indices = numpy.where(sum_of_weights > 0)[0]
+    elevations_m_asl[good_indices] = (
+        sum_of_weighted_values[good_indices] / sum_of_weights[good_indices]
+    )
+
+    return elevations_m_asl
+
+
+def _get_elevations_from_tiles(
+        latitudes_deg, longitudes_deg, working_dir_name=None,
+        interp_method=NEAREST_INTERP_METHOD, allow_download=False):
+    """Returns elevation of each point, reading elevation tiles as necessary.
+
+    WARNING: Input longitudes in western hemisphere must be negative.
+
+    P = number of points
+
+    :param latitudes_deg: length-P numpy array of latitudes (deg N).
+    :param longitudes_deg: length-P numpy array of longitudes (deg E).
+    :param working_dir_name: See doc for `__init__` in class
+        `ElevationFileHandler`.
+    :param interp_method: See doc for `_interp_elevations_from_grid`.
+    :param allow_download: See doc for `_read_elevation_tile`.
+    :return: elevations_m_asl: length-P numpy array of elevations (metres above
+        sea level).  Elevation is NaN if the tile does not exist or the value
+        is invalid.
+    """
+
+    tile_coord_matrix = numpy.transpose(numpy.vstack((
+        numpy.floor(latitudes_deg), numpy.floor(longitudes_deg)
+    )))
+    unique_tile_coord_matrix, tile_index_by_point = numpy.unique(
+        tile_coord_matrix, axis=0, return_inverse=True)
+
+    elevations_m_asl = numpy.full(len(latitudes_deg), numpy.nan)
+
+    for k in range(unique_tile_coord_matrix.shape[0]):
+        these_point_indices = numpy.where(tile_index_by_point == k)[0]
+
+        this_elevation_matrix_m_asl = _read_elevation_tile(
+            tile_name=_get_tile_name(
+                latitude_deg=unique_tile_coord_matrix[k, 0],
+                longitude_deg=unique_tile_coord_matrix[k, 1]),
+            working_dir_name=working_dir_name, allow_download=allow_download)
+
+        if this_elevation_matrix_m_asl is None:
+            continue
+
+        elevations_m_asl[these_point_indices] = _interp_elevations_from_grid(
+            elevation_matrix_m_asl=this_elevation_matrix_m_asl,
+            top_latitude_deg=unique_tile_coord_matrix[k, 0] + 1,
+            left_longitude_deg=unique_tile_coord_matrix[k, 1],
+            grid_points_per_degree=this_elevation_matrix_m_asl.shape[0] - 1,
+            latitudes_deg=latitudes_deg[these_point_indices],
+            longitudes_deg=longitudes_deg[these_point_indices],
+            interp_method=interp_method)
+
+    return elevations_m_asl
 
 
 def find_invalid_latitudes(latitudes_deg):
@@ -226,7 +462,108 @@ def get_latlng_centroid(latitudes_deg, longitudes_deg, allow_nan=True):
     return numpy.nanmean(latitudes_deg), numpy.nanmean(longitudes_deg)
 
 
-def get_elevations(latitudes_deg, longitudes_deg, working_dir_name=None):
+def check_elevation_interp_method(interp_method):
+    """Error-checks method for interpolating elevations.
+
+    :param interp_method: Interpolation method.
+    :raises: ValueError: if `interp_method not in
+        VALID_ELEVATION_INTERP_METHODS`.
+    """
+
+    error_checking.assert_is_string(interp_method)
+
+    if interp_method not in VALID_ELEVATION_INTERP_METHODS:
+        error_string = (
+            '\n\n{0:s}\nValid interp methods (listed above) do not include '
+            '"{1:s}".'
+        ).format(str(VALID_ELEVATION_INTERP_METHODS), interp_method)
+
+        raise ValueError(error_string)
+
+
+def create_elevation_grid(
+        min_latitude_deg, max_latitude_deg, min_longitude_deg,
+        max_longitude_deg, grid_spacing_deg, working_dir_name=None,
+        interp_method=NEAREST_INTERP_METHOD, allow_download=False):
+    """Creates equidistant lat-long grid of elevations.
+
+    The grid can be computed once for a whole domain (e.g., the tracking
+    domain) and passed to every call of `get_elevations`.  Elevations looked up
+    from the grid are interpolated twice (tiles to grid, then grid to points),
+    so they are only as accurate as the grid spacing allows.
+
+    :param min_latitude_deg: Minimum latitude (deg N) in grid.
+    :param max_latitude_deg: Max latitude (deg N) in grid.
+    :param min_longitude_deg: Minimum longitude (deg E) in grid.
+    :param max_longitude_deg: Max longitude (deg E) in grid.
+    :param grid_spacing_deg: Spacing between adjacent grid points (deg).
+    :param working_dir_name: See doc for `__init__` in class
+        `ElevationFileHandler`.
+    :param interp_method: Method used to interpolate from elevation tiles to
+        grid points (must be accepted by `check_elevation_interp_method`).
+    :param allow_download: Boolean flag.  If True, elevation tiles missing from
+        the working directory will be downloaded.  If False, grid points in
+        these tiles will have elevation NaN.
+    :return: elevation_grid_dict: Dictionary with the following keys.
+    elevation_grid_dict['top_latitude_deg']: Latitude (deg N) of first row.
+    elevation_grid_dict['left_longitude_deg']: Longitude (deg E) of first
+        column.  Longitudes in the western hemisphere are negative.
+    elevation_grid_dict['grid_points_per_degree']: Inverse of grid spacing.
+    elevation_grid_dict['elevation_matrix_m_asl']: M-by-N numpy array of
+        elevations (metres above sea level), where the first row is the
+        northernmost.
+    """
+
+    error_checking.assert_is_valid_latitude(min_latitude_deg)
+    error_checking.assert_is_valid_latitude(max_latitude_deg)
+    error_checking.assert_is_greater(max_latitude_deg, min_latitude_deg)
+    error_checking.assert_is_greater(grid_spacing_deg, 0.)
+    error_checking.assert_is_boolean(allow_download)
+    check_elevation_interp_method(interp_method)
+
+    min_longitude_deg = lng_conversion.convert_lng_negative_in_west(
+        min_longitude_deg, allow_nan=False)
+    max_longitude_deg = lng_conversion.convert_lng_negative_in_west(
+        max_longitude_deg, allow_nan=False)
+    error_checking.assert_is_greater(max_longitude_deg, min_longitude_deg)
+
+    grid_points_per_degree = 1. / grid_spacing_deg
+    num_rows = 1 + int(numpy.ceil(
+        (max_latitude_deg - min_latitude_deg) * grid_points_per_degree))
+    num_columns = 1 + int(numpy.ceil(
+        (max_longitude_deg - min_longitude_deg) * grid_points_per_degree))
+
+    grid_point_latitudes_deg = (
+        max_latitude_deg - numpy.linspace(0, num_rows - 1, num=num_rows) *
+        grid_spacing_deg
+    )
+    grid_point_longitudes_deg = (
+        min_longitude_deg +
+        numpy.linspace(0, num_columns - 1, num=num_columns) * grid_spacing_deg
+    )
+
+    latitude_matrix_deg, longitude_matrix_deg = numpy.meshgrid(
+        grid_point_latitudes_deg, grid_point_longitudes_deg, indexing='ij')
+
+    elevations_m_asl = _get_elevations_from_tiles(
+        latitudes_deg=numpy.ravel(latitude_matrix_deg),
+        longitudes_deg=numpy.ravel(longitude_matrix_deg),
+        working_dir_name=working_dir_name, interp_method=interp_method,
+        allow_download=allow_download)
+
+    return {
+        GRID_TOP_LATITUDE_KEY: max_latitude_deg,
+        GRID_LEFT_LONGITUDE_KEY: min_longitude_deg,
+        GRID_POINTS_PER_DEGREE_KEY: grid_points_per_degree,
+        ELEVATION_MATRIX_KEY:
+            numpy.reshape(elevations_m_asl, latitude_matrix_deg.shape)
+    }
+
+
+def get_elevations(
+        latitudes_deg, longitudes_deg, working_dir_name=None,
+        interp_method=NEAREST_INTERP_METHOD, elevation_grid_dict=None,
+        allow_download=False):
     """Returns elevation of each point.
 
     N = number of points
@@ -235,6 +572,16 @@ def get_elevations(latitudes_deg, longitudes_deg, working_dir_name=None):
     :param longitudes_deg: length-N numpy array of longitudes (deg E).
     :param working_dir_name: See doc for `__init__` in class
         `ElevationFileHandler`.
+    :param interp_method: Interpolation method (must be accepted by
+        `check_elevation_interp_method`).
+    :param elevation_grid_dict: Dictionary created by `create_elevation_grid`.
+        If this is specified, elevations will be interpolated from the grid,
+        except at points outside the grid, where they will be interpolated from
+        elevation tiles.  If None, all elevations will be interpolated from
+        elevation tiles.
+    :param allow_download: Boolean flag.  If True, elevation tiles missing from
+        the working directory will be downloaded.  If False, points in these
+        tiles will have elevation 0.
     :return: elevations_m_asl: length-N numpy array of elevations (metres above
         sea level).
     """
@@ -247,16 +594,51 @@ def get_elevations(latitudes_deg, longitudes_deg, working_dir_name=None):
         longitudes_deg, allow_nan=False)
     error_checking.assert_is_numpy_array(
         longitudes_deg, exact_dimensions=numpy.array([num_points]))
+    error_checking.assert_is_boolean(allow_download)
+    check_elevation_interp_method(interp_method)
 
-    srtm_data_object = None
-    elevations_m_asl = numpy.full(num_points, numpy.nan)
-
-    for i in range(num_points):
-        elevations_m_asl[i], srtm_data_object = _get_elevation(
-            latitude_deg=latitudes_deg[i], longitude_deg=longitudes_deg[i],
-            srtm_data_object=srtm_data_object,
-            working_dir_name=working_dir_name)
+    if elevation_grid_dict is None:
+        tile_flags = numpy.full(num_points, True, dtype=bool)
+        elevations_m_asl = numpy.full(num_points, numpy.nan)
+    else:
+        top_latitude_deg = elevation_grid_dict[GRID_TOP_LATITUDE_KEY]
+        left_longitude_deg = elevation_grid_dict[GRID_LEFT_LONGITUDE_KEY]
+        grid_points_per_degree = elevation_grid_dict[GRID_POINTS_PER_DEGREE_KEY]
+        elevation_matrix_m_asl = elevation_grid_dict[ELEVATION_MATRIX_KEY]
+
+        bottom_latitude_deg = top_latitude_deg - (
+            float(elevation_matrix_m_asl.shape[0] - 1) / grid_points_per_degree
+        )
+        right_longitude_deg = left_longitude_deg + (
+            float(elevation_matrix_m_asl.shape[1] - 1) / grid_points_per_degree
+        )
+
+        tile_flags = numpy.invert(numpy.all(numpy.vstack((
+            latitudes_deg >= bottom_latitude_deg,
+            latitudes_deg <= top_latitude_deg,
+            longitudes_deg >= left_longitude_deg,
+            longitudes_deg <= right_longitude_deg
+        )), axis=0))
+
+        elevations_m_asl = _interp_elevations_from_grid(
+            elevation_matrix_m_asl=elevation_matrix_m_asl,
+            top_latitude_deg=top_latitude_deg,
+            left_longitude_deg=left_longitude_deg,
+            grid_points_per_degree=grid_points_per_degree,
+            latitudes_deg=latitudes_deg, longitudes_deg=longitudes_deg,
+            interp_method=interp_method)
+
+    tile_indices = numpy.where(tile_flags)[0]
+
+    if len(tile_indices) > 0:
+        elevations_m_asl[tile_indices] = _get_elevations_from_tiles(
+            latitudes_deg=latitudes_deg[tile_indices],
+            longitudes_deg=longitudes_deg[tile_indices],
+            working_dir_name=working_dir_name, interp_method=interp_method,
+            allow_download=allow_download)
 
+    # TODO(thunderhoser): I am concerned about this hack.
+    elevations_m_asl[numpy.isnan(elevations_m_asl)] = 0.
     return elevations_m_asl
 
 
@@ -1,5 +1,7 @@
 """Unit tests for geodetic_utils.py."""
 
+import shutil
+import tempfile
 import unittest
 import numpy
 from gewittergefahr.gg_utils import geodetic_utils
@@ -32,11 +34,46 @@ POINT_LONGITUDES_DEG = numpy.array(
 CENTROID_LATITUDE_DEG = 34.
 CENTROID_LONGITUDE_DEG = 278.
 
+# The following constants are used to test _get_tile_name.
+TILE_LATITUDES_DEG = numpy.array([35.5, -0.5, 0.])
+TILE_LONGITUDES_DEG = numpy.array([-97.1, 10.2, -0.3])
+TILE_NAMES = ['N35W098.hgt', 'S01E010.hgt', 'N00W001.hgt']
+
+# The following constants are used to test _interp_elevations_from_grid.
+GRID_ELEVATION_MATRIX_M_ASL = numpy.array([[0, 100, 200],
+                                           [300, 400, -32768],
+                                           [600, 700, 800]])
+GRID_TOP_LATITUDE_DEG = 36.
+GRID_LEFT_LONGITUDE_DEG = -98.
+GRID_POINTS_PER_DEGREE = 2.
+
+GRID_QUERY_LATITUDES_DEG = numpy.array(
+    [35.9, 35.75, 35.25, 35.5, 34., 35.6, 35.55])
+GRID_QUERY_LONGITUDES_DEG = numpy.array(
+    [-97.9, -97.75, -97.75, -97., -99., -97.1, -97.05])
+GRID_ELEVATIONS_NEAREST_M_ASL = numpy.array(
+    [0, 0, 300, numpy.nan, 600, 100, 100])
+GRID_ELEVATIONS_BILINEAR_M_ASL = numpy.array([
+    0.8 * 0.8 * 0 + 0.8 * 0.2 * 100 + 0.2 * 0.8 * 300 + 0.2 * 0.2 * 400,
+    0.5 * 0.5 * (0 + 100 + 300 + 400),
+    0.5 * 0.5 * (300 + 400 + 600 + 700),
+    numpy.nan, 600,
+    (0.2 * 0.2 * 100 + 0.2 * 0.8 * 200 + 0.8 * 0.2 * 400) / 0.36,
+    (0.1 * 0.1 * 100 + 0.1 * 0.9 * 200 + 0.9 * 0.1 * 400) / 0.19
+])
+
 # The following constants are used to test get_elevations.
 LATITUDES_DEG = numpy.array([51.1, 53.5])
 LONGITUDES_DEG = numpy.array([246, 246.5])
 ELEVATIONS_M_ASL = numpy.array([1080, 675], dtype=float)
 
+# The following constants are used to test _read_elevation_tile.
+LOCAL_TILE_NAMES = ['N35W098.hgt', 'N35W099.hgt', 'N36W098.hgt']
+MISSING_TILE_NAME = 'N37W098.hgt'
+MAX_NUM_CACHED_TILES = 2
+LOCAL_TILE_MATRIX_M_ASL = numpy.array(
+    [[100, 200, 300], [400, 500, 600], [700, 800, 900]], dtype=int)
+
 # The following constants are used to test
 # start_points_and_displacements_to_endpoints.
 START_LATITUDES_DEG = numpy.array([[53.5, 53.5, 53.5],
@@ -162,11 +199,114 @@ class GeodeticUtilsTests(unittest.TestCase):
             this_centroid_lng_deg, CENTROID_LONGITUDE_DEG,
             atol=DEFAULT_TOLERANCE))
 
+    def test_get_tile_name(self):
+        """Ensures correct output from _get_tile_name."""
+
+        these_tile_names = [
+            geodetic_utils._get_tile_name(
+                latitude_deg=TILE_LATITUDES_DEG[i],
+                longitude_deg=TILE_LONGITUDES_DEG[i])
+            for i in range(len(TILE_NAMES))
+        ]
+
+        self.assertTrue(these_tile_names == TILE_NAMES)
+
+    def test_interp_elevations_from_grid_nearest(self):
+        """Ensures correct output from _interp_elevations_from_grid.
+
+        In this case, interpolation method is nearest-neighbour.
+        """
+
+        these_elevations_m_asl = geodetic_utils._interp_elevations_from_grid(
+            elevation_matrix_m_asl=GRID_ELEVATION_MATRIX_M_ASL,
+            top_latitude_deg=GRID_TOP_LATITUDE_DEG,
+            left_longitude_deg=GRID_LEFT_LONGITUDE_DEG,
+            grid_points_per_degree=GRID_POINTS_PER_DEGREE,
+            latitudes_deg=GRID_QUERY_LATITUDES_DEG,
+            longitudes_deg=GRID_QUERY_LONGITUDES_DEG,
+            interp_method=geodetic_utils.NEAREST_INTERP_METHOD)
+
+        self.assertTrue(numpy.allclose(
+            these_elevations_m_asl, GRID_ELEVATIONS_NEAREST_M_ASL,
+            atol=DEFAULT_TOLERANCE, equal_nan=True))
+
+    def test_interp_elevations_from_grid_bilinear(self):
+        """Ensures correct output from _interp_elevations_from_grid.
+
+        In this case, interpolation method is bilinear.
+        """
+
+        these_elevations_m_asl = geodetic_utils._interp_elevations_from_grid(
+            elevation_matrix_m_asl=GRID_ELEVATION_MATRIX_M_ASL,
+            top_latitude_deg=GRID_TOP_LATITUDE_DEG,
+            left_longitude_deg=GRID_LEFT_LONGITUDE_DEG,
+            grid_points_per_degree=GRID_POINTS_PER_DEGREE,
+            latitudes_deg=GRID_QUERY_LATITUDES_DEG,
+            longitudes_deg=GRID_QUERY_LONGITUDES_DEG,
+            interp_method=geodetic_utils.BILINEAR_INTERP_METHOD)
+
+        self.assertTrue(numpy.allclose(
+            these_elevations_m_asl, GRID_ELEVATIONS_BILINEAR_M_ASL,
+            atol=DEFAULT_TOLERANCE, equal_nan=True))
+
+    def test_read_elevation_tile(self):
+        """Ensures correct output from _read_elevation_tile.
+
+        In this case, tiles are read only from the working directory.  The
+        missing tile should not be downloaded, and the cache should keep only
+        the most recently used tiles.
+        """
+
+        orig_max_num_cached_tiles = geodetic_utils.MAX_NUM_CACHED_TILES
+        geodetic_utils.MAX_NUM_CACHED_TILES = MAX_NUM_CACHED_TILES
+        geodetic_utils._ELEVATION_TILE_CACHE.clear()
+        this_working_dir_name = tempfile.mkdtemp()
+
+        try:
+            for this_tile_name in LOCAL_TILE_NAMES:
+                LOCAL_TILE_MATRIX_M_ASL.astype('>i2').tofile(
+                    '{0:s}/{1:s}'.format(this_working_dir_name, this_tile_name)
+                )
+
+            this_matrix_m_asl = geodetic_utils._read_elevation_tile(
+                tile_name=LOCAL_TILE_NAMES[0],
+                working_dir_name=this_working_dir_name)
+            self.assertTrue(numpy.array_equal(
+                this_matrix_m_asl, LOCAL_TILE_MATRIX_M_ASL))
+
+            geodetic_utils._read_elevation_tile(
+                tile_name=LOCAL_TILE_NAMES[1],
+                working_dir_name=this_working_dir_name)
+            geodetic_utils._read_elevation_tile(
+                tile_name=LOCAL_TILE_NAMES[0],
+                working_dir_name=this_working_dir_name)
+            geodetic_utils._read_elevation_tile(
+                tile_name=LOCAL_TILE_NAMES[2],
+                working_dir_name=this_working_dir_name)
+
+            self.assertTrue(geodetic_utils._read_elevation_tile(
+                tile_name=MISSING_TILE_NAME,
+                working_dir_name=this_working_dir_name
+            ) is None)
+
+            these_cached_tile_names = [
+                k[1] for k in geodetic_utils._ELEVATION_TILE_CACHE.keys()
+            ]
+        finally:
+            geodetic_utils.MAX_NUM_CACHED_TILES = orig_max_num_cached_tiles
+            geodetic_utils._ELEVATION_TILE_CACHE.clear()
+            shutil.rmtree(this_working_dir_name)
+
+        self.assertTrue(these_cached_tile_names == [
+            LOCAL_TILE_NAMES[0], LOCAL_TILE_NAMES[2]
+        ])
+
     def test_get_elevations(self):
         """Ensures correct output from get_elevations."""
 
         these_elevations_m_asl = geodetic_utils.get_elevations(
-            latitudes_deg=LATITUDES_DEG, longitudes_deg=LONGITUDES_DEG)
+            latitudes_deg=LATITUDES_DEG, longitudes_deg=LONGITUDES_DEG,
+            allow_download=True)
 
         self.assertTrue(numpy.allclose(
             these_elevations_m_asl, ELEVATIONS_M_ASL, atol=DEFAULT_TOLERANCE))
@@ -69,9 +69,13 @@ def interp_temperature_surface_from_nwp(
         radar_time_unix_sec, critical_temperature_kelvins, model_name,
         top_grib_directory_name, use_all_grids=True, grid_id=None,
         wgrib_exe_name=grib_io.WGRIB_EXE_NAME_DEFAULT,
-        wgrib2_exe_name=grib_io.WGRIB2_EXE_NAME_DEFAULT):
+        wgrib2_exe_name=grib_io.WGRIB2_EXE_NAME_DEFAULT,
+        top_field_store_dir_name=None):
     """Interpolates temperature (isothermal) surface from NWP model.
 
+    The isosurface is found on the NWP grid and then interpolated bilinearly to
+    the radar grid (see `interp.interp_temperature_surface_from_nwp_grid`).
+
     M = number of rows (unique grid-point latitudes) in radar grid
     N = number of columns (unique grid-point longitudes) in radar grid
 
@@ -81,12 +85,14 @@ def interp_temperature_surface_from_nwp(
         longitudes (deg E).
     :param radar_time_unix_sec: Radar time.
     :param critical_temperature_kelvins: Temperature of isosurface.
-    :param model_name: See doc for `interp.interp_temperature_surface_from_nwp`.
+    :param model_name: See doc for
+        `interp.interp_temperature_surface_from_nwp_grid`.
     :param top_grib_directory_name: Same.
     :param use_all_grids: Same.
     :param grid_id: Same.
     :param wgrib_exe_name: Same.
     :param wgrib2_exe_name: Same.
+    :param top_field_store_dir_name: Same.
     :return: isosurface_height_matrix_m_asl: M-by-N numpy array with heights of
         temperature isosurface (metres above sea level).
     """
@@ -119,14 +125,18 @@ def interp_temperature_surface_from_nwp(
     }
     query_point_table = pandas.DataFrame.from_dict(query_point_dict)
 
-    isosurface_height_vector_m_asl = interp.interp_temperature_surface_from_nwp(
-        query_point_table=query_point_table,
-        query_time_unix_sec=radar_time_unix_sec,
-        critical_temperature_kelvins=critical_temperature_kelvins,
-        model_name=model_name, top_grib_directory_name=top_grib_directory_name,
-        use_all_grids=use_all_grids, grid_id=grid_id,
-        wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
-        raise_error_if_missing=True)
+    isosurface_height_vector_m_asl = (
+        interp.interp_temperature_surface_from_nwp_grid(
+            query_point_table=query_point_table,
+            query_time_unix_sec=radar_time_unix_sec,
+            critical_temperature_kelvins=critical_temperature_kelvins,
+            model_name=model_name,
+            top_grib_directory_name=top_grib_directory_name,
+            use_all_grids=use_all_grids, grid_id=grid_id,
+            wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
+            raise_error_if_missing=True,
+            top_field_store_dir_name=top_field_store_dir_name)
+    )
 
     return numpy.reshape(
         isosurface_height_vector_m_asl, (num_grid_rows, num_grid_columns))
@@ -7,7 +7,6 @@ import pandas
 import scipy.interpolate
 from gewittergefahr.gg_io import grib_io
 from gewittergefahr.gg_io import nwp_model_io
-from gewittergefahr.gg_utils import general_utils
 from gewittergefahr.gg_utils import nwp_model_utils
 from gewittergefahr.gg_utils import error_checking
 
@@ -58,6 +57,7 @@ ROTATION_COSINES_KEY = 'rotation_cosine_by_query_point'
 # times from the same model initialization, rather than just interpolating
 # between zero-hour analyses from the same initialization.
 FORECAST_LEAD_TIME_HOURS = 0
+NUM_LEVELS_PER_READ_FOR_ISOSURFACE = 6
 
 
 def _interp_to_previous_time(
@@ -116,6 +116,69 @@ def _interp_to_next_time(
     return numpy.stack(list_of_interp_matrices, axis=-1)
 
 
+def _find_nearest_indices(sorted_input_values, test_values):
+    """Finds nearest value in sorted array to each test value.
+
+    This is a vectorized version of `general_utils.find_nearest_value`, with
+    the same tie-breaking (ties go to the larger index).
+
+    :param sorted_input_values: 1-D numpy array.  Must be sorted in ascending
+        order.
+    :param test_values: 1-D numpy array of test values.
+    :return: nearest_indices: 1-D numpy array (same length as `test_values`),
+        containing array index of nearest value for each test value.
+    """
+
+    num_input_values = len(sorted_input_values)
+    nearest_indices = numpy.searchsorted(
+        sorted_input_values, test_values, side='left')
+
+    lower_indices = numpy.maximum(nearest_indices - 1, 0)
+    upper_indices = numpy.minimum(nearest_indices, num_input_values - 1)
+
+    subtract_one_flags = numpy.logical_and(
+        nearest_indices > 0,
+        numpy.logical_or(
+            nearest_indices == num_input_values,
+            numpy.absolute(test_values - sorted_input_values[lower_indices]) <
+            numpy.absolute(test_values - sorted_input_values[upper_indices])
+        )
+    )
+
+    nearest_indices[subtract_one_flags] -= 1
+    return nearest_indices
+
+
+def _get_nn_interp_plan(
+        sorted_grid_point_x_metres, sorted_grid_point_y_metres,
+        query_x_coords_metres, query_y_coords_metres):
+    """Finds nearest grid point to each query point.
+
+    The resulting "interp plan" can be reused for nearest-neighbour
+    interpolation of any number of fields on the same grid.
+
+    Q = number of query points
+
+    :param sorted_grid_point_x_metres: See doc for
+        `interp_from_xy_grid_to_points`.
+    :param sorted_grid_point_y_metres: Same.
+    :param query_x_coords_metres: Same.
+    :param query_y_coords_metres: Same.
+    :return: row_indices: length-Q numpy array with row (y-coordinate) index of
+        nearest grid point to each query point.
+    :return: column_indices: Same but for columns (x-coordinates).
+    """
+
+    row_indices = _find_nearest_indices(
+        sorted_input_values=sorted_grid_point_y_metres,
+        test_values=query_y_coords_metres)
+    column_indices = _find_nearest_indices(
+        sorted_input_values=sorted_grid_point_x_metres,
+        test_values=query_x_coords_metres)
+
+    return row_indices, column_indices
+
+
 def _nn_interp_from_xy_grid_to_points(
         input_matrix, sorted_grid_point_x_metres, sorted_grid_point_y_metres,
         query_x_coords_metres, query_y_coords_metres):
@@ -129,17 +192,13 @@ def _nn_interp_from_xy_grid_to_points(
     :return: interp_values: Same.
     """
 
-    num_query_points = len(query_x_coords_metres)
-    interp_values = numpy.full(num_query_points, numpy.nan)
-
-    for i in range(num_query_points):
-        _, this_row = general_utils.find_nearest_value(
-            sorted_grid_point_y_metres, query_y_coords_metres[i])
-        _, this_column = general_utils.find_nearest_value(
-            sorted_grid_point_x_metres, query_x_coords_metres[i])
-        interp_values[i] = input_matrix[this_row, this_column]
+    row_indices, column_indices = _get_nn_interp_plan(
+        sorted_grid_point_x_metres=sorted_grid_point_x_metres,
+        sorted_grid_point_y_metres=sorted_grid_point_y_metres,
+        query_x_coords_metres=query_x_coords_metres,
+        query_y_coords_metres=query_y_coords_metres)
 
-    return interp_values
+    return input_matrix[row_indices, column_indices].astype(float)
 
 
 def _get_wind_rotation_metadata(field_names_grib1, model_name):
@@ -384,6 +443,220 @@ def _read_nwp_for_interp_any_grid(
             missing_data)
 
 
+def _open_field_store(
+        init_time_unix_sec, field_names_grib1, model_name, grid_id,
+        top_field_store_dir_name):
+    """Opens field store, if it exists and contains all the desired fields.
+
+    :param init_time_unix_sec: Model-initialization time.
+    :param field_names_grib1: 1-D list of field names in grib1 format.
+    :param model_name: Model name (must be accepted by
+        `nwp_model_utils.check_model_name`).
+    :param grid_id: Grid ID.
+    :param top_field_store_dir_name: Name of top-level directory with field
+        stores.
+    :return: field_store_dict: Dictionary created by
+        `nwp_model_io.read_field_store`.  If the store is missing or does not
+        contain all the desired fields, this is None.
+    """
+
+    store_dir_name = nwp_model_io.find_field_store(
+        top_directory_name=top_field_store_dir_name,
+        init_time_unix_sec=init_time_unix_sec, model_name=model_name,
+        grid_id=grid_id, lead_time_hours=FORECAST_LEAD_TIME_HOURS,
+        raise_error_if_missing=False)
+
+    if not os.path.isfile('{0:s}/{1:s}'.format(
+            store_dir_name, nwp_model_io.FIELD_STORE_METADATA_FILE_NAME)):
+        return None
+
+    field_store_dict = nwp_model_io.read_field_store(store_dir_name)
+    if not numpy.all(nwp_model_io.are_fields_in_store(
+            field_store_dict=field_store_dict,
+            field_names_grib1=field_names_grib1)):
+        return None
+
+    return field_store_dict
+
+
+def _read_nwp_field_cube(
+        init_time_unix_sec, field_names_grib1, model_name, grid_ids,
+        top_grib_directory_name, wgrib_exe_name=grib_io.WGRIB_EXE_NAME_DEFAULT,
+        wgrib2_exe_name=grib_io.WGRIB2_EXE_NAME_DEFAULT,
+        raise_error_if_missing=False, top_field_store_dir_name=None):
+    """Reads many NWP fields from one model run into a 3-D cube.
+
+    This method reads from the first grid (in `grid_ids`) for which a file
+    exists.  For each grid, a field store containing all the desired fields
+    (see `nwp_model_io.write_field_store`) is preferred over the grib file.
+
+    F = number of fields
+    M = number of rows in grid
+    N = number of columns in grid
+
+    :param init_time_unix_sec: Model-initialization time.
+    :param field_names_grib1: length-F list of field names in grib1 format.
+    :param model_name: Model name (must be accepted by
+        `nwp_model_utils.check_model_name`).
+    :param grid_ids: 1-D list of grid IDs, in order of preference.
+    :param top_grib_directory_name: Name of top-level directory with grib files
+        containing NWP data.
+    :param wgrib_exe_name: Path to wgrib executable.
+    :param wgrib2_exe_name: Path to wgrib2 executable.
+    :param raise_error_if_missing: See doc for `_read_nwp_for_interp`.
+    :param top_field_store_dir_name: Name of top-level directory with field
+        stores.  If None, will read only grib files.
+    :return: field_cube: F-by-M-by-N numpy array of field values.  Fields that
+        cannot be read are all NaN.  If no file is found, this is None.
+    :return: grid_id: ID of grid used.  If no file is found, this is None.
+    """
+
+    num_grids = len(grid_ids)
+
+    for g in range(num_grids):
+        if top_field_store_dir_name is not None:
+            field_store_dict = _open_field_store(
+                init_time_unix_sec=init_time_unix_sec,
+                field_names_grib1=field_names_grib1, model_name=model_name,
+                grid_id=grid_ids[g],
+                top_field_store_dir_name=top_field_store_dir_name)
+
+            if field_store_dict is not None:
+                these_dimensions = field_store_dict[
+                    nwp_model_io.FIELD_MATRIX_KEY].shape
+
+                field_cube = nwp_model_io.read_window_from_field_store(
+                    field_store_dict=field_store_dict,
+                    field_names_grib1=field_names_grib1, first_row=0,
+                    last_row=these_dimensions[2] - 1, first_column=0,
+                    last_column=these_dimensions[3] - 1)
+
+                return field_cube, grid_ids[g]
+
+        this_grib_file_name = nwp_model_io.find_grib_file(
+            top_directory_name=top_grib_directory_name,
+            init_time_unix_sec=init_time_unix_sec, model_name=model_name,
+            grid_id=grid_ids[g], lead_time_hours=FORECAST_LEAD_TIME_HOURS,
+            raise_error_if_missing=(
+                raise_error_if_missing and g == num_grids - 1))
+
+        if not os.path.isfile(this_grib_file_name):
+            continue
+
+        num_grid_rows, num_grid_columns = nwp_model_utils.get_grid_dimensions(
+            model_name=model_name, grid_id=grid_ids[g])
+        field_cube = numpy.full(
+            (len(field_names_grib1), num_grid_rows, num_grid_columns),
+            numpy.nan)
+
+        for j in range(len(field_names_grib1)):
+            this_field_matrix = nwp_model_io.read_field_from_grib_file(
+                grib_file_name=this_grib_file_name,
+                field_name_grib1=field_names_grib1[j], model_name=model_name,
+                grid_id=grid_ids[g], wgrib_exe_name=wgrib_exe_name,
+                wgrib2_exe_name=wgrib2_exe_name,
+                raise_error_if_fails=raise_error_if_missing)
+
+            if this_field_matrix is not None:
+                field_cube[j, ...] = this_field_matrix
+
+        return field_cube, grid_ids[g]
+
+    return None, None
+
+
+def _read_nwp_from_field_store(
+        init_time_unix_sec, field_names_grib1, model_name, grid_ids,
+        top_field_store_dir_name, row_indices_by_grid, column_indices_by_grid):
+    """Reads many NWP fields at many grid points from one field store.
+
+    This method reads from the first grid (in `grid_ids`) for which a field
+    store exists (see `nwp_model_io.write_field_store`) and contains all the
+    desired fields.  Only the smallest horizontal window containing all the
+    desired grid points is read from disk.
+
+    F = number of fields
+    Q = number of grid points
+
+    :param init_time_unix_sec: Model-initialization time.
+    :param field_names_grib1: length-F list of field names in grib1 format.
+    :param model_name: Model name (must be accepted by
+        `nwp_model_utils.check_model_name`).
+    :param grid_ids: 1-D list of grid IDs, in order of preference.
+    :param top_field_store_dir_name: Name of top-level directory with field
+        stores.
+    :param row_indices_by_grid: 1-D list (same length as `grid_ids`), where
+        each item is a length-Q numpy array of row indices.
+    :param column_indices_by_grid: Same but for columns.
+    :return: value_matrix: F-by-Q numpy array of field values.  If no
+        suitable field store is found, this is None.
+    :return: grid_id: ID of grid used.  If no suitable field store is found,
+        this is None.
+    """
+
+    for g in range(len(grid_ids)):
+        field_store_dict = _open_field_store(
+            init_time_unix_sec=init_time_unix_sec,
+            field_names_grib1=field_names_grib1, model_name=model_name,
+            grid_id=grid_ids[g],
+            top_field_store_dir_name=top_field_store_dir_name)
+
+        if field_store_dict is None:
+            continue
+
+        these_rows = row_indices_by_grid[g]
+        these_columns = column_indices_by_grid[g]
+        first_row = numpy.min(these_rows)
+        first_column = numpy.min(these_columns)
+
+        field_cube = nwp_model_io.read_window_from_field_store(
+            field_store_dict=field_store_dict,
+            field_names_grib1=field_names_grib1, first_row=first_row,
+            last_row=numpy.max(these_rows), first_column=first_column,
+            last_column=numpy.max(these_columns))
+
+        return (
+            field_cube[:, these_rows - first_row, these_columns - first_column],
+            grid_ids[g]
+        )
+
+    return None, None
+
+
+def _find_query_time_ranges(query_times_unix_sec, query_to_model_times_table):
+    """Finds range of query times (as used for temporal interp) for each point.
+
+    Q = number of query points
+
+    :param query_times_unix_sec: length-Q numpy array of query times.
+    :param query_to_model_times_table: pandas DataFrame created by
+        `nwp_model_utils.get_times_needed_for_interp`.
+    :return: range_indices: length-Q numpy array of indices.  If
+        range_indices[q] = i, the [q]th query time is in the [i]th row of
+        `query_to_model_times_table`.  If range_indices[q] = -1, the [q]th query
+        time is in no range.
+    """
+
+    range_indices = numpy.full(len(query_times_unix_sec), -1, dtype=int)
+    num_ranges = len(query_to_model_times_table.index)
+
+    for i in range(num_ranges):
+        if i == num_ranges - 1:
+            these_flags = query_times_unix_sec >= query_to_model_times_table[
+                nwp_model_utils.MIN_QUERY_TIME_COLUMN].values[-1]
+        else:
+            these_flags = numpy.logical_and(
+                query_times_unix_sec >= query_to_model_times_table[
+                    nwp_model_utils.MIN_QUERY_TIME_COLUMN].values[i],
+                query_times_unix_sec < query_to_model_times_table[
+                    nwp_model_utils.MAX_QUERY_TIME_COLUMN].values[i]
+            )
+
+        range_indices[these_flags] = i
+
+    return range_indices
+
+
 def _stack_1d_arrays_horizontally(list_of_1d_arrays):
     """Stacks 1-D numpy arrays horizontally.
 
@@ -544,6 +817,153 @@ def _find_heights_with_temperature(
     return target_heights_m_asl
 
 
+def _find_temperature_surface_in_columns(
+        temperature_matrix_kelvins, height_matrix_m_asl,
+        target_temperature_kelvins):
+    """In each vertical column, finds height with the target temperature.
+
+    This is a vectorized version of the level-by-level search in
+    `interp_temperature_surface_from_nwp`.  In each column, the "cold" level is
+    the lowest level with temperature < target and a valid height.  The "warm"
+    level is the highest level below the cold level with temperature >= target.
+    The target height is then interpolated between the two (see
+    `_find_heights_with_temperature`).  Levels with NaN temperature are
+    ignored.
+
+    L = number of vertical levels
+    P = number of columns
+
+    :param temperature_matrix_kelvins: L-by-P numpy array of temperatures.
+        Levels must be sorted from bottom to top.
+    :param height_matrix_m_asl: L-by-P numpy array of heights (metres above sea
+        level).
+    :param target_temperature_kelvins: Target temperature.
+    :return: target_heights_m_asl: length-P numpy array of heights (metres above
+        sea level) with the target temperature.  If the target temperature is
+        not bracketed in a column, that column's height is NaN.
+    """
+
+    num_levels, num_columns = temperature_matrix_kelvins.shape
+    level_indices = numpy.linspace(0, num_levels - 1, num=num_levels, dtype=int)
+    column_indices = numpy.linspace(
+        0, num_columns - 1, num=num_columns, dtype=int)
+
+    with numpy.errstate(invalid='ignore'):
+        cold_flag_matrix = numpy.logical_and(
+            temperature_matrix_kelvins < target_temperature_kelvins,
+            numpy.invert(numpy.isnan(height_matrix_m_asl)))
+        warm_flag_matrix = (
+            temperature_matrix_kelvins >= target_temperature_kelvins)
+
+    cold_found_flags = numpy.any(cold_flag_matrix, axis=0)
+    cold_level_indices = numpy.argmax(cold_flag_matrix, axis=0)
+    cold_level_indices[numpy.invert(cold_found_flags)] = num_levels
+
+    warm_flag_matrix[
+        level_indices[:, numpy.newaxis] >= cold_level_indices[numpy.newaxis, :]
+    ] = False
+    warm_found_flags = numpy.any(warm_flag_matrix, axis=0)
+    warm_level_indices = (
+        num_levels - 1 - numpy.argmax(warm_flag_matrix[::-1, :], axis=0))
+
+    cold_temperatures_kelvins = numpy.full(num_columns, numpy.nan)
+    cold_heights_m_asl = numpy.full(num_columns, numpy.nan)
+    these_columns = column_indices[cold_found_flags]
+    these_levels = cold_level_indices[cold_found_flags]
+    cold_temperatures_kelvins[these_columns] = temperature_matrix_kelvins[
+        these_levels, these_columns]
+    cold_heights_m_asl[these_columns] = height_matrix_m_asl[
+        these_levels, these_columns]
+
+    warm_temperatures_kelvins = numpy.full(num_columns, numpy.nan)
+    warm_heights_m_asl = numpy.full(num_columns, numpy.nan)
+    these_columns = column_indices[warm_found_flags]
+    these_levels = warm_level_indices[warm_found_flags]
+    warm_temperatures_kelvins[these_columns] = temperature_matrix_kelvins[
+        these_levels, these_columns]
+    warm_heights_m_asl[these_columns] = height_matrix_m_asl[
+        these_levels, these_columns]
+
+    return _find_heights_with_temperature(
+        warm_temperatures_kelvins=warm_temperatures_kelvins,
+        cold_temperatures_kelvins=cold_temperatures_kelvins,
+        warm_heights_m_asl=warm_heights_m_asl,
+        cold_heights_m_asl=cold_heights_m_asl,
+        target_temperature_kelvins=target_temperature_kelvins)
+
+
+def _bilinear_interp_from_xy_grid_to_points(
+        input_matrix, sorted_grid_point_x_metres, sorted_grid_point_y_metres,
+        query_x_coords_metres, query_y_coords_metres):
+    """Bilinear interpolation from x-y grid to scattered points.
+
+    Unlike `interp_from_xy_grid_to_points`, this method allows NaN in the input
+    matrix.  At each query point, grid points with NaN are ignored and the
+    weights of the other surrounding grid points are renormalized.  If all four
+    surrounding grid points are NaN, the interpolated value is NaN.  Query
+    points outside the grid are moved to the nearest edge.
+
+    :param input_matrix: See doc for `interp_from_xy_grid_to_points`.
+    :param sorted_grid_point_x_metres: Same.
+    :param sorted_grid_point_y_metres: Same.
+    :param query_x_coords_metres: Same.
+    :param query_y_coords_metres: Same.
+    :return: interp_values: Same.
+    """
+
+    def _find_left_indices_and_weights(sorted_grid_values, query_values):
+        left_indices = numpy.searchsorted(
+            sorted_grid_values, query_values, side='right') - 1
+        left_indices = numpy.clip(left_indices, 0, len(sorted_grid_values) - 2)
+
+        right_weights = (
+            (query_values - sorted_grid_values[left_indices]) /
+            (sorted_grid_values[left_indices + 1] -
+             sorted_grid_values[left_indices])
+        )
+        return left_indices, numpy.clip(right_weights, 0., 1.)
+
+    row_indices, row_weights = _find_left_indices_and_weights(
+        sorted_grid_values=sorted_grid_point_y_metres,
+        query_values=query_y_coords_metres)
+    column_indices, column_weights = _find_left_indices_and_weights(
+        sorted_grid_values=sorted_grid_point_x_metres,
+        query_values=query_x_coords_metres)
+
+    num_query_points = len(query_x_coords_metres)
+    sum_of_weighted_values = numpy.full(num_query_points, 0.)
+    sum_of_weights = numpy.full(num_query_points, 0.)
+
+    for this_row_offset in [0, 1]:
+        these_row_weights = (
+            row_weights if this_row_offset else 1. - row_weights)
+
+        for this_column_offset in [0, 1]:
+            these_weights = these_row_weights * (
+                column_weights if this_column_offset else 1. - column_weights)
+            these_values = input_matrix[
+                row_indices + this_row_offset,
+                column_indices + this_column_offset
+            ]
+
+            these_valid_flags = numpy.invert(numpy.isnan(these_values))
+            sum_of_weighted_values[these_valid_flags] += (
+                these_weights[these_valid_flags] *
+                these_values[these_valid_flags]
+            )
+            sum_of_weights[these_valid_flags] += these_weights[
+                these_valid_flags]
+
+    interp_values = numpy.full(num_query_points, numpy.nan)
+    these_good_indices = numpy.where(sum_of_weights > 0)[0]
+    interp_values[these_good_indices] = (
+        sum_of_weighted_values[these_good_indices] /
+        sum_of_weights[these_good_indices]
+    )
+
+    return interp_values
+
+
 def check_temporal_interp_method(interp_method_string):
     """Ensures that temporal-interpolation method is valid.
 
@@ -994,6 +1414,254 @@ def interp_nwp_from_xy_grid(
     return interp_table
 
 
+def interp_nwp_from_xy_grid_by_init_time(
+        query_point_table, field_names, field_names_grib1, model_name,
+        top_grib_directory_name, use_all_grids=True, grid_id=None,
+        temporal_interp_method_string=PREV_NEIGHBOUR_METHOD_STRING,
+        wgrib_exe_name=grib_io.WGRIB_EXE_NAME_DEFAULT,
+        wgrib2_exe_name=grib_io.WGRIB2_EXE_NAME_DEFAULT,
+        raise_error_if_missing=False, top_field_store_dir_name=None):
+    """Interpolates NWP data from x-y grid in both space and time.
+
+    This method does the same as `interp_nwp_from_xy_grid` with
+    nearest-neighbour spatial interpolation, but it groups query points by
+    model-initialization time.  Query points are projected to each grid, and
+    their nearest grid points are found, only once.  Then, for each
+    initialization time, all fields are read into one cube (see
+    `_read_nwp_field_cube`) and sampled for all query points that need this
+    initialization time.
+
+    If `top_field_store_dir_name` is specified, fields are read from field
+    stores (see `nwp_model_io.write_field_store`) when available, so that grib
+    files need not be decoded again.  Grib files are still used for any
+    initialization time without a field store.
+
+    :param query_point_table: See doc for `interp_nwp_from_xy_grid`.
+    :param field_names: Same.
+    :param field_names_grib1: Same.
+    :param model_name: Same.
+    :param top_grib_directory_name: Same.
+    :param use_all_grids: Same.
+    :param grid_id: Same.
+    :param temporal_interp_method_string: Same.
+    :param wgrib_exe_name: Same.
+    :param wgrib2_exe_name: Same.
+    :param raise_error_if_missing: Same.
+    :param top_field_store_dir_name: Name of top-level directory with field
+        stores.  If None, will read only grib files.
+    :return: interp_table: Same.
+    """
+
+    error_checking.assert_is_boolean(use_all_grids)
+    nwp_model_utils.check_model_name(model_name)
+    if top_field_store_dir_name is not None:
+        error_checking.assert_is_string(top_field_store_dir_name)
+
+    if model_name == nwp_model_utils.NARR_MODEL_NAME or use_all_grids:
+        grid_ids = _get_grids_for_model(model_name)
+    else:
+        grid_ids = [grid_id]
+
+    num_grids = len(grid_ids)
+    row_indices_by_grid = [numpy.array([], dtype=int)] * num_grids
+    column_indices_by_grid = [numpy.array([], dtype=int)] * num_grids
+
+    for g in range(num_grids):
+        (this_query_point_table, _, metadata_dict
+        ) = _prep_to_interp_nwp_from_xy_grid(
+            query_point_table=copy.deepcopy(query_point_table),
+            model_name=model_name, grid_id=grid_ids[g], field_names=field_names,
+            field_names_grib1=field_names_grib1)
+
+        row_indices_by_grid[g], column_indices_by_grid[g] = (
+            _get_nn_interp_plan(
+                sorted_grid_point_x_metres=metadata_dict[GRID_POINT_X_KEY],
+                sorted_grid_point_y_metres=metadata_dict[GRID_POINT_Y_KEY],
+                query_x_coords_metres=this_query_point_table[
+                    QUERY_X_COLUMN].values,
+                query_y_coords_metres=this_query_point_table[
+                    QUERY_Y_COLUMN].values)
+        )
+
+    # If only one component of a grid-relative wind vector is requested, the
+    # other component must still be read (for rotation).
+    num_fields = len(field_names)
+    rotate_wind_flags = metadata_dict[ROTATE_WIND_FLAGS_KEY]
+    cube_field_names_grib1 = copy.deepcopy(field_names_grib1)
+    other_wind_component_indices = copy.deepcopy(
+        metadata_dict[OTHER_WIND_COMPONENT_INDICES_KEY])
+
+    for j in range(num_fields):
+        if rotate_wind_flags[j] and other_wind_component_indices[j] == -1:
+            cube_field_names_grib1.append(
+                metadata_dict[FIELD_NAMES_OTHER_COMPONENT_KEY][j])
+            other_wind_component_indices[j] = len(cube_field_names_grib1) - 1
+
+    u_wind_indices = []
+    v_wind_indices = []
+
+    for j in range(num_fields):
+        if not rotate_wind_flags[j]:
+            continue
+
+        if grib_io.is_u_wind_field(field_names_grib1[j]):
+            this_u_index = j
+            this_v_index = other_wind_component_indices[j]
+        else:
+            this_u_index = other_wind_component_indices[j]
+            this_v_index = j
+
+        if this_u_index in u_wind_indices:
+            continue
+
+        u_wind_indices.append(this_u_index)
+        v_wind_indices.append(this_v_index)
+
+    u_wind_indices = numpy.array(u_wind_indices, dtype=int)
+    v_wind_indices = numpy.array(v_wind_indices, dtype=int)
+
+    _, init_time_step_hours = nwp_model_utils.get_time_steps(model_name)
+    init_times_unix_sec, query_to_model_times_table = (
+        nwp_model_utils.get_times_needed_for_interp(
+            query_times_unix_sec=query_point_table[QUERY_TIME_COLUMN].values,
+            model_time_step_hours=init_time_step_hours,
+            method_string=temporal_interp_method_string))
+
+    query_times_unix_sec = query_point_table[QUERY_TIME_COLUMN].values
+    range_index_by_query_point = _find_query_time_ranges(
+        query_times_unix_sec=query_times_unix_sec,
+        query_to_model_times_table=query_to_model_times_table)
+    init_time_needed_matrix = numpy.vstack(tuple(
+        query_to_model_times_table[
+            nwp_model_utils.MODEL_TIMES_NEEDED_COLUMN].values
+    )).astype(bool)
+
+    num_init_times = len(init_times_unix_sec)
+    query_indices_by_init_time = [numpy.array([], dtype=int)] * num_init_times
+    spatial_interp_matrix_by_init_time = [None] * num_init_times
+
+    for t in range(num_init_times):
+        query_indices_by_init_time[t] = numpy.where(numpy.in1d(
+            range_index_by_query_point,
+            numpy.where(init_time_needed_matrix[:, t])[0]
+        ))[0]
+
+        if len(query_indices_by_init_time[t]) == 0:
+            continue
+
+        print (
+            'Reading {0:d} fields from model run initialized at {1:d} (needed '
+            'for {2:d} query points)...'
+        ).format(len(cube_field_names_grib1), init_times_unix_sec[t],
+                 len(query_indices_by_init_time[t]))
+
+        these_query_indices = query_indices_by_init_time[t]
+        this_value_matrix = None
+
+        if top_field_store_dir_name is not None:
+            this_value_matrix, _ = _read_nwp_from_field_store(
+                init_time_unix_sec=init_times_unix_sec[t],
+                field_names_grib1=cube_field_names_grib1,
+                model_name=model_name, grid_ids=grid_ids,
+                top_field_store_dir_name=top_field_store_dir_name,
+                row_indices_by_grid=[
+                    r[these_query_indices] for r in row_indices_by_grid],
+                column_indices_by_grid=[
+                    c[these_query_indices] for c in column_indices_by_grid]
+            )
+
+        if this_value_matrix is None:
+            field_cube, this_grid_id = _read_nwp_field_cube(
+                init_time_unix_sec=init_times_unix_sec[t],
+                field_names_grib1=cube_field_names_grib1,
+                model_name=model_name, grid_ids=grid_ids,
+                top_grib_directory_name=top_grib_directory_name,
+                wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
+                raise_error_if_missing=raise_error_if_missing)
+
+            if field_cube is None:
+                continue
+
+            this_grid_index = grid_ids.index(this_grid_id)
+            this_value_matrix = field_cube[
+                :, row_indices_by_grid[this_grid_index][these_query_indices],
+                column_indices_by_grid[this_grid_index][these_query_indices]
+            ]
+            del field_cube
+
+        # All wind vectors (at all pressure levels) are rotated at once.
+        if len(u_wind_indices) > 0:
+            (this_value_matrix[u_wind_indices, :],
+             this_value_matrix[v_wind_indices, :]
+            ) = nwp_model_utils.rotate_winds_to_earth_relative(
+                u_winds_grid_relative_m_s01=this_value_matrix[
+                    u_wind_indices, :],
+                v_winds_grid_relative_m_s01=this_value_matrix[
+                    v_wind_indices, :],
+                rotation_angle_cosines=metadata_dict[ROTATION_COSINES_KEY][
+                    these_query_indices],
+                rotation_angle_sines=metadata_dict[ROTATION_SINES_KEY][
+                    these_query_indices])
+
+        spatial_interp_matrix_by_init_time[t] = this_value_matrix[
+            :num_fields, :]
+
+    num_query_points = len(query_times_unix_sec)
+    interp_matrix = numpy.full((num_fields, num_query_points), numpy.nan)
+
+    for i in range(len(query_to_model_times_table.index)):
+        query_indices_in_this_range = numpy.where(
+            range_index_by_query_point == i)[0]
+        init_time_needed_indices = numpy.where(init_time_needed_matrix[i, :])[0]
+
+        if len(query_indices_in_this_range) == 0:
+            continue
+        if any([spatial_interp_matrix_by_init_time[t] is None
+                for t in init_time_needed_indices]):
+            continue
+
+        # Matrix is F x Q_i x T_i, where Q_i is the number of query points in
+        # this range and T_i is the number of initialization times needed.
+        spatial_interp_matrix_3d = numpy.stack(tuple([
+            spatial_interp_matrix_by_init_time[t][
+                :, numpy.searchsorted(query_indices_by_init_time[t],
+                                      query_indices_in_this_range)
+            ]
+            for t in init_time_needed_indices
+        ]), axis=-1)
+
+        (these_unique_query_times_unix_sec,
+         these_query_times_orig_to_unique
+        ) = numpy.unique(
+            query_times_unix_sec[query_indices_in_this_range],
+            return_inverse=True)
+
+        for k in range(len(these_unique_query_times_unix_sec)):
+            these_indices = numpy.where(
+                these_query_times_orig_to_unique == k)[0]
+            this_input_matrix = spatial_interp_matrix_3d[:, these_indices, :]
+
+            these_interp_values = interp_in_time(
+                input_matrix=numpy.reshape(
+                    this_input_matrix, (-1, this_input_matrix.shape[-1])),
+                sorted_input_times_unix_sec=init_times_unix_sec[
+                    init_time_needed_indices],
+                query_times_unix_sec=these_unique_query_times_unix_sec[[k]],
+                method_string=temporal_interp_method_string,
+                extrapolate=False)
+
+            interp_matrix[
+                :, query_indices_in_this_range[these_indices]
+            ] = numpy.reshape(these_interp_values[:, 0],
+                              (num_fields, len(these_indices)))
+
+    interp_dict = {}
+    for j in range(num_fields):
+        interp_dict.update({field_names[j]: interp_matrix[j, :]})
+
+    return pandas.DataFrame.from_dict(interp_dict)
+
+
 def interp_temperature_surface_from_nwp(
         query_point_table, query_time_unix_sec, critical_temperature_kelvins,
         model_name, top_grib_directory_name, use_all_grids=True, grid_id=None,
@@ -1091,134 +1759,335 @@ def interp_temperature_surface_from_nwp(
     num_pressure_levels = len(pressure_levels_mb)
     num_query_points = len(query_point_table.index)
 
-    warm_temp_by_query_point_kelvins = numpy.full(num_query_points, numpy.nan)
-    warm_height_by_query_point_m_asl = numpy.full(num_query_points, numpy.nan)
-    cold_temp_by_query_point_kelvins = numpy.full(num_query_points, numpy.nan)
-    cold_height_by_query_point_m_asl = numpy.full(num_query_points, numpy.nan)
+    # Levels are searched from the bottom up.  Once every query point has a
+    # level colder than the critical temperature, higher levels are not read.
+    temperature_matrix_kelvins = numpy.full(
+        (num_pressure_levels, num_query_points), numpy.nan)
+    height_matrix_m_asl = numpy.full(
+        (num_pressure_levels, num_query_points), numpy.nan)
+    cold_level_found_flags = numpy.full(num_query_points, False, dtype=bool)
 
     for k in range(num_pressure_levels):
-        these_query_point_indices = numpy.where(
-            numpy.isnan(cold_height_by_query_point_m_asl))[0]
-        if not len(these_query_point_indices):
-            continue
+        if numpy.all(cold_level_found_flags):
+            break
 
-        (list_of_2d_height_grids_m_asl, _, missing_data
-        ) = _read_nwp_for_interp_any_grid(
-            init_times_unix_sec=init_times_unix_sec,
-            query_to_model_times_row=query_to_model_times_table,
-            field_name_grib1=height_field_names_grib1[k],
-            field_name_other_wind_component_grib1='',
-            list_of_model_grids=[None] * num_init_times,
-            list_of_model_grids_other_wind_component=[None] * num_init_times,
-            model_name=model_name,
-            top_grib_directory_name=top_grib_directory_name,
-            wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
-            raise_error_if_missing=raise_error_if_missing)
+        list_of_2d_grids_by_field = [None, None]
+        for m, these_field_names_grib1 in enumerate(
+                [temperature_field_names_grib1, height_field_names_grib1]):
+            (list_of_2d_grids_by_field[m], _, missing_data
+            ) = _read_nwp_for_interp_any_grid(
+                init_times_unix_sec=init_times_unix_sec,
+                query_to_model_times_row=query_to_model_times_table,
+                field_name_grib1=these_field_names_grib1[k],
+                field_name_other_wind_component_grib1='',
+                list_of_model_grids=[None] * num_init_times,
+                list_of_model_grids_other_wind_component=
+                [None] * num_init_times,
+                model_name=model_name,
+                top_grib_directory_name=top_grib_directory_name,
+                wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
+                raise_error_if_missing=raise_error_if_missing)
+
+            if missing_data:
+                break
 
         if missing_data:
             continue
 
-        (list_of_2d_temp_grids_kelvins, _, missing_data
-        ) = _read_nwp_for_interp_any_grid(
-            init_times_unix_sec=init_times_unix_sec,
-            query_to_model_times_row=query_to_model_times_table,
-            field_name_grib1=temperature_field_names_grib1[k],
-            field_name_other_wind_component_grib1='',
-            list_of_model_grids=[None] * num_init_times,
-            list_of_model_grids_other_wind_component=[None] * num_init_times,
-            model_name=model_name,
-            top_grib_directory_name=top_grib_directory_name,
-            wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
-            raise_error_if_missing=raise_error_if_missing)
+        these_query_point_indices = numpy.where(
+            numpy.invert(cold_level_found_flags))[0]
+        list_of_interp_matrices = [None, None]
+
+        for m in range(2):
+            list_of_sinterp_arrays = [numpy.array([])] * num_init_times
+
+            for i in range(num_init_times):
+                this_grid_id = nwp_model_utils.dimensions_to_grid_id(
+                    numpy.array(list_of_2d_grids_by_field[0][i].shape))
+                this_grid_index = grid_ids.index(this_grid_id)
+
+                list_of_sinterp_arrays[i] = interp_from_xy_grid_to_points(
+                    input_matrix=list_of_2d_grids_by_field[m][i],
+                    sorted_grid_point_x_metres=x_points_by_grid_metres[
+                        this_grid_index],
+                    sorted_grid_point_y_metres=y_points_by_grid_metres[
+                        this_grid_index],
+                    query_x_coords_metres=query_point_table_by_grid[
+                        this_grid_index][QUERY_X_COLUMN].values[
+                            these_query_point_indices],
+                    query_y_coords_metres=query_point_table_by_grid[
+                        this_grid_index][QUERY_Y_COLUMN].values[
+                            these_query_point_indices],
+                    method_string=spatial_interp_method_string,
+                    spline_degree=spline_degree, extrapolate=True)
+
+            list_of_interp_matrices[m] = interp_in_time(
+                input_matrix=_stack_1d_arrays_horizontally(
+                    list_of_sinterp_arrays),
+                sorted_input_times_unix_sec=init_times_unix_sec,
+                query_times_unix_sec=numpy.array(
+                    [query_time_unix_sec], dtype=int),
+                method_string=temporal_interp_method_string,
+                extrapolate=False)
+
+        temperature_matrix_kelvins[k, these_query_point_indices] = (
+            list_of_interp_matrices[0][:, 0])
+        height_matrix_m_asl[k, these_query_point_indices] = (
+            list_of_interp_matrices[1][:, 0])
+
+        with numpy.errstate(invalid='ignore'):
+            cold_level_found_flags[these_query_point_indices] = (
+                numpy.logical_and(
+                    list_of_interp_matrices[0][:, 0] <
+                    critical_temperature_kelvins,
+                    numpy.invert(numpy.isnan(list_of_interp_matrices[1][:, 0]))
+                )
+            )
+
+    return _find_temperature_surface_in_columns(
+        temperature_matrix_kelvins=temperature_matrix_kelvins,
+        height_matrix_m_asl=height_matrix_m_asl,
+        target_temperature_kelvins=critical_temperature_kelvins)
+
+
+def get_temperature_surface_on_nwp_grid(
+        query_time_unix_sec, critical_temperature_kelvins, model_name,
+        top_grib_directory_name, use_all_grids=True, grid_id=None,
+        temporal_interp_method_string=PREV_NEIGHBOUR_METHOD_STRING,
+        wgrib_exe_name=grib_io.WGRIB_EXE_NAME_DEFAULT,
+        wgrib2_exe_name=grib_io.WGRIB2_EXE_NAME_DEFAULT,
+        raise_error_if_missing=False, top_field_store_dir_name=None):
+    """Finds temperature (isothermal) surface at each NWP grid point.
+
+    Pressure levels are read from the bottom up,
+    `NUM_LEVELS_PER_READ_FOR_ISOSURFACE` at a time.  For each
+    model-initialization time needed, temperature and height at these levels
+    are read into one cube.  The cubes are interpolated to the query time, and
+    then all vertical columns are searched at once (see
+    `_find_temperature_surface_in_columns`).  Once every column has a level
+    colder than the critical temperature (with a valid height), higher levels
+    are not read, since they cannot change the result.
+
+    All initialization times must come from the same grid.  This method uses
+    the first grid (highest resolution if `use_all_grids = True`) with data for
+    all initialization times needed.
+
+    M = number of rows in grid
+    N = number of columns in grid
+
+    :param query_time_unix_sec: Query time.
+    :param critical_temperature_kelvins: Temperature of isosurface.
+    :param model_name: See doc for `interp_nwp_from_xy_grid`.
+    :param top_grib_directory_name: Same.
+    :param use_all_grids: Same.
+    :param grid_id: Same.
+    :param temporal_interp_method_string: Same.
+    :param wgrib_exe_name: Same.
+    :param wgrib2_exe_name: Same.
+    :param raise_error_if_missing: Same.
+    :param top_field_store_dir_name: See doc for
+        `interp_nwp_from_xy_grid_by_init_time`.
+    :return: isosurface_height_matrix_m_asl: M-by-N numpy array with heights of
+        temperature isosurface (metres above sea level).  If no grid has all the
+        data needed, this is None.
+    :return: grid_id: ID of grid used.  If no grid has all the data needed,
+        this is None.
+    """
+
+    error_checking.assert_is_integer(query_time_unix_sec)
+    error_checking.assert_is_geq(critical_temperature_kelvins, 0.)
+    error_checking.assert_is_boolean(use_all_grids)
+    nwp_model_utils.check_model_name(model_name)
+
+    if model_name == nwp_model_utils.NARR_MODEL_NAME or use_all_grids:
+        grid_ids = _get_grids_for_model(model_name)
+    else:
+        grid_ids = [grid_id]
+
+    _, init_time_step_hours = nwp_model_utils.get_time_steps(model_name)
+    init_times_unix_sec, query_to_model_times_table = (
+        nwp_model_utils.get_times_needed_for_interp(
+            query_times_unix_sec=numpy.array([query_time_unix_sec], dtype=int),
+            model_time_step_hours=init_time_step_hours,
+            method_string=temporal_interp_method_string))
+
+    init_time_needed_flags = query_to_model_times_table[
+        nwp_model_utils.MODEL_TIMES_NEEDED_COLUMN].values[0]
+    init_times_unix_sec = init_times_unix_sec[init_time_needed_flags]
+    num_init_times = len(init_times_unix_sec)
+
+    num_grids = len(grid_ids)
+
+    for g in range(num_grids):
+        num_grid_rows, num_grid_columns = nwp_model_utils.get_grid_dimensions(
+            model_name=model_name, grid_id=grid_ids[g])
+        num_columns = num_grid_rows * num_grid_columns
+
+        # Levels are sorted from bottom to top.
+        pressure_levels_mb = numpy.sort(nwp_model_utils.get_pressure_levels(
+            model_name=model_name, grid_id=grid_ids[g]))[::-1]
+        num_pressure_levels = len(pressure_levels_mb)
+
+        temperature_matrix_kelvins = numpy.full(
+            (num_pressure_levels, num_columns), numpy.nan)
+        height_matrix_m_asl = numpy.full(
+            (num_pressure_levels, num_columns), numpy.nan)
+        cold_level_found_flags = numpy.full(num_columns, False, dtype=bool)
+        missing_data = False
+
+        for k in range(0, num_pressure_levels,
+                       NUM_LEVELS_PER_READ_FOR_ISOSURFACE):
+            if numpy.all(cold_level_found_flags):
+                break
+
+            these_levels_mb = pressure_levels_mb[
+                k:(k + NUM_LEVELS_PER_READ_FOR_ISOSURFACE)]
+            this_num_levels = len(these_levels_mb)
+
+            these_field_names_grib1 = [
+                '{0:s}:{1:d} mb'.format(TEMPERATURE_NAME_GRIB1, int(p))
+                for p in these_levels_mb
+            ] + [
+                '{0:s}:{1:d} mb'.format(HEIGHT_NAME_GRIB1, int(p))
+                for p in these_levels_mb
+            ]
+
+            list_of_field_cubes = [None] * num_init_times
+
+            for i in range(num_init_times):
+                print (
+                    'Reading temperature and height from {0:d} to {1:d} mb '
+                    'from model run initialized at {2:d}...'
+                ).format(int(these_levels_mb[0]), int(these_levels_mb[-1]),
+                         init_times_unix_sec[i])
+
+                list_of_field_cubes[i] = _read_nwp_field_cube(
+                    init_time_unix_sec=init_times_unix_sec[i],
+                    field_names_grib1=these_field_names_grib1,
+                    model_name=model_name, grid_ids=[grid_ids[g]],
+                    top_grib_directory_name=top_grib_directory_name,
+                    wgrib_exe_name=wgrib_exe_name,
+                    wgrib2_exe_name=wgrib2_exe_name,
+                    raise_error_if_missing=(
+                        raise_error_if_missing and g == num_grids - 1),
+                    top_field_store_dir_name=top_field_store_dir_name
+                )[0]
+
+                if list_of_field_cubes[i] is None:
+                    missing_data = True
+                    break
+
+            if missing_data:
+                break
+
+            field_cube = interp_in_time(
+                input_matrix=numpy.stack(tuple(list_of_field_cubes), axis=-1),
+                sorted_input_times_unix_sec=init_times_unix_sec,
+                query_times_unix_sec=numpy.array(
+                    [query_time_unix_sec], dtype=int),
+                method_string=temporal_interp_method_string, extrapolate=False
+            )[..., 0]
+            del list_of_field_cubes
+
+            field_cube = numpy.reshape(
+                field_cube, (field_cube.shape[0], num_columns))
+            temperature_matrix_kelvins[k:(k + this_num_levels), :] = (
+                field_cube[:this_num_levels, :])
+            height_matrix_m_asl[k:(k + this_num_levels), :] = (
+                field_cube[this_num_levels:, :])
+
+            with numpy.errstate(invalid='ignore'):
+                cold_level_found_flags = numpy.logical_or(
+                    cold_level_found_flags,
+                    numpy.any(numpy.logical_and(
+                        field_cube[:this_num_levels, :] <
+                        critical_temperature_kelvins,
+                        numpy.invert(numpy.isnan(
+                            field_cube[this_num_levels:, :]))
+                    ), axis=0)
+                )
 
         if missing_data:
             continue
 
-        list_of_sinterp_temp_arrays_kelvins = [numpy.array([])] * num_init_times
-        for i in range(num_init_times):
-            this_grid_id = nwp_model_utils.dimensions_to_grid_id(
-                numpy.array(list_of_2d_temp_grids_kelvins[i].shape))
-            this_grid_index = grid_ids.index(this_grid_id)
+        isosurface_height_vector_m_asl = _find_temperature_surface_in_columns(
+            temperature_matrix_kelvins=temperature_matrix_kelvins,
+            height_matrix_m_asl=height_matrix_m_asl,
+            target_temperature_kelvins=critical_temperature_kelvins)
 
-            list_of_sinterp_temp_arrays_kelvins[
-                i
-            ] = interp_from_xy_grid_to_points(
-                input_matrix=list_of_2d_temp_grids_kelvins[i],
-                sorted_grid_point_x_metres=x_points_by_grid_metres[
-                    this_grid_index],
-                sorted_grid_point_y_metres=y_points_by_grid_metres[
-                    this_grid_index],
-                query_x_coords_metres=query_point_table_by_grid[
-                    this_grid_index][QUERY_X_COLUMN].values[
-                        these_query_point_indices],
-                query_y_coords_metres=query_point_table_by_grid[
-                    this_grid_index][QUERY_Y_COLUMN].values[
-                        these_query_point_indices],
-                method_string=spatial_interp_method_string,
-                spline_degree=spline_degree, extrapolate=True)
-
-        spatal_interp_temp_matrix_kelvins = _stack_1d_arrays_horizontally(
-            [list_of_sinterp_temp_arrays_kelvins[i]
-             for i in range(num_init_times)])
-        these_interp_temps_kelvins = interp_in_time(
-            input_matrix=spatal_interp_temp_matrix_kelvins,
-            sorted_input_times_unix_sec=init_times_unix_sec,
-            query_times_unix_sec=numpy.array([query_time_unix_sec], dtype=int),
-            method_string=temporal_interp_method_string, extrapolate=False)
-
-        these_cold_interp_indices = numpy.where(
-            these_interp_temps_kelvins < critical_temperature_kelvins)[0]
-        these_warm_interp_indices = numpy.where(
-            these_interp_temps_kelvins >= critical_temperature_kelvins)[0]
-        these_cold_query_point_indices = these_query_point_indices[
-            these_cold_interp_indices]
-        these_warm_query_point_indices = these_query_point_indices[
-            these_warm_interp_indices]
-        cold_temp_by_query_point_kelvins[these_cold_query_point_indices] = (
-            these_interp_temps_kelvins[these_cold_interp_indices])
-        warm_temp_by_query_point_kelvins[these_warm_query_point_indices] = (
-            these_interp_temps_kelvins[these_warm_interp_indices])
-
-        list_of_sinterp_height_arrays_m_asl = [numpy.array([])] * num_init_times
-        for i in range(num_init_times):
-            this_grid_id = nwp_model_utils.dimensions_to_grid_id(
-                numpy.array(list_of_2d_temp_grids_kelvins[i].shape))
-            this_grid_index = grid_ids.index(this_grid_id)
+        return (
+            numpy.reshape(isosurface_height_vector_m_asl,
+                          (num_grid_rows, num_grid_columns)),
+            grid_ids[g]
+        )
 
-            list_of_sinterp_height_arrays_m_asl[
-                i
-            ] = interp_from_xy_grid_to_points(
-                input_matrix=list_of_2d_height_grids_m_asl[i],
-                sorted_grid_point_x_metres=x_points_by_grid_metres[
-                    this_grid_index],
-                sorted_grid_point_y_metres=y_points_by_grid_metres[
-                    this_grid_index],
-                query_x_coords_metres=query_point_table_by_grid[
-                    this_grid_index][QUERY_X_COLUMN].values[
-                        these_query_point_indices],
-                query_y_coords_metres=query_point_table_by_grid[
-                    this_grid_index][QUERY_Y_COLUMN].values[
-                        these_query_point_indices],
-                method_string=spatial_interp_method_string,
-                spline_degree=spline_degree, extrapolate=True)
-
-        spatal_interp_height_matrix_m_asl = _stack_1d_arrays_horizontally(
-            [list_of_sinterp_height_arrays_m_asl[i]
-             for i in range(num_init_times)])
-        these_interp_heights_m_asl = interp_in_time(
-            input_matrix=spatal_interp_height_matrix_m_asl,
-            sorted_input_times_unix_sec=init_times_unix_sec,
-            query_times_unix_sec=numpy.array([query_time_unix_sec], dtype=int),
-            method_string=temporal_interp_method_string, extrapolate=False)
+    return None, None
 
-        cold_height_by_query_point_m_asl[these_cold_query_point_indices] = (
-            these_interp_heights_m_asl[these_cold_interp_indices])
-        warm_height_by_query_point_m_asl[these_warm_query_point_indices] = (
-            these_interp_heights_m_asl[these_warm_interp_indices])
 
-    return _find_heights_with_temperature(
-        warm_temperatures_kelvins=warm_temp_by_query_point_kelvins,
-        cold_temperatures_kelvins=cold_temp_by_query_point_kelvins,
-        warm_heights_m_asl=warm_height_by_query_point_m_asl,
-        cold_heights_m_asl=cold_height_by_query_point_m_asl,
-        target_temperature_kelvins=critical_temperature_kelvins)
+def interp_temperature_surface_from_nwp_grid(
+        query_point_table, query_time_unix_sec, critical_temperature_kelvins,
+        model_name, top_grib_directory_name, use_all_grids=True, grid_id=None,
+        temporal_interp_method_string=PREV_NEIGHBOUR_METHOD_STRING,
+        wgrib_exe_name=grib_io.WGRIB_EXE_NAME_DEFAULT,
+        wgrib2_exe_name=grib_io.WGRIB2_EXE_NAME_DEFAULT,
+        raise_error_if_missing=False, top_field_store_dir_name=None):
+    """Interpolates temperature (isothermal) surface from NWP model.
+
+    Unlike `interp_temperature_surface_from_nwp`, which interpolates
+    temperature and height to query points and then searches for the
+    isosurface, this method finds the isosurface on the NWP grid (see
+    `get_temperature_surface_on_nwp_grid`) and then interpolates it bilinearly
+    to the query points.  This is much cheaper when there are many more query
+    points than grid points (e.g., for a radar grid).
+
+    Q = number of query points
+
+    :param query_point_table: See doc for `interp_temperature_surface_from_nwp`.
+    :param query_time_unix_sec: Same.
+    :param critical_temperature_kelvins: Same.
+    :param model_name: Same.
+    :param top_grib_directory_name: Same.
+    :param use_all_grids: Same.
+    :param grid_id: Same.
+    :param temporal_interp_method_string: Same.
+    :param wgrib_exe_name: Same.
+    :param wgrib2_exe_name: Same.
+    :param raise_error_if_missing: Same.
+    :param top_field_store_dir_name: See doc for
+        `get_temperature_surface_on_nwp_grid`.
+    :return: isosurface_heights_m_asl: length-Q numpy array with heights of
+        temperature isosurface (metres above sea level).
+    """
+
+    isosurface_height_matrix_m_asl, grid_id = (
+        get_temperature_surface_on_nwp_grid(
+            query_time_unix_sec=query_time_unix_sec,
+            critical_temperature_kelvins=critical_temperature_kelvins,
+            model_name=model_name,
+            top_grib_directory_name=top_grib_directory_name,
+            use_all_grids=use_all_grids, grid_id=grid_id,
+            temporal_interp_method_string=temporal_interp_method_string,
+            wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
+            raise_error_if_missing=raise_error_if_missing,
+            top_field_store_dir_name=top_field_store_dir_name)
+    )
+
+    num_query_points = len(query_point_table.index)
+    if isosurface_height_matrix_m_asl is None:
+        return numpy.full(num_query_points, numpy.nan)
+
+    grid_point_x_metres, grid_point_y_metres = (
+        nwp_model_utils.get_xy_grid_points(
+            model_name=model_name, grid_id=grid_id))
+
+    query_x_metres, query_y_metres = nwp_model_utils.project_latlng_to_xy(
+        latitudes_deg=query_point_table[QUERY_LAT_COLUMN].values,
+        longitudes_deg=query_point_table[QUERY_LNG_COLUMN].values,
+        model_name=model_name, grid_id=grid_id)
+
+    return _bilinear_interp_from_xy_grid_to_points(
+        input_matrix=isosurface_height_matrix_m_asl,
+        sorted_grid_point_x_metres=grid_point_x_metres,
+        sorted_grid_point_y_metres=grid_point_y_metres,
+        query_x_coords_metres=query_x_metres,
+        query_y_coords_metres=query_y_metres)
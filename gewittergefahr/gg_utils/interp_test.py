@@ -69,6 +69,19 @@ TARGET_HEIGHTS_M_ASL = numpy.array(
     [2000., 2000., numpy.nan, 2166.666667, 2250., 2500., 2250., 2333.333333,
      2500., numpy.nan, numpy.nan, numpy.nan])
 
+# The following constants are used to test
+# _find_temperature_surface_in_columns.
+COLUMN_TEMPERATURE_MATRIX_KELVINS = numpy.array(
+    [[12., 12., 12., 12., 8.],
+     [10., numpy.nan, 11., 11., 7.],
+     [8., 8., 8., 10.5, 6.]])
+COLUMN_HEIGHT_MATRIX_M_ASL = numpy.array(
+    [[1000., 1000., 1000., 1000., 1000.],
+     [2000., 2000., 2000., 2000., 2000.],
+     [3000., 3000., numpy.nan, 3000., 3000.]])
+COLUMN_TARGET_HEIGHTS_M_ASL = numpy.array(
+    [2000., 2000., numpy.nan, numpy.nan, numpy.nan])
+
 # The following constants are used to test interp_in_time.
 INPUT_MATRIX_TIME0 = numpy.array([[0., 2., 5., 10.],
                                   [-2., 1., 3., 6.],
@@ -138,11 +151,31 @@ QUERY_Y_FOR_NEAREST_NEIGH_METRES = numpy.array(
     [0.5, 1.5, 2.5, 4., 5.5, 6.5, 7.7])
 INTERP_VALUES_NEAREST_NEIGH = numpy.array([17., 23., 5., 6., 19., 19., 2])
 
+NEAREST_NEIGH_ROW_INDICES = numpy.array([0, 1, 1, 2, 3, 3, 4], dtype=int)
+NEAREST_NEIGH_COLUMN_INDICES = numpy.array([0, 0, 1, 1, 2, 2, 3], dtype=int)
+
 QUERY_X_FOR_EXTRAP_METRES = numpy.array([-1., 4.])
 QUERY_Y_FOR_EXTRAP_METRES = numpy.array([-2., 10.])
 SPATIAL_EXTRAP_VALUES = numpy.array([17., 2.])
 
 
+# The following constants are used to test
+# _bilinear_interp_from_xy_grid_to_points.
+MATRIX_WITH_NAN = numpy.array([[0., 1., 2.],
+                               [10., 11., numpy.nan]])
+GRID_POINT_X_FOR_NAN_METRES = numpy.array([0., 1., 2.])
+GRID_POINT_Y_FOR_NAN_METRES = numpy.array([0., 1.])
+QUERY_X_FOR_NAN_METRES = numpy.array([0.5, 1.5, -1., 3., 0.25])
+QUERY_Y_FOR_NAN_METRES = numpy.array([0.5, 0.5, 0., 2., 0.])
+INTERP_VALUES_WITH_NAN = numpy.array(
+    [5.5, 14. / 3, 0., numpy.nan, 0.25])
+
+# The following constants are used to test _find_nearest_indices.
+SORTED_VALUES_FOR_NEAREST = numpy.array([0., 2., 4.])
+TEST_VALUES_FOR_NEAREST = numpy.array([-1., 0.5, 1., 2.9, 3., 5.])
+NEAREST_INDICES = numpy.array([0, 0, 1, 1, 2, 2], dtype=int)
+
+
 def _compare_metadata_dicts(first_metadata_dict, second_metadata_dict):
     """Compares two dicts created by `interp._get_wind_rotation_metadata`.
 
@@ -264,6 +297,18 @@ class InterpTests(unittest.TestCase):
             these_heights_m_asl, TARGET_HEIGHTS_M_ASL, atol=TOLERANCE,
             equal_nan=True))
 
+    def test_find_temperature_surface_in_columns(self):
+        """Ensures correct output from _find_temperature_surface_in_columns."""
+
+        these_heights_m_asl = interp._find_temperature_surface_in_columns(
+            temperature_matrix_kelvins=COLUMN_TEMPERATURE_MATRIX_KELVINS,
+            height_matrix_m_asl=COLUMN_HEIGHT_MATRIX_M_ASL,
+            target_temperature_kelvins=TARGET_TEMPERATURE_KELVINS)
+
+        self.assertTrue(numpy.allclose(
+            these_heights_m_asl, COLUMN_TARGET_HEIGHTS_M_ASL, atol=TOLERANCE,
+            equal_nan=True))
+
     def test_check_temporal_interp_method_valid(self):
         """Ensures correct output from check_temporal_interp_method.
 
@@ -398,6 +443,28 @@ class InterpTests(unittest.TestCase):
         self.assertTrue(numpy.allclose(
             these_interp_values, SPATIAL_EXTRAP_VALUES, atol=TOLERANCE))
 
+    def test_find_nearest_indices(self):
+        """Ensures correct output from _find_nearest_indices."""
+
+        these_indices = interp._find_nearest_indices(
+            sorted_input_values=SORTED_VALUES_FOR_NEAREST,
+            test_values=TEST_VALUES_FOR_NEAREST)
+        self.assertTrue(numpy.array_equal(these_indices, NEAREST_INDICES))
+
+    def test_get_nn_interp_plan(self):
+        """Ensures correct output from _get_nn_interp_plan."""
+
+        these_row_indices, these_column_indices = interp._get_nn_interp_plan(
+            sorted_grid_point_x_metres=GRID_POINT_X_METRES,
+            sorted_grid_point_y_metres=GRID_POINT_Y_METRES,
+            query_x_coords_metres=QUERY_X_FOR_NEAREST_NEIGH_METRES,
+            query_y_coords_metres=QUERY_Y_FOR_NEAREST_NEIGH_METRES)
+
+        self.assertTrue(numpy.array_equal(
+            these_row_indices, NEAREST_NEIGH_ROW_INDICES))
+        self.assertTrue(numpy.array_equal(
+            these_column_indices, NEAREST_NEIGH_COLUMN_INDICES))
+
     def test_interp_from_xy_grid_to_points_nearest(self):
         """Ensures correct output from interp_from_xy_grid_to_points.
 
@@ -435,6 +502,24 @@ class InterpTests(unittest.TestCase):
         self.assertTrue(numpy.allclose(
             these_interp_values, SPATIAL_EXTRAP_VALUES, atol=TOLERANCE))
 
+    def test_bilinear_interp_from_xy_grid_to_points(self):
+        """Ensures correct output from _bilinear_interp_from_xy_grid_to_points.
+
+        In this case the input matrix contains NaN, and some query points are
+        outside the grid.
+        """
+
+        these_interp_values = interp._bilinear_interp_from_xy_grid_to_points(
+            input_matrix=MATRIX_WITH_NAN,
+            sorted_grid_point_x_metres=GRID_POINT_X_FOR_NAN_METRES,
+            sorted_grid_point_y_metres=GRID_POINT_Y_FOR_NAN_METRES,
+            query_x_coords_metres=QUERY_X_FOR_NAN_METRES,
+            query_y_coords_metres=QUERY_Y_FOR_NAN_METRES)
+
+        self.assertTrue(numpy.allclose(
+            these_interp_values, INTERP_VALUES_WITH_NAN, atol=TOLERANCE,
+            equal_nan=True))
+
 
 if __name__ == '__main__':
     unittest.main()
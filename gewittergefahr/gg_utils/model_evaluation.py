@@ -16,6 +16,7 @@ Lagerquist, R., McGovern, A., and Smith, T., 2017: Machine learning for real-
 
 import copy
 import pickle
+import multiprocessing
 import numpy
 import sklearn.metrics
 from gewittergefahr.gg_utils import grids
@@ -37,6 +38,7 @@ MAX_FORECAST_PROB_FOR_XENTROPY = 1. - numpy.finfo(float).eps
 
 DEFAULT_NUM_BOOTSTRAP_ITERS = 100
 DEFAULT_BOOTSTRAP_CONFIDENCE_LEVEL = 0.95
+MAX_RANDOM_SEED = numpy.iinfo(numpy.int32).max
 
 MIN_OPTIMIZATION_DIRECTION = 'min'
 MAX_OPTIMIZATION_DIRECTION = 'max'
@@ -61,6 +63,8 @@ SUCCESS_RATIO_BY_THRESHOLD_KEY = 'success_ratio_by_threshold'
 MAX_CSI_KEY = 'max_csi_over_thresholds'
 MEAN_FORECAST_PROB_BY_BIN_KEY = 'mean_forecast_prob_by_bin'
 MEAN_OBSERVED_LABEL_BY_BIN_KEY = 'mean_observed_label_by_bin'
+NUM_EXAMPLES_BY_BIN_KEY = 'num_examples_by_bin'
+CROSS_ENTROPY_KEY = 'cross_entropy'
 
 FORECAST_PROBABILITIES_KEY = 'forecast_probabilities'
 OBSERVED_LABELS_KEY = 'observed_labels'
@@ -95,6 +99,39 @@ THRESHOLD_ARG_FOR_UNIQUE_FORECASTS = 'unique_forecasts'
 DEFAULT_SUCCESS_RATIO_SPACING = 0.01
 DEFAULT_POD_SPACING = 0.01
 
+ACCUM_THRESHOLDS_KEY = 'binarization_thresholds'
+ACCUM_NUM_FORECASTS_BY_THRESHOLD_KEY = 'num_forecasts_by_threshold'
+ACCUM_NUM_POSITIVES_BY_BIN_KEY = 'num_positives_by_threshold_bin'
+ACCUM_NUM_NEGATIVES_BY_BIN_KEY = 'num_negatives_by_threshold_bin'
+ACCUM_NUM_EXAMPLES_BY_RELIA_BIN_KEY = 'num_examples_by_reliability_bin'
+ACCUM_FORECAST_SUM_BY_RELIA_BIN_KEY = 'forecast_prob_sum_by_reliability_bin'
+ACCUM_LABEL_SUM_BY_RELIA_BIN_KEY = 'observed_label_sum_by_reliability_bin'
+ACCUM_NUM_EXAMPLES_KEY = 'num_examples'
+ACCUM_BRIER_SCORE_SUM_KEY = 'brier_score_sum'
+ACCUM_CROSS_ENTROPY_SUM_KEY = 'cross_entropy_sum'
+
+ACCUMULATOR_KEYS = [
+    ACCUM_THRESHOLDS_KEY, ACCUM_NUM_FORECASTS_BY_THRESHOLD_KEY,
+    ACCUM_NUM_POSITIVES_BY_BIN_KEY, ACCUM_NUM_NEGATIVES_BY_BIN_KEY,
+    ACCUM_NUM_EXAMPLES_BY_RELIA_BIN_KEY, ACCUM_FORECAST_SUM_BY_RELIA_BIN_KEY,
+    ACCUM_LABEL_SUM_BY_RELIA_BIN_KEY, ACCUM_NUM_EXAMPLES_KEY,
+    ACCUM_BRIER_SCORE_SUM_KEY, ACCUM_CROSS_ENTROPY_SUM_KEY
+]
+
+# Keys in the accumulator that are summed when accumulators are merged.
+ADDITIVE_ACCUMULATOR_KEYS = [
+    ACCUM_NUM_FORECASTS_BY_THRESHOLD_KEY, ACCUM_NUM_POSITIVES_BY_BIN_KEY,
+    ACCUM_NUM_NEGATIVES_BY_BIN_KEY, ACCUM_NUM_EXAMPLES_BY_RELIA_BIN_KEY,
+    ACCUM_FORECAST_SUM_BY_RELIA_BIN_KEY, ACCUM_LABEL_SUM_BY_RELIA_BIN_KEY,
+    ACCUM_NUM_EXAMPLES_KEY, ACCUM_BRIER_SCORE_SUM_KEY,
+    ACCUM_CROSS_ENTROPY_SUM_KEY
+]
+
+# Optional keys in the accumulator (lists of 1-D numpy arrays, one per batch,
+# or None if raw forecasts are not kept).
+ACCUM_FORECAST_PROBS_KEY = 'forecast_probs_by_batch'
+ACCUM_OBSERVED_LABELS_KEY = 'observed_labels_by_batch'
+
 
 def _check_forecast_probs_and_observed_labels(
         forecast_probabilities, observed_labels):
@@ -191,6 +228,271 @@ def _split_forecast_probs_into_bins(forecast_probabilities, num_bins):
     return bin_index_by_forecast
 
 
+def _get_threshold_bin_indices(forecast_probabilities, binarization_thresholds):
+    """Assigns each forecast to an interval between binarization thresholds.
+
+    N = number of forecasts
+    T = number of binarization thresholds
+
+    :param forecast_probabilities: length-N numpy array of forecast
+        probabilities.
+    :param binarization_thresholds: length-T numpy array of binarization
+        thresholds, sorted in ascending order.
+    :return: bin_index_by_forecast: length-N numpy array of indices (from
+        0...T).  If bin_index_by_forecast[i] = j, the [i]th forecast is >= the
+        first j thresholds, so it is a "yes" forecast for thresholds 0...(j - 1)
+        and a "no" forecast for all others.
+    """
+
+    return numpy.searchsorted(
+        binarization_thresholds, forecast_probabilities, side='right')
+
+
+def _contingency_tables_from_bin_counts(
+        num_positives_by_bin, num_negatives_by_bin):
+    """Creates contingency tables for all binarization thresholds at once.
+
+    T = number of binarization thresholds
+
+    :param num_positives_by_bin: numpy array of positive examples (observed
+        label = 1) in each threshold bin (created by
+        `_get_threshold_bin_indices`).  The last axis must have length T + 1.
+        Other axes (e.g., one for bootstrap replicates) are allowed.
+    :param num_negatives_by_bin: Same but for negative examples (observed label
+        = 0).
+    :return: contingency_table_as_dict: Dictionary with the same keys as the
+        output of `get_contingency_table`, except that each value is a numpy
+        array with the same shape as the inputs, but with T elements along the
+        last axis.
+    """
+
+    # The [k]th element of the reverse cumulative sum is the number of examples
+    # in bins k...T.  Forecasts in bins (k + 1)...T are >= the [k]th threshold.
+    num_positives_by_threshold = numpy.cumsum(
+        num_positives_by_bin[..., ::-1], axis=-1)[..., ::-1]
+    num_negatives_by_threshold = numpy.cumsum(
+        num_negatives_by_bin[..., ::-1], axis=-1)[..., ::-1]
+
+    num_true_positives = num_positives_by_threshold[..., 1:]
+    num_false_positives = num_negatives_by_threshold[..., 1:]
+
+    return {
+        NUM_TRUE_POSITIVES_KEY: num_true_positives,
+        NUM_FALSE_POSITIVES_KEY: num_false_positives,
+        NUM_FALSE_NEGATIVES_KEY:
+            num_positives_by_threshold[..., [0]] - num_true_positives,
+        NUM_TRUE_NEGATIVES_KEY:
+            num_negatives_by_threshold[..., [0]] - num_false_positives
+    }
+
+
+def _divide_or_nan(numerator_array, denominator_array):
+    """Divides two arrays, returning NaN wherever the denominator is zero.
+
+    This mimics the handling of `ZeroDivisionError` in `get_pod` et al.
+
+    :param numerator_array: numpy array of numerators.
+    :param denominator_array: numpy array of denominators (same shape).
+    :return: quotient_array: numpy array of quotients (same shape).
+    """
+
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        quotient_array = (
+            numpy.array(numerator_array, dtype=float) / denominator_array)
+
+    quotient_array[denominator_array == 0] = numpy.nan
+    return quotient_array
+
+
+def _get_scores_from_contingency_tables(contingency_table_as_dict):
+    """Computes scores for many contingency tables at once.
+
+    :param contingency_table_as_dict: Dictionary created by
+        `_contingency_tables_from_bin_counts`.
+    :return: score_dict: Dictionary with the following keys.  Each value is a
+        numpy array with the same shape as each value in
+        `contingency_table_as_dict`.
+    score_dict['pod']: Probability of detection.
+    score_dict['pofd']: Probability of false detection.
+    score_dict['success_ratio']: Success ratio.
+    score_dict['csi']: Critical success index.
+    score_dict['frequency_bias']: Frequency bias.
+    score_dict['peirce_score']: Peirce score.
+    score_dict['heidke_score']: Heidke score.
+    """
+
+    num_true_positives = contingency_table_as_dict[
+        NUM_TRUE_POSITIVES_KEY].astype(float)
+    num_false_positives = contingency_table_as_dict[
+        NUM_FALSE_POSITIVES_KEY].astype(float)
+    num_false_negatives = contingency_table_as_dict[
+        NUM_FALSE_NEGATIVES_KEY].astype(float)
+    num_true_negatives = contingency_table_as_dict[
+        NUM_TRUE_NEGATIVES_KEY].astype(float)
+
+    pod_array = _divide_or_nan(
+        num_true_positives, num_true_positives + num_false_negatives)
+    pofd_array = _divide_or_nan(
+        num_false_positives, num_false_positives + num_true_negatives)
+
+    num_positives = num_true_positives + num_false_positives
+    num_negatives = num_true_negatives + num_false_negatives
+    num_events = num_true_positives + num_false_negatives
+    num_non_events = num_true_negatives + num_false_positives
+
+    return {
+        POD_KEY: pod_array,
+        POFD_KEY: pofd_array,
+        SUCCESS_RATIO_KEY: _divide_or_nan(num_true_positives, num_positives),
+        CSI_KEY: _divide_or_nan(
+            num_true_positives,
+            num_true_positives + num_false_positives + num_false_negatives),
+        FREQUENCY_BIAS_KEY: _divide_or_nan(num_positives, num_events),
+        PEIRCE_SCORE_KEY: pod_array - pofd_array,
+        HEIDKE_SCORE_KEY: _divide_or_nan(
+            2 * (num_true_positives * num_true_negatives -
+                 num_false_positives * num_false_negatives),
+            num_positives * num_non_events + num_negatives * num_events)
+    }
+
+
+def _bootstrap_bin_sums_one_process(argument_tuple):
+    """Computes binned sums for a subset of bootstrap replicates.
+
+    N = number of examples
+    B = number of bins
+    V = number of variables to sum
+    K = number of bootstrap replicates
+
+    Instead of creating a resampled copy of the data, each replicate is
+    represented by the number of times each example is drawn.  These counts are
+    then used as weights in `numpy.bincount`.
+
+    :param argument_tuple: Tuple with the following elements.
+    argument_tuple[0]: bin_index_by_example: length-N numpy array of bin
+        indices (from 0...[B - 1]).
+    argument_tuple[1]: num_bins: B.
+    argument_tuple[2]: value_matrix: V-by-N numpy array of values to sum.
+    argument_tuple[3]: random_seeds: length-K numpy array of random seeds.  Each
+        seed generates one bootstrap replicate.
+    :return: sum_matrix: K-by-V-by-B numpy array, where sum_matrix[k, v, b] is
+        the sum of the [v]th variable over examples in the [b]th bin for the
+        [k]th replicate.
+    """
+
+    bin_index_by_example, num_bins, value_matrix, random_seeds = argument_tuple
+
+    num_examples = len(bin_index_by_example)
+    num_variables = value_matrix.shape[0]
+    num_replicates = len(random_seeds)
+    sum_matrix = numpy.full(
+        (num_replicates, num_variables, num_bins), numpy.nan)
+
+    for k in range(num_replicates):
+        these_sample_indices = numpy.random.RandomState(
+            seed=random_seeds[k]
+        ).randint(0, high=num_examples, size=num_examples)
+
+        these_draw_counts = numpy.bincount(
+            these_sample_indices, minlength=num_examples
+        ).astype(float)
+
+        for v in range(num_variables):
+            sum_matrix[k, v, :] = numpy.bincount(
+                bin_index_by_example,
+                weights=these_draw_counts * value_matrix[v, :],
+                minlength=num_bins)
+
+    return sum_matrix
+
+
+def _get_bootstrapped_bin_sums(
+        bin_index_by_example, num_bins, value_matrix, num_bootstrap_iters,
+        num_processes):
+    """Computes binned sums for many bootstrap replicates.
+
+    The random seed for each replicate is drawn from the global random-number
+    generator, so results do not depend on `num_processes`.
+
+    :param bin_index_by_example: See doc for `_bootstrap_bin_sums_one_process`.
+    :param num_bins: Same.
+    :param value_matrix: Same.
+    :param num_bootstrap_iters: Number of bootstrap replicates.
+    :param num_processes: Number of processes across which to split the
+        replicates.
+    :return: sum_matrix: See doc for `_bootstrap_bin_sums_one_process`.
+    """
+
+    error_checking.assert_is_integer(num_bootstrap_iters)
+    error_checking.assert_is_greater(num_bootstrap_iters, 1)
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_geq(num_processes, 1)
+
+    random_seeds = numpy.random.randint(
+        0, high=MAX_RANDOM_SEED, size=num_bootstrap_iters)
+
+    if num_processes == 1:
+        return _bootstrap_bin_sums_one_process(
+            (bin_index_by_example, num_bins, value_matrix, random_seeds))
+
+    list_of_argument_tuples = [
+        (bin_index_by_example, num_bins, value_matrix, these_seeds)
+        for these_seeds in numpy.array_split(random_seeds, num_processes)
+        if len(these_seeds) > 0
+    ]
+
+    pool_object = multiprocessing.Pool(processes=num_processes)
+    list_of_sum_matrices = pool_object.map(
+        _bootstrap_bin_sums_one_process, list_of_argument_tuples, chunksize=1)
+    pool_object.close()
+    pool_object.join()
+
+    return numpy.concatenate(list_of_sum_matrices, axis=0)
+
+
+def _bootstrap_pod_pofd_and_sr(
+        forecast_probabilities, observed_labels, binarization_thresholds,
+        num_bootstrap_iters, num_processes):
+    """Computes POD, POFD, and success ratio for many bootstrap replicates.
+
+    T = number of binarization thresholds
+    K = number of bootstrap replicates
+
+    :param forecast_probabilities: See documentation for
+        `_check_forecast_probs_and_observed_labels`.
+    :param observed_labels: See doc for
+        `_check_forecast_probs_and_observed_labels`.
+    :param binarization_thresholds: length-T numpy array of binarization
+        thresholds, sorted in ascending order.
+    :param num_bootstrap_iters: K in the above discussion.
+    :param num_processes: See doc for `_get_bootstrapped_bin_sums`.
+    :return: pod_matrix: T-by-K numpy array of POD values.
+    :return: pofd_matrix: T-by-K numpy array of POFD values.
+    :return: success_ratio_matrix: T-by-K numpy array of success ratios.
+    """
+
+    bin_index_by_example = _get_threshold_bin_indices(
+        forecast_probabilities, binarization_thresholds)
+
+    sum_matrix = _get_bootstrapped_bin_sums(
+        bin_index_by_example=bin_index_by_example,
+        num_bins=len(binarization_thresholds) + 1,
+        value_matrix=numpy.vstack(
+            (observed_labels, 1 - observed_labels)
+        ).astype(float),
+        num_bootstrap_iters=num_bootstrap_iters, num_processes=num_processes)
+
+    contingency_table_as_dict = _contingency_tables_from_bin_counts(
+        num_positives_by_bin=sum_matrix[:, 0, :],
+        num_negatives_by_bin=sum_matrix[:, 1, :])
+
+    score_dict = _get_scores_from_contingency_tables(contingency_table_as_dict)
+
+    return (numpy.transpose(score_dict[POD_KEY]),
+            numpy.transpose(score_dict[POFD_KEY]),
+            numpy.transpose(score_dict[SUCCESS_RATIO_KEY]))
+
+
 def get_binarization_thresholds(
         threshold_arg, forecast_probabilities=None,
         unique_forecast_precision=DEFAULT_PRECISION_FOR_THRESHOLDS):
@@ -318,23 +620,22 @@ def find_best_binarization_threshold(
                                        optimization_direction)
         raise ValueError(error_string)
 
-    possible_thresholds = get_binarization_thresholds(
-        threshold_arg=threshold_arg,
+    possible_thresholds, score_dict = get_scores_at_all_thresholds(
         forecast_probabilities=forecast_probabilities,
+        observed_labels=observed_labels, threshold_arg=threshold_arg,
         unique_forecast_precision=unique_forecast_precision)
 
     num_thresholds = len(possible_thresholds)
     criterion_values = numpy.full(num_thresholds, numpy.nan)
+    contingency_table_keys = [
+        NUM_TRUE_POSITIVES_KEY, NUM_FALSE_POSITIVES_KEY,
+        NUM_FALSE_NEGATIVES_KEY, NUM_TRUE_NEGATIVES_KEY
+    ]
 
     for i in range(num_thresholds):
-        these_forecast_labels = binarize_forecast_probs(
-            forecast_probabilities=forecast_probabilities,
-            binarization_threshold=possible_thresholds[i])
-
-        this_contingency_table_as_dict = get_contingency_table(
-            forecast_labels=these_forecast_labels,
-            observed_labels=observed_labels)
-
+        this_contingency_table_as_dict = dict([
+            (k, int(score_dict[k][i])) for k in contingency_table_keys
+        ])
         criterion_values[i] = criterion_function(this_contingency_table_as_dict)
 
     if optimization_direction == MAX_OPTIMIZATION_DIRECTION:
@@ -383,6 +684,97 @@ def get_contingency_table(forecast_labels, observed_labels):
     }
 
 
+def get_contingency_tables_at_thresholds(
+        forecast_probabilities, observed_labels, binarization_thresholds):
+    """Computes contingency table for each binarization threshold.
+
+    This is equivalent to calling `binarize_forecast_probs` and
+    `get_contingency_table` for each threshold, but the forecasts are binned
+    only once and the tables come from cumulative counts, so the cost is
+    O(N log T + T) rather than O(N * T).
+
+    N = number of forecasts
+    T = number of binarization thresholds
+
+    :param forecast_probabilities: See documentation for
+        `_check_forecast_probs_and_observed_labels`.
+    :param observed_labels: See doc for
+        `_check_forecast_probs_and_observed_labels`.
+    :param binarization_thresholds: length-T numpy array of binarization
+        thresholds, sorted in ascending order.
+    :return: contingency_table_as_dict: Dictionary with the same keys as the
+        output of `get_contingency_table`, except that each value is a length-T
+        integer numpy array.
+    """
+
+    _check_forecast_probs_and_observed_labels(
+        forecast_probabilities, observed_labels)
+
+    error_checking.assert_is_numpy_array(
+        binarization_thresholds, num_dimensions=1)
+    error_checking.assert_is_geq_numpy_array(
+        numpy.diff(binarization_thresholds), 0.)
+
+    num_thresholds = len(binarization_thresholds)
+    bin_index_by_example = _get_threshold_bin_indices(
+        forecast_probabilities, binarization_thresholds)
+
+    num_positives_by_bin = numpy.bincount(
+        bin_index_by_example[observed_labels == 1],
+        minlength=num_thresholds + 1)
+    num_negatives_by_bin = numpy.bincount(
+        bin_index_by_example[observed_labels == 0],
+        minlength=num_thresholds + 1)
+
+    return _contingency_tables_from_bin_counts(
+        num_positives_by_bin=num_positives_by_bin,
+        num_negatives_by_bin=num_negatives_by_bin)
+
+
+def get_scores_at_all_thresholds(
+        forecast_probabilities, observed_labels,
+        threshold_arg=THRESHOLD_ARG_FOR_UNIQUE_FORECASTS,
+        unique_forecast_precision=DEFAULT_PRECISION_FOR_THRESHOLDS):
+    """Computes contingency table and scores for every binarization threshold.
+
+    By default the thresholds are all unique (rounded) forecast probabilities.
+    Thresholds and forecasts are each sorted once, so the total cost is
+    O(N log N) rather than O(N * T).
+
+    N = number of forecasts
+    T = number of binarization thresholds
+
+    :param forecast_probabilities: See documentation for
+        `_check_forecast_probs_and_observed_labels`.
+    :param observed_labels: See doc for
+        `_check_forecast_probs_and_observed_labels`.
+    :param threshold_arg: See doc for `get_binarization_thresholds`.
+    :param unique_forecast_precision: Same.
+    :return: binarization_thresholds: length-T numpy array of binarization
+        thresholds.
+    :return: score_dict: Dictionary with keys listed in
+        `_get_scores_from_contingency_tables`, plus those listed in
+        `get_contingency_table`.  Each value is a length-T numpy array.
+    """
+
+    _check_forecast_probs_and_observed_labels(
+        forecast_probabilities, observed_labels)
+
+    binarization_thresholds = get_binarization_thresholds(
+        threshold_arg=threshold_arg,
+        forecast_probabilities=forecast_probabilities,
+        unique_forecast_precision=unique_forecast_precision)
+
+    contingency_table_as_dict = get_contingency_tables_at_thresholds(
+        forecast_probabilities=forecast_probabilities,
+        observed_labels=observed_labels,
+        binarization_thresholds=binarization_thresholds)
+
+    score_dict = _get_scores_from_contingency_tables(contingency_table_as_dict)
+    score_dict.update(contingency_table_as_dict)
+    return binarization_thresholds, score_dict
+
+
 def get_pod(contingency_table_as_dict):
     """Computes POD (probability of detection).
 
@@ -649,28 +1041,12 @@ def get_points_in_roc_curve(
         on the y-axis.
     """
 
-    _check_forecast_probs_and_observed_labels(
-        forecast_probabilities, observed_labels)
-
-    binarization_thresholds = get_binarization_thresholds(
-        threshold_arg=threshold_arg,
+    _, score_dict = get_scores_at_all_thresholds(
         forecast_probabilities=forecast_probabilities,
+        observed_labels=observed_labels, threshold_arg=threshold_arg,
         unique_forecast_precision=unique_forecast_precision)
 
-    num_thresholds = len(binarization_thresholds)
-    pofd_by_threshold = numpy.full(num_thresholds, numpy.nan)
-    pod_by_threshold = numpy.full(num_thresholds, numpy.nan)
-
-    for i in range(num_thresholds):
-        these_forecast_labels = binarize_forecast_probs(
-            forecast_probabilities, binarization_thresholds[i])
-        this_contingency_table_as_dict = get_contingency_table(
-            these_forecast_labels, observed_labels)
-
-        pofd_by_threshold[i] = get_pofd(this_contingency_table_as_dict)
-        pod_by_threshold[i] = get_pod(this_contingency_table_as_dict)
-
-    return pofd_by_threshold, pod_by_threshold
+    return score_dict[POFD_KEY], score_dict[POD_KEY]
 
 
 def get_area_under_roc_curve(pofd_by_threshold, pod_by_threshold):
@@ -719,7 +1095,8 @@ def bootstrap_roc_curve(
         forecast_probabilities=None, observed_labels=None, threshold_arg=None,
         unique_forecast_precision=DEFAULT_PRECISION_FOR_THRESHOLDS,
         num_bootstrap_iters=DEFAULT_NUM_BOOTSTRAP_ITERS,
-        confidence_level=DEFAULT_BOOTSTRAP_CONFIDENCE_LEVEL):
+        confidence_level=DEFAULT_BOOTSTRAP_CONFIDENCE_LEVEL,
+        num_processes=1):
     """Bootstrapped version of get_points_in_roc_curve.
 
     T = number of binarization thresholds (same for top, middle, and bottom of
@@ -735,6 +1112,8 @@ def bootstrap_roc_curve(
         samples to draw from full set of forecast-observation pairs).
     :param confidence_level: Confidence level.  Will be used to create
         confidence interval ("envelope") for ROC curve.
+    :param num_processes: Number of processes across which to split bootstrap
+        iterations.  If 1, all iterations will be done in the main process.
     :return: roc_dictionary_bottom: Dictionary with the following keys.
     roc_dictionary_bottom['pofd_by_threshold']: length-T numpy array of POFD
         values for bottom of envelope (confidence interval).
@@ -755,28 +1134,15 @@ def bootstrap_roc_curve(
         forecast_probabilities=forecast_probabilities,
         unique_forecast_precision=unique_forecast_precision)
 
-    error_checking.assert_is_integer(num_bootstrap_iters)
-    error_checking.assert_is_greater(num_bootstrap_iters, 1)
-
     num_thresholds = len(binarization_thresholds)
-    pod_matrix = numpy.full((num_thresholds, num_bootstrap_iters), numpy.nan)
-    pofd_matrix = numpy.full((num_thresholds, num_bootstrap_iters), numpy.nan)
-    auc_values = numpy.full(num_bootstrap_iters, numpy.nan)
+    pod_matrix, pofd_matrix, _ = _bootstrap_pod_pofd_and_sr(
+        forecast_probabilities=forecast_probabilities,
+        observed_labels=observed_labels,
+        binarization_thresholds=binarization_thresholds,
+        num_bootstrap_iters=num_bootstrap_iters, num_processes=num_processes)
 
+    auc_values = numpy.full(num_bootstrap_iters, numpy.nan)
     for j in range(num_bootstrap_iters):
-        _, these_sample_indices = bootstrapping.draw_sample(
-            forecast_probabilities)
-
-        for i in range(num_thresholds):
-            these_forecast_labels = binarize_forecast_probs(
-                forecast_probabilities[these_sample_indices],
-                binarization_thresholds[i])
-            this_contingency_table_as_dict = get_contingency_table(
-                these_forecast_labels, observed_labels[these_sample_indices])
-
-            pofd_matrix[i, j] = get_pofd(this_contingency_table_as_dict)
-            pod_matrix[i, j] = get_pod(this_contingency_table_as_dict)
-
         auc_values[j] = get_area_under_roc_curve(
             pofd_matrix[:, j], pod_matrix[:, j])
 
@@ -841,29 +1207,12 @@ def get_points_in_performance_diagram(
         on the y-axis.
     """
 
-    _check_forecast_probs_and_observed_labels(
-        forecast_probabilities, observed_labels)
-
-    binarization_thresholds = get_binarization_thresholds(
-        threshold_arg=threshold_arg,
+    _, score_dict = get_scores_at_all_thresholds(
         forecast_probabilities=forecast_probabilities,
+        observed_labels=observed_labels, threshold_arg=threshold_arg,
         unique_forecast_precision=unique_forecast_precision)
 
-    num_thresholds = len(binarization_thresholds)
-    success_ratio_by_threshold = numpy.full(num_thresholds, numpy.nan)
-    pod_by_threshold = numpy.full(num_thresholds, numpy.nan)
-
-    for i in range(num_thresholds):
-        these_forecast_labels = binarize_forecast_probs(
-            forecast_probabilities, binarization_thresholds[i])
-        this_contingency_table_as_dict = get_contingency_table(
-            these_forecast_labels, observed_labels)
-
-        success_ratio_by_threshold[i] = get_success_ratio(
-            this_contingency_table_as_dict)
-        pod_by_threshold[i] = get_pod(this_contingency_table_as_dict)
-
-    return success_ratio_by_threshold, pod_by_threshold
+    return score_dict[SUCCESS_RATIO_KEY], score_dict[POD_KEY]
 
 
 def get_area_under_perf_diagram(success_ratio_by_threshold, pod_by_threshold):
@@ -910,7 +1259,8 @@ def bootstrap_performance_diagram(
         forecast_probabilities=None, observed_labels=None, threshold_arg=None,
         unique_forecast_precision=DEFAULT_PRECISION_FOR_THRESHOLDS,
         num_bootstrap_iters=DEFAULT_NUM_BOOTSTRAP_ITERS,
-        confidence_level=DEFAULT_BOOTSTRAP_CONFIDENCE_LEVEL):
+        confidence_level=DEFAULT_BOOTSTRAP_CONFIDENCE_LEVEL,
+        num_processes=1):
     """Bootstrapped version of get_points_in_performance_diagram.
 
     T = number of binarization thresholds (same for top, middle, and bottom of
@@ -926,6 +1276,8 @@ def bootstrap_performance_diagram(
         samples to draw from full set of forecast-observation pairs).
     :param confidence_level: Confidence level.  Will be used to create
         confidence interval ("envelope") for performance diagram.
+    :param num_processes: Number of processes across which to split bootstrap
+        iterations.  If 1, all iterations will be done in the main process.
     :return: performance_diagram_dict_bottom: Dictionary with the following
         keys.
     performance_diagram_dict_bottom['success_ratio_by_threshold']: length-T
@@ -951,35 +1303,19 @@ def bootstrap_performance_diagram(
         forecast_probabilities=forecast_probabilities,
         unique_forecast_precision=unique_forecast_precision)
 
-    error_checking.assert_is_integer(num_bootstrap_iters)
-    error_checking.assert_is_greater(num_bootstrap_iters, 1)
-
     num_thresholds = len(binarization_thresholds)
-    pod_matrix = numpy.full((num_thresholds, num_bootstrap_iters), numpy.nan)
-    success_ratio_matrix = numpy.full((num_thresholds, num_bootstrap_iters),
-                                      numpy.nan)
-    max_csi_values = numpy.full(num_bootstrap_iters, numpy.nan)
+    pod_matrix, _, success_ratio_matrix = _bootstrap_pod_pofd_and_sr(
+        forecast_probabilities=forecast_probabilities,
+        observed_labels=observed_labels,
+        binarization_thresholds=binarization_thresholds,
+        num_bootstrap_iters=num_bootstrap_iters, num_processes=num_processes)
 
+    with numpy.errstate(divide='ignore'):
+        csi_matrix = csi_from_sr_and_pod(success_ratio_matrix, pod_matrix)
+
+    max_csi_values = numpy.full(num_bootstrap_iters, numpy.nan)
     for j in range(num_bootstrap_iters):
-        _, these_sample_indices = bootstrapping.draw_sample(
-            forecast_probabilities)
-        these_csi_values = numpy.full(num_thresholds, numpy.nan)
-
-        for i in range(num_thresholds):
-            these_forecast_labels = binarize_forecast_probs(
-                forecast_probabilities[these_sample_indices],
-                binarization_thresholds[i])
-            this_contingency_table_as_dict = get_contingency_table(
-                these_forecast_labels, observed_labels[these_sample_indices])
-
-            pod_matrix[i, j] = get_pod(this_contingency_table_as_dict)
-            success_ratio_matrix[i, j] = get_success_ratio(
-                this_contingency_table_as_dict)
-            these_csi_values[i] = csi_from_sr_and_pod(
-                numpy.array([success_ratio_matrix[i, j]]),
-                numpy.array([pod_matrix[i, j]]))[0]
-
-        max_csi_values[j] = numpy.nanmax(these_csi_values)
+        max_csi_values[j] = numpy.nanmax(csi_matrix[:, j])
 
     performance_diagram_dict_bottom = {
         POD_BY_THRESHOLD_KEY: numpy.full(num_thresholds, numpy.nan),
@@ -1151,7 +1487,8 @@ def bootstrap_reliability_curve(
         forecast_probabilities=None, observed_labels=None,
         num_forecast_bins=DEFAULT_NUM_BINS_FOR_RELIABILITY_CURVE,
         num_bootstrap_iters=DEFAULT_NUM_BOOTSTRAP_ITERS,
-        confidence_level=DEFAULT_BOOTSTRAP_CONFIDENCE_LEVEL):
+        confidence_level=DEFAULT_BOOTSTRAP_CONFIDENCE_LEVEL,
+        num_processes=1):
     """Bootstrapped version of get_points_in_reliability_curve.
 
     B = number of forecast bins (same for top, middle, and bottom of confidence
@@ -1167,6 +1504,8 @@ def bootstrap_reliability_curve(
         samples to draw from full set of forecast-observation pairs).
     :param confidence_level: Confidence level.  Will be used to create
         confidence interval ("envelope") for reliability curve.
+    :param num_processes: Number of processes across which to split bootstrap
+        iterations.  If 1, all iterations will be done in the main process.
     :return: reliability_dict_bottom: Dictionary with the following keys.
     reliability_dict_bottom['mean_forecast_prob_by_bin']: length-B numpy array
         of mean forecast probabilities for bottom of envelope (confidence
@@ -1191,41 +1530,42 @@ def bootstrap_reliability_curve(
     bin_index_by_example = _split_forecast_probs_into_bins(
         forecast_probabilities, num_forecast_bins)
 
-    num_examples_by_bin = numpy.full(num_forecast_bins, -1, dtype=int)
-    for i in range(num_forecast_bins):
-        num_examples_by_bin[i] = len(numpy.where(bin_index_by_example == i)[0])
+    num_examples_by_bin = numpy.bincount(
+        bin_index_by_example, minlength=num_forecast_bins)
+
+    # For each replicate and bin, this gives the number of examples, sum of
+    # forecast probabilities, and sum of observed labels.
+    sum_matrix = _get_bootstrapped_bin_sums(
+        bin_index_by_example=bin_index_by_example, num_bins=num_forecast_bins,
+        value_matrix=numpy.vstack((
+            numpy.ones(len(forecast_probabilities)), forecast_probabilities,
+            observed_labels.astype(float)
+        )),
+        num_bootstrap_iters=num_bootstrap_iters, num_processes=num_processes)
+
+    num_examples_matrix = numpy.round(
+        numpy.transpose(sum_matrix[:, 0, :])).astype(int)
+
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        mean_forecast_prob_matrix = (
+            numpy.transpose(sum_matrix[:, 1, :]) / num_examples_matrix)
+        mean_observed_label_matrix = (
+            numpy.transpose(sum_matrix[:, 2, :]) / num_examples_matrix)
+
+    climatologies = (
+        numpy.sum(sum_matrix[:, 2, :], axis=1) / len(forecast_probabilities))
 
-    mean_forecast_prob_matrix = numpy.full(
-        (num_forecast_bins, num_bootstrap_iters), numpy.nan)
-    mean_observed_label_matrix = numpy.full(
-        (num_forecast_bins, num_bootstrap_iters), numpy.nan)
     brier_skill_scores = numpy.full(num_bootstrap_iters, numpy.nan)
     brier_scores = numpy.full(num_bootstrap_iters, numpy.nan)
     reliabilities = numpy.full(num_bootstrap_iters, numpy.nan)
     resolutions = numpy.full(num_bootstrap_iters, numpy.nan)
 
     for j in range(num_bootstrap_iters):
-        _, these_sample_indices = bootstrapping.draw_sample(
-            forecast_probabilities)
-        these_num_examples_by_bin = numpy.full(num_forecast_bins, -1, dtype=int)
-
-        for i in range(num_forecast_bins):
-            these_example_indices = numpy.where(
-                bin_index_by_example[these_sample_indices] == i)[0]
-            these_example_indices = these_sample_indices[these_example_indices]
-
-            mean_forecast_prob_matrix[i, j] = numpy.mean(
-                forecast_probabilities[these_example_indices])
-            mean_observed_label_matrix[i, j] = numpy.mean(
-                observed_labels[these_example_indices].astype(float))
-            these_num_examples_by_bin[i] = len(these_example_indices)
-
         this_bss_dictionary = get_brier_skill_score(
             mean_forecast_prob_by_bin=mean_forecast_prob_matrix[:, j],
             mean_observed_label_by_bin=mean_observed_label_matrix[:, j],
-            num_examples_by_bin=these_num_examples_by_bin,
-            climatology=numpy.mean(
-                observed_labels[these_sample_indices].astype(float)))
+            num_examples_by_bin=num_examples_matrix[:, j],
+            climatology=climatologies[j])
 
         brier_skill_scores[j] = this_bss_dictionary[BRIER_SKILL_SCORE_KEY]
         brier_scores[j] = this_bss_dictionary[BRIER_SCORE_KEY]
@@ -1441,6 +1781,377 @@ def get_no_resolution_line_for_reliability_curve(mean_observed_label):
     return numpy.array([0., 1.]), numpy.full(2, mean_observed_label)
 
 
+def create_accumulator(
+        unique_forecast_precision=DEFAULT_PRECISION_FOR_THRESHOLDS,
+        num_forecast_bins=DEFAULT_NUM_BINS_FOR_RELIABILITY_CURVE,
+        keep_forecasts=False):
+    """Creates empty accumulator for streaming evaluation.
+
+    The accumulator holds sufficient statistics for everything in the
+    dictionary returned by `get_results_from_accumulator` (contingency counts
+    for each binarization threshold, sums for each reliability bin, and sums
+    for Brier score and cross-entropy).  It can be updated one batch at a time
+    (`update_accumulator`), merged with accumulators from other processes
+    (`merge_accumulators`), and written to a file (`write_accumulator`), so
+    that the full set of forecasts never has to be held in memory.
+
+    If `keep_forecasts = True`, the accumulator also keeps the raw forecast
+    probabilities and observed labels (one float and one integer per example).
+    These are needed only for the outputs that cannot be computed from
+    sufficient statistics (scikit-learn AUC and the raw arrays themselves).
+
+    The possible binarization thresholds are all multiples of
+    `unique_forecast_precision` from 0...1, plus `MAX_BINARIZATION_THRESHOLD`.
+    Only thresholds that equal some rounded forecast are used when the
+    accumulator is finalized, which makes the results equivalent to
+    `threshold_arg = "unique_forecasts"` elsewhere in this module.
+
+    :param unique_forecast_precision: See doc for `get_binarization_thresholds`.
+        1 must be a multiple of this value.
+    :param num_forecast_bins: Number of bins for reliability curve.
+    :param keep_forecasts: Boolean flag (see above).
+    :return: accumulator_dict: Dictionary with all keys in the list
+        `ACCUMULATOR_KEYS`, plus `ACCUM_FORECAST_PROBS_KEY` and
+        `ACCUM_OBSERVED_LABELS_KEY` (empty lists if `keep_forecasts = True`,
+        None otherwise).
+    """
+
+    error_checking.assert_is_greater(unique_forecast_precision, 0.)
+    error_checking.assert_is_leq(unique_forecast_precision, 0.01)
+    error_checking.assert_is_integer(num_forecast_bins)
+    error_checking.assert_is_geq(num_forecast_bins, 2)
+    error_checking.assert_is_boolean(keep_forecasts)
+
+    num_rounded_values = 1 + int(numpy.round(1. / unique_forecast_precision))
+    error_checking.assert_is_geq(
+        (num_rounded_values - 1) * unique_forecast_precision, 1. - TOLERANCE)
+    error_checking.assert_is_leq(
+        (num_rounded_values - 1) * unique_forecast_precision, 1. + TOLERANCE)
+
+    # These are computed the same way as in `number_rounding.round_to_nearest`,
+    # so that they exactly equal rounded forecast probabilities.
+    binarization_thresholds = unique_forecast_precision * numpy.round(
+        numpy.linspace(0, num_rounded_values - 1, num=num_rounded_values))
+    binarization_thresholds = numpy.concatenate((
+        binarization_thresholds, numpy.array([MAX_BINARIZATION_THRESHOLD])))
+    num_thresholds = len(binarization_thresholds)
+
+    return {
+        ACCUM_THRESHOLDS_KEY: binarization_thresholds,
+        ACCUM_NUM_FORECASTS_BY_THRESHOLD_KEY:
+            numpy.full(num_thresholds, 0, dtype=int),
+        ACCUM_NUM_POSITIVES_BY_BIN_KEY:
+            numpy.full(num_thresholds + 1, 0, dtype=int),
+        ACCUM_NUM_NEGATIVES_BY_BIN_KEY:
+            numpy.full(num_thresholds + 1, 0, dtype=int),
+        ACCUM_NUM_EXAMPLES_BY_RELIA_BIN_KEY:
+            numpy.full(num_forecast_bins, 0, dtype=int),
+        ACCUM_FORECAST_SUM_BY_RELIA_BIN_KEY: numpy.full(num_forecast_bins, 0.),
+        ACCUM_LABEL_SUM_BY_RELIA_BIN_KEY: numpy.full(num_forecast_bins, 0.),
+        ACCUM_NUM_EXAMPLES_KEY: 0,
+        ACCUM_BRIER_SCORE_SUM_KEY: 0.,
+        ACCUM_CROSS_ENTROPY_SUM_KEY: 0.,
+        ACCUM_FORECAST_PROBS_KEY: [] if keep_forecasts else None,
+        ACCUM_OBSERVED_LABELS_KEY: [] if keep_forecasts else None
+    }
+
+
+def update_accumulator(accumulator_dict, forecast_probabilities,
+                       observed_labels):
+    """Adds one batch of forecast-observation pairs to accumulator.
+
+    :param accumulator_dict: Dictionary created by `create_accumulator`.
+    :param forecast_probabilities: See documentation for
+        `_check_forecast_probs_and_observed_labels`.
+    :param observed_labels: See doc for
+        `_check_forecast_probs_and_observed_labels`.
+    :return: accumulator_dict: Same as input, but updated (this is done in
+        place, so the return value is just for convenience).
+    """
+
+    _check_forecast_probs_and_observed_labels(
+        forecast_probabilities, observed_labels)
+
+    binarization_thresholds = accumulator_dict[ACCUM_THRESHOLDS_KEY]
+    num_thresholds = len(binarization_thresholds)
+
+    # The first two thresholds are 0 and `unique_forecast_precision`.
+    unique_forecast_precision = binarization_thresholds[1]
+
+    rounded_value_indices = numpy.round(
+        forecast_probabilities / unique_forecast_precision).astype(int)
+    accumulator_dict[ACCUM_NUM_FORECASTS_BY_THRESHOLD_KEY] += numpy.bincount(
+        rounded_value_indices, minlength=num_thresholds)
+
+    bin_index_by_example = _get_threshold_bin_indices(
+        forecast_probabilities, binarization_thresholds)
+    accumulator_dict[ACCUM_NUM_POSITIVES_BY_BIN_KEY] += numpy.bincount(
+        bin_index_by_example[observed_labels == 1],
+        minlength=num_thresholds + 1)
+    accumulator_dict[ACCUM_NUM_NEGATIVES_BY_BIN_KEY] += numpy.bincount(
+        bin_index_by_example[observed_labels == 0],
+        minlength=num_thresholds + 1)
+
+    num_forecast_bins = len(
+        accumulator_dict[ACCUM_NUM_EXAMPLES_BY_RELIA_BIN_KEY])
+    bin_index_by_example = _split_forecast_probs_into_bins(
+        forecast_probabilities, num_forecast_bins)
+
+    accumulator_dict[ACCUM_NUM_EXAMPLES_BY_RELIA_BIN_KEY] += numpy.bincount(
+        bin_index_by_example, minlength=num_forecast_bins)
+    accumulator_dict[ACCUM_FORECAST_SUM_BY_RELIA_BIN_KEY] += numpy.bincount(
+        bin_index_by_example, weights=forecast_probabilities,
+        minlength=num_forecast_bins)
+    accumulator_dict[ACCUM_LABEL_SUM_BY_RELIA_BIN_KEY] += numpy.bincount(
+        bin_index_by_example, weights=observed_labels.astype(float),
+        minlength=num_forecast_bins)
+
+    clipped_forecast_probs = numpy.clip(
+        forecast_probabilities, MIN_FORECAST_PROB_FOR_XENTROPY,
+        MAX_FORECAST_PROB_FOR_XENTROPY)
+
+    accumulator_dict[ACCUM_NUM_EXAMPLES_KEY] += len(forecast_probabilities)
+    accumulator_dict[ACCUM_BRIER_SCORE_SUM_KEY] += numpy.sum(
+        (forecast_probabilities - observed_labels) ** 2)
+    accumulator_dict[ACCUM_CROSS_ENTROPY_SUM_KEY] -= numpy.sum(
+        observed_labels * numpy.log2(clipped_forecast_probs) +
+        (1 - observed_labels) * numpy.log2(1 - clipped_forecast_probs))
+
+    if accumulator_dict.get(ACCUM_FORECAST_PROBS_KEY) is not None:
+        accumulator_dict[ACCUM_FORECAST_PROBS_KEY].append(
+            numpy.array(forecast_probabilities, dtype=float))
+        accumulator_dict[ACCUM_OBSERVED_LABELS_KEY].append(
+            numpy.array(observed_labels, dtype=int))
+
+    return accumulator_dict
+
+
+def merge_accumulators(list_of_accumulator_dicts):
+    """Merges accumulators (e.g., from different batches or processes).
+
+    :param list_of_accumulator_dicts: 1-D list of dictionaries created by
+        `create_accumulator`.  All must have been created with the same
+        arguments.
+    :return: accumulator_dict: Dictionary created by `create_accumulator`,
+        containing all forecast-observation pairs from the input accumulators.
+        Raw forecasts are kept only if they were kept in all input
+        accumulators.
+    :raises: ValueError: if the accumulators have different binarization
+        thresholds or reliability bins.
+    """
+
+    error_checking.assert_is_list(list_of_accumulator_dicts)
+    error_checking.assert_is_geq(len(list_of_accumulator_dicts), 1)
+
+    accumulator_dict = copy.deepcopy(list_of_accumulator_dicts[0])
+
+    for this_accumulator_dict in list_of_accumulator_dicts[1:]:
+        these_thresholds = this_accumulator_dict[ACCUM_THRESHOLDS_KEY]
+        these_num_forecast_bins = len(
+            this_accumulator_dict[ACCUM_NUM_EXAMPLES_BY_RELIA_BIN_KEY])
+
+        are_thresholds_equal = (
+            len(these_thresholds) == len(accumulator_dict[ACCUM_THRESHOLDS_KEY])
+            and numpy.allclose(
+                these_thresholds, accumulator_dict[ACCUM_THRESHOLDS_KEY],
+                atol=TOLERANCE)
+        )
+        are_bins_equal = these_num_forecast_bins == len(
+            accumulator_dict[ACCUM_NUM_EXAMPLES_BY_RELIA_BIN_KEY])
+
+        if not (are_thresholds_equal and are_bins_equal):
+            error_string = (
+                'Accumulators must have the same binarization thresholds and '
+                'reliability bins.  Found {0:d} thresholds and {1:d} bins, '
+                'expected {2:d} and {3:d}.'
+            ).format(len(these_thresholds), these_num_forecast_bins,
+                     len(accumulator_dict[ACCUM_THRESHOLDS_KEY]),
+                     len(accumulator_dict[ACCUM_NUM_EXAMPLES_BY_RELIA_BIN_KEY]))
+
+            raise ValueError(error_string)
+
+        for this_key in ADDITIVE_ACCUMULATOR_KEYS:
+            accumulator_dict[this_key] = (
+                accumulator_dict[this_key] + this_accumulator_dict[this_key])
+
+        for this_key in [ACCUM_FORECAST_PROBS_KEY, ACCUM_OBSERVED_LABELS_KEY]:
+            if (accumulator_dict.get(this_key) is None or
+                    this_accumulator_dict.get(this_key) is None):
+                accumulator_dict[this_key] = None
+            else:
+                accumulator_dict[this_key] = (
+                    accumulator_dict[this_key] +
+                    copy.deepcopy(this_accumulator_dict[this_key])
+                )
+
+    return accumulator_dict
+
+
+def get_results_from_accumulator(accumulator_dict):
+    """Finalizes accumulator, computing all evaluation scores.
+
+    T = number of binarization thresholds used
+    B = number of bins for reliability curve
+
+    :param accumulator_dict: Dictionary created by `create_accumulator`.
+    :return: evaluation_dict: Dictionary with all keys in the list
+        `EVALUATION_DICT_KEYS` (the same keys written by `write_results`),
+        plus those listed below.  If the accumulator was created with
+        `keep_forecasts = True`, keys `forecast_probabilities`,
+        `observed_labels`, and `scikit_learn_auc` are computed from the raw
+        forecasts, exactly as in `model_evaluation_helper.run_evaluation`.
+        Otherwise, the first two map to None and `scikit_learn_auc` maps to
+        NaN.  The binarization threshold is the one that maximizes CSI.
+    evaluation_dict['pofd_by_threshold']: length-T numpy array of POFD values
+        (for ROC curve).
+    evaluation_dict['pod_by_threshold']: length-T numpy array of POD values.
+    evaluation_dict['success_ratio_by_threshold']: length-T numpy array of
+        success ratios (for performance diagram).
+    evaluation_dict['mean_forecast_prob_by_bin']: length-B numpy array of mean
+        forecast probabilities (for reliability curve).
+    evaluation_dict['mean_observed_label_by_bin']: length-B numpy array of mean
+        observed labels.
+    evaluation_dict['num_examples_by_bin']: length-B numpy array with number of
+        examples in each bin.
+    evaluation_dict['brier_score']: Brier score (not decomposed, so not
+        affected by binning of forecast probabilities).
+    evaluation_dict['cross_entropy']: Cross-entropy.
+    """
+
+    num_rounded_values = (
+        len(accumulator_dict[ACCUM_THRESHOLDS_KEY]) - 1)
+    threshold_indices = numpy.where(
+        accumulator_dict[ACCUM_NUM_FORECASTS_BY_THRESHOLD_KEY] > 0)[0]
+    threshold_indices = numpy.unique(numpy.concatenate((
+        numpy.array([0, num_rounded_values], dtype=int), threshold_indices
+    )))
+
+    binarization_thresholds = accumulator_dict[ACCUM_THRESHOLDS_KEY][
+        threshold_indices]
+    contingency_table_as_dict = _contingency_tables_from_bin_counts(
+        num_positives_by_bin=accumulator_dict[ACCUM_NUM_POSITIVES_BY_BIN_KEY],
+        num_negatives_by_bin=accumulator_dict[ACCUM_NUM_NEGATIVES_BY_BIN_KEY])
+
+    for this_key in contingency_table_as_dict:
+        contingency_table_as_dict[this_key] = contingency_table_as_dict[
+            this_key][threshold_indices]
+
+    score_dict = _get_scores_from_contingency_tables(contingency_table_as_dict)
+    pod_by_threshold = score_dict[POD_KEY]
+    pofd_by_threshold = score_dict[POFD_KEY]
+    success_ratio_by_threshold = score_dict[SUCCESS_RATIO_KEY]
+
+    best_index = numpy.nanargmax(score_dict[CSI_KEY])
+    best_contingency_table_as_dict = dict([
+        (k, int(contingency_table_as_dict[k][best_index]))
+        for k in contingency_table_as_dict
+    ])
+
+    num_examples_by_bin = accumulator_dict[ACCUM_NUM_EXAMPLES_BY_RELIA_BIN_KEY]
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        mean_forecast_prob_by_bin = (
+            accumulator_dict[ACCUM_FORECAST_SUM_BY_RELIA_BIN_KEY] /
+            num_examples_by_bin)
+        mean_observed_label_by_bin = (
+            accumulator_dict[ACCUM_LABEL_SUM_BY_RELIA_BIN_KEY] /
+            num_examples_by_bin)
+
+    num_examples = accumulator_dict[ACCUM_NUM_EXAMPLES_KEY]
+    bss_dict = get_brier_skill_score(
+        mean_forecast_prob_by_bin=mean_forecast_prob_by_bin,
+        mean_observed_label_by_bin=mean_observed_label_by_bin,
+        num_examples_by_bin=num_examples_by_bin,
+        climatology=numpy.sum(
+            accumulator_dict[ACCUM_LABEL_SUM_BY_RELIA_BIN_KEY]
+        ) / num_examples)
+
+    if accumulator_dict.get(ACCUM_FORECAST_PROBS_KEY) is None:
+        forecast_probabilities = None
+        observed_labels = None
+        scikit_learn_auc = numpy.nan
+    else:
+        forecast_probabilities = numpy.concatenate(
+            accumulator_dict[ACCUM_FORECAST_PROBS_KEY])
+        observed_labels = numpy.concatenate(
+            accumulator_dict[ACCUM_OBSERVED_LABELS_KEY])
+        scikit_learn_auc = sklearn.metrics.roc_auc_score(
+            y_true=observed_labels, y_score=forecast_probabilities)
+
+    return {
+        FORECAST_PROBABILITIES_KEY: forecast_probabilities,
+        OBSERVED_LABELS_KEY: observed_labels,
+        BINARIZATION_THRESHOLD_KEY: binarization_thresholds[best_index],
+        POD_KEY: get_pod(best_contingency_table_as_dict),
+        POFD_KEY: get_pofd(best_contingency_table_as_dict),
+        SUCCESS_RATIO_KEY: get_success_ratio(best_contingency_table_as_dict),
+        FOCN_KEY: get_focn(best_contingency_table_as_dict),
+        ACCURACY_KEY: get_accuracy(best_contingency_table_as_dict),
+        CSI_KEY: get_csi(best_contingency_table_as_dict),
+        FREQUENCY_BIAS_KEY: get_frequency_bias(best_contingency_table_as_dict),
+        PEIRCE_SCORE_KEY: get_peirce_score(best_contingency_table_as_dict),
+        HEIDKE_SCORE_KEY: get_heidke_score(best_contingency_table_as_dict),
+        AUC_KEY: get_area_under_roc_curve(
+            pofd_by_threshold=pofd_by_threshold,
+            pod_by_threshold=pod_by_threshold),
+        SCIKIT_LEARN_AUC_KEY: scikit_learn_auc,
+        AUPD_KEY: get_area_under_perf_diagram(
+            success_ratio_by_threshold=success_ratio_by_threshold,
+            pod_by_threshold=pod_by_threshold),
+        BSS_DICTIONARY_KEY: bss_dict,
+        POFD_BY_THRESHOLD_KEY: pofd_by_threshold,
+        POD_BY_THRESHOLD_KEY: pod_by_threshold,
+        SUCCESS_RATIO_BY_THRESHOLD_KEY: success_ratio_by_threshold,
+        MEAN_FORECAST_PROB_BY_BIN_KEY: mean_forecast_prob_by_bin,
+        MEAN_OBSERVED_LABEL_BY_BIN_KEY: mean_observed_label_by_bin,
+        NUM_EXAMPLES_BY_BIN_KEY: num_examples_by_bin,
+        BRIER_SCORE_KEY: (
+            accumulator_dict[ACCUM_BRIER_SCORE_SUM_KEY] / num_examples),
+        CROSS_ENTROPY_KEY: (
+            accumulator_dict[ACCUM_CROSS_ENTROPY_SUM_KEY] / num_examples)
+    }
+
+
+def write_accumulator(accumulator_dict, pickle_file_name):
+    """Writes accumulator to Pickle file.
+
+    :param accumulator_dict: Dictionary created by `create_accumulator`.
+    :param pickle_file_name: Path to output file.
+    """
+
+    file_system_utils.mkdir_recursive_if_necessary(file_name=pickle_file_name)
+    pickle_file_handle = open(pickle_file_name, 'wb')
+    pickle.dump(accumulator_dict, pickle_file_handle)
+    pickle_file_handle.close()
+
+
+def read_accumulator(pickle_file_name):
+    """Reads accumulator from Pickle file.
+
+    :param pickle_file_name: Path to input file.
+    :return: accumulator_dict: Dictionary with all keys in the list
+        `ACCUMULATOR_KEYS`.
+    :raises: ValueError: if dictionary does not contain all keys in the list
+        `ACCUMULATOR_KEYS`.
+    """
+
+    pickle_file_handle = open(pickle_file_name, 'rb')
+    accumulator_dict = pickle.load(pickle_file_handle)
+    pickle_file_handle.close()
+
+    expected_keys_as_set = set(ACCUMULATOR_KEYS)
+    actual_keys_as_set = set(accumulator_dict.keys())
+    if not set(expected_keys_as_set).issubset(actual_keys_as_set):
+        error_string = (
+            '\n\n{0:s}\nExpected keys are listed above.  Keys found in file '
+            '("{1:s}") are listed below.  Some expected keys were not found.'
+            '\n{2:s}\n').format(ACCUMULATOR_KEYS, pickle_file_name,
+                                accumulator_dict.keys())
+
+        raise ValueError(error_string)
+
+    return accumulator_dict
+
+
 def write_results(
         forecast_probabilities, observed_labels, binarization_threshold, pod,
         pofd, success_ratio, focn, accuracy, csi, frequency_bias, peirce_score,
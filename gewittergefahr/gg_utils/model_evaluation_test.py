@@ -3,6 +3,7 @@
 import copy
 import unittest
 import numpy
+from sklearn.metrics import roc_auc_score
 from gewittergefahr.gg_utils import model_evaluation as model_eval
 
 TOLERANCE = 1e-6
@@ -99,6 +100,20 @@ POD_BY_THRESHOLD = numpy.array([1., 1., 1., 1., 1., 1., 1., 0.8, 0.6, 0.4, 0.])
 POFD_BY_THRESHOLD = numpy.array(
     [1., 1., 0.8, 0.6, 0.4, 0.2, 0., 0., 0., 0., 0.])
 
+# The following constants are used to test
+# get_contingency_tables_at_thresholds.
+THESE_NUM_TRUE_POSITIVES = numpy.array(
+    [5, 5, 5, 5, 5, 5, 5, 4, 3, 2, 0], dtype=int)
+THESE_NUM_FALSE_POSITIVES = numpy.array(
+    [5, 5, 4, 3, 2, 1, 0, 0, 0, 0, 0], dtype=int)
+
+CONTINGENCY_TABLES_AT_THRESHOLDS = {
+    model_eval.NUM_TRUE_POSITIVES_KEY: THESE_NUM_TRUE_POSITIVES,
+    model_eval.NUM_FALSE_POSITIVES_KEY: THESE_NUM_FALSE_POSITIVES,
+    model_eval.NUM_FALSE_NEGATIVES_KEY: 5 - THESE_NUM_TRUE_POSITIVES,
+    model_eval.NUM_TRUE_NEGATIVES_KEY: 5 - THESE_NUM_FALSE_POSITIVES
+}
+
 # The following constants are used to test get_points_in_performance_diagram.
 SUCCESS_RATIO_BY_THRESHOLD = numpy.array(
     [0.5, 0.5, 5. / 9, 0.625, 5. / 7, 0.833333, 1., 1., 1., 1., numpy.nan])
@@ -178,6 +193,11 @@ Y_VALUES_FOR_CLIMATOLOGY_LINE = numpy.array([0., 1.])
 X_VALUES_FOR_NO_RESOLUTION_LINE = numpy.array([0., 1.])
 Y_VALUES_FOR_NO_RESOLUTION_LINE = numpy.array([0.2, 0.2])
 
+# The following constants are used to test create_accumulator,
+# update_accumulator, merge_accumulators, and get_results_from_accumulator.
+FIRST_INDICES_FOR_ACCUMULATOR = numpy.array([0, 2, 5, 7], dtype=int)
+SECOND_INDICES_FOR_ACCUMULATOR = numpy.array([1, 3, 4, 6, 8, 9], dtype=int)
+
 
 class ModelEvaluationTests(unittest.TestCase):
     """Each method is a unit test for model_evaluation.py."""
@@ -289,6 +309,22 @@ class ModelEvaluationTests(unittest.TestCase):
         self.assertTrue(
             this_contingency_table == CONTINGENCY_TABLE_THRESHOLD_HALF)
 
+    def test_get_contingency_tables_at_thresholds(self):
+        """Ensures correct output from get_contingency_tables_at_thresholds."""
+
+        this_dict = model_eval.get_contingency_tables_at_thresholds(
+            forecast_probabilities=FORECAST_PROBABILITIES,
+            observed_labels=OBSERVED_LABELS,
+            binarization_thresholds=ROC_AND_PERFORMANCE_THRESHOLDS)
+
+        self.assertTrue(set(this_dict.keys()) ==
+                        set(CONTINGENCY_TABLES_AT_THRESHOLDS.keys()))
+
+        for this_key in CONTINGENCY_TABLES_AT_THRESHOLDS:
+            self.assertTrue(numpy.array_equal(
+                this_dict[this_key], CONTINGENCY_TABLES_AT_THRESHOLDS[this_key]
+            ))
+
     def test_get_pod(self):
         """Ensures correct output from get_pod; input values are non-zero."""
 
@@ -525,6 +561,32 @@ class ModelEvaluationTests(unittest.TestCase):
         self.assertTrue(numpy.allclose(
             these_pod_by_threshold, POD_BY_THRESHOLD, atol=TOLERANCE))
 
+    def test_get_scores_at_all_thresholds(self):
+        """Ensures correct output from get_scores_at_all_thresholds."""
+
+        these_thresholds, this_score_dict = (
+            model_eval.get_scores_at_all_thresholds(
+                forecast_probabilities=FORECAST_PROBABILITIES,
+                observed_labels=OBSERVED_LABELS,
+                threshold_arg=model_eval.THRESHOLD_ARG_FOR_UNIQUE_FORECASTS,
+                unique_forecast_precision=
+                UNIQUE_FORECAST_PRECISION_FOR_THRESHOLDS))
+
+        self.assertTrue(numpy.allclose(
+            these_thresholds, ROC_AND_PERFORMANCE_THRESHOLDS, atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            this_score_dict[model_eval.POD_KEY], POD_BY_THRESHOLD,
+            atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            this_score_dict[model_eval.POFD_KEY], POFD_BY_THRESHOLD,
+            atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            this_score_dict[model_eval.SUCCESS_RATIO_KEY],
+            SUCCESS_RATIO_BY_THRESHOLD, atol=TOLERANCE, equal_nan=True))
+        self.assertTrue(numpy.allclose(
+            this_score_dict[model_eval.PEIRCE_SCORE_KEY],
+            POD_BY_THRESHOLD - POFD_BY_THRESHOLD, atol=TOLERANCE))
+
     def test_get_area_under_roc_curve_no_nan(self):
         """Ensures correct output from get_area_under_roc_curve.
 
@@ -710,6 +772,118 @@ class ModelEvaluationTests(unittest.TestCase):
         self.assertTrue(numpy.allclose(
             these_y_values, Y_VALUES_FOR_NO_RESOLUTION_LINE, atol=TOLERANCE))
 
+    def test_merge_accumulators(self):
+        """Ensures correct output from merge_accumulators.
+
+        Merging accumulators for two halves of the dataset should give the same
+        accumulator as the full dataset.
+        """
+
+        this_full_accumulator_dict = model_eval.update_accumulator(
+            accumulator_dict=model_eval.create_accumulator(
+                unique_forecast_precision=
+                UNIQUE_FORECAST_PRECISION_FOR_THRESHOLDS),
+            forecast_probabilities=FORECAST_PROBABILITIES,
+            observed_labels=OBSERVED_LABELS)
+
+        these_accumulator_dicts = [
+            model_eval.update_accumulator(
+                accumulator_dict=model_eval.create_accumulator(
+                    unique_forecast_precision=
+                    UNIQUE_FORECAST_PRECISION_FOR_THRESHOLDS),
+                forecast_probabilities=FORECAST_PROBABILITIES[these_indices],
+                observed_labels=OBSERVED_LABELS[these_indices])
+            for these_indices in
+            [FIRST_INDICES_FOR_ACCUMULATOR, SECOND_INDICES_FOR_ACCUMULATOR]
+        ]
+
+        this_merged_accumulator_dict = model_eval.merge_accumulators(
+            these_accumulator_dicts)
+
+        for this_key in model_eval.ACCUMULATOR_KEYS:
+            self.assertTrue(numpy.allclose(
+                this_merged_accumulator_dict[this_key],
+                this_full_accumulator_dict[this_key], atol=TOLERANCE))
+
+    def test_merge_accumulators_mismatch(self):
+        """Ensures that merge_accumulators errors if thresholds differ."""
+
+        with self.assertRaises(ValueError):
+            model_eval.merge_accumulators([
+                model_eval.create_accumulator(unique_forecast_precision=0.01),
+                model_eval.create_accumulator(unique_forecast_precision=0.001)
+            ])
+
+    def test_get_results_from_accumulator(self):
+        """Ensures correct output from get_results_from_accumulator."""
+
+        this_accumulator_dict = model_eval.update_accumulator(
+            accumulator_dict=model_eval.create_accumulator(
+                unique_forecast_precision=
+                UNIQUE_FORECAST_PRECISION_FOR_THRESHOLDS),
+            forecast_probabilities=FORECAST_PROBABILITIES,
+            observed_labels=OBSERVED_LABELS)
+
+        this_evaluation_dict = model_eval.get_results_from_accumulator(
+            this_accumulator_dict)
+
+        self.assertTrue(numpy.allclose(
+            this_evaluation_dict[model_eval.POFD_BY_THRESHOLD_KEY],
+            POFD_BY_THRESHOLD, atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            this_evaluation_dict[model_eval.POD_BY_THRESHOLD_KEY],
+            POD_BY_THRESHOLD, atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            this_evaluation_dict[model_eval.SUCCESS_RATIO_BY_THRESHOLD_KEY],
+            SUCCESS_RATIO_BY_THRESHOLD, atol=TOLERANCE, equal_nan=True))
+        self.assertTrue(numpy.array_equal(
+            this_evaluation_dict[model_eval.NUM_EXAMPLES_BY_BIN_KEY],
+            NUM_EXAMPLES_BY_BIN))
+        self.assertTrue(numpy.isclose(
+            this_evaluation_dict[model_eval.BRIER_SCORE_KEY],
+            model_eval.get_brier_score(
+                forecast_probabilities=FORECAST_PROBABILITIES,
+                observed_labels=OBSERVED_LABELS),
+            atol=TOLERANCE))
+
+    def test_get_results_from_accumulator_keep_forecasts(self):
+        """Ensures correct output from get_results_from_accumulator.
+
+        In this case, the accumulator keeps raw forecasts and is merged from
+        two halves of the dataset, so raw forecasts and scikit-learn AUC should
+        be available.
+        """
+
+        these_accumulator_dicts = [
+            model_eval.update_accumulator(
+                accumulator_dict=model_eval.create_accumulator(
+                    unique_forecast_precision=
+                    UNIQUE_FORECAST_PRECISION_FOR_THRESHOLDS,
+                    keep_forecasts=True),
+                forecast_probabilities=FORECAST_PROBABILITIES[these_indices],
+                observed_labels=OBSERVED_LABELS[these_indices])
+            for these_indices in
+            [FIRST_INDICES_FOR_ACCUMULATOR, SECOND_INDICES_FOR_ACCUMULATOR]
+        ]
+
+        this_evaluation_dict = model_eval.get_results_from_accumulator(
+            model_eval.merge_accumulators(these_accumulator_dicts))
+
+        these_indices = numpy.concatenate((
+            FIRST_INDICES_FOR_ACCUMULATOR, SECOND_INDICES_FOR_ACCUMULATOR))
+
+        self.assertTrue(numpy.allclose(
+            this_evaluation_dict[model_eval.FORECAST_PROBABILITIES_KEY],
+            FORECAST_PROBABILITIES[these_indices], atol=TOLERANCE))
+        self.assertTrue(numpy.array_equal(
+            this_evaluation_dict[model_eval.OBSERVED_LABELS_KEY],
+            OBSERVED_LABELS[these_indices]))
+        self.assertTrue(numpy.isclose(
+            this_evaluation_dict[model_eval.SCIKIT_LEARN_AUC_KEY],
+            roc_auc_score(y_true=OBSERVED_LABELS,
+                          y_score=FORECAST_PROBABILITIES),
+            atol=TOLERANCE))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -55,6 +55,17 @@ PREVIOUS_INTERP_METHOD = 'previous'
 NEXT_INTERP_METHOD = 'next'
 SUPERLINEAR_INTERP_METHODS = ['quadratic', 'cubic']
 
+LATLNG_POINTS_TABLE_NAME = 'latlng_grid_points'
+LATLNG_EDGES_TABLE_NAME = 'latlng_grid_cell_edges'
+WIND_ROTATION_TABLE_NAME = 'wind_rotation_angles'
+
+# Projection objects and full-grid tables (lat-long coordinates, wind-rotation
+# angles) are expensive enough that they are created only once per process.
+# Keys are model names (for projections) and (model name, grid ID, table name)
+# for tables.
+_PROJECTION_CACHE = {}
+_GRID_TABLE_CACHE = {}
+
 
 def _check_wind_rotation_inputs(
         u_winds_m_s01, v_winds_m_s01, rotation_angle_cosines,
@@ -72,10 +83,11 @@ def _check_wind_rotation_inputs(
         metres per second).
     :param v_winds_m_s01: Same as above, except y-components or northward
         components.
-    :param rotation_angle_cosines: equivalent-shape numpy array with cosines of
-        rotation angles.
-    :param rotation_angle_sines: equivalent-shape numpy array with sines of
-        rotation angles.
+    :param rotation_angle_cosines: numpy array with cosines of rotation angles.
+        This may have the same shape as `u_winds_m_s01`, or it may match only
+        the last dimensions.  For example, if `u_winds_m_s01` is K x M x N (K
+        fields stacked on the same grid), this array may be M x N.
+    :param rotation_angle_sines: Same as above, except with sines.
     """
 
     error_checking.assert_is_real_numpy_array(u_winds_m_s01)
@@ -85,15 +97,43 @@ def _check_wind_rotation_inputs(
     error_checking.assert_is_numpy_array(
         v_winds_m_s01, exact_dimensions=array_dimensions)
 
+    error_checking.assert_is_numpy_array(rotation_angle_cosines)
+    num_angle_dimensions = len(rotation_angle_cosines.shape)
+    error_checking.assert_is_leq(num_angle_dimensions, len(array_dimensions))
+    angle_dimensions = array_dimensions[
+        (len(array_dimensions) - num_angle_dimensions):]
+
     error_checking.assert_is_geq_numpy_array(rotation_angle_cosines, -1)
     error_checking.assert_is_leq_numpy_array(rotation_angle_cosines, 1)
     error_checking.assert_is_numpy_array(
-        rotation_angle_cosines, exact_dimensions=array_dimensions)
+        rotation_angle_cosines, exact_dimensions=angle_dimensions)
 
     error_checking.assert_is_geq_numpy_array(rotation_angle_sines, -1)
     error_checking.assert_is_leq_numpy_array(rotation_angle_sines, 1)
     error_checking.assert_is_numpy_array(
-        rotation_angle_sines, exact_dimensions=array_dimensions)
+        rotation_angle_sines, exact_dimensions=angle_dimensions)
+
+
+def _get_grid_table(model_name, grid_id, table_name, table_function):
+    """Returns full-grid table, computing it only on the first call.
+
+    :param model_name: Name of model.
+    :param grid_id: ID for model grid.
+    :param table_name: Name of table (must be in the list
+        [LATLNG_POINTS_TABLE_NAME, LATLNG_EDGES_TABLE_NAME,
+        WIND_ROTATION_TABLE_NAME]).
+    :param table_function: Function that computes the table.  Takes no input
+        arguments and returns a tuple of numpy arrays.
+    :return: table_arrays: Tuple of numpy arrays returned by `table_function`.
+        These are copies, so the caller may modify them without corrupting the
+        cache.
+    """
+
+    cache_key = (model_name, grid_id, table_name)
+    if cache_key not in _GRID_TABLE_CACHE:
+        _GRID_TABLE_CACHE[cache_key] = table_function()
+
+    return tuple([numpy.copy(a) for a in _GRID_TABLE_CACHE[cache_key]])
 
 
 def check_model_name(model_name):
@@ -358,10 +398,15 @@ def init_model_projection(model_name):
         Lambert conformal projection.
     """
 
-    standard_latitudes_deg, central_longitude_deg = get_projection_params(
-        model_name)
-    return projections.init_lambert_conformal_projection(
-        standard_latitudes_deg, central_longitude_deg)
+    if model_name not in _PROJECTION_CACHE:
+        standard_latitudes_deg, central_longitude_deg = get_projection_params(
+            model_name)
+        _PROJECTION_CACHE[model_name] = (
+            projections.init_lambert_conformal_projection(
+                standard_latitudes_deg, central_longitude_deg)
+        )
+
+    return _PROJECTION_CACHE[model_name]
 
 
 def get_columns_in_sounding_table(model_name):
@@ -657,19 +702,28 @@ def get_latlng_grid_point_matrices(model_name, grid_id=None,
     :param grid_id: ID for model grid.
     :param projection_object: Projection object created by
         init_model_projection.  If projection_object = None, it will be created
-        on the fly, based on args `model_name` and `grid_id`.
+        on the fly, based on args `model_name` and `grid_id`, and the matrices
+        will be computed only once per process.
     :return: grid_point_lat_matrix_deg: M-by-N numpy array of grid-point
         latitudes (generally increasing downward).
     :return: grid_point_lng_matrix_deg: M-by-N numpy array of grid-point
         longitudes (generally increasing to the right).
     """
 
-    grid_point_x_matrix_metres, grid_point_y_matrix_metres = (
-        get_xy_grid_point_matrices(model_name, grid_id=grid_id))
-    return project_xy_to_latlng(
-        grid_point_x_matrix_metres, grid_point_y_matrix_metres,
-        projection_object=projection_object, model_name=model_name,
-        grid_id=grid_id)
+    def _compute_matrices():
+        grid_point_x_matrix_metres, grid_point_y_matrix_metres = (
+            get_xy_grid_point_matrices(model_name, grid_id=grid_id))
+        return project_xy_to_latlng(
+            grid_point_x_matrix_metres, grid_point_y_matrix_metres,
+            projection_object=projection_object, model_name=model_name,
+            grid_id=grid_id)
+
+    if projection_object is not None:
+        return _compute_matrices()
+
+    return _get_grid_table(
+        model_name=model_name, grid_id=grid_id,
+        table_name=LATLNG_POINTS_TABLE_NAME, table_function=_compute_matrices)
 
 
 def get_latlng_grid_cell_edge_matrices(model_name, grid_id=None,
@@ -683,19 +737,28 @@ def get_latlng_grid_cell_edge_matrices(model_name, grid_id=None,
     :param grid_id: ID for model grid.
     :param projection_object: Projection object created by
         init_model_projection.  If projection_object = None, it will be created
-        on the fly, based on args `model_name` and `grid_id`.
+        on the fly, based on args `model_name` and `grid_id`, and the matrices
+        will be computed only once per process.
     :return: grid_cell_edge_lat_matrix_deg: (M + 1)-by-(N + 1) numpy array with
         latitudes of grid-cell edges (generally increasing downward).
     :return: grid_cell_edge_lat_matrix_deg: (M + 1)-by-(N + 1) numpy array with
         longitudes of grid-cell edges (generally increasing to the right).
     """
 
-    grid_cell_edge_x_matrix_metres, grid_cell_edge_y_matrix_metres = (
-        get_xy_grid_cell_edge_matrices(model_name, grid_id=grid_id))
-    return project_xy_to_latlng(
-        grid_cell_edge_x_matrix_metres, grid_cell_edge_y_matrix_metres,
-        projection_object=projection_object, model_name=model_name,
-        grid_id=grid_id)
+    def _compute_matrices():
+        grid_cell_edge_x_matrix_metres, grid_cell_edge_y_matrix_metres = (
+            get_xy_grid_cell_edge_matrices(model_name, grid_id=grid_id))
+        return project_xy_to_latlng(
+            grid_cell_edge_x_matrix_metres, grid_cell_edge_y_matrix_metres,
+            projection_object=projection_object, model_name=model_name,
+            grid_id=grid_id)
+
+    if projection_object is not None:
+        return _compute_matrices()
+
+    return _get_grid_table(
+        model_name=model_name, grid_id=grid_id,
+        table_name=LATLNG_EDGES_TABLE_NAME, table_function=_compute_matrices)
 
 
 def get_times_needed_for_interp(query_times_unix_sec=None,
@@ -855,6 +918,35 @@ def get_wind_rotation_angles(latitudes_deg, longitudes_deg, model_name):
     return numpy.cos(rotation_angles), numpy.sin(rotation_angles)
 
 
+def get_wind_rotation_angle_matrices(model_name, grid_id=None):
+    """Returns wind-rotation angle at each grid point.
+
+    The matrices are computed only once per process.
+
+    M = number of rows (unique grid-point y-coordinates)
+    N = number of columns (unique grid-point x-coordinates)
+
+    :param model_name: Name of model.
+    :param grid_id: ID for model grid.
+    :return: rotation_angle_cos_matrix: M-by-N numpy array with cosines of
+        rotation angles.
+    :return: rotation_angle_sin_matrix: M-by-N numpy array with sines of
+        rotation angles.
+    """
+
+    def _compute_matrices():
+        grid_point_lat_matrix_deg, grid_point_lng_matrix_deg = (
+            get_latlng_grid_point_matrices(
+                model_name=model_name, grid_id=grid_id))
+        return get_wind_rotation_angles(
+            latitudes_deg=grid_point_lat_matrix_deg,
+            longitudes_deg=grid_point_lng_matrix_deg, model_name=model_name)
+
+    return _get_grid_table(
+        model_name=model_name, grid_id=grid_id,
+        table_name=WIND_ROTATION_TABLE_NAME, table_function=_compute_matrices)
+
+
 def rotate_winds_to_earth_relative(
         u_winds_grid_relative_m_s01, v_winds_grid_relative_m_s01,
         rotation_angle_cosines, rotation_angle_sines):
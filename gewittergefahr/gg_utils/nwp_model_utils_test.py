@@ -166,6 +166,21 @@ V_WINDS_EARTH_RELATIVE_M_S01 = numpy.array(
     [[10., 7.5 - 5 * HALF_ROOT3, -10. - 10 * HALF_ROOT3],
      [10., 7.5 - 5 * HALF_ROOT3, -10. - 10 * HALF_ROOT3]])
 
+U_WINDS_GRID_RELATIVE_STACKED_M_S01 = numpy.stack(
+    (U_WINDS_GRID_RELATIVE_M_S01, V_WINDS_GRID_RELATIVE_M_S01), axis=0)
+V_WINDS_GRID_RELATIVE_STACKED_M_S01 = numpy.stack(
+    (V_WINDS_GRID_RELATIVE_M_S01, U_WINDS_GRID_RELATIVE_M_S01), axis=0)
+U_WINDS_EARTH_RELATIVE_STACKED_M_S01 = numpy.stack(
+    (U_WINDS_EARTH_RELATIVE_M_S01, numpy.array(
+        [[10., 7.5 + 5 * HALF_ROOT3, -10. + 10 * HALF_ROOT3],
+         [10., 7.5 + 5 * HALF_ROOT3, -10. + 10 * HALF_ROOT3]])
+    ), axis=0)
+V_WINDS_EARTH_RELATIVE_STACKED_M_S01 = numpy.stack(
+    (V_WINDS_EARTH_RELATIVE_M_S01, numpy.array(
+        [[0., 2.5 - 15 * HALF_ROOT3, -5. - 20 * HALF_ROOT3],
+         [0., 2.5 - 15 * HALF_ROOT3, -5. - 20 * HALF_ROOT3]])
+    ), axis=0)
+
 
 class NwpModelUtilsTests(unittest.TestCase):
     """Each method is a unit test for nwp_model_utils.py."""
@@ -453,6 +468,58 @@ class NwpModelUtilsTests(unittest.TestCase):
             these_v_winds_grid_relative_m_s01, V_WINDS_GRID_RELATIVE_M_S01,
             atol=TOLERANCE))
 
+    def test_rotate_winds_to_earth_relative_stacked(self):
+        """Ensures correct output from rotate_winds_to_earth_relative.
+
+        In this case, many wind fields are stacked along the first axis and
+        rotation angles are given only for one field.
+        """
+
+        (these_u_winds_earth_relative_m_s01,
+         these_v_winds_earth_relative_m_s01
+        ) = nwp_model_utils.rotate_winds_to_earth_relative(
+            u_winds_grid_relative_m_s01=U_WINDS_GRID_RELATIVE_STACKED_M_S01,
+            v_winds_grid_relative_m_s01=V_WINDS_GRID_RELATIVE_STACKED_M_S01,
+            rotation_angle_cosines=ROTATION_ANGLE_COSINES,
+            rotation_angle_sines=ROTATION_ANGLE_SINES)
+
+        self.assertTrue(numpy.allclose(
+            these_u_winds_earth_relative_m_s01,
+            U_WINDS_EARTH_RELATIVE_STACKED_M_S01, atol=TOLERANCE))
+        self.assertTrue(numpy.allclose(
+            these_v_winds_earth_relative_m_s01,
+            V_WINDS_EARTH_RELATIVE_STACKED_M_S01, atol=TOLERANCE))
+
+    def test_get_wind_rotation_angle_matrices(self):
+        """Ensures correct output from get_wind_rotation_angle_matrices.
+
+        This method also ensures that modifying the output does not corrupt the
+        cache.
+        """
+
+        grid_point_lat_matrix_deg, grid_point_lng_matrix_deg = (
+            nwp_model_utils.get_latlng_grid_point_matrices(
+                model_name=nwp_model_utils.RAP_MODEL_NAME,
+                grid_id=nwp_model_utils.ID_FOR_252GRID))
+        expected_cos_matrix, expected_sin_matrix = (
+            nwp_model_utils.get_wind_rotation_angles(
+                grid_point_lat_matrix_deg, grid_point_lng_matrix_deg,
+                model_name=nwp_model_utils.RAP_MODEL_NAME))
+
+        for _ in range(2):
+            this_cos_matrix, this_sin_matrix = (
+                nwp_model_utils.get_wind_rotation_angle_matrices(
+                    model_name=nwp_model_utils.RAP_MODEL_NAME,
+                    grid_id=nwp_model_utils.ID_FOR_252GRID))
+
+            self.assertTrue(numpy.allclose(
+                this_cos_matrix, expected_cos_matrix, atol=TOLERANCE))
+            self.assertTrue(numpy.allclose(
+                this_sin_matrix, expected_sin_matrix, atol=TOLERANCE))
+
+            this_cos_matrix[:] = 0.
+            this_sin_matrix[:] = 0.
+
     def test_projection_grid130(self):
         """Ensures approx correctness of Lambert projection for NCEP 130 grid.
 
@@ -560,9 +560,8 @@ def get_storm_based_radar_stats_myrorss_or_mrms(
     error_checking.assert_is_boolean(dilate_azimuthal_shear)
 
     # Find radar files.
-    spc_date_strings = [
-        time_conversion.time_to_spc_date_string(t)
-        for t in storm_object_table[tracking_utils.SPC_DATE_COLUMN].values]
+    spc_date_strings = time_conversion.times_to_spc_date_strings(
+        storm_object_table[tracking_utils.SPC_DATE_COLUMN].values)
 
     file_dictionary = myrorss_and_mrms_io.find_many_raw_files(
         desired_times_unix_sec=
@@ -2,7 +2,9 @@
 
 import copy
 import pickle
+import hashlib
 import os.path
+import multiprocessing
 import numpy
 import pandas
 import netCDF4
@@ -41,6 +43,9 @@ SENTINEL_VALUE_TOLERANCE = 1e-3
 REDUNDANT_PRESSURE_TOLERANCE_MB = 1e-3
 REDUNDANT_HEIGHT_TOLERANCE_METRES = 1e-3
 MIN_PRESSURE_LEVELS_IN_SOUNDING = 15
+DEFAULT_NUM_SOUNDINGS_PER_CHUNK = 50
+SOUNDING_KEY_PRECISION = 0.01
+MISSING_VALUE_IN_SOUNDING_KEY = numpy.iinfo(numpy.int64).min
 
 PERCENT_TO_UNITLESS = 0.01
 UNITLESS_TO_PERCENT = 100
@@ -60,6 +65,10 @@ STATISTIC_NAMES_KEY = 'statistic_names'
 STORM_IDS_KEY = 'storm_ids'
 STATISTIC_MATRIX_KEY = 'sounding_statistic_matrix'
 
+MEMO_HASHES_KEY = 'storm_sounding_hashes'
+MEMO_STATISTIC_NAMES_KEY = 'statistic_names_sharppy'
+MEMO_STATISTIC_MATRIX_KEY = 'statistic_matrix_sharppy'
+
 PRESSURE_COLUMN_IN_SHARPPY_SOUNDING = 'pressure_mb'
 HEIGHT_COLUMN_IN_SHARPPY_SOUNDING = 'geopotential_height_metres'
 TEMPERATURE_COLUMN_IN_SHARPPY_SOUNDING = 'temperature_deg_c'
@@ -222,53 +231,37 @@ def _fill_missing_humidity(sounding_table):
     return sounding_table
 
 
-def _get_dummy_sharppy_statistic_table(
-        u_motion_m_s01, v_motion_m_s01, metadata_table):
-    """Creates dummy table with SHARPpy sounding statistics.
+def _get_statistic_column_indices(metadata_table):
+    """Finds columns of statistic matrix for each SHARPpy statistic.
 
-    In this "dummy table," all statistics except storm motion are NaN.
+    In a statistic matrix (see `_compute_stats_for_soundings`), each scalar
+    statistic occupies one column and each vector statistic occupies two
+    (x- then y-component), in the order of `metadata_table`.
+
+    M = number of statistics in metadata table
 
-    :param u_motion_m_s01: Eastward component of storm motion (metres per
-        second).
-    :param v_motion_m_s01: Northward component of storm motion (metres per
-        second).
     :param metadata_table: pandas DataFrame created by
         `read_metadata_for_statistics`.
-    :return: statistic_table_sharppy: pandas DataFrame, with the same columns as
-        one created by `_compute_sounding_statistics`.
+    :return: column_indices_by_statistic: length-M list, where the [j]th
+        element is a numpy array with the column indices (length 1 or 2) for
+        the [j]th statistic.
+    :return: num_columns: Number of columns in statistic matrix.
     """
 
-    vector_flags = numpy.array(
-        metadata_table[IS_VECTOR_COLUMN].values)
-    vector_indices = numpy.where(vector_flags)[0]
-    scalar_indices = numpy.where(numpy.invert(vector_flags))[0]
-
-    dummy_dict = {}
-    for this_index in scalar_indices:
-        this_statistic_name = metadata_table[
-            SHARPPY_STATISTIC_NAME_COLUMN].values[this_index]
-        dummy_dict.update({this_statistic_name: numpy.full(1, numpy.nan)})
-
-    statistic_table_sharppy = pandas.DataFrame.from_dict(dummy_dict)
-
-    first_statistic_name = list(statistic_table_sharppy)[0]
-    nested_array = statistic_table_sharppy[[
-        first_statistic_name, first_statistic_name]].values.tolist()
-
-    for this_index in vector_indices:
-        this_statistic_name = metadata_table[
-            SHARPPY_STATISTIC_NAME_COLUMN].values[this_index]
-        statistic_table_sharppy = statistic_table_sharppy.assign(
-            **{this_statistic_name: nested_array})
-
-        if this_statistic_name == STORM_VELOCITY_NAME_SHARPPY:
-            statistic_table_sharppy[this_statistic_name].values[
-                0] = numpy.array([u_motion_m_s01, v_motion_m_s01])
-        else:
-            statistic_table_sharppy[this_statistic_name].values[
-                0] = numpy.full(2, numpy.nan)
+    num_columns_by_statistic = numpy.where(
+        metadata_table[IS_VECTOR_COLUMN].values.astype(bool), 2, 1)
+    first_column_indices = numpy.concatenate((
+        numpy.array([0], dtype=int), numpy.cumsum(num_columns_by_statistic)
+    ))
+
+    column_indices_by_statistic = [
+        numpy.linspace(
+            first_column_indices[j], first_column_indices[j + 1] - 1,
+            num=num_columns_by_statistic[j], dtype=int)
+        for j in range(len(num_columns_by_statistic))
+    ]
 
-    return statistic_table_sharppy
+    return column_indices_by_statistic, first_column_indices[-1]
 
 
 def _get_nwp_fields_for_sounding(
@@ -710,7 +703,9 @@ def _extract_stats_from_sharppy_profile(profile_object, metadata_table):
     return statistic_table_sharppy
 
 
-def _split_vector_column(input_table, conversion_factor=1.):
+def _split_vector(
+        x_components, y_components, basic_statistic_name,
+        conversion_factor=1.):
     """Splits array of 2-D vectors into 5 arrays, listed below.
 
     - x-component
@@ -721,12 +716,13 @@ def _split_vector_column(input_table, conversion_factor=1.):
 
     N = number of vectors
 
-    :param input_table: pandas DataFrame with one column, where each row is a
-        2-D vector.
+    :param x_components: length-N numpy array of x-components.
+    :param y_components: length-N numpy array of y-components.
+    :param basic_statistic_name: Name of vector statistic (without suffix).
     :param conversion_factor: Both x- and y-components will be multiplied by
         this factor.
-    :return: vector_dict: Dictionary with the following keys (assuming that the
-        original column name is "foo").
+    :return: vector_dict: Dictionary with the following keys (assuming that
+        `basic_statistic_name` is "foo").
     vector_dict['foo_x']: length-N numpy array of x-components.
     vector_dict['foo_y']: length-N numpy array of y-components.
     vector_dict['foo_magnitude']: length-N numpy array of magnitudes.
@@ -736,31 +732,25 @@ def _split_vector_column(input_table, conversion_factor=1.):
         directions.
     """
 
-    input_column = list(input_table)[0]
-    num_vectors = len(input_table.index)
-    x_components = numpy.full(num_vectors, numpy.nan)
-    y_components = numpy.full(num_vectors, numpy.nan)
-
-    for i in range(num_vectors):
-        x_components[i] = input_table[input_column].values[i][0]
-        y_components[i] = input_table[input_column].values[i][1]
-
-    x_components *= conversion_factor
-    y_components *= conversion_factor
+    x_components = x_components * conversion_factor
+    y_components = y_components * conversion_factor
     magnitudes = numpy.sqrt(x_components ** 2 + y_components ** 2)
     cosines = x_components / magnitudes
     sines = y_components / magnitudes
 
     x_component_name = add_vector_suffix_to_stat_name(
-        basic_statistic_name=input_column, vector_suffix=X_COMPONENT_SUFFIX)
+        basic_statistic_name=basic_statistic_name,
+        vector_suffix=X_COMPONENT_SUFFIX)
     y_component_name = add_vector_suffix_to_stat_name(
-        basic_statistic_name=input_column, vector_suffix=Y_COMPONENT_SUFFIX)
+        basic_statistic_name=basic_statistic_name,
+        vector_suffix=Y_COMPONENT_SUFFIX)
     magnitude_name = add_vector_suffix_to_stat_name(
-        basic_statistic_name=input_column, vector_suffix=MAGNITUDE_SUFFIX)
+        basic_statistic_name=basic_statistic_name,
+        vector_suffix=MAGNITUDE_SUFFIX)
     cosine_name = add_vector_suffix_to_stat_name(
-        basic_statistic_name=input_column, vector_suffix=COSINE_SUFFIX)
+        basic_statistic_name=basic_statistic_name, vector_suffix=COSINE_SUFFIX)
     sine_name = add_vector_suffix_to_stat_name(
-        basic_statistic_name=input_column, vector_suffix=SINE_SUFFIX)
+        basic_statistic_name=basic_statistic_name, vector_suffix=SINE_SUFFIX)
 
     return {
         x_component_name: x_components, y_component_name: y_components,
@@ -1187,105 +1177,85 @@ def _compute_sounding_statistics(
         profile_object=profile_object, metadata_table=metadata_table)
 
 
-def _sentinels_to_nan(statistic_table_sharppy, metadata_table):
-    """Replaces sentinel values with NaN.
+def _quantize_storm_sounding(sounding_table_sharppy, u_motion_m_s01,
+                             v_motion_m_s01):
+    """Quantizes "storm sounding" (pair of sounding and motion vector).
 
-    :param statistic_table_sharppy: pandas DataFrame created by
-        `_compute_sounding_statistics`.
-    :param metadata_table: pandas DataFrame created by
-        `read_metadata_for_statistics`.
-    :return: statistic_table_sharppy: Same as input, but sentinel values have
-        been replaced with NaN.
-    """
-
-    statistic_names_sharppy = metadata_table[
-        SHARPPY_STATISTIC_NAME_COLUMN].values.tolist()
-    num_soundings = len(statistic_table_sharppy.index)
+    Values are rounded to the nearest `SOUNDING_KEY_PRECISION` and converted
+    to integers, so that two storm soundings are considered equal iff their
+    quantized vectors are equal.
 
-    for this_name in list(statistic_table_sharppy):
-        if this_name not in statistic_names_sharppy:
-            continue
+    L = number of levels in sounding
+    F = number of fields in sounding (length of `SHARPPY_SOUNDING_COLUMNS`)
 
-        this_index = statistic_names_sharppy.index(this_name)
-        this_vector_flag = metadata_table[IS_VECTOR_COLUMN].values[this_index]
+    :param sounding_table_sharppy: pandas DataFrame created by
+        `_create_sharppy_sounding_tables` (may be None).
+    :param u_motion_m_s01: Eastward component of storm motion (metres per
+        second).
+    :param v_motion_m_s01: Northward component of storm motion (metres per
+        second).
+    :return: key_vector: numpy array (length 3 + L * F) of 64-bit integers.  The
+        first 3 elements are u-motion, v-motion, and L; the rest are sounding
+        values, ordered by level and then field.  If the sounding is None,
+        L = 0.
+    """
 
-        if this_vector_flag:
-            for i in range(num_soundings):
-                these_sentinel_flags = numpy.isclose(
-                    statistic_table_sharppy[this_name].values[i],
-                    SENTINEL_VALUE_FOR_SHARPPY, atol=SENTINEL_VALUE_TOLERANCE)
-                if numpy.any(these_sentinel_flags):
-                    statistic_table_sharppy[this_name].values[i] = numpy.full(
-                        2, numpy.nan)
+    if sounding_table_sharppy is None:
+        sounding_matrix = numpy.full((0, len(SHARPPY_SOUNDING_COLUMNS)), 0.)
+    else:
+        sounding_matrix = sounding_table_sharppy[
+            SHARPPY_SOUNDING_COLUMNS].values.astype(float)
 
-        else:
-            these_sentinel_flags = numpy.isclose(
-                statistic_table_sharppy[this_name].values,
-                SENTINEL_VALUE_FOR_SHARPPY, atol=SENTINEL_VALUE_TOLERANCE)
-            these_sentinel_indices = numpy.where(these_sentinel_flags)[0]
-            statistic_table_sharppy[this_name].values[
-                these_sentinel_indices] = numpy.nan
+    float_vector = numpy.concatenate((
+        numpy.array([u_motion_m_s01, v_motion_m_s01], dtype=float),
+        numpy.ravel(sounding_matrix)
+    ))
 
-    return statistic_table_sharppy
+    key_vector = numpy.full(
+        len(float_vector), MISSING_VALUE_IN_SOUNDING_KEY, dtype=numpy.int64)
+    real_flags = numpy.invert(numpy.isnan(float_vector))
+    key_vector[real_flags] = numpy.round(
+        float_vector[real_flags] / SOUNDING_KEY_PRECISION).astype(numpy.int64)
 
+    return numpy.insert(key_vector, 2, sounding_matrix.shape[0])
 
-def _convert_sounding_statistics(statistic_table_sharppy, metadata_table):
-    """Converts sounding statistics from SHARPpy to GewitterGefahr format.
 
-    :param statistic_table_sharppy: pandas DataFrame created by
-        `_compute_sounding_statistics`.
-    :param metadata_table: pandas DataFrame created by
-        `read_metadata_for_statistics`.
-    :return: sounding_statistic_table: pandas DataFrame with sounding statistics
-        in GewitterGefahr format.  In other words, both column names and units
-        are in GewitterGefahr format.  Also, vectors are split into one column
-        per component.
-    """
+def _hash_storm_soundings(
+        list_of_sharppy_sounding_tables, u_motions_m_s01, v_motions_m_s01):
+    """Hashes each "storm sounding" (pair of sounding and motion vector).
 
-    sharppy_column_names = list(statistic_table_sharppy)
-    sounding_statistic_table = None
+    Hashes depend only on the quantized storm sounding (see
+    `_quantize_storm_sounding`), so they are consistent across runs and can be
+    used as keys in the memo file (see `get_sounding_stats_for_storm_objects`).
 
-    for this_orig_name in sharppy_column_names:
-        match_flags = [s == this_orig_name for s in metadata_table[
-            SHARPPY_STATISTIC_NAME_COLUMN].values]
-        match_index = numpy.where(match_flags)[0][0]
+    N = number of storm soundings
 
-        this_new_name = metadata_table[STATISTIC_NAME_COLUMN].values[
-            match_index]
-        this_conversion_factor = metadata_table[
-            CONVERSION_FACTOR_COLUMN].values[match_index]
-        this_vector_flag = metadata_table[IS_VECTOR_COLUMN].values[match_index]
-
-        if this_vector_flag:
-            this_column_as_table = statistic_table_sharppy[[this_orig_name]]
-            this_column_as_table.rename(
-                columns={this_orig_name: this_new_name}, inplace=True)
-            argument_dict = _split_vector_column(
-                input_table=this_column_as_table,
-                conversion_factor=this_conversion_factor)
-        else:
-            argument_dict = {
-                this_new_name: (
-                    this_conversion_factor *
-                    statistic_table_sharppy[this_orig_name].values)
-            }
-
-        if sounding_statistic_table is None:
-            sounding_statistic_table = pandas.DataFrame.from_dict(argument_dict)
-        else:
-            sounding_statistic_table = sounding_statistic_table.assign(
-                **argument_dict)
+    :param list_of_sharppy_sounding_tables: See doc for
+        `_get_unique_storm_soundings`.
+    :param u_motions_m_s01: Same.
+    :param v_motions_m_s01: Same.
+    :return: hash_strings: length-N list of hashes (hexadecimal strings).
+    """
 
-    temperatures_kelvins = temperature_conversions.fahrenheit_to_kelvins(
-        sounding_statistic_table[CONVECTIVE_TEMPERATURE_NAME].values)
-    argument_dict = {CONVECTIVE_TEMPERATURE_NAME: temperatures_kelvins}
-    return sounding_statistic_table.assign(**argument_dict)
+    return [
+        hashlib.sha1(_quantize_storm_sounding(
+            sounding_table_sharppy=list_of_sharppy_sounding_tables[i],
+            u_motion_m_s01=u_motions_m_s01[i],
+            v_motion_m_s01=v_motions_m_s01[i]
+        ).astype('<i8').tobytes()).hexdigest()
+        for i in range(len(list_of_sharppy_sounding_tables))
+    ]
 
 
 def _get_unique_storm_soundings(
         list_of_sharppy_sounding_tables, u_motions_m_s01, v_motions_m_s01):
     """Finds unique "storm soundings" (pairs of sounding and motion vector).
 
+    Each storm sounding is quantized (see `_quantize_storm_sounding`), and the
+    resulting vectors are padded to equal length and stacked into an N-by-K
+    matrix.  Each row is then viewed as one fixed-width byte string, so that
+    unique rows can be found by one call to `numpy.unique`.
+
     N = number of storm objects
     U = number of unique "storm soundings"
 
@@ -1296,32 +1266,370 @@ def _get_unique_storm_soundings(
     :param v_motions_m_s01: length-N numpy array with northward components of
         storm motion (metres per second).
     :return: unique_indices: length-U numpy array with indices of unique storm
-        soundings.  These are indices into the input arrays.
+        soundings.  These are indices into the input arrays, sorted in
+        ascending order (i.e., by first appearance).
     :return: orig_to_unique_indices: length-N numpy array.  If
         orig_to_unique_indices[j] = i, the [j]th original storm sounding is an
         instance of the [i]th unique storm sounding.
     """
 
     num_storm_objects = len(list_of_sharppy_sounding_tables)
-    storm_sounding_strings = [''] * num_storm_objects
+    list_of_key_vectors = [
+        _quantize_storm_sounding(
+            sounding_table_sharppy=list_of_sharppy_sounding_tables[i],
+            u_motion_m_s01=u_motions_m_s01[i],
+            v_motion_m_s01=v_motions_m_s01[i])
+        for i in range(num_storm_objects)
+    ]
+
+    num_key_columns = max([len(k) for k in list_of_key_vectors])
+    key_matrix = numpy.full(
+        (num_storm_objects, num_key_columns), MISSING_VALUE_IN_SOUNDING_KEY,
+        dtype=numpy.int64)
 
     for i in range(num_storm_objects):
+        key_matrix[i, :len(list_of_key_vectors[i])] = list_of_key_vectors[i]
+
+    key_matrix = numpy.ascontiguousarray(key_matrix)
+    key_strings = key_matrix.view(
+        numpy.dtype((numpy.void, key_matrix.dtype.itemsize * num_key_columns))
+    ).ravel()
+
+    _, unique_indices, orig_to_unique_indices = numpy.unique(
+        key_strings, return_index=True, return_inverse=True)
+
+    # Sort unique storm soundings by first appearance.
+    sort_indices = numpy.argsort(unique_indices)
+    new_unique_indices = numpy.full(len(unique_indices), -1, dtype=int)
+    new_unique_indices[sort_indices] = numpy.linspace(
+        0, len(unique_indices) - 1, num=len(unique_indices), dtype=int)
+
+    return (unique_indices[sort_indices],
+            new_unique_indices[orig_to_unique_indices])
+
+
+def _write_statistic_memo(memo_dict, pickle_file_name):
+    """Writes memo of SHARPpy statistics to Pickle file.
+
+    The file is written under a temporary name and then renamed, so that an
+    interrupted run cannot leave a corrupt memo.
+
+    K = number of storm soundings in memo
+    C = number of columns in statistic matrix
+
+    :param memo_dict: Dictionary with the following keys.
+    memo_dict['storm_sounding_hashes']: length-K list of hashes, created by
+        `_hash_storm_soundings`.
+    memo_dict['statistic_names_sharppy']: 1-D list with names of SHARPpy
+        statistics (in the order used by `_get_statistic_column_indices`).
+    memo_dict['statistic_matrix_sharppy']: K-by-C numpy array of statistics
+        in SHARPpy units.
+
+    :param pickle_file_name: Path to output file.
+    """
+
+    file_system_utils.mkdir_recursive_if_necessary(file_name=pickle_file_name)
+
+    temp_file_name = '{0:s}.tmp'.format(pickle_file_name)
+    pickle_file_handle = open(temp_file_name, 'wb')
+    pickle.dump(memo_dict, pickle_file_handle)
+    pickle_file_handle.close()
+
+    os.rename(temp_file_name, pickle_file_name)
+
+
+def _read_statistic_memo(pickle_file_name, metadata_table):
+    """Reads memo of SHARPpy statistics from Pickle file.
+
+    :param pickle_file_name: Path to input file.
+    :param metadata_table: pandas DataFrame created by
+        `read_metadata_for_statistics`.
+    :return: memo_dict: See doc for `_write_statistic_memo`.
+    :raises: ValueError: if the memo was created with different statistics.
+    """
+
+    pickle_file_handle = open(pickle_file_name, 'rb')
+    memo_dict = pickle.load(pickle_file_handle)
+    pickle_file_handle.close()
+
+    statistic_names_sharppy = metadata_table[
+        SHARPPY_STATISTIC_NAME_COLUMN].values.tolist()
+
+    if memo_dict[MEMO_STATISTIC_NAMES_KEY] != statistic_names_sharppy:
+        error_string = (
+            'Memo file ("{0:s}") was created with different statistics.'
+        ).format(pickle_file_name)
+        raise ValueError(error_string)
+
+    return memo_dict
+
+
+def _compute_stats_for_soundings(argument_tuple):
+    """Computes statistics for many soundings (may be run in worker process).
+
+    S = number of soundings
+    C = number of columns in statistic matrix (see
+        `_get_statistic_column_indices`)
+
+    :param argument_tuple: Tuple with the following items.
+    argument_tuple[0] = list_of_sharppy_sounding_tables: length-S list of
+        pandas DataFrames (may contain None), created by
+        `_create_sharppy_sounding_tables`.
+    argument_tuple[1] = u_motions_m_s01: length-S numpy array with eastward
+        components of storm motion (metres per second).
+    argument_tuple[2] = v_motions_m_s01: length-S numpy array with northward
+        components of storm motion (metres per second).
+    argument_tuple[3] = metadata_table: pandas DataFrame created by
+        `read_metadata_for_statistics`.
+    :return: statistic_matrix_sharppy: S-by-C numpy array of statistics in
+        SHARPpy units.  If a sounding is None, all its statistics except storm
+        motion are NaN.
+    """
+
+    (list_of_sharppy_sounding_tables, u_motions_m_s01, v_motions_m_s01,
+     metadata_table) = argument_tuple
+
+    column_indices_by_statistic, num_columns = _get_statistic_column_indices(
+        metadata_table)
+    statistic_names_sharppy = metadata_table[
+        SHARPPY_STATISTIC_NAME_COLUMN].values
+
+    num_soundings = len(list_of_sharppy_sounding_tables)
+    statistic_matrix_sharppy = numpy.full(
+        (num_soundings, num_columns), numpy.nan)
+
+    for i in range(num_soundings):
         if list_of_sharppy_sounding_tables[i] is None:
-            storm_sounding_strings[i] = 'None'
+            j = statistic_names_sharppy.tolist().index(
+                STORM_VELOCITY_NAME_SHARPPY)
+            statistic_matrix_sharppy[i, column_indices_by_statistic[j]] = [
+                u_motions_m_s01[i], v_motions_m_s01[i]
+            ]
+            continue
+
+        this_statistic_table = _compute_sounding_statistics(
+            sounding_table_sharppy=list_of_sharppy_sounding_tables[i],
+            u_motion_m_s01=u_motions_m_s01[i],
+            v_motion_m_s01=v_motions_m_s01[i], metadata_table=metadata_table)
+
+        for j in range(len(statistic_names_sharppy)):
+            this_value = this_statistic_table[
+                statistic_names_sharppy[j]].values[0]
+
+            statistic_matrix_sharppy[i, column_indices_by_statistic[j]] = (
+                numpy.ma.filled(
+                    numpy.ma.asarray(this_value, dtype=float),
+                    fill_value=numpy.nan)
+            )
+
+    return statistic_matrix_sharppy
+
+
+def _compute_stats_for_unique_soundings(
+        list_of_sharppy_sounding_tables, unique_indices, u_motions_m_s01,
+        v_motions_m_s01, metadata_table, num_processes=1,
+        num_soundings_per_chunk=DEFAULT_NUM_SOUNDINGS_PER_CHUNK):
+    """Computes statistics for each unique storm sounding.
+
+    U = number of unique storm soundings
+    C = number of columns in statistic matrix
+
+    :param list_of_sharppy_sounding_tables: See doc for
+        `_get_unique_storm_soundings`.
+    :param unique_indices: length-U numpy array created by
+        `_get_unique_storm_soundings`.
+    :param u_motions_m_s01: See doc for `_get_unique_storm_soundings`.
+    :param v_motions_m_s01: Same.
+    :param metadata_table: pandas DataFrame created by
+        `read_metadata_for_statistics`.
+    :param num_processes: Number of worker processes.  Unique soundings are
+        split into chunks, which are distributed among processes.
+    :param num_soundings_per_chunk: Number of soundings per chunk.
+    :return: statistic_matrix_sharppy: U-by-C numpy array created by
+        `_compute_stats_for_soundings`.
+    """
+
+    error_checking.assert_is_integer(num_processes)
+    error_checking.assert_is_greater(num_processes, 0)
+    error_checking.assert_is_integer(num_soundings_per_chunk)
+    error_checking.assert_is_greater(num_soundings_per_chunk, 0)
+
+    num_unique_soundings = len(unique_indices)
+    num_chunks = int(numpy.ceil(
+        float(num_unique_soundings) / num_soundings_per_chunk))
+    list_of_index_arrays = numpy.array_split(
+        numpy.linspace(0, num_unique_soundings - 1, num=num_unique_soundings,
+                       dtype=int),
+        max([num_chunks, 1])
+    )
+
+    list_of_argument_tuples = [
+        ([list_of_sharppy_sounding_tables[k] for k in unique_indices[i]],
+         u_motions_m_s01[unique_indices[i]],
+         v_motions_m_s01[unique_indices[i]],
+         metadata_table)
+        for i in list_of_index_arrays
+    ]
+
+    if num_processes == 1:
+        list_of_statistic_matrices = [
+            _compute_stats_for_soundings(t) for t in list_of_argument_tuples
+        ]
+    else:
+        pool_object = multiprocessing.Pool(processes=num_processes)
+        list_of_statistic_matrices = pool_object.map(
+            _compute_stats_for_soundings, list_of_argument_tuples, chunksize=1)
+        pool_object.close()
+        pool_object.join()
+
+    num_columns = _get_statistic_column_indices(metadata_table)[1]
+    statistic_matrix_sharppy = numpy.full(
+        (num_unique_soundings, num_columns), numpy.nan)
+
+    for this_index_array, this_statistic_matrix in zip(
+            list_of_index_arrays, list_of_statistic_matrices):
+        statistic_matrix_sharppy[this_index_array, :] = this_statistic_matrix
+
+    return statistic_matrix_sharppy
+
+
+def _compute_stats_with_memo(
+        list_of_sharppy_sounding_tables, unique_indices, u_motions_m_s01,
+        v_motions_m_s01, metadata_table, memo_file_name, num_processes=1):
+    """Computes statistics for each unique storm sounding, using memo file.
+
+    Statistics for storm soundings already in the memo file are read from
+    there.  Statistics for all other storm soundings are computed by
+    `_compute_stats_for_unique_soundings` and added to the memo file.
+
+    :param list_of_sharppy_sounding_tables: See doc for
+        `_compute_stats_for_unique_soundings`.
+    :param unique_indices: Same.
+    :param u_motions_m_s01: Same.
+    :param v_motions_m_s01: Same.
+    :param metadata_table: Same.
+    :param memo_file_name: Path to memo file (readable by
+        `_read_statistic_memo`).  If the file does not exist, it will be
+        created.
+    :param num_processes: See doc for `_compute_stats_for_unique_soundings`.
+    :return: statistic_matrix_sharppy: Same.
+    """
+
+    num_columns = _get_statistic_column_indices(metadata_table)[1]
+
+    if os.path.isfile(memo_file_name):
+        memo_dict = _read_statistic_memo(
+            pickle_file_name=memo_file_name, metadata_table=metadata_table)
+    else:
+        memo_dict = {
+            MEMO_HASHES_KEY: [],
+            MEMO_STATISTIC_NAMES_KEY: metadata_table[
+                SHARPPY_STATISTIC_NAME_COLUMN].values.tolist(),
+            MEMO_STATISTIC_MATRIX_KEY: numpy.full((0, num_columns), numpy.nan)
+        }
+
+    hash_strings = _hash_storm_soundings(
+        list_of_sharppy_sounding_tables=[
+            list_of_sharppy_sounding_tables[k] for k in unique_indices],
+        u_motions_m_s01=u_motions_m_s01[unique_indices],
+        v_motions_m_s01=v_motions_m_s01[unique_indices])
+
+    memo_index_by_hash = dict(
+        zip(memo_dict[MEMO_HASHES_KEY], range(len(memo_dict[MEMO_HASHES_KEY])))
+    )
+    memo_indices = numpy.array(
+        [memo_index_by_hash.get(h, -1) for h in hash_strings], dtype=int)
+
+    found_indices = numpy.where(memo_indices >= 0)[0]
+    missing_indices = numpy.where(memo_indices < 0)[0]
+
+    print (
+        'Found statistics for {0:d} of {1:d} unique soundings in memo file '
+        '("{2:s}")...'
+    ).format(len(found_indices), len(unique_indices), memo_file_name)
+
+    statistic_matrix_sharppy = numpy.full(
+        (len(unique_indices), num_columns), numpy.nan)
+    statistic_matrix_sharppy[found_indices, :] = memo_dict[
+        MEMO_STATISTIC_MATRIX_KEY][memo_indices[found_indices], :]
+
+    if len(missing_indices) == 0:
+        return statistic_matrix_sharppy
+
+    statistic_matrix_sharppy[missing_indices, :] = (
+        _compute_stats_for_unique_soundings(
+            list_of_sharppy_sounding_tables=list_of_sharppy_sounding_tables,
+            unique_indices=unique_indices[missing_indices],
+            u_motions_m_s01=u_motions_m_s01, v_motions_m_s01=v_motions_m_s01,
+            metadata_table=metadata_table, num_processes=num_processes)
+    )
+
+    memo_dict[MEMO_HASHES_KEY] += [hash_strings[i] for i in missing_indices]
+    memo_dict[MEMO_STATISTIC_MATRIX_KEY] = numpy.concatenate((
+        memo_dict[MEMO_STATISTIC_MATRIX_KEY],
+        statistic_matrix_sharppy[missing_indices, :]
+    ), axis=0)
+
+    print 'Writing memo of statistics to: "{0:s}"...'.format(memo_file_name)
+    _write_statistic_memo(memo_dict=memo_dict, pickle_file_name=memo_file_name)
+
+    return statistic_matrix_sharppy
+
+
+def _convert_statistic_matrix(statistic_matrix_sharppy, metadata_table):
+    """Converts statistic matrix from SHARPpy to GewitterGefahr format.
+
+    Sentinel values are replaced with NaN.  If either component of a vector is a
+    sentinel value, both components become NaN.
+
+    :param statistic_matrix_sharppy: 2-D numpy array created by
+        `_compute_stats_for_soundings`.
+    :param metadata_table: pandas DataFrame created by
+        `read_metadata_for_statistics`.
+    :return: sounding_statistic_table: pandas DataFrame with sounding statistics
+        in GewitterGefahr format.  In other words, both column names and units
+        are in GewitterGefahr format.  Also, vectors are split into one column
+        per component.
+    """
+
+    column_indices_by_statistic = _get_statistic_column_indices(
+        metadata_table)[0]
+    sentinel_flag_matrix = numpy.isclose(
+        statistic_matrix_sharppy, SENTINEL_VALUE_FOR_SHARPPY,
+        atol=SENTINEL_VALUE_TOLERANCE)
+
+    argument_dict = {}
+
+    for j in range(len(column_indices_by_statistic)):
+        these_values = statistic_matrix_sharppy[
+            :, column_indices_by_statistic[j]] + 0.
+
+        # If either component of a vector is a sentinel value, both become NaN.
+        these_sentinel_flags = numpy.any(
+            sentinel_flag_matrix[:, column_indices_by_statistic[j]], axis=1)
+        these_values[these_sentinel_flags, :] = numpy.nan
+
+        this_new_name = metadata_table[STATISTIC_NAME_COLUMN].values[j]
+        this_conversion_factor = metadata_table[
+            CONVERSION_FACTOR_COLUMN].values[j]
+
+        if metadata_table[IS_VECTOR_COLUMN].values[j]:
+            argument_dict.update(_split_vector(
+                x_components=these_values[:, 0],
+                y_components=these_values[:, 1],
+                basic_statistic_name=this_new_name,
+                conversion_factor=this_conversion_factor))
         else:
-            storm_sounding_strings[i] = '{0:.2f}_{1:.2f}'.format(
-                u_motions_m_s01[i], v_motions_m_s01[i])
+            argument_dict.update({
+                this_new_name: this_conversion_factor * these_values[:, 0]
+            })
 
-            for j in range(3):
-                for this_column in SHARPPY_SOUNDING_COLUMNS:
-                    storm_sounding_strings[i] += '_{0:.2f}'.format(
-                        list_of_sharppy_sounding_tables[
-                            i][this_column].values[j])
+    argument_dict[CONVECTIVE_TEMPERATURE_NAME] = (
+        temperature_conversions.fahrenheit_to_kelvins(
+            argument_dict[CONVECTIVE_TEMPERATURE_NAME])
+    )
 
-    _, unique_indices, orig_to_unique_indices = numpy.unique(
-        numpy.array(storm_sounding_strings), return_index=True,
-        return_inverse=True)
-    return unique_indices, orig_to_unique_indices
+    return pandas.DataFrame.from_dict(argument_dict)
 
 
 def check_statistic_name(statistic_name, metadata_table):
@@ -1493,7 +1801,7 @@ def get_sounding_stats_for_storm_objects(
         model_name=None, grid_id=None,
         wgrib_exe_name=grib_io.WGRIB_EXE_NAME_DEFAULT,
         wgrib2_exe_name=grib_io.WGRIB2_EXE_NAME_DEFAULT,
-        raise_error_if_missing=False):
+        raise_error_if_missing=False, num_processes=1, memo_file_name=None):
     """Computes sounding statistics for each storm object.
 
     N = number of storm objects
@@ -1520,6 +1828,13 @@ def get_sounding_stats_for_storm_objects(
         is missing and `raise_error_if_missing` = True, this method will error
         out.  If a grib file is missing and `raise_error_if_missing` = False,
         this method will skip the corresponding time step.
+    :param num_processes: Number of worker processes used to compute SHARPpy
+        statistics.
+    :param memo_file_name: Path to memo file, containing SHARPpy statistics
+        for previously seen storm soundings (see `_compute_stats_with_memo`).
+        Storm soundings are matched by hash, so re-running for overlapping
+        periods does not recompute identical soundings.  If None, will not use
+        a memo file.
     :return: sounding_statistic_table: pandas DataFrame with N*T rows (one for
         each storm object and lead time) and 3 + K columns.  The first 3 columns
         are listed below.  The other K column names can be found by running the
@@ -1573,52 +1888,31 @@ def get_sounding_stats_for_storm_objects(
     print 'Number of unique soundings = {0:d}/{1:d}\n'.format(
         num_unique_soundings, num_soundings)
 
-    list_of_sharppy_statistic_tables = [None] * num_soundings
     metadata_table = read_metadata_for_statistics()
 
-    for i in range(num_unique_soundings):
-        print (
-            'Computing statistics for {0:d}th of {1:d} unique soundings...'
-        ).format(i + 1, num_unique_soundings)
-
-        j = unique_indices[i]
-        if list_of_sharppy_sounding_tables[j] is None:
-            this_statistic_table = _get_dummy_sharppy_statistic_table(
-                u_motion_m_s01=query_point_table[
-                    tracking_utils.EAST_VELOCITY_COLUMN].values[j],
-                v_motion_m_s01=query_point_table[
-                    tracking_utils.NORTH_VELOCITY_COLUMN].values[j],
-                metadata_table=metadata_table)
-
-        else:
-            this_statistic_table = _compute_sounding_statistics(
-                sounding_table_sharppy=list_of_sharppy_sounding_tables[j],
-                u_motion_m_s01=query_point_table[
-                    tracking_utils.EAST_VELOCITY_COLUMN].values[j],
-                v_motion_m_s01=query_point_table[
-                    tracking_utils.NORTH_VELOCITY_COLUMN].values[j],
-                metadata_table=metadata_table)
-
-        these_orig_indices = numpy.where(orig_to_unique_indices == i)[0]
-        for this_orig_index in these_orig_indices:
-            list_of_sharppy_statistic_tables[
-                this_orig_index] = this_statistic_table
-
-    for i in range(num_soundings):
-        if i == 0:
-            continue
-
-        list_of_sharppy_statistic_tables[i], _ = (
-            list_of_sharppy_statistic_tables[i].align(
-                list_of_sharppy_statistic_tables[0], axis=1))
-
-    statistic_table_sharppy = pandas.concat(
-        list_of_sharppy_statistic_tables, axis=0, ignore_index=True)
-    statistic_table_sharppy = _sentinels_to_nan(
-        statistic_table_sharppy=statistic_table_sharppy,
-        metadata_table=metadata_table)
-    sounding_statistic_table = _convert_sounding_statistics(
-        statistic_table_sharppy=statistic_table_sharppy,
+    if memo_file_name is None:
+        statistic_matrix_sharppy = _compute_stats_for_unique_soundings(
+            list_of_sharppy_sounding_tables=list_of_sharppy_sounding_tables,
+            unique_indices=unique_indices,
+            u_motions_m_s01=query_point_table[
+                tracking_utils.EAST_VELOCITY_COLUMN].values,
+            v_motions_m_s01=query_point_table[
+                tracking_utils.NORTH_VELOCITY_COLUMN].values,
+            metadata_table=metadata_table, num_processes=num_processes)
+    else:
+        statistic_matrix_sharppy = _compute_stats_with_memo(
+            list_of_sharppy_sounding_tables=list_of_sharppy_sounding_tables,
+            unique_indices=unique_indices,
+            u_motions_m_s01=query_point_table[
+                tracking_utils.EAST_VELOCITY_COLUMN].values,
+            v_motions_m_s01=query_point_table[
+                tracking_utils.NORTH_VELOCITY_COLUMN].values,
+            metadata_table=metadata_table, memo_file_name=memo_file_name,
+            num_processes=num_processes)
+
+    sounding_statistic_table = _convert_statistic_matrix(
+        statistic_matrix_sharppy=statistic_matrix_sharppy[
+            orig_to_unique_indices, :],
         metadata_table=metadata_table)
     sounding_statistic_table = pandas.concat(
         [storm_object_table[STORM_COLUMNS_TO_KEEP],
@@ -1683,7 +1977,7 @@ def write_sounding_statistics(
     :param lead_time_sec: Same.
     :param spc_date_string: Same.
     :param sounding_statistic_table: See output doc for
-        `_convert_sounding_statistics`.
+        `_convert_statistic_matrix`.
     :param verbose: Boolean flag.  If True, will print log message.
     """
 
@@ -331,38 +331,14 @@ SOUNDING_TABLE_NO_SUBSURFACE = SOUNDING_TABLE_NO_REDUNDANT.drop(
     SOUNDING_TABLE_NO_REDUNDANT.index[[0]], axis=0,
     inplace=False).reset_index(drop=True)
 
-# The following constants are used to test _split_vector_column.
-VECTOR_COLUMN = 'vector'
-VECTOR_COLUMN_AS_TABLE = pandas.DataFrame.from_dict(
-    {VECTOR_COLUMN: numpy.full(8, numpy.nan)})
-
-THIS_NESTED_ARRAY = VECTOR_COLUMN_AS_TABLE[[
-    VECTOR_COLUMN, VECTOR_COLUMN]].values.tolist()
-VECTOR_COLUMN_AS_TABLE = VECTOR_COLUMN_AS_TABLE.assign(
-    **{VECTOR_COLUMN: THIS_NESTED_ARRAY})
-
-VECTOR_COLUMN_AS_TABLE[VECTOR_COLUMN].values[0] = numpy.array(
-    [1, 0], dtype=float)
-VECTOR_COLUMN_AS_TABLE[VECTOR_COLUMN].values[1] = numpy.array(
-    [1, 1], dtype=float)
-VECTOR_COLUMN_AS_TABLE[VECTOR_COLUMN].values[2] = numpy.array(
-    [0, 1], dtype=float)
-VECTOR_COLUMN_AS_TABLE[VECTOR_COLUMN].values[3] = numpy.array(
-    [-1, 1], dtype=float)
-VECTOR_COLUMN_AS_TABLE[VECTOR_COLUMN].values[4] = numpy.array(
-    [-1, 0], dtype=float)
-VECTOR_COLUMN_AS_TABLE[VECTOR_COLUMN].values[5] = numpy.array(
-    [-1, -1], dtype=float)
-VECTOR_COLUMN_AS_TABLE[VECTOR_COLUMN].values[6] = numpy.array(
-    [0, -1], dtype=float)
-VECTOR_COLUMN_AS_TABLE[VECTOR_COLUMN].values[7] = numpy.array(
-    [1, -1], dtype=float)
+# The following constants are used to test _split_vector.
+VECTOR_STATISTIC_NAME = 'vector'
+X_COMPONENTS = numpy.array([1, 1, 0, -1, -1, -1, 0, 1], dtype=float)
+Y_COMPONENTS = numpy.array([0, 1, 1, 1, 0, -1, -1, -1], dtype=float)
 
 ROOT2 = numpy.sqrt(2.)
 HALF_ROOT2 = ROOT2 / 2
 
-THESE_X_COMPONENTS = numpy.array([1, 1, 0, -1, -1, -1, 0, 1], dtype=float)
-THESE_Y_COMPONENTS = numpy.array([0, 1, 1, 1, 0, -1, -1, -1], dtype=float)
 THESE_MAGNITUDES = numpy.array([1, ROOT2, 1, ROOT2, 1, ROOT2, 1, ROOT2])
 THESE_COSINES = numpy.array(
     [1, HALF_ROOT2, 0, -HALF_ROOT2, -1, -HALF_ROOT2, 0, HALF_ROOT2])
@@ -376,21 +352,22 @@ COSINE_COLUMN = 'vector_cos'
 SINE_COLUMN = 'vector_sin'
 
 THIS_VECTOR_COMPONENT_DICT = {
-    X_COMPONENT_COLUMN: THESE_X_COMPONENTS,
-    Y_COMPONENT_COLUMN: THESE_Y_COMPONENTS, MAGNITUDE_COLUMN: THESE_MAGNITUDES,
+    X_COMPONENT_COLUMN: X_COMPONENTS,
+    Y_COMPONENT_COLUMN: Y_COMPONENTS, MAGNITUDE_COLUMN: THESE_MAGNITUDES,
     COSINE_COLUMN: THESE_COSINES, SINE_COLUMN: THESE_SINES}
 VECTOR_COMPONENT_TABLE_CONV_FACTOR1 = pandas.DataFrame.from_dict(
     THIS_VECTOR_COMPONENT_DICT)
 
 THIS_VECTOR_COMPONENT_DICT = {
-    X_COMPONENT_COLUMN: THESE_X_COMPONENTS * 10,
-    Y_COMPONENT_COLUMN: THESE_Y_COMPONENTS * 10,
+    X_COMPONENT_COLUMN: X_COMPONENTS * 10,
+    Y_COMPONENT_COLUMN: Y_COMPONENTS * 10,
     MAGNITUDE_COLUMN: THESE_MAGNITUDES * 10,
     COSINE_COLUMN: THESE_COSINES, SINE_COLUMN: THESE_SINES}
 VECTOR_COMPONENT_TABLE_CONV_FACTOR10 = pandas.DataFrame.from_dict(
     THIS_VECTOR_COMPONENT_DICT)
 
-# The following constants are used to test _sentinels_to_nan.
+# The following constants are used to test _get_statistic_column_indices and
+# _convert_statistic_matrix.
 CONVECTIVE_TEMPERATURE_NAME = 'convective_temperature_kelvins'
 MEAN_WIND_0TO1KM_NAME = 'wind_mean_0to1km_agl_m_s01'
 SURFACE_RH_NAME = 'relative_humidity_surface'
@@ -402,17 +379,6 @@ VALID_SOUNDING_STAT_NAMES = METADATA_TABLE[
 
 SOUNDING_STAT_NAMES = list(
     METADATA_TABLE[sounding_stats.STATISTIC_NAME_COLUMN].values)
-SOUNDING_STAT_NAMES_SHARPPY = list(
-    METADATA_TABLE[sounding_stats.SHARPPY_STATISTIC_NAME_COLUMN].values)
-
-CONVECTIVE_TEMPERATURE_NAME_SHARPPY = SOUNDING_STAT_NAMES_SHARPPY[
-    SOUNDING_STAT_NAMES.index(CONVECTIVE_TEMPERATURE_NAME)]
-MEAN_WIND_0TO1KM_NAME_SHARPPY = SOUNDING_STAT_NAMES_SHARPPY[
-    SOUNDING_STAT_NAMES.index(MEAN_WIND_0TO1KM_NAME)]
-SURFACE_RH_NAME_SHARPPY = SOUNDING_STAT_NAMES_SHARPPY[
-    SOUNDING_STAT_NAMES.index(SURFACE_RH_NAME)]
-DERECHO_COMPOSITE_NAME_SHARPPY = SOUNDING_STAT_NAMES_SHARPPY[
-    SOUNDING_STAT_NAMES.index(DERECHO_COMPOSITE_NAME)]
 
 CONVECTIVE_TEMPS_DEG_F = numpy.array(
     [-130, -76, -40, -4, 32, 50, 68], dtype=float)
@@ -421,74 +387,6 @@ V_WINDS_0TO1KM_AGL_KT = numpy.array([0, 10, 10, 10, 0, -10, -10], dtype=float)
 SURFACE_RH_PERCENTAGES = numpy.array([40, 50, 60, 70, 80, 90, 100], dtype=float)
 DERECHO_COMPOSITE_PARAMS = numpy.array([0, 5, 10, 15, 20, 25, 30], dtype=float)
 
-THIS_DICT = {
-    CONVECTIVE_TEMPERATURE_NAME_SHARPPY: CONVECTIVE_TEMPS_DEG_F,
-    SURFACE_RH_NAME_SHARPPY: SURFACE_RH_PERCENTAGES,
-    DERECHO_COMPOSITE_NAME_SHARPPY: DERECHO_COMPOSITE_PARAMS
-}
-STATISTIC_TABLE_SHARPPY = pandas.DataFrame.from_dict(THIS_DICT)
-STATISTIC_TABLE_SHARPPY_WITH_SENTINELS = pandas.DataFrame.from_dict(THIS_DICT)
-STATISTIC_TABLE_SHARPPY_WITH_NANS = pandas.DataFrame.from_dict(THIS_DICT)
-
-THIS_NESTED_ARRAY = STATISTIC_TABLE_SHARPPY[[
-    SURFACE_RH_NAME_SHARPPY, SURFACE_RH_NAME_SHARPPY]].values.tolist()
-STATISTIC_TABLE_SHARPPY = STATISTIC_TABLE_SHARPPY.assign(
-    **{MEAN_WIND_0TO1KM_NAME_SHARPPY: THIS_NESTED_ARRAY})
-STATISTIC_TABLE_SHARPPY_WITH_SENTINELS = (
-    STATISTIC_TABLE_SHARPPY_WITH_SENTINELS.assign(
-        **{MEAN_WIND_0TO1KM_NAME_SHARPPY: THIS_NESTED_ARRAY}))
-STATISTIC_TABLE_SHARPPY_WITH_NANS = (
-    STATISTIC_TABLE_SHARPPY_WITH_NANS.assign(
-        **{MEAN_WIND_0TO1KM_NAME_SHARPPY: THIS_NESTED_ARRAY}))
-
-for k in range(len(U_WINDS_0TO1KM_AGL_KT)):
-    this_wind_vector = numpy.array(
-        [U_WINDS_0TO1KM_AGL_KT[k], V_WINDS_0TO1KM_AGL_KT[k]])
-
-    STATISTIC_TABLE_SHARPPY[MEAN_WIND_0TO1KM_NAME_SHARPPY].values[
-        k] = copy.deepcopy(this_wind_vector)
-    STATISTIC_TABLE_SHARPPY_WITH_SENTINELS[
-        MEAN_WIND_0TO1KM_NAME_SHARPPY
-    ].values[k] = copy.deepcopy(this_wind_vector)
-    STATISTIC_TABLE_SHARPPY_WITH_NANS[MEAN_WIND_0TO1KM_NAME_SHARPPY].values[
-        k] = copy.deepcopy(this_wind_vector)
-
-STATISTIC_TABLE_SHARPPY_WITH_SENTINELS[
-    CONVECTIVE_TEMPERATURE_NAME_SHARPPY
-].values[0] = sounding_stats.SENTINEL_VALUE_FOR_SHARPPY
-STATISTIC_TABLE_SHARPPY_WITH_SENTINELS[
-    SURFACE_RH_NAME_SHARPPY
-].values[1] = sounding_stats.SENTINEL_VALUE_FOR_SHARPPY
-STATISTIC_TABLE_SHARPPY_WITH_SENTINELS[
-    DERECHO_COMPOSITE_NAME_SHARPPY
-].values[2] = sounding_stats.SENTINEL_VALUE_FOR_SHARPPY
-STATISTIC_TABLE_SHARPPY_WITH_SENTINELS[
-    MEAN_WIND_0TO1KM_NAME_SHARPPY
-].values[3][0] = sounding_stats.SENTINEL_VALUE_FOR_SHARPPY
-STATISTIC_TABLE_SHARPPY_WITH_SENTINELS[
-    MEAN_WIND_0TO1KM_NAME_SHARPPY
-].values[4][1] = sounding_stats.SENTINEL_VALUE_FOR_SHARPPY
-STATISTIC_TABLE_SHARPPY_WITH_SENTINELS[
-    MEAN_WIND_0TO1KM_NAME_SHARPPY
-].values[5][0] = sounding_stats.SENTINEL_VALUE_FOR_SHARPPY
-STATISTIC_TABLE_SHARPPY_WITH_SENTINELS[
-    MEAN_WIND_0TO1KM_NAME_SHARPPY
-].values[5][1] = sounding_stats.SENTINEL_VALUE_FOR_SHARPPY
-
-STATISTIC_TABLE_SHARPPY_WITH_NANS[
-    CONVECTIVE_TEMPERATURE_NAME_SHARPPY].values[0] = numpy.nan
-STATISTIC_TABLE_SHARPPY_WITH_NANS[
-    SURFACE_RH_NAME_SHARPPY].values[1] = numpy.nan
-STATISTIC_TABLE_SHARPPY_WITH_NANS[
-    DERECHO_COMPOSITE_NAME_SHARPPY].values[2] = numpy.nan
-STATISTIC_TABLE_SHARPPY_WITH_NANS[
-    MEAN_WIND_0TO1KM_NAME_SHARPPY].values[3] = numpy.full(2, numpy.nan)
-STATISTIC_TABLE_SHARPPY_WITH_NANS[
-    MEAN_WIND_0TO1KM_NAME_SHARPPY].values[4] = numpy.full(2, numpy.nan)
-STATISTIC_TABLE_SHARPPY_WITH_NANS[
-    MEAN_WIND_0TO1KM_NAME_SHARPPY].values[5] = numpy.full(2, numpy.nan)
-
-# The following constants are used to test _convert_sounding_statistics.
 TEN_KT_IN_MPS = 5.144444
 ROOT200_KT_IN_MPS = 7.275343
 U_WIND_0TO1KM_NAME = 'wind_mean_0to1km_agl_m_s01_x'
@@ -523,6 +421,45 @@ THIS_DICT = {
 }
 SOUNDING_STATISTIC_TABLE = pandas.DataFrame.from_dict(THIS_DICT)
 
+THESE_ROW_INDICES = numpy.array([
+    SOUNDING_STAT_NAMES.index(CONVECTIVE_TEMPERATURE_NAME),
+    SOUNDING_STAT_NAMES.index(MEAN_WIND_0TO1KM_NAME),
+    SOUNDING_STAT_NAMES.index(SURFACE_RH_NAME),
+    SOUNDING_STAT_NAMES.index(DERECHO_COMPOSITE_NAME)
+], dtype=int)
+SMALL_METADATA_TABLE = METADATA_TABLE.iloc[THESE_ROW_INDICES]
+
+COLUMN_INDICES_BY_STATISTIC = [
+    numpy.array([0], dtype=int), numpy.array([1, 2], dtype=int),
+    numpy.array([3], dtype=int), numpy.array([4], dtype=int)
+]
+NUM_STATISTIC_COLUMNS = 5
+
+STATISTIC_MATRIX_SHARPPY = numpy.transpose(numpy.vstack((
+    CONVECTIVE_TEMPS_DEG_F, U_WINDS_0TO1KM_AGL_KT, V_WINDS_0TO1KM_AGL_KT,
+    SURFACE_RH_PERCENTAGES, DERECHO_COMPOSITE_PARAMS
+)))
+
+STATISTIC_MATRIX_SHARPPY_WITH_SENTINELS = STATISTIC_MATRIX_SHARPPY + 0.
+STATISTIC_MATRIX_SHARPPY_WITH_SENTINELS[0, 0] = (
+    sounding_stats.SENTINEL_VALUE_FOR_SHARPPY)
+STATISTIC_MATRIX_SHARPPY_WITH_SENTINELS[3, 1] = (
+    sounding_stats.SENTINEL_VALUE_FOR_SHARPPY)
+STATISTIC_MATRIX_SHARPPY_WITH_SENTINELS[4, 2] = (
+    sounding_stats.SENTINEL_VALUE_FOR_SHARPPY)
+STATISTIC_MATRIX_SHARPPY_WITH_SENTINELS[2, 4] = (
+    sounding_stats.SENTINEL_VALUE_FOR_SHARPPY)
+
+SOUNDING_STAT_TABLE_WITH_NANS = copy.deepcopy(SOUNDING_STATISTIC_TABLE)
+SOUNDING_STAT_TABLE_WITH_NANS[CONVECTIVE_TEMPERATURE_NAME].values[0] = (
+    numpy.nan)
+SOUNDING_STAT_TABLE_WITH_NANS[DERECHO_COMPOSITE_NAME].values[2] = numpy.nan
+
+for this_column in [U_WIND_0TO1KM_NAME, V_WIND_0TO1KM_NAME,
+                    WIND_SPEED_0TO1KM_NAME, WIND_COS_0TO1KM_NAME,
+                    WIND_SIN_0TO1KM_NAME]:
+    SOUNDING_STAT_TABLE_WITH_NANS[this_column].values[3:5] = numpy.nan
+
 # The following constants are used to test _get_unique_storm_sounding_stats.
 THIS_SOUNDING_DICT1 = {
     sounding_stats.PRESSURE_COLUMN_IN_SHARPPY_SOUNDING:
@@ -587,9 +524,12 @@ LIST_OF_SOUNDING_TABLES = [
 U_MOTIONS_M_S01 = numpy.array([0, 5, 10, 15, 20, 25, 30, 27.5, 20, 15, 10, 5])
 V_MOTIONS_M_S01 = numpy.full(len(U_MOTIONS_M_S01), 0.)
 
-UNIQUE_INDICES = numpy.array([3, 5, 7, 1, 0], dtype=int)
+UNIQUE_INDICES = numpy.array([0, 1, 2, 3, 4, 5, 6, 7], dtype=int)
 ORIG_TO_UNIQUE_INDICES = numpy.array(
-    [4, 3, 4, 0, 4, 1, 4, 2, 4, 0, 4, 3], dtype=int)
+    [0, 1, 2, 3, 4, 5, 6, 7, 4, 3, 2, 1], dtype=int)
+
+# The following constants are used to test _hash_storm_soundings.
+HASH_INDICES_TO_COMPARE = numpy.array([1, 3, 9, 11], dtype=int)
 
 # The following constants are used to test find_sounding_statistic_file.
 TOP_DIRECTORY_NAME = 'poop'
@@ -939,14 +879,16 @@ class SoundingsTests(unittest.TestCase):
         self.assertTrue(
             this_sounding_table.equals(SOUNDING_TABLE_NO_SUBSURFACE))
 
-    def test_split_vector_column_conversion_factor1(self):
-        """Ensures correct output from _split_vector_column.
+    def test_split_vector_conversion_factor1(self):
+        """Ensures correct output from _split_vector.
 
         In this case, conversion_factor = 1.
         """
 
-        this_vector_component_dict = sounding_stats._split_vector_column(
-            VECTOR_COLUMN_AS_TABLE, conversion_factor=1.)
+        this_vector_component_dict = sounding_stats._split_vector(
+            x_components=X_COMPONENTS, y_components=Y_COMPONENTS,
+            basic_statistic_name=VECTOR_STATISTIC_NAME,
+            conversion_factor=1.)
         this_vector_component_table = pandas.DataFrame.from_dict(
             this_vector_component_dict)
 
@@ -959,14 +901,16 @@ class SoundingsTests(unittest.TestCase):
                 VECTOR_COMPONENT_TABLE_CONV_FACTOR1[this_column].values,
                 atol=TOLERANCE))
 
-    def test_split_vector_column_conversion_factor10(self):
-        """Ensures correct output from _split_vector_column.
+    def test_split_vector_conversion_factor10(self):
+        """Ensures correct output from _split_vector.
 
         In this case, conversion_factor = 10.
         """
 
-        this_vector_component_dict = sounding_stats._split_vector_column(
-            VECTOR_COLUMN_AS_TABLE, conversion_factor=10.)
+        this_vector_component_dict = sounding_stats._split_vector(
+            x_components=X_COMPONENTS, y_components=Y_COMPONENTS,
+            basic_statistic_name=VECTOR_STATISTIC_NAME,
+            conversion_factor=10.)
         this_vector_component_table = pandas.DataFrame.from_dict(
             this_vector_component_dict)
 
@@ -1015,39 +959,31 @@ class SoundingsTests(unittest.TestCase):
                 SOUNDING_TABLE_SHARPPY_ORIG[this_column].values,
                 atol=TOLERANCE))
 
-    def test_sentinels_to_nan(self):
-        """Ensures correct output from _sentinels_to_nan."""
+    def test_get_statistic_column_indices(self):
+        """Ensures correct output from _get_statistic_column_indices."""
 
-        this_table = copy.deepcopy(STATISTIC_TABLE_SHARPPY_WITH_SENTINELS)
-        this_table = sounding_stats._sentinels_to_nan(
-            statistic_table_sharppy=this_table, metadata_table=METADATA_TABLE)
-        this_num_soundings = len(this_table.index)
+        these_column_indices_by_stat, this_num_columns = (
+            sounding_stats._get_statistic_column_indices(SMALL_METADATA_TABLE))
 
-        expected_column_names = list(STATISTIC_TABLE_SHARPPY_WITH_NANS)
-        actual_column_names = list(this_table)
-        self.assertTrue(set(expected_column_names) == set(actual_column_names))
+        self.assertTrue(this_num_columns == NUM_STATISTIC_COLUMNS)
+        self.assertTrue(
+            len(these_column_indices_by_stat) ==
+            len(COLUMN_INDICES_BY_STATISTIC))
 
-        for this_column in actual_column_names:
-            if this_column == MEAN_WIND_0TO1KM_NAME_SHARPPY:
-                for i in range(this_num_soundings):
-                    self.assertTrue(numpy.allclose(
-                        this_table[this_column].values[i],
-                        STATISTIC_TABLE_SHARPPY_WITH_NANS[
-                            this_column].values[i],
-                        atol=TOLERANCE, equal_nan=True))
+        for k in range(len(COLUMN_INDICES_BY_STATISTIC)):
+            self.assertTrue(numpy.array_equal(
+                these_column_indices_by_stat[k],
+                COLUMN_INDICES_BY_STATISTIC[k]))
 
-            else:
-                self.assertTrue(numpy.allclose(
-                    this_table[this_column].values,
-                    STATISTIC_TABLE_SHARPPY_WITH_NANS[this_column].values,
-                    atol=TOLERANCE, equal_nan=True))
+    def test_convert_statistic_matrix_no_sentinels(self):
+        """Ensures correct output from _convert_statistic_matrix.
 
-    def test_convert_sounding_statistics(self):
-        """Ensures correct output from _convert_sounding_statistics."""
+        In this case there are no sentinel values.
+        """
 
-        this_sounding_stat_table = (
-            sounding_stats._convert_sounding_statistics(
-                STATISTIC_TABLE_SHARPPY, METADATA_TABLE))
+        this_sounding_stat_table = sounding_stats._convert_statistic_matrix(
+            statistic_matrix_sharppy=STATISTIC_MATRIX_SHARPPY,
+            metadata_table=SMALL_METADATA_TABLE)
 
         self.assertTrue(set(list(this_sounding_stat_table)) ==
                         set(list(SOUNDING_STATISTIC_TABLE)))
@@ -1058,6 +994,26 @@ class SoundingsTests(unittest.TestCase):
                 SOUNDING_STATISTIC_TABLE[this_column].values, atol=TOLERANCE,
                 equal_nan=True))
 
+    def test_convert_statistic_matrix_with_sentinels(self):
+        """Ensures correct output from _convert_statistic_matrix.
+
+        In this case there are sentinel values, including one in each component
+        of a vector.
+        """
+
+        this_sounding_stat_table = sounding_stats._convert_statistic_matrix(
+            statistic_matrix_sharppy=STATISTIC_MATRIX_SHARPPY_WITH_SENTINELS,
+            metadata_table=SMALL_METADATA_TABLE)
+
+        self.assertTrue(set(list(this_sounding_stat_table)) ==
+                        set(list(SOUNDING_STAT_TABLE_WITH_NANS)))
+
+        for this_column in list(this_sounding_stat_table):
+            self.assertTrue(numpy.allclose(
+                this_sounding_stat_table[this_column].values,
+                SOUNDING_STAT_TABLE_WITH_NANS[this_column].values,
+                atol=TOLERANCE, equal_nan=True))
+
     def test_get_unique_storm_soundings(self):
         """Ensures correct output from _get_unique_storm_sounding_stats."""
 
@@ -1070,6 +1026,18 @@ class SoundingsTests(unittest.TestCase):
         self.assertTrue(numpy.array_equal(
             these_indices_orig_to_unique, ORIG_TO_UNIQUE_INDICES))
 
+    def test_hash_storm_soundings(self):
+        """Ensures correct output from _hash_storm_soundings."""
+
+        these_hash_strings = sounding_stats._hash_storm_soundings(
+            [LIST_OF_SOUNDING_TABLES[k] for k in HASH_INDICES_TO_COMPARE],
+            u_motions_m_s01=U_MOTIONS_M_S01[HASH_INDICES_TO_COMPARE],
+            v_motions_m_s01=V_MOTIONS_M_S01[HASH_INDICES_TO_COMPARE])
+
+        self.assertTrue(these_hash_strings[0] == these_hash_strings[3])
+        self.assertTrue(these_hash_strings[1] == these_hash_strings[2])
+        self.assertFalse(these_hash_strings[0] == these_hash_strings[1])
+
     def test_find_sounding_statistic_file(self):
         """Ensures correct output from find_sounding_statistic_file."""
 
@@ -324,7 +324,8 @@ def _create_target_points_for_interp(storm_object_table, lead_times_seconds):
 def _interp_soundings_from_nwp(
         target_point_table, top_grib_directory_name, include_surface,
         model_name, use_all_grids, grid_id, wgrib_exe_name, wgrib2_exe_name,
-        raise_error_if_missing):
+        raise_error_if_missing, group_by_init_time=True,
+        top_field_store_dir_name=None):
     """Interpolates soundings from NWP model to target points.
 
     Each target point consists of (latitude, longitude, time).
@@ -340,6 +341,14 @@ def _interp_soundings_from_nwp(
     :param wgrib_exe_name: Same.
     :param wgrib2_exe_name: Same.
     :param raise_error_if_missing: Same.
+    :param group_by_init_time: Boolean flag.  If True, will use
+        `interp.interp_nwp_from_xy_grid_by_init_time`, which reads all fields
+        for each model-initialization time into one cube and reuses the
+        nearest-neighbour interp plan.  If False, will use
+        `interp.interp_nwp_from_xy_grid`, which interpolates one field at a
+        time.
+    :param top_field_store_dir_name: [used only if group_by_init_time = True]
+        See doc for `interp.interp_nwp_from_xy_grid_by_init_time`.
     :return: interp_table: pandas DataFrame, where each column is one field and
         each row is one target point.  Column names are from the list
     """
@@ -349,6 +358,18 @@ def _interp_soundings_from_nwp(
         model_name=model_name, return_table=False,
         include_surface=include_surface)
 
+    if group_by_init_time:
+        return interp.interp_nwp_from_xy_grid_by_init_time(
+            query_point_table=target_point_table,
+            field_names=sounding_field_names,
+            field_names_grib1=sounding_field_names_grib1, model_name=model_name,
+            top_grib_directory_name=top_grib_directory_name,
+            use_all_grids=use_all_grids, grid_id=grid_id,
+            temporal_interp_method_string=interp.PREV_NEIGHBOUR_METHOD_STRING,
+            wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
+            raise_error_if_missing=raise_error_if_missing,
+            top_field_store_dir_name=top_field_store_dir_name)
+
     return interp.interp_nwp_from_xy_grid(
         query_point_table=target_point_table, field_names=sounding_field_names,
         field_names_grib1=sounding_field_names_grib1, model_name=model_name,
@@ -754,6 +775,62 @@ def _convert_fields_and_units(sounding_dict_pressure_coords):
         dewpoint_matrix_kelvins=dewpoint_matrix_kelvins)
 
 
+def _interp_soundings_linear(orig_x_matrix, orig_y_matrix, new_x_matrix):
+    """Linearly interpolates each sounding to new vertical coordinates.
+
+    This method is equivalent to calling `scipy.interpolate.interp1d` (with
+    kind = "linear", fill_value = "extrapolate", and assume_sorted = False)
+    once for each sounding and field, but it sorts each sounding once and
+    computes bracketing indices and weights for all soundings at once.
+
+    N = number of soundings
+    P = number of original vertical levels
+    H = number of new vertical levels
+    F = number of fields
+
+    :param orig_x_matrix: N-by-P numpy array of original vertical coordinates.
+    :param orig_y_matrix: N-by-P-by-F numpy array of original values.
+    :param new_x_matrix: N-by-H numpy array of new vertical coordinates.
+    :return: new_y_matrix: N-by-H-by-F numpy array of interpolated values.
+    """
+
+    sort_indices = numpy.argsort(orig_x_matrix, axis=1, kind='mergesort')
+    sorted_x_matrix = numpy.take_along_axis(orig_x_matrix, sort_indices, axis=1)
+    sorted_y_matrix = numpy.take_along_axis(
+        orig_y_matrix, sort_indices[..., numpy.newaxis], axis=1)
+
+    # Number of original levels strictly below each new level (same as
+    # `numpy.searchsorted` with side = "left"), clipped so that points outside
+    # the sounding are extrapolated from the lowest or highest two levels.
+    num_orig_levels = orig_x_matrix.shape[1]
+    top_index_matrix = numpy.full(new_x_matrix.shape, 0, dtype=int)
+
+    for k in range(num_orig_levels):
+        top_index_matrix += sorted_x_matrix[:, [k]] < new_x_matrix
+
+    top_index_matrix = numpy.clip(top_index_matrix, 1, num_orig_levels - 1)
+    bottom_index_matrix = top_index_matrix - 1
+
+    bottom_x_matrix = numpy.take_along_axis(
+        sorted_x_matrix, bottom_index_matrix, axis=1)
+    top_x_matrix = numpy.take_along_axis(
+        sorted_x_matrix, top_index_matrix, axis=1)
+    bottom_y_matrix = numpy.take_along_axis(
+        sorted_y_matrix, bottom_index_matrix[..., numpy.newaxis], axis=1)
+    top_y_matrix = numpy.take_along_axis(
+        sorted_y_matrix, top_index_matrix[..., numpy.newaxis], axis=1)
+
+    slope_matrix = (
+        (top_y_matrix - bottom_y_matrix) /
+        (top_x_matrix - bottom_x_matrix)[..., numpy.newaxis]
+    )
+
+    return (
+        slope_matrix * (new_x_matrix - bottom_x_matrix)[..., numpy.newaxis] +
+        bottom_y_matrix
+    )
+
+
 def _pressure_to_height_coords(
         sounding_dict_pressure_coords, height_levels_m_agl):
     """Converts soundings from pressure coords to ground-relative height coords.
@@ -821,33 +898,32 @@ def _pressure_to_height_coords(
         (num_soundings, num_height_levels, num_fields), numpy.nan)
 
     pressure_index = field_names.index(PRESSURE_NAME)
+    other_field_indices = numpy.array([
+        field_names.index(this_field_name)
+        for this_field_name in field_names_to_interp
+        if this_field_name != PRESSURE_NAME
+    ], dtype=int)
+
+    # Interpolate log-pressure to new heights, then other fields to new
+    # pressures.
+    new_height_matrix_m_asl = (
+        numpy.reshape(storm_elevations_m_asl, (num_soundings, 1)) +
+        numpy.reshape(height_levels_m_agl, (1, num_height_levels))
+    )
 
-    for j in range(len(field_names_to_interp)):
-        this_field_index = field_names.index(field_names_to_interp[j])
-
-        for i in range(num_soundings):
-            if field_names_to_interp[j] == PRESSURE_NAME:
-                this_interp_object = scipy_interp1d(
-                    x=orig_height_matrix_m_asl[i, ...],
-                    y=numpy.log(orig_sounding_matrix[i, ..., this_field_index]),
-                    kind='linear', bounds_error=False, fill_value='extrapolate',
-                    assume_sorted=False)
-
-                new_sounding_matrix[i, ..., this_field_index] = numpy.exp(
-                    this_interp_object(
-                        storm_elevations_m_asl[i] + height_levels_m_agl)
-                )
-            else:
-                this_interp_object = scipy_interp1d(
-                    x=orig_sounding_matrix[i, ..., pressure_index],
-                    y=orig_sounding_matrix[i, ..., this_field_index],
-                    kind='linear', bounds_error=False, fill_value='extrapolate',
-                    assume_sorted=False)
+    new_sounding_matrix[..., pressure_index] = numpy.exp(
+        _interp_soundings_linear(
+            orig_x_matrix=orig_height_matrix_m_asl,
+            orig_y_matrix=numpy.log(
+                orig_sounding_matrix[..., [pressure_index]]),
+            new_x_matrix=new_height_matrix_m_asl
+        )[..., 0]
+    )
 
-                new_sounding_matrix[i, ..., this_field_index] = (
-                    this_interp_object(
-                        new_sounding_matrix[i, ..., pressure_index])
-                )
+    new_sounding_matrix[..., other_field_indices] = _interp_soundings_linear(
+        orig_x_matrix=orig_sounding_matrix[..., pressure_index],
+        orig_y_matrix=orig_sounding_matrix[..., other_field_indices],
+        new_x_matrix=new_sounding_matrix[..., pressure_index])
 
     sounding_dict_height_coords[FIELD_NAMES_KEY] = field_names
     sounding_dict_height_coords[SOUNDING_MATRIX_KEY] = new_sounding_matrix
@@ -889,7 +965,8 @@ def interp_soundings_to_storm_objects(
         DEFAULT_LAG_TIME_FOR_CONVECTIVE_CONTAMINATION_SEC,
         wgrib_exe_name=grib_io.WGRIB_EXE_NAME_DEFAULT,
         wgrib2_exe_name=grib_io.WGRIB2_EXE_NAME_DEFAULT,
-        raise_error_if_missing=False):
+        raise_error_if_missing=False, group_by_init_time=True,
+        top_field_store_dir_name=None):
     """Interpolates NWP sounding to each storm object at each lead time.
 
     :param storm_object_table: pandas DataFrame with columns listed in
@@ -916,6 +993,8 @@ def interp_soundings_to_storm_objects(
         and `raise_error_if_missing = True`, this method will error out.  If any
         grib file is missing and `raise_error_if_missing = False`, this method
         will carry on, leaving the affected values as NaN.
+    :param group_by_init_time: See doc for `_interp_soundings_from_nwp`.
+    :param top_field_store_dir_name: Same.
     :return: sounding_dict_by_lead_time: length-T list of dictionaries, each
         containing the keys listed in `_pressure_to_height_coords`.
     """
@@ -964,7 +1043,9 @@ def interp_soundings_to_storm_objects(
         top_grib_directory_name=top_grib_directory_name, include_surface=False,
         model_name=model_name, use_all_grids=use_all_grids, grid_id=grid_id,
         wgrib_exe_name=wgrib_exe_name, wgrib2_exe_name=wgrib2_exe_name,
-        raise_error_if_missing=raise_error_if_missing)
+        raise_error_if_missing=raise_error_if_missing,
+        group_by_init_time=group_by_init_time,
+        top_field_store_dir_name=top_field_store_dir_name)
     print SEPARATOR_STRING
 
     print 'Converting interpolated values to soundings...'
@@ -468,6 +468,25 @@ SOUNDING_DICT_P_COORDS_NO_NANS = {
     soundings.SURFACE_PRESSURES_KEY: THESE_SURFACE_PRESSURES_MB
 }
 
+# The following constants are used to test _interp_soundings_linear.
+ORIG_X_MATRIX_FOR_INTERP = numpy.array([[3, 1, 2],
+                                        [10, 20, 30]], dtype=float)
+THIS_FIRST_MATRIX = numpy.array([[30, 10, 20],
+                                 [0, -1, -2]], dtype=float)
+THIS_SECOND_MATRIX = numpy.array([[1, 0, 1],
+                                  [5, 5, 5]], dtype=float)
+ORIG_Y_MATRIX_FOR_INTERP = numpy.stack(
+    (THIS_FIRST_MATRIX, THIS_SECOND_MATRIX), axis=-1)
+
+NEW_X_MATRIX_FOR_INTERP = numpy.array([[0, 1.5, 4],
+                                       [15, 30, 35]], dtype=float)
+THIS_FIRST_MATRIX = numpy.array([[0, 15, 40],
+                                 [-0.5, -2, -2.5]], dtype=float)
+THIS_SECOND_MATRIX = numpy.array([[-1, 0.5, 1],
+                                  [5, 5, 5]], dtype=float)
+NEW_Y_MATRIX_FOR_INTERP = numpy.stack(
+    (THIS_FIRST_MATRIX, THIS_SECOND_MATRIX), axis=-1)
+
 # The following constants are used to test _pressure_to_height_coords.
 THESE_STORM_ELEVATIONS_M_ASL = numpy.array([385])
 SOUNDING_DICT_PRESSURE_COORDS = copy.deepcopy(SOUNDING_DICT_P_COORDS_NO_NANS)
@@ -792,6 +811,17 @@ class SoundingsTests(unittest.TestCase):
         self.assertTrue(_compare_sounding_dictionaries(
             this_sounding_dict, SOUNDING_DICT_P_COORDS_NO_NANS))
 
+    def test_interp_soundings_linear(self):
+        """Ensures correct output from _interp_soundings_linear."""
+
+        this_y_matrix = soundings._interp_soundings_linear(
+            orig_x_matrix=ORIG_X_MATRIX_FOR_INTERP,
+            orig_y_matrix=ORIG_Y_MATRIX_FOR_INTERP,
+            new_x_matrix=NEW_X_MATRIX_FOR_INTERP)
+
+        self.assertTrue(numpy.allclose(
+            this_y_matrix, NEW_Y_MATRIX_FOR_INTERP, atol=TOLERANCE))
+
     def test_pressure_to_height_coords(self):
         """Ensures correct output from _pressure_to_height_coords."""
 
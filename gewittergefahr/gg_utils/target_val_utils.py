@@ -45,6 +45,12 @@ WIND_SPEED_PREFIX_FOR_REGRESSION_NAME = 'wind-speed-m-s01'
 WIND_SPEED_PREFIX_FOR_CLASSIFN_NAME = 'wind-speed'
 TORNADO_PREFIX = 'tornado'
 
+STORM_INDICES_KEY = 'storm_indices'
+FIRST_EVENT_INDICES_KEY = 'first_event_indices'
+RELATIVE_TIMES_KEY = 'relative_times_sec'
+LINKAGE_DISTANCES_KEY = 'link_distances_metres'
+WIND_SPEEDS_KEY = 'wind_speeds_m_s01'
+
 CHARACTER_DIMENSION_KEY = 'storm_id_character'
 STORM_OBJECT_DIMENSION_KEY = 'storm_object'
 STORM_IDS_KEY = 'storm_ids'
@@ -182,6 +188,177 @@ def _find_dead_storms(storm_to_events_table, min_lead_time_sec):
     return numpy.where(remaining_lifetimes_sec < min_lead_time_sec)[0]
 
 
+def _concat_event_arrays(list_of_arrays, dtype):
+    """Concatenates per-storm arrays of event attributes.
+
+    :param list_of_arrays: 1-D list of numpy arrays.
+    :param dtype: Data type of output array.
+    :return: flat_array: 1-D numpy array.
+    """
+
+    if len(list_of_arrays) == 0:
+        return numpy.array([], dtype=dtype)
+
+    return numpy.concatenate(
+        [numpy.array(a, dtype=dtype) for a in list_of_arrays])
+
+
+def _flatten_linked_events(storm_to_events_table):
+    """Flattens linked events into one array per attribute.
+
+    In `storm_to_events_table`, each row (storm object) contains one array per
+    event attribute.  This method concatenates these arrays, so that targets
+    can be computed for all storm objects at once.  Events linked to the [i]th
+    storm object are at flat indices j = first_event_indices[i], ...,
+    first_event_indices[i + 1] - 1.
+
+    N = number of storm objects
+    E = total number of linked events
+
+    :param storm_to_events_table: See doc for `linkage.read_linkage_file`.
+    :return: flat_event_dict: Dictionary with the following keys.
+    flat_event_dict['storm_indices']: length-E numpy array of storm-object
+        indices (rows in `storm_to_events_table`).
+    flat_event_dict['first_event_indices']: numpy array (length N + 1) of flat
+        indices, as described above.
+    flat_event_dict['relative_times_sec']: length-E numpy array of event times
+        relative to storm object.
+    flat_event_dict['link_distances_metres']: length-E numpy array of linkage
+        distances.
+    flat_event_dict['wind_speeds_m_s01']: length-E numpy array of wind speeds.
+        If `storm_to_events_table` contains tornadoes rather than wind
+        observations, this is None.
+    """
+
+    relative_times_by_storm_sec = storm_to_events_table[
+        linkage.RELATIVE_EVENT_TIMES_COLUMN].values
+
+    num_storm_objects = len(relative_times_by_storm_sec)
+    num_events_by_storm = numpy.array(
+        [len(t) for t in relative_times_by_storm_sec], dtype=int)
+
+    first_event_indices = numpy.concatenate((
+        numpy.array([0], dtype=int), numpy.cumsum(num_events_by_storm)
+    ))
+    storm_indices = numpy.repeat(
+        numpy.linspace(
+            0, num_storm_objects - 1, num=num_storm_objects, dtype=int),
+        num_events_by_storm)
+
+    relative_times_sec = _concat_event_arrays(
+        list_of_arrays=relative_times_by_storm_sec, dtype=int)
+    link_distances_metres = _concat_event_arrays(
+        list_of_arrays=storm_to_events_table[
+            linkage.LINKAGE_DISTANCES_COLUMN].values,
+        dtype=float)
+
+    if linkage.U_WINDS_COLUMN in storm_to_events_table:
+        wind_speeds_m_s01 = numpy.sqrt(
+            _concat_event_arrays(
+                list_of_arrays=storm_to_events_table[
+                    linkage.U_WINDS_COLUMN].values,
+                dtype=float) ** 2 +
+            _concat_event_arrays(
+                list_of_arrays=storm_to_events_table[
+                    linkage.V_WINDS_COLUMN].values,
+                dtype=float) ** 2
+        )
+    else:
+        wind_speeds_m_s01 = None
+
+    return {
+        STORM_INDICES_KEY: storm_indices,
+        FIRST_EVENT_INDICES_KEY: first_event_indices,
+        RELATIVE_TIMES_KEY: relative_times_sec,
+        LINKAGE_DISTANCES_KEY: link_distances_metres,
+        WIND_SPEEDS_KEY: wind_speeds_m_s01
+    }
+
+
+def _find_good_events(
+        flat_event_dict, min_lead_time_sec, max_lead_time_sec,
+        min_link_distance_metres, max_link_distance_metres):
+    """Finds events in lead-time window and distance buffer.
+
+    E = total number of linked events
+
+    :param flat_event_dict: Dictionary created by `_flatten_linked_events`.
+    :param min_lead_time_sec: See doc for `_check_target_params`.
+    :param max_lead_time_sec: Same.
+    :param min_link_distance_metres: Same.
+    :param max_link_distance_metres: Same.
+    :return: good_event_flags: length-E numpy array of Boolean flags.
+    """
+
+    relative_times_sec = flat_event_dict[RELATIVE_TIMES_KEY]
+    link_distances_metres = flat_event_dict[LINKAGE_DISTANCES_KEY]
+
+    good_time_flags = numpy.logical_and(
+        relative_times_sec >= min_lead_time_sec,
+        relative_times_sec <= max_lead_time_sec)
+    good_distance_flags = numpy.logical_and(
+        link_distances_metres >= min_link_distance_metres,
+        link_distances_metres <= max_link_distance_metres)
+
+    return numpy.logical_and(good_time_flags, good_distance_flags)
+
+
+def _percentile_by_storm(
+        event_values, storm_indices, num_storm_objects, percentile_level):
+    """Computes percentile of event values for each storm object.
+
+    This is equivalent to calling `numpy.percentile` (with linear
+    interpolation) separately for each storm object, but all storm objects are
+    handled at once.
+
+    E = number of events
+    N = number of storm objects
+
+    :param event_values: length-E numpy array of values.
+    :param storm_indices: length-E numpy array of storm-object indices.
+    :param num_storm_objects: N in the above discussion.
+    :param percentile_level: Percentile level (from 0...100).
+    :return: percentiles_by_storm: length-N numpy array of percentiles.  If no
+        events are linked to the [i]th storm object, percentiles_by_storm[i] is
+        NaN.
+    """
+
+    sort_indices = numpy.lexsort((event_values, storm_indices))
+    sorted_event_values = event_values[sort_indices]
+
+    num_events_by_storm = numpy.bincount(
+        storm_indices, minlength=num_storm_objects)
+    first_event_indices = (
+        numpy.cumsum(num_events_by_storm) - num_events_by_storm
+    )
+
+    percentiles_by_storm = numpy.full(num_storm_objects, numpy.nan)
+    good_storm_indices = numpy.where(num_events_by_storm > 0)[0]
+    if len(good_storm_indices) == 0:
+        return percentiles_by_storm
+
+    num_events_by_storm = num_events_by_storm[good_storm_indices]
+    first_event_indices = first_event_indices[good_storm_indices]
+
+    # This follows the linear interpolation in `numpy.percentile`.
+    real_indices = (
+        numpy.true_divide(percentile_level, 100) * (num_events_by_storm - 1)
+    )
+    indices_below = numpy.floor(real_indices).astype(int)
+    indices_above = numpy.minimum(indices_below + 1, num_events_by_storm - 1)
+    weights_above = real_indices - indices_below
+    weights_below = 1. - weights_above
+
+    percentiles_by_storm[good_storm_indices] = (
+        sorted_event_values[first_event_indices + indices_below] *
+        weights_below +
+        sorted_event_values[first_event_indices + indices_above] *
+        weights_above
+    )
+
+    return percentiles_by_storm
+
+
 def target_params_to_name(
         min_lead_time_sec, max_lead_time_sec, min_link_distance_metres,
         max_link_distance_metres, wind_speed_percentile_level=None,
@@ -405,65 +582,6 @@ def create_wind_regression_targets(
         `target_params_to_name`.
     """
 
-    target_param_dict = _check_target_params(
-        min_lead_time_sec=min_lead_time_sec,
-        max_lead_time_sec=max_lead_time_sec,
-        min_link_distance_metres=min_link_distance_metres,
-        max_link_distance_metres=max_link_distance_metres,
-        wind_speed_percentile_level=percentile_level,
-        wind_speed_cutoffs_kt=None)
-
-    min_link_distance_metres = target_param_dict[MIN_LINKAGE_DISTANCE_KEY]
-    max_link_distance_metres = target_param_dict[MAX_LINKAGE_DISTANCE_KEY]
-    percentile_level = target_param_dict[PERCENTILE_LEVEL_KEY]
-
-    end_of_period_indices = _find_storms_near_end_of_period(
-        storm_to_events_table=storm_to_winds_table,
-        max_lead_time_sec=max_lead_time_sec)
-
-    dead_storm_indices = _find_dead_storms(
-        storm_to_events_table=storm_to_winds_table,
-        min_lead_time_sec=min_lead_time_sec)
-
-    num_storm_objects = len(storm_to_winds_table.index)
-    labels_m_s01 = numpy.full(num_storm_objects, numpy.nan)
-    labels_m_s01[end_of_period_indices] = INVALID_STORM_INTEGER
-    labels_m_s01[dead_storm_indices] = DEAD_STORM_INTEGER
-
-    for i in range(num_storm_objects):
-        if i in end_of_period_indices or i in dead_storm_indices:
-            continue
-
-        these_relative_times_sec = storm_to_winds_table[
-            linkage.RELATIVE_EVENT_TIMES_COLUMN].values[i]
-        these_link_distances_metres = storm_to_winds_table[
-            linkage.LINKAGE_DISTANCES_COLUMN].values[i]
-
-        these_good_time_flags = numpy.logical_and(
-            these_relative_times_sec >= min_lead_time_sec,
-            these_relative_times_sec <= max_lead_time_sec)
-        these_good_distance_flags = numpy.logical_and(
-            these_link_distances_metres >= min_link_distance_metres,
-            these_link_distances_metres <= max_link_distance_metres)
-        these_good_ob_flags = numpy.logical_and(
-            these_good_time_flags, these_good_distance_flags)
-
-        if not numpy.any(these_good_ob_flags):
-            # labels_m_s01[i] = 0.
-            labels_m_s01[i] = INVALID_STORM_INTEGER
-            continue
-
-        these_good_ob_indices = numpy.where(these_good_ob_flags)[0]
-        these_wind_speeds_m_s01 = numpy.sqrt(
-            storm_to_winds_table[linkage.U_WINDS_COLUMN].values[i][
-                these_good_ob_indices] ** 2 +
-            storm_to_winds_table[linkage.V_WINDS_COLUMN].values[i][
-                these_good_ob_indices] ** 2
-        )
-
-        labels_m_s01[i] = numpy.percentile(
-            these_wind_speeds_m_s01, percentile_level)
-
     target_name = target_params_to_name(
         min_lead_time_sec=min_lead_time_sec,
         max_lead_time_sec=max_lead_time_sec,
@@ -472,7 +590,8 @@ def create_wind_regression_targets(
         wind_speed_percentile_level=percentile_level,
         wind_speed_cutoffs_kt=None)
 
-    return storm_to_winds_table.assign(**{target_name: labels_m_s01})
+    return create_target_values(
+        storm_to_events_table=storm_to_winds_table, target_names=[target_name])
 
 
 def create_wind_classification_targets(
@@ -496,52 +615,6 @@ def create_wind_classification_targets(
         `target_params_to_name`.
     """
 
-    target_param_dict = _check_target_params(
-        min_lead_time_sec=min_lead_time_sec,
-        max_lead_time_sec=max_lead_time_sec,
-        min_link_distance_metres=min_link_distance_metres,
-        max_link_distance_metres=max_link_distance_metres,
-        wind_speed_percentile_level=percentile_level,
-        wind_speed_cutoffs_kt=class_cutoffs_kt)
-
-    class_cutoffs_kt = target_param_dict[WIND_SPEED_CUTOFFS_KEY]
-    class_cutoffs_m_s01 = class_cutoffs_kt * KT_TO_METRES_PER_SECOND
-
-    storm_to_winds_table = create_wind_regression_targets(
-        storm_to_winds_table=storm_to_winds_table,
-        min_lead_time_sec=min_lead_time_sec,
-        max_lead_time_sec=max_lead_time_sec,
-        min_link_distance_metres=min_link_distance_metres,
-        max_link_distance_metres=max_link_distance_metres,
-        percentile_level=percentile_level)
-
-    target_name = target_params_to_name(
-        min_lead_time_sec=min_lead_time_sec,
-        max_lead_time_sec=max_lead_time_sec,
-        min_link_distance_metres=min_link_distance_metres,
-        max_link_distance_metres=max_link_distance_metres,
-        wind_speed_percentile_level=percentile_level,
-        wind_speed_cutoffs_kt=None)
-
-    regression_labels_m_s01 = storm_to_winds_table[target_name].values
-
-    invalid_storm_indices = numpy.where(
-        regression_labels_m_s01 == INVALID_STORM_INTEGER
-    )[0]
-    dead_storm_indices = numpy.where(
-        regression_labels_m_s01 == DEAD_STORM_INTEGER
-    )[0]
-
-    regression_labels_m_s01[invalid_storm_indices] = 0.
-    regression_labels_m_s01[dead_storm_indices] = 0.
-
-    storm_classes = classifn_utils.classify_values(
-        input_values=regression_labels_m_s01, class_cutoffs=class_cutoffs_m_s01,
-        non_negative_only=True)
-
-    storm_classes[invalid_storm_indices] = INVALID_STORM_INTEGER
-    storm_classes[dead_storm_indices] = DEAD_STORM_INTEGER
-
     target_name = target_params_to_name(
         min_lead_time_sec=min_lead_time_sec,
         max_lead_time_sec=max_lead_time_sec,
@@ -550,7 +623,8 @@ def create_wind_classification_targets(
         wind_speed_percentile_level=percentile_level,
         wind_speed_cutoffs_kt=class_cutoffs_kt)
 
-    return storm_to_winds_table.assign(**{target_name: storm_classes})
+    return create_target_values(
+        storm_to_events_table=storm_to_winds_table, target_names=[target_name])
 
 
 def create_tornado_targets(
@@ -570,48 +644,157 @@ def create_tornado_targets(
         `target_params_to_name`.
     """
 
-    target_param_dict = _check_target_params(
+    target_name = target_params_to_name(
         min_lead_time_sec=min_lead_time_sec,
         max_lead_time_sec=max_lead_time_sec,
         min_link_distance_metres=min_link_distance_metres,
         max_link_distance_metres=max_link_distance_metres)
 
-    min_link_distance_metres = target_param_dict[MIN_LINKAGE_DISTANCE_KEY]
-    max_link_distance_metres = target_param_dict[MAX_LINKAGE_DISTANCE_KEY]
-
-    end_of_period_indices = _find_storms_near_end_of_period(
+    return create_target_values(
         storm_to_events_table=storm_to_tornadoes_table,
-        max_lead_time_sec=max_lead_time_sec)
+        target_names=[target_name])
 
-    num_storm_objects = len(storm_to_tornadoes_table.index)
-    tornado_classes = numpy.full(num_storm_objects, -1, dtype=int)
 
-    for i in range(num_storm_objects):
-        these_relative_times_sec = storm_to_tornadoes_table[
-            linkage.RELATIVE_EVENT_TIMES_COLUMN].values[i]
-        these_link_distances_metres = storm_to_tornadoes_table[
-            linkage.LINKAGE_DISTANCES_COLUMN].values[i]
-
-        these_good_time_flags = numpy.logical_and(
-            these_relative_times_sec >= min_lead_time_sec,
-            these_relative_times_sec <= max_lead_time_sec)
-        these_good_distance_flags = numpy.logical_and(
-            these_link_distances_metres >= min_link_distance_metres,
-            these_link_distances_metres <= max_link_distance_metres)
-        these_good_ob_flags = numpy.logical_and(
-            these_good_time_flags, these_good_distance_flags)
-
-        tornado_classes[i] = numpy.any(these_good_ob_flags)
-        if i in end_of_period_indices and tornado_classes[i] == 0:
-            tornado_classes[i] = INVALID_STORM_INTEGER
+def create_target_values(storm_to_events_table, target_names):
+    """Creates one or more target variables for each storm object.
 
-    target_name = target_params_to_name(
-        min_lead_time_sec=min_lead_time_sec,
-        max_lead_time_sec=max_lead_time_sec,
-        min_link_distance_metres=min_link_distance_metres,
-        max_link_distance_metres=max_link_distance_metres)
+    Linked events are flattened only once (see `_flatten_linked_events`), and
+    each target variable is computed for all storm objects at once.  Wind-speed
+    percentiles are shared by all target variables with the same lead-time
+    window, distance buffer, and percentile level.
+
+    :param storm_to_events_table: See doc for `linkage.read_linkage_file`.
+    :param target_names: 1-D list with names of target variables.  All target
+        variables must have the same event type as `storm_to_events_table`.
+    :return: storm_to_events_table: Same as input, but with one additional
+        column for each target variable.
+    :raises: ValueError: if any item in `target_names` is not a valid name.
+    """
+
+    error_checking.assert_is_string_list(target_names)
+    error_checking.assert_is_numpy_array(
+        numpy.array(target_names), num_dimensions=1)
+
+    target_param_dicts = [target_name_to_params(n) for n in target_names]
+
+    for k in range(len(target_names)):
+        if target_param_dicts[k] is not None:
+            continue
+
+        error_string = (
+            '"{0:s}" is not a valid name for a target variable.'
+        ).format(target_names[k])
+        raise ValueError(error_string)
 
-    return storm_to_tornadoes_table.assign(**{target_name: tornado_classes})
+    flat_event_dict = _flatten_linked_events(storm_to_events_table)
+    num_storm_objects = len(storm_to_events_table.index)
+
+    end_of_period_flags_by_lead_time = {}
+    dead_storm_flags_by_lead_time = {}
+    wind_speed_labels_by_params = {}
+    target_value_dict = {}
+
+    for k in range(len(target_names)):
+        this_min_lead_time_sec = target_param_dicts[k][MIN_LEAD_TIME_KEY]
+        this_max_lead_time_sec = target_param_dicts[k][MAX_LEAD_TIME_KEY]
+        this_min_distance_metres = target_param_dicts[k][
+            MIN_LINKAGE_DISTANCE_KEY]
+        this_max_distance_metres = target_param_dicts[k][
+            MAX_LINKAGE_DISTANCE_KEY]
+        this_percentile_level = target_param_dicts[k][PERCENTILE_LEVEL_KEY]
+
+        if this_max_lead_time_sec not in end_of_period_flags_by_lead_time:
+            these_flags = numpy.full(num_storm_objects, False, dtype=bool)
+            these_flags[_find_storms_near_end_of_period(
+                storm_to_events_table=storm_to_events_table,
+                max_lead_time_sec=this_max_lead_time_sec)] = True
+
+            end_of_period_flags_by_lead_time[
+                this_max_lead_time_sec] = these_flags
+
+        end_of_period_flags = end_of_period_flags_by_lead_time[
+            this_max_lead_time_sec]
+
+        these_param_values = (
+            this_min_lead_time_sec, this_max_lead_time_sec,
+            this_min_distance_metres, this_max_distance_metres,
+            this_percentile_level
+        )
+
+        if these_param_values not in wind_speed_labels_by_params:
+            these_good_event_flags = _find_good_events(
+                flat_event_dict=flat_event_dict,
+                min_lead_time_sec=this_min_lead_time_sec,
+                max_lead_time_sec=this_max_lead_time_sec,
+                min_link_distance_metres=this_min_distance_metres,
+                max_link_distance_metres=this_max_distance_metres)
+
+            if this_percentile_level is None:
+                these_labels = numpy.bincount(
+                    flat_event_dict[STORM_INDICES_KEY][these_good_event_flags],
+                    minlength=num_storm_objects
+                ) > 0
+            else:
+                these_labels = _percentile_by_storm(
+                    event_values=flat_event_dict[WIND_SPEEDS_KEY][
+                        these_good_event_flags],
+                    storm_indices=flat_event_dict[STORM_INDICES_KEY][
+                        these_good_event_flags],
+                    num_storm_objects=num_storm_objects,
+                    percentile_level=this_percentile_level)
+
+            wind_speed_labels_by_params[these_param_values] = these_labels
+
+        these_labels = wind_speed_labels_by_params[these_param_values]
+
+        if this_percentile_level is None:
+            these_target_values = these_labels.astype(int)
+            these_target_values[numpy.logical_and(
+                end_of_period_flags, these_target_values == 0
+            )] = INVALID_STORM_INTEGER
+
+            target_value_dict[target_names[k]] = these_target_values
+            continue
+
+        if this_min_lead_time_sec not in dead_storm_flags_by_lead_time:
+            these_flags = numpy.full(num_storm_objects, False, dtype=bool)
+            these_flags[_find_dead_storms(
+                storm_to_events_table=storm_to_events_table,
+                min_lead_time_sec=this_min_lead_time_sec)] = True
+
+            dead_storm_flags_by_lead_time[this_min_lead_time_sec] = these_flags
+
+        dead_storm_flags = dead_storm_flags_by_lead_time[this_min_lead_time_sec]
+
+        these_regression_labels_m_s01 = these_labels + 0.
+        these_regression_labels_m_s01[
+            numpy.isnan(these_regression_labels_m_s01)
+        ] = INVALID_STORM_INTEGER
+        these_regression_labels_m_s01[
+            end_of_period_flags] = INVALID_STORM_INTEGER
+        these_regression_labels_m_s01[dead_storm_flags] = DEAD_STORM_INTEGER
+
+        this_cutoff_array_kt = target_param_dicts[k][WIND_SPEED_CUTOFFS_KEY]
+        if this_cutoff_array_kt is None:
+            target_value_dict[target_names[k]] = these_regression_labels_m_s01
+            continue
+
+        these_invalid_flags = (
+            these_regression_labels_m_s01 == INVALID_STORM_INTEGER)
+        these_dead_flags = these_regression_labels_m_s01 == DEAD_STORM_INTEGER
+        these_regression_labels_m_s01[these_invalid_flags] = 0.
+        these_regression_labels_m_s01[these_dead_flags] = 0.
+
+        these_target_values = classifn_utils.classify_values(
+            input_values=these_regression_labels_m_s01,
+            class_cutoffs=this_cutoff_array_kt * KT_TO_METRES_PER_SECOND,
+            non_negative_only=True)
+
+        these_target_values[these_invalid_flags] = INVALID_STORM_INTEGER
+        these_target_values[these_dead_flags] = DEAD_STORM_INTEGER
+        target_value_dict[target_names[k]] = these_target_values
+
+    return storm_to_events_table.assign(**target_value_dict)
 
 
 def find_target_file(top_directory_name, event_type_string, spc_date_string,
@@ -670,10 +853,12 @@ def write_target_values(storm_to_events_table, target_names, netcdf_file_name):
     """Writes target values to NetCDF file.
 
     :param storm_to_events_table: pandas DataFrame created by
-        `create_wind_regression_targets`, `create_wind_classification_targets`,
-        or `create_tornado_targets`.
-    :param target_names: 1-D list with names of target variables to write.  Each
-        name must be a column in `storm_to_events_table`.
+        `create_target_values`, `create_wind_regression_targets`,
+        `create_wind_classification_targets`, or `create_tornado_targets`; or
+        linkage table created by `linkage.read_linkage_file`.
+    :param target_names: 1-D list with names of target variables to write.  If
+        any target variable is not a column in `storm_to_events_table`, it will
+        be computed by `create_target_values`.
     :param netcdf_file_name: Path to output file.
     :raises: ValueError: if any item in `target_names` is not a valid name.
     """
@@ -692,6 +877,15 @@ def write_target_values(storm_to_events_table, target_names, netcdf_file_name):
         ).format(this_target_name)
         raise ValueError(error_string)
 
+    missing_target_names = [
+        n for n in target_names if n not in storm_to_events_table
+    ]
+
+    if len(missing_target_names) > 0:
+        storm_to_events_table = create_target_values(
+            storm_to_events_table=storm_to_events_table,
+            target_names=missing_target_names)
+
     file_system_utils.mkdir_recursive_if_necessary(file_name=netcdf_file_name)
     netcdf_dataset = netCDF4.Dataset(
         netcdf_file_name, 'w', format='NETCDF3_64BIT_OFFSET')
@@ -144,6 +144,78 @@ INVALID_STORM_INTEGER = target_val_utils.INVALID_STORM_INTEGER
 TARGET_VALUES = numpy.array(
     [1, 0, INVALID_STORM_INTEGER, 1, INVALID_STORM_INTEGER], dtype=int)
 
+# The following constants are used to test _flatten_linked_events.
+FLAT_EVENT_DICT_TORNADO = {
+    target_val_utils.STORM_INDICES_KEY:
+        numpy.array([0, 0, 1, 1, 2, 2, 3, 3, 4, 4], dtype=int),
+    target_val_utils.FIRST_EVENT_INDICES_KEY:
+        numpy.array([0, 2, 4, 6, 8, 10], dtype=int),
+    target_val_utils.RELATIVE_TIMES_KEY: numpy.array(
+        [600, 1200, 3000, 3600, 0, 300, 1200, 1500, 2400, 3000], dtype=int),
+    target_val_utils.LINKAGE_DISTANCES_KEY: numpy.array(
+        [1000, 2000, 0, 0, 1000, 2000, 5000, 10000, 0, 0], dtype=float),
+    target_val_utils.WIND_SPEEDS_KEY: None
+}
+
+# The following constants are used to test _percentile_by_storm.
+EVENT_VALUES_FOR_PERCENTILES = numpy.array([3., 1., 2., 5., 6., 4.])
+STORM_INDICES_FOR_PERCENTILES = numpy.array([0, 0, 0, 2, 3, 3], dtype=int)
+NUM_STORMS_FOR_PERCENTILES = 4
+
+MEDIANS_BY_STORM = numpy.array([2., numpy.nan, 5., 5.])
+MAXIMA_BY_STORM = numpy.array([3., numpy.nan, 5., 6.])
+
+# The following constants are used to test create_target_values.
+THESE_STORM_IDS = ['a', 'b', 'c', 'd', 'e']
+THESE_TIMES_UNIX_SEC = numpy.array([0, 0, 0, 0, 0], dtype=int)
+THESE_TRACKING_END_TIMES_UNIX_SEC = numpy.array(
+    [7200, 7200, 7200, 1800, 7200], dtype=int)
+THESE_CELL_END_TIMES_UNIX_SEC = numpy.array(
+    [7200, 7200, 600, 1800, 7200], dtype=int)
+
+THESE_RELATIVE_TIMES_UNIX_SEC = [
+    numpy.array([1000, 2000], dtype=int), numpy.array([100, 1200], dtype=int),
+    numpy.array([1000], dtype=int), numpy.array([1000], dtype=int),
+    numpy.array([1000], dtype=int)
+]
+THESE_LINK_DIST_METRES = [
+    numpy.array([0., 0.]), numpy.array([0., 6000.]), numpy.array([0.]),
+    numpy.array([0.]), numpy.array([100.])
+]
+THESE_U_WINDS_M_S01 = [
+    numpy.array([10., 30.]), numpy.array([40., 40.]), numpy.array([40.]),
+    numpy.array([40.]), numpy.array([3.])
+]
+THESE_V_WINDS_M_S01 = [
+    numpy.array([0., 0.]), numpy.array([0., 0.]), numpy.array([0.]),
+    numpy.array([0.]), numpy.array([4.])
+]
+
+THIS_DICT = {
+    tracking_utils.STORM_ID_COLUMN: THESE_STORM_IDS,
+    tracking_utils.TIME_COLUMN: THESE_TIMES_UNIX_SEC,
+    tracking_utils.TRACKING_END_TIME_COLUMN: THESE_TRACKING_END_TIMES_UNIX_SEC,
+    tracking_utils.CELL_END_TIME_COLUMN: THESE_CELL_END_TIMES_UNIX_SEC,
+    linkage.RELATIVE_EVENT_TIMES_COLUMN: THESE_RELATIVE_TIMES_UNIX_SEC,
+    linkage.LINKAGE_DISTANCES_COLUMN: THESE_LINK_DIST_METRES,
+    linkage.U_WINDS_COLUMN: THESE_U_WINDS_M_S01,
+    linkage.V_WINDS_COLUMN: THESE_V_WINDS_M_S01
+}
+STORM_TO_WINDS_TABLE = pandas.DataFrame.from_dict(THIS_DICT)
+
+WIND_TARGET_NAMES = [
+    'wind-speed-m-s01_percentile=100.0_lead-time=0900-3600sec_'
+    'distance=00000-05000m',
+    'wind-speed_percentile=100.0_lead-time=0900-3600sec_distance=00000-05000m'
+    '_cutoffs=50kt'
+]
+
+DEAD_STORM_INTEGER = target_val_utils.DEAD_STORM_INTEGER
+WIND_TARGET_MATRIX = numpy.array([
+    [30, INVALID_STORM_INTEGER, DEAD_STORM_INTEGER, INVALID_STORM_INTEGER, 5],
+    [1, INVALID_STORM_INTEGER, DEAD_STORM_INTEGER, INVALID_STORM_INTEGER, 0]
+], dtype=float)
+
 # The following constants are used to test find_target_file.
 TOP_DIRECTORY_NAME = 'target_values'
 FILE_TIME_UNIX_SEC = 1517523991  # 222631 1 Feb 2018
@@ -340,6 +412,64 @@ class TargetValUtilsTests(unittest.TestCase):
         these_target_values = this_storm_to_tornadoes_table[TARGET_NAME].values
         self.assertTrue(numpy.array_equal(these_target_values, TARGET_VALUES))
 
+    def test_flatten_linked_events(self):
+        """Ensures correct output from _flatten_linked_events."""
+
+        this_flat_event_dict = target_val_utils._flatten_linked_events(
+            STORM_TO_TORNADOES_TABLE)
+
+        self.assertTrue(set(this_flat_event_dict.keys()) ==
+                        set(FLAT_EVENT_DICT_TORNADO.keys()))
+
+        for this_key in FLAT_EVENT_DICT_TORNADO:
+            if FLAT_EVENT_DICT_TORNADO[this_key] is None:
+                self.assertTrue(this_flat_event_dict[this_key] is None)
+                continue
+
+            self.assertTrue(numpy.allclose(
+                this_flat_event_dict[this_key],
+                FLAT_EVENT_DICT_TORNADO[this_key], atol=TOLERANCE))
+
+    def test_percentile_by_storm_median(self):
+        """Ensures correct output from _percentile_by_storm.
+
+        In this case, percentile level is 50.
+        """
+
+        these_medians = target_val_utils._percentile_by_storm(
+            event_values=EVENT_VALUES_FOR_PERCENTILES,
+            storm_indices=STORM_INDICES_FOR_PERCENTILES,
+            num_storm_objects=NUM_STORMS_FOR_PERCENTILES, percentile_level=50.)
+
+        self.assertTrue(numpy.allclose(
+            these_medians, MEDIANS_BY_STORM, atol=TOLERANCE, equal_nan=True))
+
+    def test_percentile_by_storm_max(self):
+        """Ensures correct output from _percentile_by_storm.
+
+        In this case, percentile level is 100.
+        """
+
+        these_maxima = target_val_utils._percentile_by_storm(
+            event_values=EVENT_VALUES_FOR_PERCENTILES,
+            storm_indices=STORM_INDICES_FOR_PERCENTILES,
+            num_storm_objects=NUM_STORMS_FOR_PERCENTILES, percentile_level=100.)
+
+        self.assertTrue(numpy.allclose(
+            these_maxima, MAXIMA_BY_STORM, atol=TOLERANCE, equal_nan=True))
+
+    def test_create_target_values(self):
+        """Ensures correct output from create_target_values."""
+
+        this_storm_to_winds_table = target_val_utils.create_target_values(
+            storm_to_events_table=copy.deepcopy(STORM_TO_WINDS_TABLE),
+            target_names=WIND_TARGET_NAMES)
+
+        for k in range(len(WIND_TARGET_NAMES)):
+            self.assertTrue(numpy.allclose(
+                this_storm_to_winds_table[WIND_TARGET_NAMES[k]].values,
+                WIND_TARGET_MATRIX[k, :], atol=TOLERANCE))
+
     def test_find_target_file_wind_one_time(self):
         """Ensures correct output from find_target_file.
 
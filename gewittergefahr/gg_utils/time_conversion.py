@@ -11,6 +11,7 @@ date, which runs from 0000-0000 UTC (or 000000-235959 UTC).
 
 import time
 import calendar
+import collections
 import numpy
 from gewittergefahr.gg_utils import number_rounding as rounder
 from gewittergefahr.gg_utils import time_periods
@@ -25,6 +26,40 @@ SECONDS_INTO_SPC_DATE_DEFAULT = 18 * HOURS_TO_SECONDS
 MIN_SECONDS_INTO_SPC_DATE = 12 * HOURS_TO_SECONDS
 MAX_SECONDS_INTO_SPC_DATE = (36 * HOURS_TO_SECONDS) - 1
 
+MAX_CACHE_SIZE = 100000
+
+# Memoization caches for scalar conversions, ordered from least to most
+# recently used.
+_STRING_TO_UNIX_SEC_CACHE = collections.OrderedDict()
+_UNIX_SEC_TO_STRING_CACHE = collections.OrderedDict()
+
+
+def _get_cached_value(cache_dict, key, create_value):
+    """Returns value from memoization cache (creating it if necessary).
+
+    If the cache contains more than `MAX_CACHE_SIZE` entries, the least recently
+    used are dropped.
+
+    :param cache_dict: Cache (instance of `collections.OrderedDict`).
+    :param key: Key.
+    :param create_value: Function with no input arguments that creates the
+        value.  This is called only if the key is not already in the cache.
+    :return: value: Value for the given key.
+    """
+
+    if key in cache_dict:
+        value = cache_dict.pop(key)
+        cache_dict[key] = value
+        return value
+
+    value = create_value()
+    cache_dict[key] = value
+
+    while len(cache_dict) > MAX_CACHE_SIZE:
+        cache_dict.popitem(last=False)
+
+    return value
+
 
 def string_to_unix_sec(time_string, time_directive):
     """Converts time from string to Unix format.
@@ -40,7 +75,13 @@ def string_to_unix_sec(time_string, time_directive):
 
     error_checking.assert_is_string(time_string)
     error_checking.assert_is_string(time_directive)
-    return calendar.timegm(time.strptime(time_string, time_directive))
+
+    return _get_cached_value(
+        cache_dict=_STRING_TO_UNIX_SEC_CACHE,
+        key=(time_string, time_directive),
+        create_value=lambda: calendar.timegm(
+            time.strptime(time_string, time_directive))
+    )
 
 
 def unix_sec_to_string(unix_time_sec, time_directive):
@@ -57,7 +98,38 @@ def unix_sec_to_string(unix_time_sec, time_directive):
 
     error_checking.assert_is_integer(unix_time_sec)
     error_checking.assert_is_string(time_directive)
-    return time.strftime(time_directive, time.gmtime(unix_time_sec))
+
+    return _get_cached_value(
+        cache_dict=_UNIX_SEC_TO_STRING_CACHE,
+        key=(int(unix_time_sec), time_directive),
+        create_value=lambda: time.strftime(
+            time_directive, time.gmtime(unix_time_sec))
+    )
+
+
+def unix_sec_array_to_strings(unix_times_sec, time_directive):
+    """Converts array of times from Unix format to strings.
+
+    Each unique time is converted only once.
+
+    N = number of times
+
+    :param unix_times_sec: length-N numpy array of times in Unix format.
+    :param time_directive: See doc for `unix_sec_to_string`.
+    :return: time_strings: length-N list of time strings.
+    """
+
+    error_checking.assert_is_integer_numpy_array(unix_times_sec)
+    error_checking.assert_is_numpy_array(unix_times_sec, num_dimensions=1)
+    error_checking.assert_is_string(time_directive)
+
+    unique_times_unix_sec, orig_to_unique_indices = numpy.unique(
+        unix_times_sec, return_inverse=True)
+    unique_time_strings = [
+        unix_sec_to_string(t, time_directive) for t in unique_times_unix_sec
+    ]
+
+    return [unique_time_strings[k] for k in orig_to_unique_indices]
 
 
 def time_to_spc_date_unix_sec(unix_time_sec):
@@ -87,6 +159,40 @@ def time_to_spc_date_string(unix_time_sec):
         unix_time_sec - DAYS_TO_SECONDS / 2, SPC_DATE_FORMAT)
 
 
+def times_to_spc_dates_unix_sec(unix_times_sec):
+    """Converts array of times to SPC dates (both in Unix format).
+
+    N = number of times
+
+    :param unix_times_sec: length-N numpy array of times in Unix format.
+    :return: spc_dates_unix_sec: length-N numpy array of SPC dates in Unix
+        format (see doc for `time_to_spc_date_unix_sec`).
+    """
+
+    error_checking.assert_is_integer_numpy_array(unix_times_sec)
+    error_checking.assert_is_numpy_array(unix_times_sec, num_dimensions=1)
+
+    return SECONDS_INTO_SPC_DATE_DEFAULT + rounder.floor_to_nearest(
+        unix_times_sec - DAYS_TO_SECONDS / 2, DAYS_TO_SECONDS
+    ).astype(int)
+
+
+def times_to_spc_date_strings(unix_times_sec):
+    """Converts array of times in Unix format to SPC dates in string format.
+
+    N = number of times
+
+    :param unix_times_sec: length-N numpy array of times in Unix format.
+    :return: spc_date_strings: length-N list of SPC dates (format "yyyymmdd").
+    """
+
+    error_checking.assert_is_integer_numpy_array(unix_times_sec)
+    error_checking.assert_is_numpy_array(unix_times_sec, num_dimensions=1)
+
+    return unix_sec_array_to_strings(
+        unix_times_sec - DAYS_TO_SECONDS / 2, SPC_DATE_FORMAT)
+
+
 def spc_date_string_to_unix_sec(spc_date_string):
     """Converts SPC date from string to Unix format.
 
@@ -101,6 +207,31 @@ def spc_date_string_to_unix_sec(spc_date_string):
         spc_date_string, SPC_DATE_FORMAT)
 
 
+def spc_date_strings_to_unix_sec(spc_date_strings):
+    """Converts list of SPC dates from string to Unix format.
+
+    Each unique SPC date is converted only once.
+
+    N = number of SPC dates
+
+    :param spc_date_strings: length-N list of SPC dates (format "yyyymmdd").
+    :return: spc_dates_unix_sec: length-N numpy array of SPC dates in Unix
+        format (see doc for `spc_date_string_to_unix_sec`).
+    """
+
+    error_checking.assert_is_string_list(spc_date_strings)
+    if len(spc_date_strings) == 0:
+        return numpy.array([], dtype=int)
+
+    unique_date_strings, orig_to_unique_indices = numpy.unique(
+        numpy.array(spc_date_strings), return_inverse=True)
+    unique_dates_unix_sec = numpy.array(
+        [spc_date_string_to_unix_sec(str(s)) for s in unique_date_strings],
+        dtype=int)
+
+    return unique_dates_unix_sec[orig_to_unique_indices]
+
+
 def get_spc_dates_in_range(first_spc_date_string, last_spc_date_string):
     """Returns list of SPC dates in range.
 
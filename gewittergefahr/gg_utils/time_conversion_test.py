@@ -1,8 +1,17 @@
 """Unit tests for time_conversion.py."""
 
 import unittest
+import collections
+import numpy
 from gewittergefahr.gg_utils import time_conversion
 
+# The following constants are used to test _get_cached_value.
+SMALL_CACHE_SIZE = 3
+FIRST_CACHE_KEYS = ['a', 'b', 'c']
+RECENTLY_USED_CACHE_KEY = 'a'
+NEW_CACHE_KEYS = ['d', 'e']
+EVICTED_CACHE_KEYS = ['b', 'c']
+
 TIME_FORMAT_YEAR = '%Y'
 TIME_FORMAT_NUMERIC_MONTH = '%m'
 TIME_FORMAT_3LETTER_MONTH = '%b'
@@ -50,10 +59,70 @@ ALL_SPC_DATE_STRINGS = [
 TIME_115959UTC_BEFORE_DATE_UNIX_SEC = 1506340799
 TIME_1200UTC_AFTER_DATE_UNIX_SEC = 1506427200
 
+UNIX_TIMES_FOR_ARRAYS_SEC = numpy.array([
+    TIME_0000UTC_SPC_DATE_UNIX_SEC, TIME_115959UTC_BEFORE_DATE_UNIX_SEC,
+    TIME_1200UTC_SPC_DATE_UNIX_SEC, TIME_1200UTC_AFTER_DATE_UNIX_SEC,
+    TIME_0000UTC_SPC_DATE_UNIX_SEC
+], dtype=int)
+TIME_STRINGS_FOR_ARRAYS = [
+    '2017-09-26-000000', '2017-09-25-115959', '2017-09-25-120000',
+    '2017-09-26-120000', '2017-09-26-000000'
+]
+SPC_DATE_STRINGS_FOR_ARRAYS = [
+    '20170925', '20170924', '20170925', '20170926', '20170925'
+]
+SPC_DATES_FOR_ARRAYS_UNIX_SEC = numpy.array([
+    SPC_DATE_UNIX_SEC, SPC_DATE_UNIX_SEC - 86400, SPC_DATE_UNIX_SEC,
+    SPC_DATE_UNIX_SEC + 86400, SPC_DATE_UNIX_SEC
+], dtype=int)
+
 
 class TimeConversionTests(unittest.TestCase):
     """Each method is a unit test for time_conversion.py."""
 
+    def test_get_cached_value(self):
+        """Ensures correct output from _get_cached_value.
+
+        The cache is filled past its limit, after which the most recently used
+        key should survive and the least recently used keys should be evicted.
+        """
+
+        orig_max_cache_size = time_conversion.MAX_CACHE_SIZE
+        time_conversion.MAX_CACHE_SIZE = SMALL_CACHE_SIZE
+        this_cache_dict = collections.OrderedDict()
+        num_values_created = [0]
+
+        def create_value():
+            """Creates dummy value (and counts creations)."""
+
+            num_values_created[0] += 1
+            return num_values_created[0]
+
+        try:
+            for this_key in FIRST_CACHE_KEYS:
+                time_conversion._get_cached_value(
+                    cache_dict=this_cache_dict, key=this_key,
+                    create_value=create_value)
+
+            this_value = time_conversion._get_cached_value(
+                cache_dict=this_cache_dict, key=RECENTLY_USED_CACHE_KEY,
+                create_value=create_value)
+
+            self.assertTrue(this_value == 1)
+            self.assertTrue(num_values_created[0] == len(FIRST_CACHE_KEYS))
+
+            for this_key in NEW_CACHE_KEYS:
+                time_conversion._get_cached_value(
+                    cache_dict=this_cache_dict, key=this_key,
+                    create_value=create_value)
+        finally:
+            time_conversion.MAX_CACHE_SIZE = orig_max_cache_size
+
+        self.assertTrue(len(this_cache_dict) == SMALL_CACHE_SIZE)
+        self.assertTrue(RECENTLY_USED_CACHE_KEY in this_cache_dict)
+        for this_key in EVICTED_CACHE_KEYS:
+            self.assertFalse(this_key in this_cache_dict)
+
     def test_string_to_unix_sec_year(self):
         """Ensures correctness of string_to_unix_sec; string = year only."""
 
@@ -208,6 +277,40 @@ class TimeConversionTests(unittest.TestCase):
             SPC_DATE_STRING)
         self.assertTrue(this_spc_date_unix_sec == SPC_DATE_UNIX_SEC)
 
+    def test_unix_sec_array_to_strings(self):
+        """Ensures correct output from unix_sec_array_to_strings."""
+
+        these_time_strings = time_conversion.unix_sec_array_to_strings(
+            UNIX_TIMES_FOR_ARRAYS_SEC, TIME_FORMAT_SECOND)
+        self.assertTrue(these_time_strings == TIME_STRINGS_FOR_ARRAYS)
+
+    def test_times_to_spc_dates_unix_sec(self):
+        """Ensures correct output from times_to_spc_dates_unix_sec."""
+
+        these_spc_dates_unix_sec = (
+            time_conversion.times_to_spc_dates_unix_sec(
+                UNIX_TIMES_FOR_ARRAYS_SEC)
+        )
+        self.assertTrue(numpy.array_equal(
+            these_spc_dates_unix_sec, SPC_DATES_FOR_ARRAYS_UNIX_SEC))
+
+    def test_times_to_spc_date_strings(self):
+        """Ensures correct output from times_to_spc_date_strings."""
+
+        these_spc_date_strings = time_conversion.times_to_spc_date_strings(
+            UNIX_TIMES_FOR_ARRAYS_SEC)
+        self.assertTrue(these_spc_date_strings == SPC_DATE_STRINGS_FOR_ARRAYS)
+
+    def test_spc_date_strings_to_unix_sec(self):
+        """Ensures correct output from spc_date_strings_to_unix_sec."""
+
+        these_spc_dates_unix_sec = (
+            time_conversion.spc_date_strings_to_unix_sec(
+                SPC_DATE_STRINGS_FOR_ARRAYS)
+        )
+        self.assertTrue(numpy.array_equal(
+            these_spc_dates_unix_sec, SPC_DATES_FOR_ARRAYS_UNIX_SEC))
+
     def test_get_spc_dates_in_range_one_date(self):
         """Ensures correct output from get_spc_dates_in_range.
 
@@ -0,0 +1,170 @@
+"""Benchmarks interpolation of NWP soundings to storm objects.
+
+Soundings are interpolated to all storm objects on one SPC date, once
+field-by-field (`interp.interp_nwp_from_xy_grid`) and once grouped by
+model-initialization time (`interp.interp_nwp_from_xy_grid_by_init_time`).  For
+each method, this script reports the number of grib fields read and the wall
+time.
+"""
+
+import time
+import argparse
+import numpy
+from gewittergefahr.gg_io import nwp_model_io
+from gewittergefahr.gg_io import storm_tracking_io as tracking_io
+from gewittergefahr.gg_utils import soundings
+from gewittergefahr.gg_utils import echo_top_tracking
+from gewittergefahr.gg_utils import storm_tracking_utils as tracking_utils
+
+SEPARATOR_STRING = '\n\n' + '*' * 50 + '\n\n'
+
+WGRIB_EXE_NAME = '/condo/swatwork/ralager/wgrib/wgrib'
+WGRIB2_EXE_NAME = '/condo/swatwork/ralager/grib2/wgrib2/wgrib2'
+
+SPC_DATE_ARG_NAME = 'spc_date_string'
+MODEL_NAME_ARG_NAME = 'model_name'
+GRIB_DIR_ARG_NAME = 'input_grib_directory_name'
+TRACKING_DIR_ARG_NAME = 'input_tracking_dir_name'
+TRACKING_SCALE_ARG_NAME = 'tracking_scale_metres2'
+LEAD_TIMES_ARG_NAME = 'lead_times_seconds'
+
+SPC_DATE_HELP_STRING = (
+    'SPC (Storm Prediction Center) date in format "yyyymmdd".  Soundings will '
+    'be interpolated to all storm objects on this date.  For a meaningful '
+    'benchmark, this should be a busy day.')
+MODEL_NAME_HELP_STRING = (
+    'Name of NWP model (must be accepted by '
+    '`nwp_model_utils.check_model_name`).')
+GRIB_DIR_HELP_STRING = (
+    'Name of top-level directory with grib files for the given model.')
+TRACKING_DIR_HELP_STRING = (
+    'Name of top-level directory with storm tracks (one file per time step, '
+    'readable by `storm_tracking_io.read_processed_file`).')
+TRACKING_SCALE_HELP_STRING = (
+    'Tracking scale (minimum storm area).  Used to find input data.')
+LEAD_TIMES_HELP_STRING = 'Lead times for soundings.'
+
+DEFAULT_TRACKING_SCALE_METRES2 = int(numpy.round(
+    echo_top_tracking.DUMMY_TRACKING_SCALE_METRES2))
+
+INPUT_ARG_PARSER = argparse.ArgumentParser()
+INPUT_ARG_PARSER.add_argument(
+    '--' + SPC_DATE_ARG_NAME, type=str, required=True,
+    help=SPC_DATE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + MODEL_NAME_ARG_NAME, type=str, required=True,
+    help=MODEL_NAME_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + GRIB_DIR_ARG_NAME, type=str, required=True,
+    help=GRIB_DIR_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + TRACKING_DIR_ARG_NAME, type=str, required=True,
+    help=TRACKING_DIR_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + TRACKING_SCALE_ARG_NAME, type=int, required=False,
+    default=DEFAULT_TRACKING_SCALE_METRES2, help=TRACKING_SCALE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + LEAD_TIMES_ARG_NAME, type=int, nargs='+', required=False,
+    default=[0], help=LEAD_TIMES_HELP_STRING)
+
+
+def _count_grib_reads(read_function, counter_dict):
+    """Wraps grib-reading function, so that calls are counted.
+
+    :param read_function: Function to wrap (e.g.,
+        `nwp_model_io.read_field_from_grib_file`).
+    :param counter_dict: Dictionary with key "num_reads", which will be
+        incremented at each call.
+    :return: wrapped_function: Wrapped function.
+    """
+
+    def wrapped_function(*args, **kwargs):
+        counter_dict['num_reads'] += 1
+        return read_function(*args, **kwargs)
+
+    return wrapped_function
+
+
+def _run(spc_date_string, model_name, top_grib_directory_name,
+         top_tracking_dir_name, tracking_scale_metres2, lead_times_seconds):
+    """Benchmarks interpolation of NWP soundings to storm objects.
+
+    This is effectively the main method.
+
+    :param spc_date_string: See documentation at top of file.
+    :param model_name: Same.
+    :param top_grib_directory_name: Same.
+    :param top_tracking_dir_name: Same.
+    :param tracking_scale_metres2: Same.
+    :param lead_times_seconds: Same.
+    """
+
+    tracking_file_names, _ = tracking_io.find_processed_files_one_spc_date(
+        spc_date_string=spc_date_string,
+        data_source=tracking_utils.SEGMOTION_SOURCE_ID,
+        top_processed_dir_name=top_tracking_dir_name,
+        tracking_scale_metres2=tracking_scale_metres2)
+
+    storm_object_table = tracking_io.read_many_processed_files(
+        tracking_file_names)
+    print SEPARATOR_STRING
+
+    counter_dict = {'num_reads': 0}
+    nwp_model_io.read_field_from_grib_file = _count_grib_reads(
+        read_function=nwp_model_io.read_field_from_grib_file,
+        counter_dict=counter_dict)
+
+    group_flags = [False, True]
+    method_names = ['field-by-field', 'grouped by init time']
+    num_reads_by_method = [0] * len(group_flags)
+    wall_times_by_method_sec = [0.] * len(group_flags)
+    list_of_sounding_matrices = [None] * len(group_flags)
+
+    for k in range(len(group_flags)):
+        counter_dict['num_reads'] = 0
+        this_start_time_sec = time.time()
+
+        this_sounding_dict = soundings.interp_soundings_to_storm_objects(
+            storm_object_table=storm_object_table,
+            top_grib_directory_name=top_grib_directory_name,
+            model_name=model_name, use_all_grids=True,
+            lead_times_seconds=numpy.array(lead_times_seconds, dtype=int),
+            wgrib_exe_name=WGRIB_EXE_NAME, wgrib2_exe_name=WGRIB2_EXE_NAME,
+            raise_error_if_missing=False, group_by_init_time=group_flags[k]
+        )[0]
+
+        wall_times_by_method_sec[k] = time.time() - this_start_time_sec
+        num_reads_by_method[k] = counter_dict['num_reads']
+        list_of_sounding_matrices[k] = this_sounding_dict[
+            soundings.SOUNDING_MATRIX_KEY]
+        print SEPARATOR_STRING
+
+    for k in range(len(group_flags)):
+        print (
+            'Interpolation {0:s}: {1:d} grib fields read, {2:.1f} seconds '
+            'elapsed.'
+        ).format(method_names[k], num_reads_by_method[k],
+                 wall_times_by_method_sec[k])
+
+    print 'Max absolute difference between methods = {0:.4e}'.format(
+        numpy.nanmax(numpy.absolute(
+            list_of_sounding_matrices[0] - list_of_sounding_matrices[1])))
+
+
+if __name__ == '__main__':
+    INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
+
+    _run(
+        spc_date_string=getattr(INPUT_ARG_OBJECT, SPC_DATE_ARG_NAME),
+        model_name=getattr(INPUT_ARG_OBJECT, MODEL_NAME_ARG_NAME),
+        top_grib_directory_name=getattr(INPUT_ARG_OBJECT, GRIB_DIR_ARG_NAME),
+        top_tracking_dir_name=getattr(INPUT_ARG_OBJECT, TRACKING_DIR_ARG_NAME),
+        tracking_scale_metres2=getattr(
+            INPUT_ARG_OBJECT, TRACKING_SCALE_ARG_NAME),
+        lead_times_seconds=getattr(INPUT_ARG_OBJECT, LEAD_TIMES_ARG_NAME)
+    )
@@ -210,23 +210,6 @@ def _run(top_linkage_dir_name, spc_date_string, min_lead_times_sec,
                         max_link_distance_metres=max_link_distances_metres[j],
                         wind_speed_percentile_level=wind_speed_percentile_level,
                         wind_speed_cutoffs_kt=list_of_cutoff_arrays_kt[k])
-
-                    target_names.append(this_target_name)
-                    print 'Computing values for "{0:s}"...'.format(
-                        target_names[-1])
-
-                    storm_to_events_table = (
-                        target_val_utils.create_wind_classification_targets(
-                            storm_to_winds_table=storm_to_events_table,
-                            min_lead_time_sec=min_lead_times_sec[i],
-                            max_lead_time_sec=max_lead_times_sec[i],
-                            min_link_distance_metres=min_link_distances_metres[
-                                j],
-                            max_link_distance_metres=max_link_distances_metres[
-                                j],
-                            percentile_level=wind_speed_percentile_level,
-                            class_cutoffs_kt=list_of_cutoff_arrays_kt[k])
-                    )
                 else:
                     this_target_name = target_val_utils.target_params_to_name(
                         min_lead_time_sec=min_lead_times_sec[i],
@@ -234,28 +217,17 @@ def _run(top_linkage_dir_name, spc_date_string, min_lead_times_sec,
                         min_link_distance_metres=min_link_distances_metres[j],
                         max_link_distance_metres=max_link_distances_metres[j])
 
-                    target_names.append(this_target_name)
-                    print 'Computing values for "{0:s}"...'.format(
-                        target_names[-1])
-
-                    storm_to_events_table = (
-                        target_val_utils.create_tornado_targets(
-                            storm_to_tornadoes_table=storm_to_events_table,
-                            min_lead_time_sec=min_lead_times_sec[i],
-                            max_lead_time_sec=max_lead_times_sec[i],
-                            min_link_distance_metres=min_link_distances_metres[
-                                j],
-                            max_link_distance_metres=max_link_distances_metres[
-                                j]
-                        )
-                    )
+                target_names.append(this_target_name)
 
     target_file_name = target_val_utils.find_target_file(
         top_directory_name=top_output_dir_name,
         event_type_string=event_type_string, spc_date_string=spc_date_string,
         raise_error_if_missing=False)
 
-    print 'Writing target values to: "{0:s}"...'.format(target_file_name)
+    print (
+        'Computing {0:d} target variables and writing to: "{1:s}"...'
+    ).format(len(target_names), target_file_name)
+
     target_val_utils.write_target_values(
         storm_to_events_table=storm_to_events_table, target_names=target_names,
         netcdf_file_name=target_file_name)
@@ -0,0 +1,129 @@
+"""Converts input examples from NetCDF files to memory-mappable shards.
+
+Each NetCDF file (read by `input_examples.read_example_file`) is converted to
+one shard (written by `input_examples.write_example_shard`).  Shards can be read
+by `training_validation_io.shard_generator_2d_or_3d` without decoding.
+"""
+
+import os.path
+import argparse
+from gewittergefahr.deep_learning import input_examples
+
+SEPARATOR_STRING = '\n\n' + '*' * 50 + '\n\n'
+
+INPUT_DIR_ARG_NAME = 'input_example_dir_name'
+SHUFFLED_ARG_NAME = 'shuffled'
+FIRST_DATE_ARG_NAME = 'first_spc_date_string'
+LAST_DATE_ARG_NAME = 'last_spc_date_string'
+FIRST_BATCH_NUM_ARG_NAME = 'first_batch_number'
+LAST_BATCH_NUM_ARG_NAME = 'last_batch_number'
+OUTPUT_DIR_ARG_NAME = 'output_shard_dir_name'
+
+INPUT_DIR_HELP_STRING = (
+    'Name of top-level directory with input files.  Files therein will be found'
+    ' by `input_examples.find_many_example_files` and read by '
+    '`input_examples.read_example_file`.')
+
+SHUFFLED_HELP_STRING = (
+    'Boolean flag.  If 1, will convert temporally shuffled files (from batch '
+    '`{0:s}`...`{1:s}`).  If 0, will convert unshuffled files (from SPC date '
+    '`{2:s}`...`{3:s}`).'
+).format(FIRST_BATCH_NUM_ARG_NAME, LAST_BATCH_NUM_ARG_NAME,
+         FIRST_DATE_ARG_NAME, LAST_DATE_ARG_NAME)
+
+SPC_DATE_HELP_STRING = (
+    'SPC date (format "yyyymmdd").  Used only if `{0:s} = 0`.'
+).format(SHUFFLED_ARG_NAME)
+
+BATCH_NUMBER_HELP_STRING = (
+    'Batch number (integer).  Used only if `{0:s} = 1`.'
+).format(SHUFFLED_ARG_NAME)
+
+OUTPUT_DIR_HELP_STRING = (
+    'Name of top-level directory for shards.  Shards will be written by '
+    '`input_examples.write_example_shard`, to locations in this directory '
+    'determined by `input_examples.find_example_shard`.')
+
+INPUT_ARG_PARSER = argparse.ArgumentParser()
+INPUT_ARG_PARSER.add_argument(
+    '--' + INPUT_DIR_ARG_NAME, type=str, required=True,
+    help=INPUT_DIR_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + SHUFFLED_ARG_NAME, type=int, required=False, default=1,
+    help=SHUFFLED_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + FIRST_DATE_ARG_NAME, type=str, required=False, default='',
+    help=SPC_DATE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + LAST_DATE_ARG_NAME, type=str, required=False, default='',
+    help=SPC_DATE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + FIRST_BATCH_NUM_ARG_NAME, type=int, required=False, default=-1,
+    help=BATCH_NUMBER_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + LAST_BATCH_NUM_ARG_NAME, type=int, required=False, default=-1,
+    help=BATCH_NUMBER_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + OUTPUT_DIR_ARG_NAME, type=str, required=True,
+    help=OUTPUT_DIR_HELP_STRING)
+
+
+def _run(top_input_dir_name, shuffled, first_spc_date_string,
+         last_spc_date_string, first_batch_number, last_batch_number,
+         top_output_dir_name):
+    """Converts input examples from NetCDF files to memory-mappable shards.
+
+    This is effectively the main method.
+
+    :param top_input_dir_name: See documentation at top of file.
+    :param shuffled: Same.
+    :param first_spc_date_string: Same.
+    :param last_spc_date_string: Same.
+    :param first_batch_number: Same.
+    :param last_batch_number: Same.
+    :param top_output_dir_name: Same.
+    """
+
+    input_file_names = input_examples.find_many_example_files(
+        top_directory_name=top_input_dir_name, shuffled=shuffled,
+        first_spc_date_string=first_spc_date_string,
+        last_spc_date_string=last_spc_date_string,
+        first_batch_number=first_batch_number,
+        last_batch_number=last_batch_number, raise_error_if_any_missing=False)
+
+    for this_input_file_name in input_file_names:
+        # Shards are laid out exactly like NetCDF files (see
+        # `input_examples.find_example_shard`).
+        this_shard_dir_name = os.path.splitext(
+            this_input_file_name.replace(
+                top_input_dir_name, top_output_dir_name, 1)
+        )[0]
+
+        print 'Reading data from: "{0:s}"...'.format(this_input_file_name)
+        this_example_dict = input_examples.read_example_file(
+            netcdf_file_name=this_input_file_name)
+
+        input_examples.write_example_shard(
+            shard_dir_name=this_shard_dir_name,
+            example_dict=this_example_dict)
+        print SEPARATOR_STRING
+
+
+if __name__ == '__main__':
+    INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
+
+    _run(
+        top_input_dir_name=getattr(INPUT_ARG_OBJECT, INPUT_DIR_ARG_NAME),
+        shuffled=bool(getattr(INPUT_ARG_OBJECT, SHUFFLED_ARG_NAME)),
+        first_spc_date_string=getattr(INPUT_ARG_OBJECT, FIRST_DATE_ARG_NAME),
+        last_spc_date_string=getattr(INPUT_ARG_OBJECT, LAST_DATE_ARG_NAME),
+        first_batch_number=getattr(INPUT_ARG_OBJECT, FIRST_BATCH_NUM_ARG_NAME),
+        last_batch_number=getattr(INPUT_ARG_OBJECT, LAST_BATCH_NUM_ARG_NAME),
+        top_output_dir_name=getattr(INPUT_ARG_OBJECT, OUTPUT_DIR_ARG_NAME)
+    )
@@ -0,0 +1,179 @@
+"""Converts NWP data from grib files to memory-mappable field stores.
+
+Each grib file (one model run) is decoded once and written to one field store
+(by `nwp_model_io.write_field_store`).  Field stores can then be used by
+`interp.interp_nwp_from_xy_grid_by_init_time` (and, in turn, by
+interp_soundings_to_storm_objects.py), which reads only the horizontal window
+around the query points instead of decoding every field again.
+"""
+
+import os.path
+import argparse
+import numpy
+from gewittergefahr.gg_io import nwp_model_io
+from gewittergefahr.gg_utils import nwp_model_utils
+from gewittergefahr.gg_utils import time_conversion
+from gewittergefahr.gg_utils import time_periods
+
+INPUT_TIME_FORMAT = '%Y%m%d%H'
+HOURS_TO_SECONDS = 3600
+SEPARATOR_STRING = '\n\n' + '*' * 50 + '\n\n'
+
+WGRIB_EXE_NAME = '/condo/swatwork/ralager/wgrib/wgrib'
+WGRIB2_EXE_NAME = '/condo/swatwork/ralager/grib2/wgrib2/wgrib2'
+
+MODEL_NAME_ARG_NAME = 'model_name'
+GRID_ID_ARG_NAME = 'grid_id'
+FIRST_INIT_TIME_ARG_NAME = 'first_init_time_string'
+LAST_INIT_TIME_ARG_NAME = 'last_init_time_string'
+GRIB_DIR_ARG_NAME = 'input_grib_directory_name'
+FIELD_NAMES_ARG_NAME = 'field_names_grib1'
+PRESSURE_LEVELS_ARG_NAME = 'pressure_levels_mb'
+OUTPUT_DIR_ARG_NAME = 'output_field_store_dir_name'
+
+MODEL_NAME_HELP_STRING = (
+    'Name of NWP model (must be accepted by '
+    '`nwp_model_utils.check_model_name`).')
+GRID_ID_HELP_STRING = (
+    'Grid ID (must be accepted by `nwp_model_utils.check_grid_id`).  For the '
+    'NARR, leave this alone.')
+INIT_TIME_HELP_STRING = (
+    'Model-initialization time (format "yyyymmddHH").  This script will convert'
+    ' all model runs (zero-hour analyses) initialized from `{0:s}`...`{1:s}`.'
+).format(FIRST_INIT_TIME_ARG_NAME, LAST_INIT_TIME_ARG_NAME)
+GRIB_DIR_HELP_STRING = (
+    'Name of top-level directory with grib files.  Files therein will be found '
+    'by `nwp_model_io.find_grib_file`.')
+FIELD_NAMES_HELP_STRING = (
+    'List of field names in grib1 format, without pressure level (example: '
+    '"HGT").  If you leave this alone, will use fields needed for soundings '
+    '(see `nwp_model_utils.get_columns_in_sounding_table`).')
+PRESSURE_LEVELS_HELP_STRING = (
+    'List of pressure levels (millibars).  If you leave this alone, will use '
+    'all pressure levels for the given model and grid (see '
+    '`nwp_model_utils.get_pressure_levels`).')
+OUTPUT_DIR_HELP_STRING = (
+    'Name of top-level directory for field stores.  Field stores will be '
+    'written by `nwp_model_io.write_field_store`, to locations in this '
+    'directory determined by `nwp_model_io.find_field_store`.')
+
+INPUT_ARG_PARSER = argparse.ArgumentParser()
+INPUT_ARG_PARSER.add_argument(
+    '--' + MODEL_NAME_ARG_NAME, type=str, required=True,
+    help=MODEL_NAME_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + GRID_ID_ARG_NAME, type=str, required=False, default='',
+    help=GRID_ID_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + FIRST_INIT_TIME_ARG_NAME, type=str, required=True,
+    help=INIT_TIME_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + LAST_INIT_TIME_ARG_NAME, type=str, required=True,
+    help=INIT_TIME_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + GRIB_DIR_ARG_NAME, type=str, required=True,
+    help=GRIB_DIR_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + FIELD_NAMES_ARG_NAME, type=str, nargs='+', required=False,
+    default=[''], help=FIELD_NAMES_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + PRESSURE_LEVELS_ARG_NAME, type=int, nargs='+', required=False,
+    default=[-1], help=PRESSURE_LEVELS_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + OUTPUT_DIR_ARG_NAME, type=str, required=True,
+    help=OUTPUT_DIR_HELP_STRING)
+
+
+def _run(model_name, grid_id, first_init_time_string, last_init_time_string,
+         top_grib_directory_name, field_names_grib1, pressure_levels_mb,
+         top_output_dir_name):
+    """Converts NWP data from grib files to memory-mappable field stores.
+
+    This is effectively the main method.
+
+    :param model_name: See documentation at top of file.
+    :param grid_id: Same.
+    :param first_init_time_string: Same.
+    :param last_init_time_string: Same.
+    :param top_grib_directory_name: Same.
+    :param field_names_grib1: Same.
+    :param pressure_levels_mb: Same.
+    :param top_output_dir_name: Same.
+    """
+
+    if grid_id == '':
+        grid_id = None
+
+    if field_names_grib1[0] == '':
+        field_names_grib1 = [
+            f.split(':')[0] for f in
+            nwp_model_utils.get_columns_in_sounding_table(model_name)[1]
+        ]
+
+    if pressure_levels_mb[0] <= 0:
+        pressure_levels_mb = nwp_model_utils.get_pressure_levels(
+            model_name=model_name, grid_id=grid_id)
+    else:
+        pressure_levels_mb = numpy.array(pressure_levels_mb, dtype=int)
+
+    first_init_time_unix_sec = time_conversion.string_to_unix_sec(
+        first_init_time_string, INPUT_TIME_FORMAT)
+    last_init_time_unix_sec = time_conversion.string_to_unix_sec(
+        last_init_time_string, INPUT_TIME_FORMAT)
+    time_interval_sec = HOURS_TO_SECONDS * nwp_model_utils.get_time_steps(
+        model_name)[1]
+
+    init_times_unix_sec = time_periods.range_and_interval_to_list(
+        start_time_unix_sec=first_init_time_unix_sec,
+        end_time_unix_sec=last_init_time_unix_sec,
+        time_interval_sec=time_interval_sec)
+
+    for this_init_time_unix_sec in init_times_unix_sec:
+        this_grib_file_name = nwp_model_io.find_grib_file(
+            top_directory_name=top_grib_directory_name,
+            init_time_unix_sec=this_init_time_unix_sec, model_name=model_name,
+            grid_id=grid_id, lead_time_hours=0, raise_error_if_missing=False)
+
+        if not os.path.isfile(this_grib_file_name):
+            print 'Cannot find grib file.  Expected at: "{0:s}"'.format(
+                this_grib_file_name)
+            continue
+
+        this_store_dir_name = nwp_model_io.find_field_store(
+            top_directory_name=top_output_dir_name,
+            init_time_unix_sec=this_init_time_unix_sec, model_name=model_name,
+            grid_id=grid_id, lead_time_hours=0, raise_error_if_missing=False)
+
+        nwp_model_io.write_field_store(
+            store_dir_name=this_store_dir_name,
+            grib_file_name=this_grib_file_name,
+            field_names_grib1=field_names_grib1,
+            pressure_levels_mb=pressure_levels_mb, model_name=model_name,
+            init_time_unix_sec=this_init_time_unix_sec, grid_id=grid_id,
+            lead_time_hours=0, wgrib_exe_name=WGRIB_EXE_NAME,
+            wgrib2_exe_name=WGRIB2_EXE_NAME, raise_error_if_fails=False)
+        print SEPARATOR_STRING
+
+
+if __name__ == '__main__':
+    INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
+
+    _run(
+        model_name=getattr(INPUT_ARG_OBJECT, MODEL_NAME_ARG_NAME),
+        grid_id=getattr(INPUT_ARG_OBJECT, GRID_ID_ARG_NAME),
+        first_init_time_string=getattr(
+            INPUT_ARG_OBJECT, FIRST_INIT_TIME_ARG_NAME),
+        last_init_time_string=getattr(
+            INPUT_ARG_OBJECT, LAST_INIT_TIME_ARG_NAME),
+        top_grib_directory_name=getattr(INPUT_ARG_OBJECT, GRIB_DIR_ARG_NAME),
+        field_names_grib1=getattr(INPUT_ARG_OBJECT, FIELD_NAMES_ARG_NAME),
+        pressure_levels_mb=getattr(INPUT_ARG_OBJECT, PRESSURE_LEVELS_ARG_NAME),
+        top_output_dir_name=getattr(INPUT_ARG_OBJECT, OUTPUT_DIR_ARG_NAME)
+    )
@@ -29,6 +29,8 @@ NUM_EXAMPLES_PER_IN_FILE_ARG_NAME = 'num_examples_per_in_file'
 OUTPUT_DIR_ARG_NAME = 'output_dir_name'
 CLASS_FRACTION_KEYS_ARG_NAME = 'class_fraction_keys'
 CLASS_FRACTION_VALUES_ARG_NAME = 'class_fraction_values'
+NUM_PROCESSES_ARG_NAME = 'num_processes'
+OVERWRITE_ARG_NAME = 'overwrite_existing_files'
 
 STORM_IMAGE_DIR_HELP_STRING = (
     'Name of top-level directory with storm-centered radar images.  Files '
@@ -110,6 +112,17 @@ CLASS_FRACTION_VALUES_HELP_STRING = (
     'sampling, leave this alone.'
 )
 
+NUM_PROCESSES_HELP_STRING = (
+    'Number of worker processes.  Work is partitioned by SPC date, and each '
+    'worker creates one output file at a time.'
+)
+
+OVERWRITE_HELP_STRING = (
+    'Boolean flag.  If 1, will overwrite existing output files.  If 0, will '
+    'skip SPC dates for which the output file already exists (use this to '
+    'restart an interrupted run).'
+)
+
 DEFAULT_TOP_STORM_IMAGE_DIR_NAME = (
     '/condo/swatcommon/common/gridrad_final/myrorss_format/tracks/'
     'correct_echo_tops/reanalyzed/storm_images'
@@ -190,12 +203,21 @@ INPUT_ARG_PARSER.add_argument(
     '--' + CLASS_FRACTION_VALUES_ARG_NAME, type=float, nargs='+',
     required=False, default=[0.], help=CLASS_FRACTION_VALUES_HELP_STRING)
 
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_PROCESSES_ARG_NAME, type=int, required=False, default=1,
+    help=NUM_PROCESSES_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + OVERWRITE_ARG_NAME, type=int, required=False, default=1,
+    help=OVERWRITE_HELP_STRING)
+
 
 def _run(top_storm_image_dir_name, radar_source, num_radar_dimensions,
          radar_field_names, radar_heights_m_agl, first_spc_date_string,
          last_spc_date_string, top_target_dir_name, target_name,
          top_sounding_dir_name, sounding_lag_time_sec, num_examples_per_in_file,
-         top_output_dir_name, class_fraction_keys, class_fraction_values):
+         top_output_dir_name, class_fraction_keys, class_fraction_values,
+         num_processes, overwrite_existing_files):
     """Runs `input_examples.shuffle_and_write_examples`.
 
     This is effectively the main method.
@@ -215,6 +237,8 @@ def _run(top_storm_image_dir_name, radar_source, num_radar_dimensions,
     :param top_output_dir_name: Same.
     :param class_fraction_keys: Same.
     :param class_fraction_values: Same.
+    :param num_processes: Same.
+    :param overwrite_existing_files: Same.
     """
 
     if len(class_fraction_keys) > 1:
@@ -280,7 +304,9 @@ def _run(top_storm_image_dir_name, radar_source, num_radar_dimensions,
         reflectivity_file_name_matrix=reflectivity_file_name_matrix,
         az_shear_file_name_matrix=az_shear_file_name_matrix,
         class_to_sampling_fraction_dict=class_to_sampling_fraction_dict,
-        sounding_file_names=sounding_file_names)
+        sounding_file_names=sounding_file_names,
+        num_processes=num_processes,
+        overwrite_existing_files=overwrite_existing_files)
 
 
 if __name__ == '__main__':
@@ -307,5 +333,8 @@ if __name__ == '__main__':
             getattr(INPUT_ARG_OBJECT, CLASS_FRACTION_KEYS_ARG_NAME), dtype=int),
         class_fraction_values=numpy.array(
             getattr(INPUT_ARG_OBJECT, CLASS_FRACTION_VALUES_ARG_NAME),
-            dtype=float)
+            dtype=float),
+        num_processes=getattr(INPUT_ARG_OBJECT, NUM_PROCESSES_ARG_NAME),
+        overwrite_existing_files=bool(
+            getattr(INPUT_ARG_OBJECT, OVERWRITE_ARG_NAME))
     )
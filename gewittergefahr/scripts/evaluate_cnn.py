@@ -6,6 +6,7 @@ import argparse
 import numpy
 from keras import backend as K
 from gewittergefahr.gg_utils import time_conversion
+from gewittergefahr.gg_utils import model_evaluation as model_eval
 from gewittergefahr.deep_learning import cnn
 from gewittergefahr.deep_learning import input_examples
 from gewittergefahr.deep_learning import testing_io
@@ -28,6 +29,7 @@ LAST_SPC_DATE_ARG_NAME = 'last_spc_date_string'
 NUM_EXAMPLES_ARG_NAME = 'num_examples'
 CLASS_FRACTION_KEYS_ARG_NAME = 'class_fraction_keys'
 CLASS_FRACTION_VALUES_ARG_NAME = 'class_fraction_values'
+NUM_EXAMPLES_PER_BATCH_ARG_NAME = 'num_examples_per_batch'
 OUTPUT_DIR_ARG_NAME = 'output_dir_name'
 
 MODEL_FILE_HELP_STRING = (
@@ -57,6 +59,10 @@ CLASS_FRACTION_VALUES_HELP_STRING = (
     'conditional sampling, leave this alone.'
 )
 
+NUM_EXAMPLES_PER_BATCH_HELP_STRING = (
+    'Number of examples per batch.  The CNN will be applied to one batch at a '
+    'time.')
+
 OUTPUT_DIR_HELP_STRING = (
     'Name of output directory.  Results will be saved here.')
 
@@ -89,6 +95,11 @@ INPUT_ARG_PARSER.add_argument(
     '--' + CLASS_FRACTION_VALUES_ARG_NAME, type=float, nargs='+',
     required=False, default=[0.], help=CLASS_FRACTION_VALUES_HELP_STRING)
 
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_EXAMPLES_PER_BATCH_ARG_NAME, type=int, required=False,
+    default=cnn.DEFAULT_NUM_EXAMPLES_PER_BATCH,
+    help=NUM_EXAMPLES_PER_BATCH_HELP_STRING)
+
 INPUT_ARG_PARSER.add_argument(
     '--' + OUTPUT_DIR_ARG_NAME, type=str, required=True,
     help=OUTPUT_DIR_HELP_STRING)
@@ -96,7 +107,7 @@ INPUT_ARG_PARSER.add_argument(
 
 def _run(model_file_name, top_example_dir_name, first_spc_date_string,
          last_spc_date_string, num_examples, class_fraction_keys,
-         class_fraction_values, output_dir_name):
+         class_fraction_values, num_examples_per_batch, output_dir_name):
     """Evaluates CNN (convolutional neural net) predictions.
 
     This is effectively the main method.
@@ -108,6 +119,7 @@ def _run(model_file_name, top_example_dir_name, first_spc_date_string,
     :param num_examples: Same.
     :param class_fraction_keys: Same.
     :param class_fraction_values: Same.
+    :param num_examples_per_batch: Same.
     :param output_dir_name: Same.
     :raises: ValueError: if the model does multi-class classification.
     """
@@ -161,59 +173,30 @@ def _run(model_file_name, top_example_dir_name, first_spc_date_string,
         generator_object = testing_io.example_generator_2d_or_3d(
             option_dict=training_option_dict, num_examples_total=num_examples)
 
-    forecast_probabilities = numpy.array([])
-    observed_labels = numpy.array([], dtype=int)
-
-    for _ in range(len(example_file_names)):
-        try:
-            this_storm_object_dict = next(generator_object)
-            print SEPARATOR_STRING
-        except StopIteration:
-            break
-
-        observed_labels = numpy.concatenate((
-            observed_labels, this_storm_object_dict[testing_io.TARGET_ARRAY_KEY]
-        ))
-
-        these_predictor_matrices = this_storm_object_dict[
-            testing_io.INPUT_MATRICES_KEY]
-
-        if model_metadata_dict[cnn.USE_2D3D_CONVOLUTION_KEY]:
-            if len(these_predictor_matrices) == 3:
-                this_sounding_matrix = these_predictor_matrices[2]
-            else:
-                this_sounding_matrix = None
-
-            this_probability_matrix = cnn.apply_2d3d_cnn(
-                model_object=model_object,
-                reflectivity_image_matrix_dbz=these_predictor_matrices[0],
-                az_shear_image_matrix_s01=these_predictor_matrices[1],
-                sounding_matrix=this_sounding_matrix)
-        else:
-            if len(these_predictor_matrices) == 2:
-                this_sounding_matrix = these_predictor_matrices[1]
-            else:
-                this_sounding_matrix = None
-
-            num_radar_dimensions = len(these_predictor_matrices[0].shape) - 2
-
-            if num_radar_dimensions == 2:
-                this_probability_matrix = cnn.apply_2d_cnn(
-                    model_object=model_object,
-                    radar_image_matrix=these_predictor_matrices[0],
-                    sounding_matrix=this_sounding_matrix)
-            else:
-                this_probability_matrix = cnn.apply_3d_cnn(
-                    model_object=model_object,
-                    radar_image_matrix=these_predictor_matrices[0],
-                    sounding_matrix=this_sounding_matrix)
-
-        forecast_probabilities = numpy.concatenate((
-            forecast_probabilities, this_probability_matrix[:, -1]))
-
-    model_eval_helper.run_evaluation(
-        forecast_probabilities=forecast_probabilities,
-        observed_labels=observed_labels, output_dir_name=output_dir_name)
+    # Predictions are evaluated as they are computed, so that predictors never
+    # need to be held in memory all at once.  Raw forecasts are kept, so that
+    # the evaluation file still contains them and the scikit-learn AUC.
+    accumulator_dict = model_eval.create_accumulator(
+        unique_forecast_precision=
+        model_eval_helper.FORECAST_PRECISION_FOR_THRESHOLDS,
+        keep_forecasts=True)
+
+    prediction_file_name = '{0:s}/predictions.nc'.format(output_dir_name)
+    num_examples_used, num_examples_per_second = cnn.apply_cnn_to_generator(
+        model_object=model_object, generator_object=generator_object,
+        use_2d3d_convolution=model_metadata_dict[cnn.USE_2D3D_CONVOLUTION_KEY],
+        output_file_name=prediction_file_name,
+        num_examples_per_batch=num_examples_per_batch,
+        evaluation_accumulator_dict=accumulator_dict)
+    print SEPARATOR_STRING
+
+    print (
+        'Applied model to {0:d} examples ({1:.1f} examples per second).  '
+        'Predictions were written to: "{2:s}"'
+    ).format(num_examples_used, num_examples_per_second, prediction_file_name)
+
+    model_eval_helper.run_evaluation_from_accumulator(
+        accumulator_dict=accumulator_dict, output_dir_name=output_dir_name)
 
 
 if __name__ == '__main__':
@@ -231,5 +214,7 @@ if __name__ == '__main__':
         class_fraction_values=numpy.array(
             getattr(INPUT_ARG_OBJECT, CLASS_FRACTION_VALUES_ARG_NAME),
             dtype=float),
+        num_examples_per_batch=getattr(
+            INPUT_ARG_OBJECT, NUM_EXAMPLES_PER_BATCH_ARG_NAME),
         output_dir_name=getattr(INPUT_ARG_OBJECT, OUTPUT_DIR_ARG_NAME)
     )
@@ -4,14 +4,13 @@
 radar images and storm-centered soundings.
 """
 
-import copy
 import argparse
+import multiprocessing
 import numpy
 import pandas
-from scipy.interpolate import interp1d
 from gewittergefahr.gg_utils import radar_utils
 from gewittergefahr.gg_utils import soundings
-from gewittergefahr.gg_utils import number_rounding
+from gewittergefahr.gg_utils import error_checking
 from gewittergefahr.deep_learning import input_examples
 from gewittergefahr.deep_learning import deep_learning_utils as dl_utils
 
@@ -22,9 +21,17 @@ SEPARATOR_STRING = '\n\n' + '*' * 50 + '\n\n'
 NUM_RADAR_ROWS = 24
 NUM_RADAR_COLUMNS = 24
 
-NUM_VALUES_KEY = 'num_values'
-MEAN_VALUE_KEY = 'mean_value'
-MEAN_OF_SQUARES_KEY = 'mean_of_squares'
+TABLE_NAME_KEY = 'table_name'
+TABLE_INDICES_KEY = 'table_indices'
+DATA_MATRIX_KEY = 'data_matrix'
+BIN_WIDTHS_KEY = 'bin_widths'
+Z_SCORE_PARAMS_KEY = 'z_score_params'
+HISTOGRAMS_KEY = 'histograms'
+
+RADAR_TABLE_NO_HEIGHT_NAME = 'radar_no_height'
+RADAR_TABLE_WITH_HEIGHT_NAME = 'radar_with_height'
+SOUNDING_TABLE_NO_HEIGHT_NAME = 'sounding_no_height'
+SOUNDING_TABLE_WITH_HEIGHT_NAME = 'sounding_with_height'
 
 RADAR_INTERVAL_DICT = {
     radar_utils.ECHO_TOP_18DBZ_NAME: 0.01,  # km
@@ -62,6 +69,7 @@ SOUNDING_INTERVAL_DICT = {
 EXAMPLE_DIR_ARG_NAME = 'input_example_dir_name'
 MIN_PERCENTILE_ARG_NAME = 'min_percentile_level'
 MAX_PERCENTILE_ARG_NAME = 'max_percentile_level'
+NUM_PROCESSES_ARG_NAME = 'num_processes'
 OUTPUT_FILE_ARG_NAME = 'output_file_name'
 
 EXAMPLE_DIR_HELP_STRING = (
@@ -77,6 +85,10 @@ MAX_PERCENTILE_HELP_STRING = (
     'Max percentile level.  The "max value" for each field will actually be '
     'this percentile.')
 
+NUM_PROCESSES_HELP_STRING = (
+    'Number of worker processes.  Each worker reads one example file at a time '
+    'and returns partial estimates, which are merged by the main process.')
+
 OUTPUT_FILE_HELP_STRING = (
     'Path to output file (will be written by `deep_learning_utils.'
     'write_normalization_params`).')
@@ -94,170 +106,317 @@ INPUT_ARG_PARSER.add_argument(
     '--' + MAX_PERCENTILE_ARG_NAME, type=float, required=False, default=99.9,
     help=MAX_PERCENTILE_HELP_STRING)
 
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_PROCESSES_ARG_NAME, type=int, required=False, default=1,
+    help=NUM_PROCESSES_HELP_STRING)
+
 INPUT_ARG_PARSER.add_argument(
     '--' + OUTPUT_FILE_ARG_NAME, type=str, required=True,
     help=OUTPUT_FILE_HELP_STRING)
 
 
-def _update_z_score_params(z_score_param_dict, new_data_matrix):
-    """Updates z-score parameters.
+def _get_data_groups(example_dict):
+    """Splits predictors into groups for which parameters are estimated jointly.
+
+    Each group contains one or more channels (e.g., all radar fields, or all
+    sounding field/height pairs), and parameters for all channels in the group
+    are updated at once by `deep_learning_utils.update_z_score_params` and
+    `deep_learning_utils.update_histograms`.
+
+    :param example_dict: Dictionary created by
+        `input_examples.read_example_file`.
+    :return: list_of_group_dicts: 1-D list of dictionaries, each with the
+        following keys.
+    group_dict['table_name']: Name of table to which group belongs (e.g.,
+        "radar_no_height" or "sounding_with_height").
+    group_dict['table_indices']: length-C list of table indices (one for each
+        channel in the group).  Each index is either a field name or a tuple
+        with (field_name, height_m_agl).
+    group_dict['data_matrix']: P-by-C numpy array of values, where P = number
+        of values per channel.
+    group_dict['bin_widths']: length-C numpy array of bin widths (used to
+        estimate percentiles).  If None, percentiles will not be estimated for
+        this group.
+    """
 
-    :param z_score_param_dict: Dictionary with the following keys.
-    z_score_param_dict['num_values']: Number of values on which current
-        estimates are based.
-    z_score_param_dict['mean_value']: Current mean.
-    z_score_param_dict['mean_of_squares']: Current mean of squared values.
+    list_of_group_dicts = []
 
-    :param new_data_matrix: numpy array with new values.  Will be used to
-        update estimates in `z_score_param_dict`.
-    :return: z_score_param_dict: Same as input, but with new estimates.
-    """
+    if input_examples.REFL_IMAGE_MATRIX_KEY in example_dict:
+        az_shear_field_names = example_dict[input_examples.RADAR_FIELDS_KEY]
+        refl_heights_m_agl = example_dict[input_examples.RADAR_HEIGHTS_KEY]
+        num_refl_heights = len(refl_heights_m_agl)
 
-    mean_values = numpy.array(
-        [z_score_param_dict[MEAN_VALUE_KEY], numpy.mean(new_data_matrix)])
-    weights = numpy.array(
-        [z_score_param_dict[NUM_VALUES_KEY], new_data_matrix.size])
-    z_score_param_dict[MEAN_VALUE_KEY] = numpy.average(
-        mean_values, weights=weights)
-
-    mean_values = numpy.array([
-        z_score_param_dict[MEAN_OF_SQUARES_KEY],
-        numpy.mean(new_data_matrix ** 2)])
-    weights = numpy.array(
-        [z_score_param_dict[NUM_VALUES_KEY], new_data_matrix.size])
-    z_score_param_dict[MEAN_OF_SQUARES_KEY] = numpy.average(
-        mean_values, weights=weights)
-
-    z_score_param_dict[NUM_VALUES_KEY] += new_data_matrix.size
-    return z_score_param_dict
-
-
-def _update_frequency_dict(frequency_dict, new_data_matrix, rounding_base):
-    """Updates measurement frequencies.
-
-    :param frequency_dict: Dictionary, where each key is a measurement and the
-        corresponding value is the number of times said measurement occurs.
-    :param new_data_matrix: numpy array with new values.  Will be used to
-        update frequencies in `frequency_dict`.
-    :param rounding_base: Each value in `new_data_matrix` will be rounded to the
-        nearest multiple of this base.
-    :return: frequency_dict: Same as input, but with new frequencies.
-    """
+        refl_matrix_dbz = example_dict[input_examples.REFL_IMAGE_MATRIX_KEY]
+        az_shear_matrix_s01 = numpy.reshape(
+            example_dict[input_examples.AZ_SHEAR_IMAGE_MATRIX_KEY],
+            (-1, len(az_shear_field_names))
+        )
+        az_shear_bin_widths = numpy.array(
+            [RADAR_INTERVAL_DICT[f] for f in az_shear_field_names])
+
+        list_of_group_dicts += [
+            {
+                TABLE_NAME_KEY: RADAR_TABLE_NO_HEIGHT_NAME,
+                TABLE_INDICES_KEY: [radar_utils.REFL_NAME],
+                DATA_MATRIX_KEY: numpy.reshape(refl_matrix_dbz, (-1, 1)),
+                BIN_WIDTHS_KEY: numpy.array(
+                    [RADAR_INTERVAL_DICT[radar_utils.REFL_NAME]])
+            },
+            {
+                TABLE_NAME_KEY: RADAR_TABLE_NO_HEIGHT_NAME,
+                TABLE_INDICES_KEY: az_shear_field_names,
+                DATA_MATRIX_KEY: az_shear_matrix_s01,
+                BIN_WIDTHS_KEY: az_shear_bin_widths
+            },
+            {
+                TABLE_NAME_KEY: RADAR_TABLE_WITH_HEIGHT_NAME,
+                TABLE_INDICES_KEY: [
+                    (radar_utils.REFL_NAME, int(h)) for h in refl_heights_m_agl
+                ],
+                DATA_MATRIX_KEY: numpy.reshape(
+                    refl_matrix_dbz, (-1, num_refl_heights)),
+                BIN_WIDTHS_KEY: None
+            },
+            {
+                TABLE_NAME_KEY: RADAR_TABLE_WITH_HEIGHT_NAME,
+                TABLE_INDICES_KEY: [
+                    (f, radar_utils.SHEAR_HEIGHT_M_ASL)
+                    for f in az_shear_field_names
+                ],
+                DATA_MATRIX_KEY: az_shear_matrix_s01,
+                BIN_WIDTHS_KEY: None
+            }
+        ]
+
+    elif len(example_dict[input_examples.RADAR_IMAGE_MATRIX_KEY].shape) == 5:
+        radar_field_names = example_dict[input_examples.RADAR_FIELDS_KEY]
+        radar_heights_m_agl = example_dict[input_examples.RADAR_HEIGHTS_KEY]
+        radar_matrix = example_dict[input_examples.RADAR_IMAGE_MATRIX_KEY]
+
+        # In the last axis of the reshaped matrix, height varies slowest and
+        # field varies fastest.
+        list_of_group_dicts += [
+            {
+                TABLE_NAME_KEY: RADAR_TABLE_NO_HEIGHT_NAME,
+                TABLE_INDICES_KEY: radar_field_names,
+                DATA_MATRIX_KEY: numpy.reshape(
+                    radar_matrix, (-1, len(radar_field_names))),
+                BIN_WIDTHS_KEY: numpy.array(
+                    [RADAR_INTERVAL_DICT[f] for f in radar_field_names])
+            },
+            {
+                TABLE_NAME_KEY: RADAR_TABLE_WITH_HEIGHT_NAME,
+                TABLE_INDICES_KEY: [
+                    (f, int(h)) for h in radar_heights_m_agl
+                    for f in radar_field_names
+                ],
+                DATA_MATRIX_KEY: numpy.reshape(
+                    radar_matrix,
+                    (-1, len(radar_heights_m_agl) * len(radar_field_names))
+                ),
+                BIN_WIDTHS_KEY: None
+            }
+        ]
 
-    new_unique_values, new_counts = numpy.unique(
-        number_rounding.round_to_nearest(new_data_matrix, rounding_base),
-        return_counts=True)
+    else:
+        radar_field_name_by_pair = numpy.array(
+            example_dict[input_examples.RADAR_FIELDS_KEY])
+        radar_height_by_pair_m_agl = example_dict[
+            input_examples.RADAR_HEIGHTS_KEY]
+        radar_matrix = example_dict[input_examples.RADAR_IMAGE_MATRIX_KEY]
+
+        # Each field may occur at a different number of heights, so each field
+        # gets its own group.
+        for this_field_name in numpy.unique(radar_field_name_by_pair):
+            these_pair_indices = numpy.where(
+                radar_field_name_by_pair == this_field_name
+            )[0]
+
+            list_of_group_dicts.append({
+                TABLE_NAME_KEY: RADAR_TABLE_NO_HEIGHT_NAME,
+                TABLE_INDICES_KEY: [str(this_field_name)],
+                DATA_MATRIX_KEY: numpy.reshape(
+                    radar_matrix[..., these_pair_indices], (-1, 1)),
+                BIN_WIDTHS_KEY: numpy.array(
+                    [RADAR_INTERVAL_DICT[this_field_name]])
+            })
+
+        list_of_group_dicts.append({
+            TABLE_NAME_KEY: RADAR_TABLE_WITH_HEIGHT_NAME,
+            TABLE_INDICES_KEY: [
+                (str(f), int(h)) for f, h in
+                zip(radar_field_name_by_pair, radar_height_by_pair_m_agl)
+            ],
+            DATA_MATRIX_KEY: numpy.reshape(
+                radar_matrix, (-1, len(radar_field_name_by_pair))),
+            BIN_WIDTHS_KEY: None
+        })
 
-    for i in range(len(new_unique_values)):
-        if new_unique_values[i] in frequency_dict:
-            frequency_dict[new_unique_values[i]] += new_counts[i]
-        else:
-            frequency_dict[new_unique_values[i]] = new_counts[i]
+    sounding_field_names = example_dict[input_examples.SOUNDING_FIELDS_KEY]
+    sounding_heights_m_agl = example_dict[input_examples.SOUNDING_HEIGHTS_KEY]
+    sounding_matrix = example_dict[input_examples.SOUNDING_MATRIX_KEY]
+
+    list_of_group_dicts += [
+        {
+            TABLE_NAME_KEY: SOUNDING_TABLE_NO_HEIGHT_NAME,
+            TABLE_INDICES_KEY: sounding_field_names,
+            DATA_MATRIX_KEY: numpy.reshape(
+                sounding_matrix, (-1, len(sounding_field_names))),
+            BIN_WIDTHS_KEY: numpy.array(
+                [SOUNDING_INTERVAL_DICT[f] for f in sounding_field_names])
+        },
+        {
+            TABLE_NAME_KEY: SOUNDING_TABLE_WITH_HEIGHT_NAME,
+            TABLE_INDICES_KEY: [
+                (f, int(h)) for h in sounding_heights_m_agl
+                for f in sounding_field_names
+            ],
+            DATA_MATRIX_KEY: numpy.reshape(
+                sounding_matrix,
+                (-1, len(sounding_heights_m_agl) * len(sounding_field_names))
+            ),
+            BIN_WIDTHS_KEY: None
+        }
+    ]
+
+    return list_of_group_dicts
+
+
+def _estimate_params_one_file(example_file_name):
+    """Estimates normalization parameters from one example file.
+
+    :param example_file_name: Path to input file (will be read by
+        `input_examples.read_example_file`).
+    :return: list_of_param_dicts: 1-D list of dictionaries (one for each group
+        created by `_get_data_groups`), each with the following keys.
+    param_dict['table_name']: See doc for `_get_data_groups`.
+    param_dict['table_indices']: Same.
+    param_dict['z_score_params']: Dictionary created by
+        `deep_learning_utils.update_z_score_params`.
+    param_dict['histograms']: Dictionary created by
+        `deep_learning_utils.update_histograms` (None if `bin_widths` for the
+        group is None).
+    """
 
-    return frequency_dict
+    print 'Reading data from: "{0:s}"...'.format(example_file_name)
+    example_dict = input_examples.read_example_file(
+        netcdf_file_name=example_file_name, num_rows_to_keep=NUM_RADAR_ROWS,
+        num_columns_to_keep=NUM_RADAR_COLUMNS)
 
+    list_of_param_dicts = []
 
-def _get_standard_deviation(z_score_param_dict):
-    """Computes standard deviation.
+    for this_group_dict in _get_data_groups(example_dict):
+        this_param_dict = {
+            TABLE_NAME_KEY: this_group_dict[TABLE_NAME_KEY],
+            TABLE_INDICES_KEY: this_group_dict[TABLE_INDICES_KEY],
+            Z_SCORE_PARAMS_KEY: dl_utils.update_z_score_params(
+                z_score_param_dict=None,
+                new_data_matrix=this_group_dict[DATA_MATRIX_KEY]),
+            HISTOGRAMS_KEY: None
+        }
 
-    :param z_score_param_dict: See doc for `_update_z_score_params`.
-    :return: standard_deviation: Standard deviation.
-    """
+        if this_group_dict[BIN_WIDTHS_KEY] is not None:
+            this_param_dict[HISTOGRAMS_KEY] = dl_utils.update_histograms(
+                histogram_dict=None,
+                new_data_matrix=this_group_dict[DATA_MATRIX_KEY],
+                bin_widths=this_group_dict[BIN_WIDTHS_KEY])
 
-    multiplier = float(
-        z_score_param_dict[NUM_VALUES_KEY]
-    ) / (z_score_param_dict[NUM_VALUES_KEY] - 1)
+        list_of_param_dicts.append(this_param_dict)
 
-    return numpy.sqrt(multiplier * (
-        z_score_param_dict[MEAN_OF_SQUARES_KEY] -
-        z_score_param_dict[MEAN_VALUE_KEY] ** 2))
+    return list_of_param_dicts
 
 
-def _get_percentile(frequency_dict, percentile_level):
-    """Computes percentile.
+def _merge_params(first_list_of_param_dicts, second_list_of_param_dicts):
+    """Merges parameter estimates from two sets of example files.
 
-    :param frequency_dict: See doc for `_update_frequency_dict`.
-    :param percentile_level: Percentile level.  Will take the [q]th percentile,
-        where q = `percentile_level`.
-    :return: percentile: [q]th percentile.
+    :param first_list_of_param_dicts: List created by
+        `_estimate_params_one_file`.  If None, this method will just return
+        `second_list_of_param_dicts`.
+    :param second_list_of_param_dicts: List created by
+        `_estimate_params_one_file`.
+    :return: list_of_param_dicts: Merged list.
+    :raises: ValueError: if the two lists have different groups.
     """
 
-    unique_values, counts = zip(*frequency_dict.iteritems())
-    unique_values = numpy.array(unique_values)
-    counts = numpy.array(counts, dtype=int)
+    if first_list_of_param_dicts is None:
+        return second_list_of_param_dicts
 
-    sort_indices = numpy.argsort(unique_values)
-    unique_values = unique_values[sort_indices]
-    counts = counts[sort_indices]
+    first_indices = [d[TABLE_INDICES_KEY] for d in first_list_of_param_dicts]
+    second_indices = [d[TABLE_INDICES_KEY] for d in second_list_of_param_dicts]
 
-    cumulative_frequencies = (
-        numpy.cumsum(counts).astype(float) / numpy.sum(counts))
-    percentile_levels = 100 * (
-        (cumulative_frequencies * numpy.sum(counts) - 1) /
-        (numpy.sum(counts) - 1)
-    )
+    if first_indices != second_indices:
+        error_string = (
+            'Table indices in first set of parameters ({0:s}) do not match '
+            'those in second set ({1:s}).'
+        ).format(str(first_indices), str(second_indices))
 
-    if percentile_level > percentile_levels[-1]:
-        return unique_values[-1]
-    if percentile_level < percentile_levels[0]:
-        return unique_values[0]
+        raise ValueError(error_string)
 
-    interp_object = interp1d(
-        x=percentile_levels, y=unique_values, kind='linear', bounds_error=True,
-        assume_sorted=True)
-    return interp_object(percentile_level)
+    for this_first_dict, this_second_dict in zip(
+            first_list_of_param_dicts, second_list_of_param_dicts):
+        this_first_dict[Z_SCORE_PARAMS_KEY] = dl_utils.merge_z_score_params(
+            this_first_dict[Z_SCORE_PARAMS_KEY],
+            this_second_dict[Z_SCORE_PARAMS_KEY])
+        this_first_dict[HISTOGRAMS_KEY] = dl_utils.merge_histograms(
+            this_first_dict[HISTOGRAMS_KEY], this_second_dict[HISTOGRAMS_KEY])
+
+    return first_list_of_param_dicts
 
 
 def _convert_normalization_params(
-        z_score_dict_dict, frequency_dict_dict=None,
-        min_percentile_level=None, max_percentile_level=None):
-    """Converts normalization params from nested dicts to pandas DataFrame.
-
-    :param z_score_dict_dict: Dictionary of dictionaries, where each inner
-        dictionary follows the input format for `_update_z_score_params`.
-    :param frequency_dict_dict: Dictionary of dictionaries, where each inner
-        dictionary follows the input format for `_update_frequency_dict`.  Must
-        have the same outer keys as `z_score_dict_dict`.
-    :param min_percentile_level: [used iff `frequency_dict_dict is not None`]
+        list_of_param_dicts, table_name, min_percentile_level=None,
+        max_percentile_level=None):
+    """Converts normalization params from list of dicts to pandas DataFrame.
+
+    :param list_of_param_dicts: List created by `_estimate_params_one_file` or
+        `_merge_params`.
+    :param table_name: Name of table to create.  Only dictionaries with this
+        table name will be used.
+    :param min_percentile_level: [used only for groups with histograms]
         Minimum percentile level (used to create "min_value" column in output
         table).
-    :param max_percentile_level: [used iff `frequency_dict_dict is not None`]
+    :param max_percentile_level: [used only for groups with histograms]
         Max percentile level (used to create "max_value" column in output
         table).
-    :return: normalization_table: pandas DataFrame, where the indices are outer
-        keys in `z_score_dict_dict`.  For example, if `z_score_dict_dict`
-        contains 80 inner dictionaries, this table will have 80 rows.  Columns
-        are as follows.
+    :return: normalization_table: pandas DataFrame, where the indices are table
+        indices from the relevant groups.  Columns are as follows.
     normalization_table.mean_value: Mean value.
     normalization_table.standard_deviation: Standard deviation.
 
-    If `frequency_dict_dict is not None`, will also contain the following.
+    If the relevant groups have histograms, will also contain the following.
 
     normalization_table.min_value: Minimum value.
     normalization_table.max_value: Max value.
     """
 
     normalization_dict = {}
-
-    for this_key in z_score_dict_dict:
-        this_inner_dict = z_score_dict_dict[this_key]
-        this_standard_deviation = _get_standard_deviation(this_inner_dict)
-        normalization_dict[this_key] = [
-            this_inner_dict[MEAN_VALUE_KEY], this_standard_deviation]
-
-        if frequency_dict_dict is not None:
-            this_inner_dict = frequency_dict_dict[this_key]
-            this_min_value = _get_percentile(
-                frequency_dict=this_inner_dict,
-                percentile_level=min_percentile_level)
-            this_max_value = _get_percentile(
-                frequency_dict=this_inner_dict,
-                percentile_level=max_percentile_level)
-
-            normalization_dict[this_key].append(this_min_value)
-            normalization_dict[this_key].append(this_max_value)
-
-        normalization_dict[this_key] = numpy.array(normalization_dict[this_key])
+    found_histograms = False
+
+    for this_param_dict in list_of_param_dicts:
+        if this_param_dict[TABLE_NAME_KEY] != table_name:
+            continue
+
+        this_matrix = numpy.transpose(numpy.vstack(dl_utils.get_z_score_params(
+            this_param_dict[Z_SCORE_PARAMS_KEY])))
+
+        if this_param_dict[HISTOGRAMS_KEY] is not None:
+            found_histograms = True
+            this_matrix = numpy.hstack((
+                this_matrix,
+                numpy.transpose(numpy.vstack((
+                    dl_utils.get_percentiles(
+                        histogram_dict=this_param_dict[HISTOGRAMS_KEY],
+                        percentile_level=min_percentile_level),
+                    dl_utils.get_percentiles(
+                        histogram_dict=this_param_dict[HISTOGRAMS_KEY],
+                        percentile_level=max_percentile_level)
+                )))
+            ))
+
+        for k in range(len(this_param_dict[TABLE_INDICES_KEY])):
+            normalization_dict[
+                this_param_dict[TABLE_INDICES_KEY][k]
+            ] = this_matrix[k, :]
 
     normalization_table = pandas.DataFrame.from_dict(
         normalization_dict, orient='index')
@@ -266,7 +425,7 @@ def _convert_normalization_params(
         0: dl_utils.MEAN_VALUE_COLUMN,
         1: dl_utils.STANDARD_DEVIATION_COLUMN
     }
-    if frequency_dict_dict is not None:
+    if found_histograms:
         column_dict_old_to_new.update({
             2: dl_utils.MIN_VALUE_COLUMN,
             3: dl_utils.MAX_VALUE_COLUMN
@@ -277,7 +436,7 @@ def _convert_normalization_params(
 
 
 def _run(top_example_dir_name, min_percentile_level, max_percentile_level,
-         output_file_name):
+         num_processes, output_file_name):
     """Finds normalization parameters for GridRad data.
 
     This is effectively the main method.
@@ -285,283 +444,41 @@ def _run(top_example_dir_name, min_percentile_level, max_percentile_level,
     :param top_example_dir_name: See documentation at top of file.
     :param min_percentile_level: Same.
     :param max_percentile_level: Same.
+    :param num_processes: Same.
     :param output_file_name: Same.
     """
 
+    error_checking.assert_is_geq(num_processes, 1)
+
     example_file_names = input_examples.find_many_example_files(
         top_directory_name=top_example_dir_name, shuffled=True,
         first_batch_number=0, last_batch_number=LARGE_INTEGER,
         raise_error_if_any_missing=False)
 
-    this_example_dict = input_examples.read_example_file(example_file_names[0])
-    sounding_field_names = this_example_dict[input_examples.SOUNDING_FIELDS_KEY]
-    sounding_heights_m_agl = this_example_dict[
-        input_examples.SOUNDING_HEIGHTS_KEY]
-
-    if input_examples.REFL_IMAGE_MATRIX_KEY in this_example_dict:
-        num_radar_dimensions = -1
-    else:
-        num_radar_dimensions = (
-            len(this_example_dict[input_examples.RADAR_IMAGE_MATRIX_KEY].shape)
-            - 2
-        )
-
-    # TODO(thunderhoser): Put this in separate method.
-    if num_radar_dimensions == 3:
-        radar_field_names = this_example_dict[input_examples.RADAR_FIELDS_KEY]
-        radar_heights_m_agl = this_example_dict[
-            input_examples.RADAR_HEIGHTS_KEY]
-
-        radar_field_name_by_pair = []
-        radar_height_by_pair_m_agl = numpy.array([], dtype=int)
-
-        for this_field_name in radar_field_names:
-            radar_field_name_by_pair += (
-                [this_field_name] * len(radar_heights_m_agl)
-            )
-            radar_height_by_pair_m_agl = numpy.concatenate((
-                radar_height_by_pair_m_agl, radar_heights_m_agl))
-
-    elif num_radar_dimensions == 2:
-        radar_field_name_by_pair = this_example_dict[
-            input_examples.RADAR_FIELDS_KEY]
-        radar_height_by_pair_m_agl = this_example_dict[
-            input_examples.RADAR_HEIGHTS_KEY]
-
-        radar_field_names = list(set(radar_field_name_by_pair))
-        radar_field_names.sort()
+    list_of_param_dicts = None
 
+    if num_processes == 1:
+        for this_example_file_name in example_file_names:
+            list_of_param_dicts = _merge_params(
+                list_of_param_dicts,
+                _estimate_params_one_file(this_example_file_name))
     else:
-        az_shear_field_names = this_example_dict[
-            input_examples.RADAR_FIELDS_KEY]
-        radar_field_names = [radar_utils.REFL_NAME] + az_shear_field_names
-
-        refl_heights_m_agl = this_example_dict[input_examples.RADAR_HEIGHTS_KEY]
-        radar_field_name_by_pair = (
-            [radar_utils.REFL_NAME] * len(refl_heights_m_agl) +
-            az_shear_field_names
-        )
+        pool_object = multiprocessing.Pool(processes=num_processes)
 
-        az_shear_heights_m_agl = numpy.full(
-            len(az_shear_field_names), radar_utils.SHEAR_NAMES)
-        radar_height_by_pair_m_agl = numpy.concatenate((
-            refl_heights_m_agl, az_shear_heights_m_agl
-        )).astype(int)
+        for this_list_of_param_dicts in pool_object.imap_unordered(
+                _estimate_params_one_file, example_file_names):
+            list_of_param_dicts = _merge_params(
+                list_of_param_dicts, this_list_of_param_dicts)
 
-    # Initialize parameters.
-    orig_parameter_dict = {
-        NUM_VALUES_KEY: 0, MEAN_VALUE_KEY: 0., MEAN_OF_SQUARES_KEY: 0.
-    }
+        pool_object.close()
+        pool_object.join()
 
-    radar_z_score_dict_no_height = {}
-    radar_z_score_dict_with_height = {}
-    radar_freq_dict_no_height = {}
-    num_radar_fields = len(radar_field_names)
-    num_radar_field_height_pairs = len(radar_field_name_by_pair)
-
-    for j in range(num_radar_fields):
-        radar_z_score_dict_no_height[radar_field_names[j]] = copy.deepcopy(
-            orig_parameter_dict)
-        radar_freq_dict_no_height[radar_field_names[j]] = {}
-
-    for k in range(num_radar_field_height_pairs):
-        radar_z_score_dict_with_height[
-            radar_field_name_by_pair[k], radar_height_by_pair_m_agl[k]
-        ] = copy.deepcopy(orig_parameter_dict)
-
-    sounding_z_score_dict_no_height = {}
-    sounding_z_score_dict_with_height = {}
-    sounding_freq_dict_no_height = {}
-    num_sounding_fields = len(sounding_field_names)
-    num_sounding_heights = len(sounding_heights_m_agl)
-
-    for j in range(num_sounding_fields):
-        sounding_z_score_dict_no_height[sounding_field_names[j]] = (
-            copy.deepcopy(orig_parameter_dict))
-        sounding_freq_dict_no_height[sounding_field_names[j]] = {}
-
-        for k in range(num_sounding_heights):
-            sounding_z_score_dict_with_height[
-                sounding_field_names[j], sounding_heights_m_agl[k]
-            ] = copy.deepcopy(orig_parameter_dict)
-
-    for this_example_file_name in example_file_names:
-        print 'Reading data from: "{0:s}"...'.format(this_example_file_name)
-        this_example_dict = input_examples.read_example_file(
-            netcdf_file_name=this_example_file_name,
-            num_rows_to_keep=NUM_RADAR_ROWS,
-            num_columns_to_keep=NUM_RADAR_COLUMNS)
-
-        for j in range(num_radar_fields):
-            print 'Updating normalization params for "{0:s}"...'.format(
-                radar_field_names[j])
-
-            if num_radar_dimensions == 3:
-                this_field_index = this_example_dict[
-                    input_examples.RADAR_FIELDS_KEY
-                ].index(radar_field_names[j])
-
-                this_radar_matrix = this_example_dict[
-                    input_examples.RADAR_IMAGE_MATRIX_KEY
-                ][..., this_field_index]
-
-            elif num_radar_dimensions == 2:
-                all_field_names = numpy.array(
-                    this_example_dict[input_examples.RADAR_FIELDS_KEY])
-
-                these_field_indices = numpy.where(
-                    all_field_names == radar_field_names[j]
-                )[0]
-
-                this_radar_matrix = this_example_dict[
-                    input_examples.RADAR_IMAGE_MATRIX_KEY
-                ][..., these_field_indices]
-
-            else:
-                if radar_field_names[j] == radar_utils.REFL_NAME:
-                    this_radar_matrix = this_example_dict[
-                        input_examples.REFL_IMAGE_MATRIX_KEY][..., 0]
-                else:
-                    this_field_index = this_example_dict[
-                        input_examples.RADAR_FIELDS_KEY
-                    ].index(radar_field_names[j])
-
-                    this_radar_matrix = this_example_dict[
-                        input_examples.AZ_SHEAR_IMAGE_MATRIX_KEY
-                    ][..., this_field_index]
-
-            radar_z_score_dict_no_height[radar_field_names[j]] = (
-                _update_z_score_params(
-                    z_score_param_dict=radar_z_score_dict_no_height[
-                        radar_field_names[j]],
-                    new_data_matrix=this_radar_matrix)
-            )
-
-            radar_freq_dict_no_height[radar_field_names[j]] = (
-                _update_frequency_dict(
-                    frequency_dict=radar_freq_dict_no_height[
-                        radar_field_names[j]],
-                    new_data_matrix=this_radar_matrix,
-                    rounding_base=RADAR_INTERVAL_DICT[radar_field_names[j]])
-            )
-
-        for k in range(num_radar_field_height_pairs):
-            print (
-                'Updating normalization params for "{0:s}" at {1:d} metres '
-                'AGL...'
-            ).format(radar_field_name_by_pair[k], radar_height_by_pair_m_agl[k])
-
-            if num_radar_dimensions == 3:
-                this_field_index = this_example_dict[
-                    input_examples.RADAR_FIELDS_KEY
-                ].index(radar_field_name_by_pair[k])
-
-                this_height_index = numpy.where(
-                    this_example_dict[input_examples.RADAR_HEIGHTS_KEY] ==
-                    radar_height_by_pair_m_agl[k]
-                )[0][0]
-
-                this_radar_matrix = this_example_dict[
-                    input_examples.RADAR_IMAGE_MATRIX_KEY
-                ][..., this_height_index, this_field_index]
-
-            elif num_radar_dimensions == 2:
-                all_field_names = numpy.array(
-                    this_example_dict[input_examples.RADAR_FIELDS_KEY])
-                all_heights_m_agl = this_example_dict[
-                    input_examples.RADAR_HEIGHTS_KEY]
-
-                this_index = numpy.where(numpy.logical_and(
-                    all_field_names == radar_field_name_by_pair[k],
-                    all_heights_m_agl == radar_height_by_pair_m_agl[k]
-                ))[0][0]
-
-                this_radar_matrix = this_example_dict[
-                    input_examples.RADAR_IMAGE_MATRIX_KEY][..., this_index]
-
-            else:
-                if radar_field_name_by_pair[k] == radar_utils.REFL_NAME:
-                    this_height_index = numpy.where(
-                        this_example_dict[input_examples.RADAR_HEIGHTS_KEY] ==
-                        radar_height_by_pair_m_agl[k]
-                    )[0][0]
-
-                    this_radar_matrix = this_example_dict[
-                        input_examples.REFL_IMAGE_MATRIX_KEY
-                    ][..., this_height_index, 0]
-                else:
-                    this_field_index = this_example_dict[
-                        input_examples.RADAR_FIELDS_KEY
-                    ].index(radar_field_name_by_pair[k])
-
-                    this_radar_matrix = this_example_dict[
-                        input_examples.AZ_SHEAR_IMAGE_MATRIX_KEY
-                    ][..., this_field_index]
-
-            radar_z_score_dict_with_height[
-                radar_field_name_by_pair[k], radar_height_by_pair_m_agl[k]
-            ] = _update_z_score_params(
-                z_score_param_dict=radar_z_score_dict_with_height[
-                    radar_field_name_by_pair[k], radar_height_by_pair_m_agl[k]],
-                new_data_matrix=this_radar_matrix)
-
-        for j in range(num_sounding_fields):
-            print 'Updating normalization params for "{0:s}"...'.format(
-                sounding_field_names[j])
-
-            this_field_index = this_example_dict[
-                input_examples.SOUNDING_FIELDS_KEY
-            ].index(sounding_field_names[j])
-
-            this_sounding_matrix = this_example_dict[
-                input_examples.SOUNDING_MATRIX_KEY][..., this_field_index]
-
-            sounding_z_score_dict_no_height[sounding_field_names[j]] = (
-                _update_z_score_params(
-                    z_score_param_dict=sounding_z_score_dict_no_height[
-                        sounding_field_names[j]],
-                    new_data_matrix=this_sounding_matrix)
-            )
-
-            sounding_freq_dict_no_height[sounding_field_names[j]] = (
-                _update_frequency_dict(
-                    frequency_dict=sounding_freq_dict_no_height[
-                        sounding_field_names[j]],
-                    new_data_matrix=this_sounding_matrix,
-                    rounding_base=SOUNDING_INTERVAL_DICT[
-                        sounding_field_names[j]]
-                )
-            )
-
-            for k in range(num_sounding_heights):
-                this_height_index = numpy.where(
-                    this_example_dict[input_examples.SOUNDING_HEIGHTS_KEY] ==
-                    sounding_heights_m_agl[k]
-                )[0][0]
-
-                this_sounding_matrix = this_example_dict[
-                    input_examples.SOUNDING_MATRIX_KEY
-                ][..., this_height_index, this_field_index]
-
-                print (
-                    'Updating normalization params for "{0:s}" at {1:d} m '
-                    'AGL...'
-                ).format(sounding_field_names[j], sounding_heights_m_agl[k])
-
-                sounding_z_score_dict_with_height[
-                    sounding_field_names[j], sounding_heights_m_agl[k]
-                ] = _update_z_score_params(
-                    z_score_param_dict=sounding_z_score_dict_with_height[
-                        sounding_field_names[j], sounding_heights_m_agl[k]
-                    ],
-                    new_data_matrix=this_sounding_matrix)
-
-        print SEPARATOR_STRING
+    print SEPARATOR_STRING
 
     # Convert dictionaries to pandas DataFrames.
     radar_table_no_height = _convert_normalization_params(
-        z_score_dict_dict=radar_z_score_dict_no_height,
-        frequency_dict_dict=radar_freq_dict_no_height,
+        list_of_param_dicts=list_of_param_dicts,
+        table_name=RADAR_TABLE_NO_HEIGHT_NAME,
         min_percentile_level=min_percentile_level,
         max_percentile_level=max_percentile_level)
 
@@ -569,15 +486,16 @@ def _run(top_example_dir_name, min_percentile_level, max_percentile_level,
         str(radar_table_no_height))
 
     radar_table_with_height = _convert_normalization_params(
-        z_score_dict_dict=radar_z_score_dict_with_height)
+        list_of_param_dicts=list_of_param_dicts,
+        table_name=RADAR_TABLE_WITH_HEIGHT_NAME)
 
     print (
         'Normalization params for each radar field/height pair:\n{0:s}\n\n'
     ).format(str(radar_table_with_height))
 
     sounding_table_no_height = _convert_normalization_params(
-        z_score_dict_dict=sounding_z_score_dict_no_height,
-        frequency_dict_dict=sounding_freq_dict_no_height,
+        list_of_param_dicts=list_of_param_dicts,
+        table_name=SOUNDING_TABLE_NO_HEIGHT_NAME,
         min_percentile_level=min_percentile_level,
         max_percentile_level=max_percentile_level)
 
@@ -585,7 +503,8 @@ def _run(top_example_dir_name, min_percentile_level, max_percentile_level,
         str(sounding_table_no_height))
 
     sounding_table_with_height = _convert_normalization_params(
-        z_score_dict_dict=sounding_z_score_dict_with_height)
+        list_of_param_dicts=list_of_param_dicts,
+        table_name=SOUNDING_TABLE_WITH_HEIGHT_NAME)
 
     print (
         'Normalization params for each sounding field/height pair:\n{0:s}\n\n'
@@ -608,5 +527,6 @@ if __name__ == '__main__':
         top_example_dir_name=getattr(INPUT_ARG_OBJECT, EXAMPLE_DIR_ARG_NAME),
         min_percentile_level=getattr(INPUT_ARG_OBJECT, MIN_PERCENTILE_ARG_NAME),
         max_percentile_level=getattr(INPUT_ARG_OBJECT, MAX_PERCENTILE_ARG_NAME),
+        num_processes=getattr(INPUT_ARG_OBJECT, NUM_PROCESSES_ARG_NAME),
         output_file_name=getattr(INPUT_ARG_OBJECT, OUTPUT_FILE_ARG_NAME)
     )
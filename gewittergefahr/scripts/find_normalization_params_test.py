@@ -4,183 +4,152 @@ import copy
 import unittest
 import numpy
 import pandas
+from gewittergefahr.gg_utils import radar_utils
+from gewittergefahr.gg_utils import soundings
+from gewittergefahr.deep_learning import input_examples
 from gewittergefahr.deep_learning import deep_learning_utils as dl_utils
 from gewittergefahr.scripts import find_normalization_params as find_norm_params
 
 TOLERANCE = 1e-6
 
-# The following constants are used to test _update_z_score_params.
-ORIGINAL_Z_SCORE_DICT = {
-    find_norm_params.NUM_VALUES_KEY: 20,
-    find_norm_params.MEAN_VALUE_KEY: 5.,
-    find_norm_params.MEAN_OF_SQUARES_KEY: 10.
+# The following constants are used to test _get_data_groups.
+RADAR_FIELD_NAMES = [radar_utils.REFL_NAME, radar_utils.SPECTRUM_WIDTH_NAME]
+RADAR_HEIGHTS_M_AGL = numpy.array([1000, 2000, 3000], dtype=int)
+SOUNDING_FIELD_NAMES = [soundings.U_WIND_NAME, soundings.V_WIND_NAME]
+SOUNDING_HEIGHTS_M_AGL = numpy.array([0, 500], dtype=int)
+
+RADAR_MATRIX_3D = numpy.reshape(
+    numpy.linspace(0, 119, num=120), (5, 2, 2, 3, 2))
+SOUNDING_MATRIX = numpy.reshape(
+    numpy.linspace(0, 19, num=20), (5, 2, 2))
+
+EXAMPLE_DICT_3D = {
+    input_examples.RADAR_FIELDS_KEY: RADAR_FIELD_NAMES,
+    input_examples.RADAR_HEIGHTS_KEY: RADAR_HEIGHTS_M_AGL,
+    input_examples.RADAR_IMAGE_MATRIX_KEY: RADAR_MATRIX_3D,
+    input_examples.SOUNDING_FIELDS_KEY: SOUNDING_FIELD_NAMES,
+    input_examples.SOUNDING_HEIGHTS_KEY: SOUNDING_HEIGHTS_M_AGL,
+    input_examples.SOUNDING_MATRIX_KEY: SOUNDING_MATRIX
 }
 
-NEW_MATRIX_FOR_Z_SCORES = numpy.array([[0, 1, 2, 3, 4],
-                                       [1, 2, 4, 2, 1]], dtype=float)
-
-NEW_Z_SCORE_DICT = {
-    find_norm_params.NUM_VALUES_KEY: 30,
-    find_norm_params.MEAN_VALUE_KEY: 4.,
-    find_norm_params.MEAN_OF_SQUARES_KEY: 8.533333
-}
-
-# The following constants are used to test _update_frequency_dict.
-ROUNDING_BASE = 0.001
-MAIN_FREQUENCY_DICT = {
-    0.001: 5, 0.002: 3, 0.004: 7, 0.006: 2
-}
+TABLE_NAMES_3D = [
+    find_norm_params.RADAR_TABLE_NO_HEIGHT_NAME,
+    find_norm_params.RADAR_TABLE_WITH_HEIGHT_NAME,
+    find_norm_params.SOUNDING_TABLE_NO_HEIGHT_NAME,
+    find_norm_params.SOUNDING_TABLE_WITH_HEIGHT_NAME
+]
+TABLE_INDICES_3D = [
+    RADAR_FIELD_NAMES,
+    [(f, h) for h in RADAR_HEIGHTS_M_AGL for f in RADAR_FIELD_NAMES],
+    SOUNDING_FIELD_NAMES,
+    [(f, h) for h in SOUNDING_HEIGHTS_M_AGL for f in SOUNDING_FIELD_NAMES]
+]
+DATA_MATRICES_3D = [
+    numpy.reshape(RADAR_MATRIX_3D, (-1, 2)),
+    numpy.reshape(RADAR_MATRIX_3D, (-1, 6)),
+    numpy.reshape(SOUNDING_MATRIX, (-1, 2)),
+    numpy.reshape(SOUNDING_MATRIX, (-1, 4))
+]
+
+# The following constants are used to test _merge_params and
+# _convert_normalization_params.
+FIRST_KEY_NO_HEIGHT = 'reflectivity_dbz'
+SECOND_KEY_NO_HEIGHT = 'reflectivity_column_max_dbz'
+THIRD_KEY_NO_HEIGHT = 'low_level_shear_s01'
 
-NEW_MATRIX_FOR_FREQUENCIES = numpy.array([[0.003, 0.007, 0.002, 0.004],
-                                          [0.006, 0.005, 0.002, -0.001],
-                                          [0.006, 0.001, 0.008, 0.007]])
+FIRST_KEY_WITH_HEIGHT = ('reflectivity_dbz', 1000)
+SECOND_KEY_WITH_HEIGHT = ('reflectivity_column_max_dbz', 250)
+THIRD_KEY_WITH_HEIGHT = ('low_level_shear_s01', 250)
 
-NEW_FREQUENCY_DICT = {
-    -0.001: 1, 0.001: 6, 0.002: 5, 0.003: 1, 0.004: 8, 0.005: 1, 0.006: 4,
-    0.007: 2, 0.008: 1
-}
+FIRST_DATA_MATRIX = numpy.array([[10, 20, 1e-3],
+                                 [15, 25, 8e-3],
+                                 [20, 30, 5e-3],
+                                 [25, 45, 2e-3]])
+SECOND_DATA_MATRIX = numpy.array([[0, 35, 11e-3],
+                                  [30, 40, -1e-3]])
+BIN_WIDTHS = numpy.array([5, 5, 1e-3])
 
-# The following constants are used to test _get_standard_deviation.
-STDEV_INPUT_MATRIX = numpy.array([[1, 2, 3, 4, 5],
-                                  [6, 7, 8, 9, 10]], dtype=float)
-STANDARD_DEVIATION = numpy.std(STDEV_INPUT_MATRIX, ddof=1)
+MIN_PERCENTILE_LEVEL = 1.
+MAX_PERCENTILE_LEVEL = 99.
 
-# The following constants are used to test _get_percentile.
-SMALL_PERCENTILE_LEVEL = 3.125
-MEDIUM_PERCENTILE_LEVEL = 43.75
-LARGE_PERCENTILE_LEVEL = 93.75
 
-SMALL_PERCENTILE = 0.001
-MEDIUM_PERCENTILE = 0.002
-LARGE_PERCENTILE = 0.005
+def _create_param_dicts(data_matrix):
+    """Creates list of parameter dictionaries for one data matrix.
 
-# The following constants are used to test _convert_normalization_params with
-# single-indexing and no percentiles.
-FIRST_KEY_NO_HEIGHT = 'reflectivity_dbz'
-SECOND_KEY_NO_HEIGHT = 'reflectivity_column_max_dbz'
-THIRD_KEY_NO_HEIGHT = 'low_level_shear_s01'
+    :param data_matrix: numpy array, where the last axis contains 3 channels.
+    :return: list_of_param_dicts: See doc for
+        `find_norm_params._estimate_params_one_file`.
+    """
 
-FIRST_Z_SCORE_DICT = {
-    find_norm_params.NUM_VALUES_KEY: 100,
-    find_norm_params.MEAN_VALUE_KEY: 15.,
-    find_norm_params.MEAN_OF_SQUARES_KEY: 300.
-}
-SECOND_Z_SCORE_DICT = {
-    find_norm_params.NUM_VALUES_KEY: 100,
-    find_norm_params.MEAN_VALUE_KEY: 25.,
-    find_norm_params.MEAN_OF_SQUARES_KEY: 1000.
-}
-THIRD_Z_SCORE_DICT = {
-    find_norm_params.NUM_VALUES_KEY: 400,
-    find_norm_params.MEAN_VALUE_KEY: 8e-3,
-    find_norm_params.MEAN_OF_SQUARES_KEY: 1e-4
-}
-Z_SCORE_DICT_DICT_NO_HEIGHT = {
-    FIRST_KEY_NO_HEIGHT: FIRST_Z_SCORE_DICT,
-    SECOND_KEY_NO_HEIGHT: SECOND_Z_SCORE_DICT,
-    THIRD_KEY_NO_HEIGHT: THIRD_Z_SCORE_DICT
-}
+    return [
+        {
+            find_norm_params.TABLE_NAME_KEY:
+                find_norm_params.RADAR_TABLE_NO_HEIGHT_NAME,
+            find_norm_params.TABLE_INDICES_KEY: [
+                FIRST_KEY_NO_HEIGHT, SECOND_KEY_NO_HEIGHT, THIRD_KEY_NO_HEIGHT
+            ],
+            find_norm_params.Z_SCORE_PARAMS_KEY: dl_utils.update_z_score_params(
+                z_score_param_dict=None, new_data_matrix=data_matrix),
+            find_norm_params.HISTOGRAMS_KEY: dl_utils.update_histograms(
+                histogram_dict=None, new_data_matrix=data_matrix,
+                bin_widths=BIN_WIDTHS)
+        },
+        {
+            find_norm_params.TABLE_NAME_KEY:
+                find_norm_params.RADAR_TABLE_WITH_HEIGHT_NAME,
+            find_norm_params.TABLE_INDICES_KEY: [
+                FIRST_KEY_WITH_HEIGHT, SECOND_KEY_WITH_HEIGHT,
+                THIRD_KEY_WITH_HEIGHT
+            ],
+            find_norm_params.Z_SCORE_PARAMS_KEY: dl_utils.update_z_score_params(
+                z_score_param_dict=None, new_data_matrix=data_matrix),
+            find_norm_params.HISTOGRAMS_KEY: None
+        }
+    ]
 
-FIRST_Z_SCORE_PARAMS = numpy.array([
-    FIRST_Z_SCORE_DICT[find_norm_params.MEAN_VALUE_KEY],
-    find_norm_params._get_standard_deviation(FIRST_Z_SCORE_DICT)
-])
-SECOND_Z_SCORE_PARAMS = numpy.array([
-    SECOND_Z_SCORE_DICT[find_norm_params.MEAN_VALUE_KEY],
-    find_norm_params._get_standard_deviation(SECOND_Z_SCORE_DICT)
-])
-THIRD_Z_SCORE_PARAMS = numpy.array([
-    THIRD_Z_SCORE_DICT[find_norm_params.MEAN_VALUE_KEY],
-    find_norm_params._get_standard_deviation(THIRD_Z_SCORE_DICT)
-])
-
-NORMALIZATION_DICT_NO_PRCTILE = {
-    FIRST_KEY_NO_HEIGHT: FIRST_Z_SCORE_PARAMS,
-    SECOND_KEY_NO_HEIGHT: SECOND_Z_SCORE_PARAMS,
-    THIRD_KEY_NO_HEIGHT: THIRD_Z_SCORE_PARAMS
-}
-NORMALIZATION_TABLE_NO_PRCTILE = pandas.DataFrame.from_dict(
-    NORMALIZATION_DICT_NO_PRCTILE, orient='index')
 
-COLUMN_DICT_OLD_TO_NEW = {
-    0: find_norm_params.MEAN_VALUE_KEY,
-    1: dl_utils.STANDARD_DEVIATION_COLUMN
-}
-NORMALIZATION_TABLE_NO_PRCTILE.rename(
-    columns=COLUMN_DICT_OLD_TO_NEW, inplace=True)
+FIRST_PARAM_DICTS = _create_param_dicts(FIRST_DATA_MATRIX)
+SECOND_PARAM_DICTS = _create_param_dicts(SECOND_DATA_MATRIX)
 
-# The following constants are used to test _convert_normalization_params with
-# single-indexing and percentiles.
-FIRST_FREQUENCY_DICT = {
-    0: 5, 5: 10, 10: 20, 15: 30, 20: 20, 25: 10, 30: 5
-}
-SECOND_FREQUENCY_DICT = {
-    0: 0, 5: 5, 10: 5, 15: 10, 20: 15, 25: 30, 30: 15, 35: 10, 40: 5, 45: 5
-}
-THIRD_FREQUENCY_DICT = {
-    -4e-3: 10, -1e-3: 15, 2e-3: 25, 5e-3: 50, 8e-3: 200, 11e-3: 50, 14e-3: 25,
-    17e-3: 15, 20e-3: 10
-}
-FREQUENCY_DICT_DICT = {
-    FIRST_KEY_NO_HEIGHT: FIRST_FREQUENCY_DICT,
-    SECOND_KEY_NO_HEIGHT: SECOND_FREQUENCY_DICT,
-    THIRD_KEY_NO_HEIGHT: THIRD_FREQUENCY_DICT
-}
+ALL_DATA_MATRIX = numpy.concatenate(
+    (FIRST_DATA_MATRIX, SECOND_DATA_MATRIX), axis=0)
+MERGED_PARAM_DICTS = _create_param_dicts(ALL_DATA_MATRIX)
 
-MIN_PERCENTILE_LEVEL = 1.
-MAX_PERCENTILE_LEVEL = 99.
+MEAN_VALUES = numpy.mean(ALL_DATA_MATRIX, axis=0)
+STANDARD_DEVIATIONS = numpy.std(ALL_DATA_MATRIX, axis=0, ddof=1)
 
-FIRST_PERCENTILES = numpy.array([
-    find_norm_params._get_percentile(
-        FIRST_FREQUENCY_DICT, MIN_PERCENTILE_LEVEL),
-    find_norm_params._get_percentile(FIRST_FREQUENCY_DICT, MAX_PERCENTILE_LEVEL)
-])
-SECOND_PERCENTILES = numpy.array([
-    find_norm_params._get_percentile(
-        SECOND_FREQUENCY_DICT, MIN_PERCENTILE_LEVEL),
-    find_norm_params._get_percentile(
-        SECOND_FREQUENCY_DICT, MAX_PERCENTILE_LEVEL)
-])
-THIRD_PERCENTILES = numpy.array([
-    find_norm_params._get_percentile(
-        THIRD_FREQUENCY_DICT, MIN_PERCENTILE_LEVEL),
-    find_norm_params._get_percentile(THIRD_FREQUENCY_DICT, MAX_PERCENTILE_LEVEL)
-])
-
-NORMALIZATION_DICT_WITH_PRCTILE = {
-    FIRST_KEY_NO_HEIGHT: numpy.concatenate((
-        FIRST_Z_SCORE_PARAMS, FIRST_PERCENTILES)),
-    SECOND_KEY_NO_HEIGHT: numpy.concatenate((
-        SECOND_Z_SCORE_PARAMS, SECOND_PERCENTILES)),
-    THIRD_KEY_NO_HEIGHT: numpy.concatenate((
-        THIRD_Z_SCORE_PARAMS, THIRD_PERCENTILES))
-}
-NORMALIZATION_TABLE_WITH_PRCTILE = pandas.DataFrame.from_dict(
-    NORMALIZATION_DICT_WITH_PRCTILE, orient='index')
+# For each channel, all values are unique multiples of the bin width, so
+# percentiles estimated from histograms should equal exact percentiles.
+MIN_VALUES = numpy.percentile(ALL_DATA_MATRIX, MIN_PERCENTILE_LEVEL, axis=0)
+MAX_VALUES = numpy.percentile(ALL_DATA_MATRIX, MAX_PERCENTILE_LEVEL, axis=0)
 
-COLUMN_DICT_OLD_TO_NEW.update({
+COLUMN_DICT_OLD_TO_NEW = {
+    0: dl_utils.MEAN_VALUE_COLUMN,
+    1: dl_utils.STANDARD_DEVIATION_COLUMN,
     2: dl_utils.MIN_VALUE_COLUMN,
     3: dl_utils.MAX_VALUE_COLUMN
-})
-NORMALIZATION_TABLE_WITH_PRCTILE.rename(
-    columns=COLUMN_DICT_OLD_TO_NEW, inplace=True)
-
-# The following constants are used to test _convert_normalization_params with
-# double-indexing.
-FIRST_KEY_WITH_HEIGHT = ('reflectivity_dbz', 1000)
-SECOND_KEY_WITH_HEIGHT = ('reflectivity_column_max_dbz', 250)
-THIRD_KEY_WITH_HEIGHT = ('low_level_shear_s01', 250)
+}
 
-Z_SCORE_DICT_DICT_WITH_HEIGHT = {
-    FIRST_KEY_WITH_HEIGHT: FIRST_Z_SCORE_DICT,
-    SECOND_KEY_WITH_HEIGHT: SECOND_Z_SCORE_DICT,
-    THIRD_KEY_WITH_HEIGHT: THIRD_Z_SCORE_DICT
+NORMALIZATION_DICT_NO_HEIGHT = {
+    FIRST_KEY_NO_HEIGHT: numpy.array(
+        [MEAN_VALUES[0], STANDARD_DEVIATIONS[0], MIN_VALUES[0], MAX_VALUES[0]]),
+    SECOND_KEY_NO_HEIGHT: numpy.array(
+        [MEAN_VALUES[1], STANDARD_DEVIATIONS[1], MIN_VALUES[1], MAX_VALUES[1]]),
+    THIRD_KEY_NO_HEIGHT: numpy.array(
+        [MEAN_VALUES[2], STANDARD_DEVIATIONS[2], MIN_VALUES[2], MAX_VALUES[2]])
 }
+NORMALIZATION_TABLE_NO_HEIGHT = pandas.DataFrame.from_dict(
+    NORMALIZATION_DICT_NO_HEIGHT, orient='index')
+NORMALIZATION_TABLE_NO_HEIGHT.rename(
+    columns=COLUMN_DICT_OLD_TO_NEW, inplace=True)
 
 NORMALIZATION_DICT_WITH_HEIGHT = {
-    FIRST_KEY_WITH_HEIGHT: FIRST_Z_SCORE_PARAMS,
-    SECOND_KEY_WITH_HEIGHT: SECOND_Z_SCORE_PARAMS,
-    THIRD_KEY_WITH_HEIGHT: THIRD_Z_SCORE_PARAMS
+    FIRST_KEY_WITH_HEIGHT: numpy.array(
+        [MEAN_VALUES[0], STANDARD_DEVIATIONS[0]]),
+    SECOND_KEY_WITH_HEIGHT: numpy.array(
+        [MEAN_VALUES[1], STANDARD_DEVIATIONS[1]]),
+    THIRD_KEY_WITH_HEIGHT: numpy.array(
+        [MEAN_VALUES[2], STANDARD_DEVIATIONS[2]])
 }
 NORMALIZATION_TABLE_WITH_HEIGHT = pandas.DataFrame.from_dict(
     NORMALIZATION_DICT_WITH_HEIGHT, orient='index')
@@ -188,63 +157,57 @@ NORMALIZATION_TABLE_WITH_HEIGHT.rename(
     columns=COLUMN_DICT_OLD_TO_NEW, inplace=True)
 
 
-def _compare_z_score_dicts(first_z_score_dict, second_z_score_dict):
-    """Compares two dictionaries with z-score parameters.
+def _compare_lists_of_param_dicts(first_list_of_dicts, second_list_of_dicts):
+    """Compares two lists of parameter dictionaries.
 
-    :param first_z_score_dict: First dictionary.
-    :param second_z_score_dict: Second dictionary.
-    :return: are_dicts_equal: Boolean flag.
+    :param first_list_of_dicts: First list.
+    :param second_list_of_dicts: Second list.
+    :return: are_lists_equal: Boolean flag.
     """
 
-    first_keys = first_z_score_dict.keys()
-    second_keys = second_z_score_dict.keys()
-    if set(first_keys) != set(second_keys):
+    if len(first_list_of_dicts) != len(second_list_of_dicts):
         return False
 
-    for this_key in first_keys:
-        if this_key == find_norm_params.MEAN_VALUE_KEY:
-            if first_z_score_dict[this_key] != second_z_score_dict[this_key]:
+    for this_first_dict, this_second_dict in zip(
+            first_list_of_dicts, second_list_of_dicts):
+        if (this_first_dict[find_norm_params.TABLE_INDICES_KEY] !=
+                this_second_dict[find_norm_params.TABLE_INDICES_KEY]):
+            return False
+
+        these_first_means, these_first_stdevs = dl_utils.get_z_score_params(
+            this_first_dict[find_norm_params.Z_SCORE_PARAMS_KEY])
+        these_second_means, these_second_stdevs = dl_utils.get_z_score_params(
+            this_second_dict[find_norm_params.Z_SCORE_PARAMS_KEY])
+
+        if not numpy.allclose(
+                these_first_means, these_second_means, atol=TOLERANCE):
+            return False
+        if not numpy.allclose(
+                these_first_stdevs, these_second_stdevs, atol=TOLERANCE):
+            return False
+
+        this_first_histogram_dict = this_first_dict[
+            find_norm_params.HISTOGRAMS_KEY]
+        this_second_histogram_dict = this_second_dict[
+            find_norm_params.HISTOGRAMS_KEY]
+
+        if this_first_histogram_dict is None:
+            if this_second_histogram_dict is not None:
                 return False
-        else:
-            if not numpy.isclose(first_z_score_dict[this_key],
-                                 second_z_score_dict[this_key], atol=TOLERANCE):
+            continue
+
+        for this_level in [MIN_PERCENTILE_LEVEL, MAX_PERCENTILE_LEVEL]:
+            if not numpy.allclose(
+                    dl_utils.get_percentiles(
+                        this_first_histogram_dict, this_level),
+                    dl_utils.get_percentiles(
+                        this_second_histogram_dict, this_level),
+                    atol=TOLERANCE):
                 return False
 
     return True
 
 
-def _compare_frequency_dicts(first_frequency_dict, second_frequency_dict):
-    """Compares two dictionaries with measurement frequencies.
-
-    :param first_frequency_dict: First dictionary.
-    :param second_frequency_dict: Second dictionary.
-    :return: are_dicts_equal: Boolean flag.
-    """
-
-    first_keys, first_values = zip(*first_frequency_dict.iteritems())
-    first_keys = numpy.array(first_keys)
-    first_values = numpy.array(first_values, dtype=int)
-
-    sort_indices = numpy.argsort(first_keys)
-    first_keys = first_keys[sort_indices]
-    first_values = first_values[sort_indices]
-
-    second_keys, second_values = zip(*second_frequency_dict.iteritems())
-    second_keys = numpy.array(second_keys)
-    second_values = numpy.array(second_values, dtype=int)
-
-    sort_indices = numpy.argsort(second_keys)
-    second_keys = second_keys[sort_indices]
-    second_values = second_values[sort_indices]
-
-    if not numpy.array_equal(first_keys, second_keys):
-        return False
-    if not numpy.array_equal(first_values, second_values):
-        return False
-
-    return True
-
-
 def _compare_normalization_tables(first_norm_table, second_norm_table):
     """Compares two pandas DataFrame with normalization params.
 
@@ -277,92 +240,36 @@ def _compare_normalization_tables(first_norm_table, second_norm_table):
 class FindNormalizationParamsTests(unittest.TestCase):
     """Each method is a unit test for find_normalization_params.py."""
 
-    def test_update_z_score_params(self):
-        """Ensures correct output from _update_z_score_params."""
-
-        this_new_param_dict = find_norm_params._update_z_score_params(
-            z_score_param_dict=copy.deepcopy(ORIGINAL_Z_SCORE_DICT),
-            new_data_matrix=NEW_MATRIX_FOR_Z_SCORES)
-
-        self.assertTrue(_compare_z_score_dicts(
-            this_new_param_dict, NEW_Z_SCORE_DICT))
-
-    def test_update_frequency_dict(self):
-        """Ensures correct output from _update_frequency_dict."""
-
-        this_new_frequency_dict = find_norm_params._update_frequency_dict(
-            frequency_dict=copy.deepcopy(MAIN_FREQUENCY_DICT),
-            new_data_matrix=NEW_MATRIX_FOR_FREQUENCIES,
-            rounding_base=ROUNDING_BASE)
+    def test_get_data_groups_3d(self):
+        """Ensures correct output from _get_data_groups.
 
-        self.assertTrue(_compare_frequency_dicts(
-            this_new_frequency_dict, NEW_FREQUENCY_DICT))
-
-    def test_get_standard_deviation(self):
-        """Ensures correct output from _get_standard_deviation."""
-
-        this_z_score_param_dict = {
-            find_norm_params.NUM_VALUES_KEY: STDEV_INPUT_MATRIX.size,
-            find_norm_params.MEAN_VALUE_KEY: numpy.mean(STDEV_INPUT_MATRIX),
-            find_norm_params.MEAN_OF_SQUARES_KEY:
-                numpy.mean(STDEV_INPUT_MATRIX ** 2)
-        }
-
-        this_standard_deviation = find_norm_params._get_standard_deviation(
-            this_z_score_param_dict)
-        self.assertTrue(numpy.isclose(
-            this_standard_deviation, STANDARD_DEVIATION, atol=TOLERANCE))
-
-    def test_get_percentile_small(self):
-        """Ensures correct output from _get_percentile.
-
-        In this case, percentile level is small.
+        In this case, radar images are 3-D.
         """
 
-        this_percentile = find_norm_params._get_percentile(
-            frequency_dict=MAIN_FREQUENCY_DICT,
-            percentile_level=SMALL_PERCENTILE_LEVEL)
-        self.assertTrue(numpy.isclose(
-            this_percentile, SMALL_PERCENTILE, atol=TOLERANCE))
-
-    def test_get_percentile_medium(self):
-        """Ensures correct output from _get_percentile.
+        these_group_dicts = find_norm_params._get_data_groups(EXAMPLE_DICT_3D)
+        self.assertTrue(len(these_group_dicts) == len(TABLE_NAMES_3D))
 
-        In this case, percentile level is medium.
-        """
+        for k in range(len(these_group_dicts)):
+            self.assertTrue(
+                these_group_dicts[k][find_norm_params.TABLE_NAME_KEY] ==
+                TABLE_NAMES_3D[k])
+            self.assertTrue(
+                these_group_dicts[k][find_norm_params.TABLE_INDICES_KEY] ==
+                TABLE_INDICES_3D[k])
+            self.assertTrue(numpy.allclose(
+                these_group_dicts[k][find_norm_params.DATA_MATRIX_KEY],
+                DATA_MATRICES_3D[k], atol=TOLERANCE))
 
-        this_percentile = find_norm_params._get_percentile(
-            frequency_dict=MAIN_FREQUENCY_DICT,
-            percentile_level=MEDIUM_PERCENTILE_LEVEL)
-        self.assertTrue(numpy.isclose(
-            this_percentile, MEDIUM_PERCENTILE, atol=TOLERANCE))
+    def test_merge_params(self):
+        """Ensures correct output from _merge_params."""
 
-    def test_get_percentile_large(self):
-        """Ensures correct output from _get_percentile.
-
-        In this case, percentile level is large.
-        """
+        these_param_dicts = find_norm_params._merge_params(
+            copy.deepcopy(FIRST_PARAM_DICTS), copy.deepcopy(SECOND_PARAM_DICTS))
 
-        this_percentile = find_norm_params._get_percentile(
-            frequency_dict=MAIN_FREQUENCY_DICT,
-            percentile_level=LARGE_PERCENTILE_LEVEL)
-        self.assertTrue(numpy.isclose(
-            this_percentile, LARGE_PERCENTILE, atol=TOLERANCE))
-
-    def test_convert_normalization_params_no_prctile(self):
-        """Ensures correct output from _convert_normalization_params.
-
-        In this case, the table should be single-indexed (field name only) and
-        should *not* contain percentiles.
-        """
-
-        this_norm_table = find_norm_params._convert_normalization_params(
-            z_score_dict_dict=Z_SCORE_DICT_DICT_NO_HEIGHT)
-
-        self.assertTrue(_compare_normalization_tables(
-            this_norm_table, NORMALIZATION_TABLE_NO_PRCTILE))
+        self.assertTrue(_compare_lists_of_param_dicts(
+            these_param_dicts, MERGED_PARAM_DICTS))
 
-    def test_convert_normalization_params_with_prctile(self):
+    def test_convert_normalization_params_no_height(self):
         """Ensures correct output from _convert_normalization_params.
 
         In this case, the table should be single-indexed (field name only) and
@@ -370,23 +277,24 @@ class FindNormalizationParamsTests(unittest.TestCase):
         """
 
         this_norm_table = find_norm_params._convert_normalization_params(
-            z_score_dict_dict=Z_SCORE_DICT_DICT_NO_HEIGHT,
-            frequency_dict_dict=FREQUENCY_DICT_DICT,
+            list_of_param_dicts=MERGED_PARAM_DICTS,
+            table_name=find_norm_params.RADAR_TABLE_NO_HEIGHT_NAME,
             min_percentile_level=MIN_PERCENTILE_LEVEL,
             max_percentile_level=MAX_PERCENTILE_LEVEL)
 
         self.assertTrue(_compare_normalization_tables(
-            this_norm_table, NORMALIZATION_TABLE_WITH_PRCTILE))
+            this_norm_table, NORMALIZATION_TABLE_NO_HEIGHT))
 
     def test_convert_normalization_params_with_height(self):
         """Ensures correct output from _convert_normalization_params.
 
         In this case, the table should be double-indexed (field name and
-        height).
+        height) and should *not* contain percentiles.
         """
 
         this_norm_table = find_norm_params._convert_normalization_params(
-            z_score_dict_dict=Z_SCORE_DICT_DICT_WITH_HEIGHT)
+            list_of_param_dicts=MERGED_PARAM_DICTS,
+            table_name=find_norm_params.RADAR_TABLE_WITH_HEIGHT_NAME)
 
         self.assertTrue(_compare_normalization_tables(
             this_norm_table, NORMALIZATION_TABLE_WITH_HEIGHT))
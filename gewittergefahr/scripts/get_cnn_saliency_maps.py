@@ -42,6 +42,8 @@ NEURON_INDICES_ARG_NAME = 'neuron_indices'
 CHANNEL_INDEX_ARG_NAME = 'channel_index'
 EXAMPLE_DIR_ARG_NAME = 'input_example_dir_name'
 STORM_DICT_FILE_ARG_NAME = 'input_storm_dict_file_name'
+NUM_EXAMPLES_PER_BATCH_ARG_NAME = 'num_examples_per_batch'
+NORMALIZE_PER_EXAMPLE_ARG_NAME = 'normalize_per_example'
 OUTPUT_FILE_ARG_NAME = 'output_file_name'
 
 MODEL_FILE_HELP_STRING = (
@@ -95,8 +97,21 @@ STORM_DICT_FILE_HELP_STRING = (
     'only one dictionary, containing at least the keys "{0:s}" and "{1:s}".'
 ).format(STORM_IDS_KEY, STORM_TIMES_KEY)
 
+NUM_EXAMPLES_PER_BATCH_HELP_STRING = (
+    'Number of examples per batch (saliency maps are computed for one batch at '
+    'a time).  If you want to do all examples from one SPC date at once, make '
+    'this non-positive.')
+
+NORMALIZE_PER_EXAMPLE_HELP_STRING = (
+    'Boolean flag.  If 1, gradients for each example will be normalized by '
+    'their own standard deviation, so that results do not depend on `{0:s}`.  '
+    'If 0, gradients will be normalized by their standard deviation over the '
+    'whole batch.'
+).format(NUM_EXAMPLES_PER_BATCH_ARG_NAME)
+
 OUTPUT_FILE_HELP_STRING = (
-    'Path to output file (will be written by `saliency_maps.write_file`).')
+    'Path to output file (will be written by `saliency_maps.write_file`, one '
+    'SPC date at a time).')
 
 INPUT_ARG_PARSER = argparse.ArgumentParser()
 INPUT_ARG_PARSER.add_argument(
@@ -136,6 +151,14 @@ INPUT_ARG_PARSER.add_argument(
     '--' + STORM_DICT_FILE_ARG_NAME, type=str, required=True,
     help=STORM_DICT_FILE_HELP_STRING)
 
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_EXAMPLES_PER_BATCH_ARG_NAME, type=int, required=False,
+    default=1000, help=NUM_EXAMPLES_PER_BATCH_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NORMALIZE_PER_EXAMPLE_ARG_NAME, type=int, required=False,
+    default=1, help=NORMALIZE_PER_EXAMPLE_HELP_STRING)
+
 INPUT_ARG_PARSER.add_argument(
     '--' + OUTPUT_FILE_ARG_NAME, type=str, required=True,
     help=OUTPUT_FILE_HELP_STRING)
@@ -171,7 +194,8 @@ def _read_storm_metadata(pickle_file_name):
 def _run(
         model_file_name, component_type_string, target_class, layer_name,
         ideal_activation, neuron_indices, channel_index, top_example_dir_name,
-        input_storm_dict_file_name, output_file_name):
+        input_storm_dict_file_name, num_examples_per_batch,
+        normalize_per_example, output_file_name):
     """Computes saliency map for each storm object and each model component.
 
     This is effectively the main method.
@@ -185,10 +209,15 @@ def _run(
     :param channel_index: Same.
     :param top_example_dir_name: Same.
     :param input_storm_dict_file_name: Same.
+    :param num_examples_per_batch: Same.
+    :param normalize_per_example: Same.
     :param output_file_name: Same.
     """
 
     # Check input args.
+    if num_examples_per_batch <= 0:
+        num_examples_per_batch = None
+
     file_system_utils.mkdir_recursive_if_necessary(file_name=output_file_name)
     model_interpretation.check_component_type(component_type_string)
 
@@ -213,11 +242,7 @@ def _run(
 
     unique_spc_dates_unix_sec = numpy.unique(desired_spc_dates_unix_sec)
 
-    list_of_input_matrices = None
-    list_of_saliency_matrices = None
-    storm_ids = []
-    storm_times_unix_sec = numpy.array([], dtype=int)
-    sounding_pressure_matrix_pascals = None
+    num_dates_written = 0
 
     print SEPARATOR_STRING
 
@@ -289,7 +314,9 @@ def _run(
             these_saliency_matrices = (
                 saliency_maps.get_saliency_maps_for_class_activation(
                     model_object=model_object, target_class=target_class,
-                    list_of_input_matrices=these_input_matrices)
+                    list_of_input_matrices=these_input_matrices,
+                    normalize_per_example=normalize_per_example,
+                    num_examples_per_batch=num_examples_per_batch)
             )
 
         elif component_type_string == NEURON_COMPONENT_TYPE_STRING:
@@ -302,7 +329,9 @@ def _run(
                     model_object=model_object, layer_name=layer_name,
                     neuron_indices=neuron_indices,
                     list_of_input_matrices=these_input_matrices,
-                    ideal_activation=ideal_activation)
+                    ideal_activation=ideal_activation,
+                    normalize_per_example=normalize_per_example,
+                    num_examples_per_batch=num_examples_per_batch)
             )
 
         else:
@@ -316,57 +345,37 @@ def _run(
                     channel_index=channel_index,
                     list_of_input_matrices=these_input_matrices,
                     stat_function_for_neuron_activations=K.max,
-                    ideal_activation=ideal_activation)
+                    ideal_activation=ideal_activation,
+                    normalize_per_example=normalize_per_example,
+                    num_examples_per_batch=num_examples_per_batch)
             )
 
-        if list_of_input_matrices is None:
-            storm_ids = these_storm_ids + []
-            storm_times_unix_sec = these_storm_times_unix_sec + 0
-            list_of_input_matrices = these_input_matrices + []
-            list_of_saliency_matrices = these_saliency_matrices + []
-
-            if this_pressure_matrix_pascals is not None:
-                sounding_pressure_matrix_pascals = (
-                    this_pressure_matrix_pascals + 0.)
-
-        else:
-            storm_ids += these_storm_ids
-            storm_times_unix_sec = numpy.concatenate((
-                storm_times_unix_sec, these_storm_times_unix_sec))
-
-            for k in range(len(list_of_input_matrices)):
-                list_of_input_matrices[k] = numpy.concatenate(
-                    (list_of_input_matrices[k], these_input_matrices[k]),
-                    axis=0)
-
-                list_of_saliency_matrices[k] = numpy.concatenate(
-                    (list_of_saliency_matrices[k], these_saliency_matrices[k]),
-                    axis=0)
-
-            if this_pressure_matrix_pascals is not None:
-                sounding_pressure_matrix_pascals = numpy.concatenate(
-                    (sounding_pressure_matrix_pascals,
-                     this_pressure_matrix_pascals), axis=0)
-
+        print 'Denormalizing model inputs...'
+        these_input_matrices = model_interpretation.denormalize_data(
+            list_of_input_matrices=these_input_matrices,
+            model_metadata_dict=model_metadata_dict)
+
+        # Write results for this SPC date, so that saliency maps do not
+        # accumulate in memory.
+        print 'Writing saliency maps to file: "{0:s}"...'.format(
+            output_file_name)
+
+        saliency_maps.write_file(
+            pickle_file_name=output_file_name,
+            list_of_input_matrices=these_input_matrices,
+            list_of_saliency_matrices=these_saliency_matrices,
+            model_file_name=model_file_name, storm_ids=these_storm_ids,
+            storm_times_unix_sec=these_storm_times_unix_sec,
+            component_type_string=component_type_string,
+            target_class=target_class, layer_name=layer_name,
+            ideal_activation=ideal_activation, neuron_indices=neuron_indices,
+            channel_index=channel_index,
+            sounding_pressure_matrix_pascals=this_pressure_matrix_pascals,
+            append=num_dates_written > 0)
+
+        num_dates_written += 1
         print SEPARATOR_STRING
 
-    print 'Denormalizing model inputs...'
-    list_of_input_matrices = model_interpretation.denormalize_data(
-        list_of_input_matrices=list_of_input_matrices,
-        model_metadata_dict=model_metadata_dict)
-
-    print 'Writing saliency maps to file: "{0:s}"...'.format(output_file_name)
-    saliency_maps.write_file(
-        pickle_file_name=output_file_name,
-        list_of_input_matrices=list_of_input_matrices,
-        list_of_saliency_matrices=list_of_saliency_matrices,
-        model_file_name=model_file_name, storm_ids=storm_ids,
-        storm_times_unix_sec=storm_times_unix_sec,
-        component_type_string=component_type_string, target_class=target_class,
-        layer_name=layer_name, ideal_activation=ideal_activation,
-        neuron_indices=neuron_indices, channel_index=channel_index,
-        sounding_pressure_matrix_pascals=sounding_pressure_matrix_pascals)
-
 
 if __name__ == '__main__':
     INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
@@ -384,5 +393,9 @@ if __name__ == '__main__':
         top_example_dir_name=getattr(INPUT_ARG_OBJECT, EXAMPLE_DIR_ARG_NAME),
         input_storm_dict_file_name=getattr(
             INPUT_ARG_OBJECT, STORM_DICT_FILE_ARG_NAME),
+        num_examples_per_batch=getattr(
+            INPUT_ARG_OBJECT, NUM_EXAMPLES_PER_BATCH_ARG_NAME),
+        normalize_per_example=bool(getattr(
+            INPUT_ARG_OBJECT, NORMALIZE_PER_EXAMPLE_ARG_NAME)),
         output_file_name=getattr(INPUT_ARG_OBJECT, OUTPUT_FILE_ARG_NAME)
     )
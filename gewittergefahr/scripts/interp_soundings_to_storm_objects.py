@@ -27,6 +27,8 @@ LEAD_TIMES_ARG_NAME = 'lead_times_seconds'
 LAG_TIME_ARG_NAME = 'lag_time_for_convective_contamination_sec'
 RUC_DIRECTORY_ARG_NAME = 'input_ruc_directory_name'
 RAP_DIRECTORY_ARG_NAME = 'input_rap_directory_name'
+RUC_STORE_DIR_ARG_NAME = 'input_ruc_field_store_dir_name'
+RAP_STORE_DIR_ARG_NAME = 'input_rap_field_store_dir_name'
 TRACKING_DIR_ARG_NAME = 'input_tracking_dir_name'
 TRACKING_SCALE_ARG_NAME = 'tracking_scale_metres2'
 OUTPUT_DIR_ARG_NAME = 'output_sounding_dir_name'
@@ -52,6 +54,11 @@ RAP_DIRECTORY_HELP_STRING = (
     'Name of top-level directory with grib files containing RAP (Rapid Refresh)'
     ' data, which will be used for all model-initialization times >= {0:s}.'
 ).format(FIRST_RAP_TIME_STRING)
+FIELD_STORE_DIR_HELP_STRING = (
+    'Name of top-level directory with field stores (created by '
+    'convert_nwp_grib_to_field_store.py) for the given model.  Field stores '
+    'will be used instead of grib files where available.  If you do not want '
+    'to use field stores, leave this argument alone.')
 TRACKING_DIR_HELP_STRING = (
     'Name of top-level directory with storm tracks (one file per time step, '
     'readable by `storm_tracking_io.read_processed_file`).')
@@ -87,6 +94,14 @@ INPUT_ARG_PARSER.add_argument(
     '--' + RAP_DIRECTORY_ARG_NAME, type=str, required=True,
     help=RAP_DIRECTORY_HELP_STRING)
 
+INPUT_ARG_PARSER.add_argument(
+    '--' + RUC_STORE_DIR_ARG_NAME, type=str, required=False, default='',
+    help=FIELD_STORE_DIR_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + RAP_STORE_DIR_ARG_NAME, type=str, required=False, default='',
+    help=FIELD_STORE_DIR_HELP_STRING)
+
 INPUT_ARG_PARSER.add_argument(
     '--' + TRACKING_DIR_ARG_NAME, type=str, required=True,
     help=TRACKING_DIR_HELP_STRING)
@@ -103,8 +118,9 @@ INPUT_ARG_PARSER.add_argument(
 def _interp_soundings(
         spc_date_string, lead_times_seconds,
         lag_time_for_convective_contamination_sec, top_ruc_directory_name,
-        top_rap_directory_name, top_tracking_dir_name, tracking_scale_metres2,
-        top_output_dir_name):
+        top_rap_directory_name, top_ruc_field_store_dir_name,
+        top_rap_field_store_dir_name, top_tracking_dir_name,
+        tracking_scale_metres2, top_output_dir_name):
     """Interpolates NWP sounding to each storm object at each lead time.
 
     :param spc_date_string: See documentation at top of file.
@@ -112,6 +128,8 @@ def _interp_soundings(
     :param lag_time_for_convective_contamination_sec: Same.
     :param top_ruc_directory_name: Same.
     :param top_rap_directory_name: Same.
+    :param top_ruc_field_store_dir_name: Same.
+    :param top_rap_field_store_dir_name: Same.
     :param top_tracking_dir_name: Same.
     :param tracking_scale_metres2: Same.
     :param top_output_dir_name: Same.
@@ -150,9 +168,11 @@ def _interp_soundings(
 
     if numpy.all(extreme_init_times_unix_sec < FIRST_RAP_TIME_UNIX_SEC):
         top_grib_directory_name = top_ruc_directory_name
+        top_field_store_dir_name = top_ruc_field_store_dir_name
         model_name = nwp_model_utils.RUC_MODEL_NAME
     elif numpy.all(extreme_init_times_unix_sec >= FIRST_RAP_TIME_UNIX_SEC):
         top_grib_directory_name = top_rap_directory_name
+        top_field_store_dir_name = top_rap_field_store_dir_name
         model_name = nwp_model_utils.RAP_MODEL_NAME
     else:
         first_storm_time_string = time_conversion.unix_sec_to_string(
@@ -175,6 +195,9 @@ def _interp_soundings(
                  FIRST_RAP_TIME_STRING)
         raise ValueError(error_string)
 
+    if top_field_store_dir_name == '':
+        top_field_store_dir_name = None
+
     sounding_dict_by_lead_time = soundings.interp_soundings_to_storm_objects(
         storm_object_table=storm_object_table,
         top_grib_directory_name=top_grib_directory_name,
@@ -184,7 +207,8 @@ def _interp_soundings(
         lag_time_for_convective_contamination_sec=
         lag_time_for_convective_contamination_sec,
         wgrib_exe_name=WGRIB_EXE_NAME, wgrib2_exe_name=WGRIB2_EXE_NAME,
-        raise_error_if_missing=False)
+        raise_error_if_missing=False,
+        top_field_store_dir_name=top_field_store_dir_name)
     print SEPARATOR_STRING
 
     num_lead_times = len(lead_times_seconds)
@@ -218,6 +242,10 @@ if __name__ == '__main__':
             INPUT_ARG_OBJECT, RUC_DIRECTORY_ARG_NAME),
         top_rap_directory_name=getattr(
             INPUT_ARG_OBJECT, RAP_DIRECTORY_ARG_NAME),
+        top_ruc_field_store_dir_name=getattr(
+            INPUT_ARG_OBJECT, RUC_STORE_DIR_ARG_NAME),
+        top_rap_field_store_dir_name=getattr(
+            INPUT_ARG_OBJECT, RAP_STORE_DIR_ARG_NAME),
         top_tracking_dir_name=getattr(INPUT_ARG_OBJECT, TRACKING_DIR_ARG_NAME),
         tracking_scale_metres2=getattr(
             INPUT_ARG_OBJECT, TRACKING_SCALE_ARG_NAME),
@@ -52,6 +52,24 @@ def _create_roc_curve(forecast_probabilities, observed_labels, output_dir_name):
         auc, scikit_learn_auc)
     print title_string
 
+    _plot_roc_curve(
+        pofd_by_threshold=pofd_by_threshold, pod_by_threshold=pod_by_threshold,
+        title_string=title_string, output_dir_name=output_dir_name)
+
+    return auc, scikit_learn_auc
+
+
+def _plot_roc_curve(
+        pofd_by_threshold, pod_by_threshold, title_string, output_dir_name):
+    """Plots ROC curve and saves it to a .jpg file.
+
+    :param pofd_by_threshold: See doc for
+        `model_evaluation.get_points_in_roc_curve`.
+    :param pod_by_threshold: Same.
+    :param title_string: Figure title.
+    :param output_dir_name: See doc for `run_evaluation`.
+    """
+
     figure_file_name = '{0:s}/roc_curve.jpg'.format(output_dir_name)
     print 'Saving ROC curve to: "{0:s}"...\n'.format(figure_file_name)
 
@@ -65,8 +83,6 @@ def _create_roc_curve(forecast_probabilities, observed_labels, output_dir_name):
     pyplot.savefig(figure_file_name, dpi=DOTS_PER_INCH)
     pyplot.close()
 
-    return auc, scikit_learn_auc
-
 
 def _create_performance_diagram(
         forecast_probabilities, observed_labels, output_dir_name):
@@ -92,6 +108,26 @@ def _create_performance_diagram(
     title_string = 'AUPD = {0:.4f}'.format(aupd)
     print title_string
 
+    _plot_performance_diagram(
+        success_ratio_by_threshold=success_ratio_by_threshold,
+        pod_by_threshold=pod_by_threshold, title_string=title_string,
+        output_dir_name=output_dir_name)
+
+    return aupd
+
+
+def _plot_performance_diagram(
+        success_ratio_by_threshold, pod_by_threshold, title_string,
+        output_dir_name):
+    """Plots performance diagram and saves it to a .jpg file.
+
+    :param success_ratio_by_threshold: See doc for
+        `model_evaluation.get_points_in_performance_diagram`.
+    :param pod_by_threshold: Same.
+    :param title_string: Figure title.
+    :param output_dir_name: See doc for `run_evaluation`.
+    """
+
     figure_file_name = '{0:s}/performance_diagram.jpg'.format(output_dir_name)
     print 'Saving performance diagram to: "{0:s}"...\n'.format(figure_file_name)
 
@@ -105,8 +141,6 @@ def _create_performance_diagram(
     pyplot.savefig(figure_file_name, dpi=DOTS_PER_INCH)
     pyplot.close()
 
-    return aupd
-
 
 def _create_attributes_diagram(
         forecast_probabilities, observed_labels, output_dir_name):
@@ -137,6 +171,31 @@ def _create_attributes_diagram(
              bss_dict[model_eval.RESOLUTION_KEY],
              bss_dict[model_eval.BRIER_SKILL_SCORE_KEY])
 
+    _plot_attributes_diagram(
+        mean_forecast_by_bin=mean_forecast_by_bin,
+        class_frequency_by_bin=class_frequency_by_bin,
+        num_examples_by_bin=num_examples_by_bin, bss_dict=bss_dict,
+        output_dir_name=output_dir_name)
+
+    return bss_dict
+
+
+def _plot_attributes_diagram(
+        mean_forecast_by_bin, class_frequency_by_bin, num_examples_by_bin,
+        bss_dict, output_dir_name):
+    """Plots reliability curve and attributes diagram.
+
+    Each is saved to a .jpg file.
+
+    :param mean_forecast_by_bin: See doc for
+        `model_evaluation.get_points_in_reliability_curve`.
+    :param class_frequency_by_bin: Same.
+    :param num_examples_by_bin: Same.
+    :param bss_dict: Dictionary created by
+        `model_evaluation.get_brier_skill_score`.
+    :param output_dir_name: See doc for `run_evaluation`.
+    """
+
     figure_file_name = '{0:s}/reliability_curve.jpg'.format(output_dir_name)
     print 'Saving reliability curve to: "{0:s}"...\n'.format(figure_file_name)
 
@@ -168,8 +227,6 @@ def _create_attributes_diagram(
     pyplot.savefig(figure_file_name, dpi=DOTS_PER_INCH)
     pyplot.close()
 
-    return bss_dict
-
 
 def run_evaluation(forecast_probabilities, observed_labels, output_dir_name):
     """Evaluates forecast-observation pairs from any forecasting method.
@@ -260,3 +317,100 @@ def run_evaluation(forecast_probabilities, observed_labels, output_dir_name):
         frequency_bias=frequency_bias, peirce_score=peirce_score,
         heidke_score=heidke_score, auc=auc, scikit_learn_auc=scikit_learn_auc,
         aupd=aupd, bss_dict=bss_dict, pickle_file_name=evaluation_file_name)
+
+
+def run_evaluation_from_accumulator(accumulator_dict, output_dir_name):
+    """Same as `run_evaluation`, but using an accumulator.
+
+    This allows evaluation of datasets too large to hold in memory.
+
+    :param accumulator_dict: Dictionary created by
+        `model_evaluation.create_accumulator` and filled by
+        `model_evaluation.update_accumulator` (or
+        `model_evaluation.merge_accumulators`).
+    :param output_dir_name: See doc for `run_evaluation`.
+    """
+
+    file_system_utils.mkdir_recursive_if_necessary(
+        directory_name=output_dir_name)
+
+    accumulator_file_name = '{0:s}/evaluation_accumulator.p'.format(
+        output_dir_name)
+    print 'Writing accumulator to: "{0:s}"...'.format(accumulator_file_name)
+    model_eval.write_accumulator(
+        accumulator_dict=accumulator_dict,
+        pickle_file_name=accumulator_file_name)
+
+    evaluation_dict = model_eval.get_results_from_accumulator(accumulator_dict)
+
+    print (
+        'Best binarization threshold = {0:.4f} ... corresponding CSI = {1:.4f}'
+    ).format(evaluation_dict[model_eval.BINARIZATION_THRESHOLD_KEY],
+             evaluation_dict[model_eval.CSI_KEY])
+
+    print (
+        'POD = {0:.4f} ... POFD = {1:.4f} ... success ratio = {2:.4f} ... '
+        'FOCN = {3:.4f} ... accuracy = {4:.4f} ... CSI = {5:.4f} ... frequency '
+        'bias = {6:.4f} ... Peirce score = {7:.4f} ... Heidke score = {8:.4f}\n'
+    ).format(evaluation_dict[model_eval.POD_KEY],
+             evaluation_dict[model_eval.POFD_KEY],
+             evaluation_dict[model_eval.SUCCESS_RATIO_KEY],
+             evaluation_dict[model_eval.FOCN_KEY],
+             evaluation_dict[model_eval.ACCURACY_KEY],
+             evaluation_dict[model_eval.CSI_KEY],
+             evaluation_dict[model_eval.FREQUENCY_BIAS_KEY],
+             evaluation_dict[model_eval.PEIRCE_SCORE_KEY],
+             evaluation_dict[model_eval.HEIDKE_SCORE_KEY])
+
+    title_string = 'AUC = {0:.4f} ... scikit-learn AUC = {1:.4f}'.format(
+        evaluation_dict[model_eval.AUC_KEY],
+        evaluation_dict[model_eval.SCIKIT_LEARN_AUC_KEY])
+    print title_string
+
+    _plot_roc_curve(
+        pofd_by_threshold=evaluation_dict[model_eval.POFD_BY_THRESHOLD_KEY],
+        pod_by_threshold=evaluation_dict[model_eval.POD_BY_THRESHOLD_KEY],
+        title_string=title_string, output_dir_name=output_dir_name)
+    print '\n'
+
+    bss_dict = evaluation_dict[model_eval.BSS_DICTIONARY_KEY]
+    climatology = (
+        numpy.sum(accumulator_dict[model_eval.ACCUM_LABEL_SUM_BY_RELIA_BIN_KEY])
+        / accumulator_dict[model_eval.ACCUM_NUM_EXAMPLES_KEY]
+    )
+
+    print (
+        'Climatology = {0:.4f} ... reliability = {1:.4f} ... resolution = '
+        '{2:.4f} ... BSS = {3:.4f}'
+    ).format(climatology,
+             bss_dict[model_eval.RELIABILITY_KEY],
+             bss_dict[model_eval.RESOLUTION_KEY],
+             bss_dict[model_eval.BRIER_SKILL_SCORE_KEY])
+
+    _plot_attributes_diagram(
+        mean_forecast_by_bin=evaluation_dict[
+            model_eval.MEAN_FORECAST_PROB_BY_BIN_KEY],
+        class_frequency_by_bin=evaluation_dict[
+            model_eval.MEAN_OBSERVED_LABEL_BY_BIN_KEY],
+        num_examples_by_bin=evaluation_dict[model_eval.NUM_EXAMPLES_BY_BIN_KEY],
+        bss_dict=bss_dict, output_dir_name=output_dir_name)
+    print '\n'
+
+    title_string = 'AUPD = {0:.4f}'.format(evaluation_dict[model_eval.AUPD_KEY])
+    print title_string
+
+    _plot_performance_diagram(
+        success_ratio_by_threshold=evaluation_dict[
+            model_eval.SUCCESS_RATIO_BY_THRESHOLD_KEY],
+        pod_by_threshold=evaluation_dict[model_eval.POD_BY_THRESHOLD_KEY],
+        title_string=title_string, output_dir_name=output_dir_name)
+    print '\n'
+
+    evaluation_file_name = '{0:s}/model_evaluation.p'.format(output_dir_name)
+    print 'Writing results to: "{0:s}"...'.format(evaluation_file_name)
+
+    evaluation_dict = dict([
+        (k, evaluation_dict[k]) for k in model_eval.EVALUATION_DICT_KEYS
+    ])
+    model_eval.write_results(
+        pickle_file_name=evaluation_file_name, **evaluation_dict)
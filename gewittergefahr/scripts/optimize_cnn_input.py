@@ -55,6 +55,8 @@ LAYER_NAME_ARG_NAME = 'layer_name'
 IDEAL_ACTIVATION_ARG_NAME = 'ideal_activation'
 NEURON_INDICES_ARG_NAME = 'neuron_indices'
 CHANNEL_INDICES_ARG_NAME = 'channel_indices'
+NUM_STARTS_ARG_NAME = 'num_starts'
+PATIENCE_ARG_NAME = 'patience'
 OUTPUT_FILE_ARG_NAME = 'output_file_name'
 
 MODEL_FILE_HELP_STRING = (
@@ -113,9 +115,20 @@ NEURON_INDICES_HELP_STRING = (
 
 CHANNEL_INDICES_HELP_STRING = (
     '[used only if {0:s} = "{1:s}"] Index for each channel whose activation is '
-    'to be maximized.'
+    'to be maximized.  To maximize activation for every channel in the layer, '
+    'leave this alone.'
 ).format(COMPONENT_TYPE_ARG_NAME, CHANNEL_COMPONENT_TYPE_STRING)
 
+NUM_STARTS_HELP_STRING = (
+    'Number of starts (random initializations) for each component.  All starts'
+    ' for all components are optimized at once, and only the best start '
+    '(lowest final loss) for each component is written.')
+
+PATIENCE_HELP_STRING = (
+    'Each start will stop early if its loss does not decrease for this many '
+    'iterations.  If you do not want early stopping (the default), make this '
+    'non-positive.')
+
 OUTPUT_FILE_HELP_STRING = (
     'Path to output file (will be written by '
     '`feature_optimization.write_file`).')
@@ -169,6 +182,15 @@ INPUT_ARG_PARSER.add_argument(
     '--' + CHANNEL_INDICES_ARG_NAME, type=int, nargs='+', required=False,
     default=[-1], help=CHANNEL_INDICES_HELP_STRING)
 
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_STARTS_ARG_NAME, type=int, required=False,
+    default=feature_optimization.DEFAULT_NUM_STARTS,
+    help=NUM_STARTS_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + PATIENCE_ARG_NAME, type=int, required=False, default=-1,
+    help=PATIENCE_HELP_STRING)
+
 INPUT_ARG_PARSER.add_argument(
     '--' + OUTPUT_FILE_ARG_NAME, type=str, required=True,
     help=OUTPUT_FILE_HELP_STRING)
@@ -333,7 +355,7 @@ def _create_gg_initializer(init_function_name, model_file_name):
 def _run(model_file_name, is_model_swirlnet, component_type_string,
          target_class, num_iterations, learning_rate, init_function_name,
          layer_name, ideal_activation, neuron_indices_flattened,
-         channel_indices, output_file_name):
+         channel_indices, num_starts, patience, output_file_name):
     """Finds optimal input for one class, neuron, or channel of a CNN.
 
     This is effectively the main method.
@@ -349,6 +371,8 @@ def _run(model_file_name, is_model_swirlnet, component_type_string,
     :param ideal_activation: Same.
     :param neuron_indices_flattened: Same.
     :param channel_indices: Same.
+    :param num_starts: Same.
+    :param patience: Same.
     :param output_file_name: Same.
     """
 
@@ -359,6 +383,8 @@ def _run(model_file_name, is_model_swirlnet, component_type_string,
 
     if ideal_activation <= 0:
         ideal_activation = None
+    if patience <= 0:
+        patience = None
 
     if component_type_string == NEURON_COMPONENT_TYPE_STRING:
         neuron_indices_flattened = neuron_indices_flattened.astype(float)
@@ -370,9 +396,6 @@ def _run(model_file_name, is_model_swirlnet, component_type_string,
     else:
         neuron_index_matrix = None
 
-    if component_type_string == CHANNEL_COMPONENT_TYPE_STRING:
-        error_checking.assert_is_geq_numpy_array(channel_indices, 0)
-
     file_system_utils.mkdir_recursive_if_necessary(file_name=output_file_name)
 
     # Read model.
@@ -390,67 +413,52 @@ def _run(model_file_name, is_model_swirlnet, component_type_string,
             init_function_name=init_function_name,
             model_file_name=model_file_name)
 
+    if component_type_string == CHANNEL_COMPONENT_TYPE_STRING:
+        if numpy.all(channel_indices < 0):
+            this_num_channels = model_object.get_layer(
+                name=layer_name).output.get_shape().as_list()[-1]
+            channel_indices = numpy.linspace(
+                0, this_num_channels - 1, num=this_num_channels, dtype=int)
+        else:
+            error_checking.assert_is_geq_numpy_array(channel_indices, 0)
+
     # Do feature optimization.
     print SEPARATOR_STRING
-    list_of_optimized_input_matrices = None
-
     if component_type_string == CLASS_COMPONENT_TYPE_STRING:
         print 'Optimizing inputs for target class {0:d}...'.format(
             target_class)
-
-        list_of_optimized_input_matrices = (
-            feature_optimization.optimize_input_for_class(
-                model_object=model_object, target_class=target_class,
-                init_function_or_matrices=init_function,
-                num_iterations=num_iterations, learning_rate=learning_rate)
-        )
-
+        num_components = 1
     elif component_type_string == NEURON_COMPONENT_TYPE_STRING:
-        for j in range(neuron_index_matrix.shape[0]):
-            print (
-                'Optimizing inputs for neuron {0:s} in layer "{1:s}"...'
-            ).format(str(neuron_index_matrix[j, :]), layer_name)
-
-            these_matrices = (
-                feature_optimization.optimize_input_for_neuron_activation(
-                    model_object=model_object, layer_name=layer_name,
-                    neuron_indices=neuron_index_matrix[j, :],
-                    init_function_or_matrices=init_function,
-                    num_iterations=num_iterations, learning_rate=learning_rate,
-                    ideal_activation=ideal_activation)
-            )
-
-            if list_of_optimized_input_matrices is None:
-                list_of_optimized_input_matrices = these_matrices + []
-            else:
-                for k in range(len(list_of_optimized_input_matrices)):
-                    list_of_optimized_input_matrices[k] = numpy.concatenate(
-                        (list_of_optimized_input_matrices[k],
-                         these_matrices[k]), axis=0)
-
+        print 'Optimizing inputs for {0:d} neurons in layer "{1:s}"...'.format(
+            neuron_index_matrix.shape[0], layer_name)
+        num_components = neuron_index_matrix.shape[0]
     else:
-        for this_channel_index in channel_indices:
-            print (
-                'Optimizing inputs for channel {0:d} in layer "{1:s}"...'
-            ).format(this_channel_index, layer_name)
-
-            these_matrices = (
-                feature_optimization.optimize_input_for_channel_activation(
-                    model_object=model_object, layer_name=layer_name,
-                    channel_index=this_channel_index,
-                    init_function_or_matrices=init_function,
-                    stat_function_for_neuron_activations=K.max,
-                    num_iterations=num_iterations, learning_rate=learning_rate,
-                    ideal_activation=ideal_activation)
-            )
+        print 'Optimizing inputs for {0:d} channels in layer "{1:s}"...'.format(
+            len(channel_indices), layer_name)
+        num_components = len(channel_indices)
+
+    list_of_optimized_input_matrices, final_losses = (
+        feature_optimization.optimize_input_for_many_components(
+            model_object=model_object,
+            component_type_string=component_type_string,
+            init_function_or_matrices=init_function, target_class=target_class,
+            layer_name=layer_name, neuron_index_matrix=neuron_index_matrix,
+            channel_indices=channel_indices,
+            stat_function_for_neuron_activations=K.max, num_starts=num_starts,
+            num_iterations=num_iterations, learning_rate=learning_rate,
+            ideal_activation=ideal_activation, patience=patience)
+    )
+
+    # Keep only the best start for each component.
+    best_rows = numpy.array([
+        j * num_starts + numpy.argmin(
+            final_losses[(j * num_starts):((j + 1) * num_starts)])
+        for j in range(num_components)
+    ], dtype=int)
 
-            if list_of_optimized_input_matrices is None:
-                list_of_optimized_input_matrices = these_matrices + []
-            else:
-                for k in range(len(list_of_optimized_input_matrices)):
-                    list_of_optimized_input_matrices[k] = numpy.concatenate(
-                        (list_of_optimized_input_matrices[k],
-                         these_matrices[k]), axis=0)
+    list_of_optimized_input_matrices = [
+        a[best_rows, ...] for a in list_of_optimized_input_matrices
+    ]
 
     print SEPARATOR_STRING
     print 'Writing optimized input matrices to file: "{0:s}"...'.format(
@@ -486,5 +494,7 @@ if __name__ == '__main__':
             getattr(INPUT_ARG_OBJECT, NEURON_INDICES_ARG_NAME), dtype=int),
         channel_indices=numpy.array(
             getattr(INPUT_ARG_OBJECT, CHANNEL_INDICES_ARG_NAME), dtype=int),
+        num_starts=getattr(INPUT_ARG_OBJECT, NUM_STARTS_ARG_NAME),
+        patience=getattr(INPUT_ARG_OBJECT, PATIENCE_ARG_NAME),
         output_file_name=getattr(INPUT_ARG_OBJECT, OUTPUT_FILE_ARG_NAME)
     )
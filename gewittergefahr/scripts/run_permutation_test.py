@@ -30,6 +30,11 @@ LAST_SPC_DATE_ARG_NAME = 'last_spc_date_string'
 NUM_EXAMPLES_ARG_NAME = 'num_examples'
 CLASS_FRACTION_KEYS_ARG_NAME = 'class_fraction_keys'
 CLASS_FRACTION_VALUES_ARG_NAME = 'class_fraction_values'
+NUM_EXAMPLES_PER_BATCH_ARG_NAME = 'num_examples_per_batch'
+NUM_REPETITIONS_ARG_NAME = 'num_repetitions'
+NUM_BOOTSTRAP_ARG_NAME = 'num_bootstrap_reps'
+CONFIDENCE_LEVEL_ARG_NAME = 'confidence_level'
+NUM_THREADS_ARG_NAME = 'num_threads'
 OUTPUT_FILE_ARG_NAME = 'output_file_name'
 
 MODEL_FILE_HELP_STRING = (
@@ -59,6 +64,28 @@ CLASS_FRACTION_VALUES_HELP_STRING = (
     'conditional sampling, leave this alone.'
 )
 
+NUM_EXAMPLES_PER_BATCH_HELP_STRING = (
+    'Number of examples per batch (predictions are generated for one batch at a'
+    ' time).  If you want to generate predictions for all examples at once, '
+    'make this non-positive.')
+
+NUM_REPETITIONS_HELP_STRING = (
+    'Number of times to permute each predictor at each step (costs are averaged'
+    ' over repetitions).')
+
+NUM_BOOTSTRAP_HELP_STRING = (
+    'Number of bootstrap replicates, used to create confidence intervals for '
+    'costs.  If you do not want confidence intervals, make this 0.')
+
+CONFIDENCE_LEVEL_HELP_STRING = (
+    'Confidence level (used only if `{0:s} > 0`).'
+).format(NUM_BOOTSTRAP_ARG_NAME)
+
+NUM_THREADS_HELP_STRING = (
+    'Number of worker threads.  If > 1, candidate predictors at each step will '
+    'be evaluated in parallel, with each worker reading its own copy of the '
+    'model.')
+
 OUTPUT_FILE_HELP_STRING = (
     'Path to output (Pickle) file.  Will be written by'
     '`permutation_importance.write_results`.')
@@ -92,6 +119,27 @@ INPUT_ARG_PARSER.add_argument(
     '--' + CLASS_FRACTION_VALUES_ARG_NAME, type=float, nargs='+',
     required=False, default=[0.], help=CLASS_FRACTION_VALUES_HELP_STRING)
 
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_EXAMPLES_PER_BATCH_ARG_NAME, type=int, required=False,
+    default=1000, help=NUM_EXAMPLES_PER_BATCH_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_REPETITIONS_ARG_NAME, type=int, required=False, default=1,
+    help=NUM_REPETITIONS_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_BOOTSTRAP_ARG_NAME, type=int, required=False, default=0,
+    help=NUM_BOOTSTRAP_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + CONFIDENCE_LEVEL_ARG_NAME, type=float, required=False,
+    default=permutation.DEFAULT_CONFIDENCE_LEVEL,
+    help=CONFIDENCE_LEVEL_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_THREADS_ARG_NAME, type=int, required=False, default=1,
+    help=NUM_THREADS_HELP_STRING)
+
 INPUT_ARG_PARSER.add_argument(
     '--' + OUTPUT_FILE_ARG_NAME, type=str, required=True,
     help=OUTPUT_FILE_HELP_STRING)
@@ -99,7 +147,9 @@ INPUT_ARG_PARSER.add_argument(
 
 def _run(model_file_name, top_example_dir_name,
          first_spc_date_string, last_spc_date_string, num_examples,
-         class_fraction_keys, class_fraction_values, output_file_name):
+         class_fraction_keys, class_fraction_values, num_examples_per_batch,
+         num_repetitions, num_bootstrap_reps, confidence_level, num_threads,
+         output_file_name):
     """Runs permutation test for predictor importance.
 
     This is effectively the main method.
@@ -111,9 +161,17 @@ def _run(model_file_name, top_example_dir_name,
     :param num_examples: Same.
     :param class_fraction_keys: Same.
     :param class_fraction_values: Same.
+    :param num_examples_per_batch: Same.
+    :param num_repetitions: Same.
+    :param num_bootstrap_reps: Same.
+    :param confidence_level: Same.
+    :param num_threads: Same.
     :param output_file_name: Same.
     """
 
+    if num_examples_per_batch <= 0:
+        num_examples_per_batch = None
+
     print 'Reading model from: "{0:s}"...'.format(model_file_name)
     model_object = cnn.read_model(model_file_name)
 
@@ -224,7 +282,11 @@ def _run(model_file_name, top_example_dir_name,
         list_of_input_matrices=list_of_predictor_matrices,
         predictor_names_by_matrix=predictor_names_by_matrix,
         target_values=target_values, prediction_function=prediction_function,
-        cost_function=permutation.cross_entropy_function)
+        cost_function=permutation.cross_entropy_function,
+        num_examples_per_batch=num_examples_per_batch,
+        num_repetitions=num_repetitions, num_bootstrap_reps=num_bootstrap_reps,
+        confidence_level=confidence_level, num_threads=num_threads,
+        model_file_name=model_file_name)
 
     result_dict[permutation.MODEL_FILE_KEY] = model_file_name
     result_dict[permutation.TARGET_VALUES_KEY] = target_values
@@ -251,5 +313,11 @@ if __name__ == '__main__':
         class_fraction_values=numpy.array(
             getattr(INPUT_ARG_OBJECT, CLASS_FRACTION_VALUES_ARG_NAME),
             dtype=float),
+        num_examples_per_batch=getattr(
+            INPUT_ARG_OBJECT, NUM_EXAMPLES_PER_BATCH_ARG_NAME),
+        num_repetitions=getattr(INPUT_ARG_OBJECT, NUM_REPETITIONS_ARG_NAME),
+        num_bootstrap_reps=getattr(INPUT_ARG_OBJECT, NUM_BOOTSTRAP_ARG_NAME),
+        confidence_level=getattr(INPUT_ARG_OBJECT, CONFIDENCE_LEVEL_ARG_NAME),
+        num_threads=getattr(INPUT_ARG_OBJECT, NUM_THREADS_ARG_NAME),
         output_file_name=getattr(INPUT_ARG_OBJECT, OUTPUT_FILE_ARG_NAME)
     )
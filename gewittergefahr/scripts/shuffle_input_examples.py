@@ -1,8 +1,20 @@
-"""Shuffles input examples in time and writes them to new file."""
+"""Shuffles input examples in time and writes them to new file.
+
+The shuffle is global (every permutation of examples across all SPC dates is
+equally likely) and uses bounded memory.  It has three phases:
+
+[1] Read metadata from each input file and assign each example a random
+    position in the output (i.e., output file and row within the file).
+[2] Read each input file once and scatter its examples into output buffers,
+    one per output file.  Buffers are flushed to disk whenever they get too
+    big, so at most `max_examples_in_buffer` examples are buffered at once.
+[3] Put the examples in each output file in their assigned order.  This phase
+    may run in parallel, since output files are independent.
+"""
 
-import random
 import os.path
 import argparse
+import multiprocessing
 import numpy
 from gewittergefahr.gg_utils import error_checking
 from gewittergefahr.deep_learning import input_examples
@@ -17,6 +29,8 @@ RADAR_FIELDS_ARG_NAME = 'radar_field_names'
 FIRST_BATCH_NUM_ARG_NAME = 'first_output_batch_number'
 NUM_EXAMPLES_PER_CHUNK_ARG_NAME = 'num_examples_per_out_chunk'
 NUM_EXAMPLES_PER_OUT_FILE_ARG_NAME = 'num_examples_per_out_file'
+MAX_EXAMPLES_IN_BUFFER_ARG_NAME = 'max_examples_in_buffer'
+NUM_PROCESSES_ARG_NAME = 'num_processes'
 
 INPUT_DIR_HELP_STRING = (
     'Name of top-level directory with input files (containing unshuffled '
@@ -45,13 +59,25 @@ FIRST_BATCH_NUM_HELP_STRING = (
     'files.')
 
 NUM_EXAMPLES_PER_CHUNK_HELP_STRING = (
-    'Number of examples per output chunk (all written to the same file).')
+    'Number of examples per output chunk.  Once the buffer for one output file '
+    'contains this many examples, they will be written to the file.')
 
 NUM_EXAMPLES_PER_OUT_FILE_HELP_STRING = (
     'Number of examples written to each output file.')
 
+MAX_EXAMPLES_IN_BUFFER_HELP_STRING = (
+    'Max number of examples in all output buffers together.  When this is '
+    'exceeded, all buffers will be written to disk.  Use this to bound memory '
+    'usage.')
+
+NUM_PROCESSES_HELP_STRING = (
+    'Number of worker processes used to put examples in each output file in '
+    'their assigned order.')
+
 DEFAULT_NUM_EXAMPLES_PER_CHUNK = 8
 DEFAULT_NUM_EXAMPLES_PER_OUT_FILE = 256
+DEFAULT_MAX_EXAMPLES_IN_BUFFER = 5000
+DEFAULT_NUM_PROCESSES = 1
 
 INPUT_ARG_PARSER = argparse.ArgumentParser()
 INPUT_ARG_PARSER.add_argument(
@@ -88,6 +114,15 @@ INPUT_ARG_PARSER.add_argument(
     default=DEFAULT_NUM_EXAMPLES_PER_OUT_FILE,
     help=NUM_EXAMPLES_PER_OUT_FILE_HELP_STRING)
 
+INPUT_ARG_PARSER.add_argument(
+    '--' + MAX_EXAMPLES_IN_BUFFER_ARG_NAME, type=int, required=False,
+    default=DEFAULT_MAX_EXAMPLES_IN_BUFFER,
+    help=MAX_EXAMPLES_IN_BUFFER_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + NUM_PROCESSES_ARG_NAME, type=int, required=False,
+    default=DEFAULT_NUM_PROCESSES, help=NUM_PROCESSES_HELP_STRING)
+
 
 def _find_input_files(
         top_input_dir_name, first_spc_date_string, last_spc_date_string):
@@ -97,7 +132,8 @@ def _find_input_files(
     :param first_spc_date_string: Same.
     :param last_spc_date_string: Same.
     :return: input_example_file_names: 1-D list of paths to input files.
-    :return: num_input_examples: Total number of examples in these files.
+    :return: num_examples_by_input_file: 1-D numpy array with number of examples
+        in each input file.
     """
 
     input_example_file_names = input_examples.find_many_example_files(
@@ -106,17 +142,18 @@ def _find_input_files(
         last_spc_date_string=last_spc_date_string,
         raise_error_if_any_missing=False)
 
-    num_input_examples = 0
+    num_examples_by_input_file = []
 
     for this_file_name in input_example_file_names:
         print 'Reading data from: "{0:s}"...'.format(this_file_name)
         this_example_dict = input_examples.read_example_file(
             netcdf_file_name=this_file_name, metadata_only=True)
 
-        num_input_examples += len(
-            this_example_dict[input_examples.STORM_IDS_KEY])
+        num_examples_by_input_file.append(
+            len(this_example_dict[input_examples.STORM_IDS_KEY]))
 
-    return input_example_file_names, num_input_examples
+    return input_example_file_names, numpy.array(
+        num_examples_by_input_file, dtype=int)
 
 
 def _set_output_locations(
@@ -157,15 +194,94 @@ def _set_output_locations(
     return output_example_file_names
 
 
-def _shuffle_one_input_file(
-        input_example_file_name, radar_field_names, num_examples_per_out_chunk,
-        output_example_file_names):
-    """Shuffles examples from one input file to many output files.
+def _assign_output_positions(num_input_examples, num_examples_per_out_file):
+    """Assigns each example a random position in the output.
+
+    E = total number of examples
+
+    :param num_input_examples: E in the above discussion.
+    :param num_examples_per_out_file: See documentation at top of file.
+    :return: output_file_indices: length-E numpy array of output-file indices.
+    :return: output_row_indices: length-E numpy array of row indices (within the
+        output file).
+    """
+
+    output_positions = numpy.random.permutation(num_input_examples)
+    return (output_positions // num_examples_per_out_file,
+            numpy.mod(output_positions, num_examples_per_out_file))
+
+
+def _concat_example_dicts(list_of_example_dicts):
+    """Concatenates dictionaries with input examples.
+
+    :param list_of_example_dicts: 1-D list of dictionaries, each in the format
+        created by `input_examples.read_example_file`, with the same metadata.
+    :return: example_dict: Single dictionary with all examples.
+    """
+
+    example_dict = list_of_example_dicts[0]
+
+    for this_key in input_examples.MAIN_KEYS:
+        if this_key not in example_dict:
+            continue
+
+        if this_key == input_examples.STORM_IDS_KEY:
+            example_dict[this_key] = sum(
+                [d[this_key] for d in list_of_example_dicts], []
+            )
+        else:
+            example_dict[this_key] = numpy.concatenate(
+                [d[this_key] for d in list_of_example_dicts], axis=0)
+
+    return example_dict
+
+
+def _flush_buffer(output_example_file_name, buffer_dict, output_file_index):
+    """Writes buffered examples to one output file and empties the buffer.
+
+    :param output_example_file_name: Path to output file.
+    :param buffer_dict: Dictionary, where each key is an output-file index and
+        each value is a list of example dictionaries waiting to be written.
+    :param output_file_index: Output-file index.
+    """
+
+    if len(buffer_dict[output_file_index]) == 0:
+        return
+
+    example_dict = _concat_example_dicts(buffer_dict[output_file_index])
+    buffer_dict[output_file_index] = []
+
+    print 'Writing {0:d} examples to: "{1:s}"...'.format(
+        len(example_dict[input_examples.STORM_IDS_KEY]),
+        output_example_file_name)
+
+    input_examples.write_example_file(
+        netcdf_file_name=output_example_file_name, example_dict=example_dict,
+        append_to_file=os.path.isfile(output_example_file_name)
+    )
+
+
+def _scatter_one_input_file(
+        input_example_file_name, radar_field_names, output_file_indices,
+        output_row_indices, output_example_file_names, buffer_dict,
+        rows_written_dict, num_examples_per_out_chunk, max_examples_in_buffer):
+    """Scatters examples from one input file into output buffers.
+
+    e = number of examples in input file
 
     :param input_example_file_name: Path to input file.
     :param radar_field_names: See documentation at top of file.
-    :param num_examples_per_out_chunk: Same.
+    :param output_file_indices: length-e numpy array of output-file indices
+        (created by `_assign_output_positions`).
+    :param output_row_indices: length-e numpy array of row indices within
+        output files (created by `_assign_output_positions`).
     :param output_example_file_names: 1-D list of paths to output files.
+    :param buffer_dict: See doc for `_flush_buffer`.
+    :param rows_written_dict: Dictionary, where each key is an output-file index
+        and each value is a list of row indices (within the output file), in
+        the order that examples were buffered.  This will be updated.
+    :param num_examples_per_out_chunk: See documentation at top of file.
+    :param max_examples_in_buffer: Same.
     """
 
     print 'Reading data from: "{0:s}"...'.format(input_example_file_name)
@@ -173,41 +289,73 @@ def _shuffle_one_input_file(
         netcdf_file_name=input_example_file_name,
         radar_field_names_to_keep=radar_field_names)
 
-    num_examples = len(example_dict[input_examples.STORM_IDS_KEY])
-    shuffled_indices = numpy.linspace(
-        0, num_examples - 1, num=num_examples, dtype=int)
-    numpy.random.shuffle(shuffled_indices)
+    if example_dict is None:
+        return
 
-    example_dict = input_examples.subset_examples(
-        example_dict=example_dict, indices_to_keep=shuffled_indices)
+    for this_file_index in numpy.unique(output_file_indices):
+        these_indices = numpy.where(output_file_indices == this_file_index)[0]
 
-    for j in xrange(0, num_examples, num_examples_per_out_chunk):
-        this_first_index = j
-        this_last_index = min(
-            [j + num_examples_per_out_chunk - 1, num_examples - 1]
+        buffer_dict[this_file_index].append(
+            input_examples.subset_examples(
+                example_dict=example_dict, indices_to_keep=these_indices,
+                create_new_dict=True)
+        )
+        rows_written_dict[this_file_index] += (
+            output_row_indices[these_indices].tolist()
         )
-        these_indices = numpy.linspace(
-            this_first_index, this_last_index,
-            num=this_last_index - this_first_index + 1, dtype=int)
 
-        this_example_dict = input_examples.subset_examples(
-            example_dict=example_dict, indices_to_keep=these_indices,
-            create_new_dict=True)
+        this_num_buffered = sum([
+            len(d[input_examples.STORM_IDS_KEY])
+            for d in buffer_dict[this_file_index]
+        ])
+        if this_num_buffered >= num_examples_per_out_chunk:
+            _flush_buffer(
+                output_example_file_name=output_example_file_names[
+                    this_file_index],
+                buffer_dict=buffer_dict, output_file_index=this_file_index)
+
+    num_examples_in_buffer = sum([
+        len(d[input_examples.STORM_IDS_KEY])
+        for k in buffer_dict for d in buffer_dict[k]
+    ])
+    if num_examples_in_buffer < max_examples_in_buffer:
+        return
+
+    for this_file_index in buffer_dict:
+        _flush_buffer(
+            output_example_file_name=output_example_file_names[this_file_index],
+            buffer_dict=buffer_dict, output_file_index=this_file_index)
+
+
+def _reorder_one_output_file(argument_tuple):
+    """Puts examples in one output file in their assigned order.
+
+    :param argument_tuple: Tuple with the following items.
+    argument_tuple[0] = output_example_file_name: Path to output file.
+    argument_tuple[1] = rows_written: 1-D list of row indices, in the order that
+        examples were written to the file (see doc for
+        `_scatter_one_input_file`).
+    """
 
-        this_output_file_name = random.choice(output_example_file_names)
-        print 'Writing shuffled examples to: "{0:s}"...'.format(
-            this_output_file_name)
+    output_example_file_name, rows_written = argument_tuple
 
-        input_examples.write_example_file(
-            netcdf_file_name=this_output_file_name,
-            example_dict=this_example_dict,
-            append_to_file=os.path.isfile(this_output_file_name)
-        )
+    example_dict = input_examples.read_example_file(
+        netcdf_file_name=output_example_file_name)
+    example_dict = input_examples.subset_examples(
+        example_dict=example_dict,
+        indices_to_keep=numpy.argsort(numpy.array(rows_written, dtype=int)))
+
+    print 'Writing shuffled examples to: "{0:s}"...'.format(
+        output_example_file_name)
+    input_examples.write_example_file(
+        netcdf_file_name=output_example_file_name, example_dict=example_dict,
+        append_to_file=False)
 
 
 def _run(top_input_dir_name, first_spc_date_string, last_spc_date_string,
          top_output_dir_name, radar_field_names, first_output_batch_number,
-         num_examples_per_out_chunk, num_examples_per_out_file):
+         num_examples_per_out_chunk, num_examples_per_out_file,
+         max_examples_in_buffer, num_processes):
     """Shuffles input examples in time and writes them to new file.
 
     This is effectively the main method.
@@ -220,6 +368,8 @@ def _run(top_input_dir_name, first_spc_date_string, last_spc_date_string,
     :param first_output_batch_number: Same.
     :param num_examples_per_out_chunk: Same.
     :param num_examples_per_out_file: Same.
+    :param max_examples_in_buffer: Same.
+    :param num_processes: Same.
     """
 
     if radar_field_names[0] in ['', 'None']:
@@ -227,13 +377,17 @@ def _run(top_input_dir_name, first_spc_date_string, last_spc_date_string,
 
     error_checking.assert_is_geq(num_examples_per_out_chunk, 2)
     error_checking.assert_is_geq(num_examples_per_out_file, 100)
+    error_checking.assert_is_geq(
+        max_examples_in_buffer, num_examples_per_out_chunk)
+    error_checking.assert_is_geq(num_processes, 1)
 
-    input_example_file_names, num_input_examples = _find_input_files(
+    input_example_file_names, num_examples_by_input_file = _find_input_files(
         top_input_dir_name=top_input_dir_name,
         first_spc_date_string=first_spc_date_string,
         last_spc_date_string=last_spc_date_string)
     print SEPARATOR_STRING
 
+    num_input_examples = int(numpy.sum(num_examples_by_input_file))
     output_example_file_names = _set_output_locations(
         top_output_dir_name=top_output_dir_name,
         num_input_examples=num_input_examples,
@@ -241,14 +395,53 @@ def _run(top_input_dir_name, first_spc_date_string, last_spc_date_string,
         first_output_batch_number=first_output_batch_number)
     print SEPARATOR_STRING
 
-    for this_file_name in input_example_file_names:
-        _shuffle_one_input_file(
-            input_example_file_name=this_file_name,
+    output_file_indices, output_row_indices = _assign_output_positions(
+        num_input_examples=num_input_examples,
+        num_examples_per_out_file=num_examples_per_out_file)
+
+    num_output_files = len(output_example_file_names)
+    buffer_dict = dict([(k, []) for k in range(num_output_files)])
+    rows_written_dict = dict([(k, []) for k in range(num_output_files)])
+    last_indices = numpy.cumsum(num_examples_by_input_file)
+
+    for i in range(len(input_example_file_names)):
+        these_indices = numpy.linspace(
+            last_indices[i] - num_examples_by_input_file[i],
+            last_indices[i] - 1, num=num_examples_by_input_file[i], dtype=int)
+
+        _scatter_one_input_file(
+            input_example_file_name=input_example_file_names[i],
             radar_field_names=radar_field_names,
+            output_file_indices=output_file_indices[these_indices],
+            output_row_indices=output_row_indices[these_indices],
+            output_example_file_names=output_example_file_names,
+            buffer_dict=buffer_dict, rows_written_dict=rows_written_dict,
             num_examples_per_out_chunk=num_examples_per_out_chunk,
-            output_example_file_names=output_example_file_names)
+            max_examples_in_buffer=max_examples_in_buffer)
         print '\n'
 
+    for k in range(num_output_files):
+        _flush_buffer(
+            output_example_file_name=output_example_file_names[k],
+            buffer_dict=buffer_dict, output_file_index=k)
+
+    print SEPARATOR_STRING
+
+    list_of_argument_tuples = [
+        (output_example_file_names[k], rows_written_dict[k])
+        for k in range(num_output_files)
+        if os.path.isfile(output_example_file_names[k])
+    ]
+
+    if num_processes == 1:
+        for this_argument_tuple in list_of_argument_tuples:
+            _reorder_one_output_file(this_argument_tuple)
+    else:
+        pool_object = multiprocessing.Pool(processes=num_processes)
+        pool_object.map(_reorder_one_output_file, list_of_argument_tuples)
+        pool_object.close()
+        pool_object.join()
+
 
 if __name__ == '__main__':
     INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
@@ -264,5 +457,8 @@ if __name__ == '__main__':
         num_examples_per_out_chunk=getattr(
             INPUT_ARG_OBJECT, NUM_EXAMPLES_PER_CHUNK_ARG_NAME),
         num_examples_per_out_file=getattr(
-            INPUT_ARG_OBJECT, NUM_EXAMPLES_PER_OUT_FILE_ARG_NAME)
+            INPUT_ARG_OBJECT, NUM_EXAMPLES_PER_OUT_FILE_ARG_NAME),
+        max_examples_in_buffer=getattr(
+            INPUT_ARG_OBJECT, MAX_EXAMPLES_IN_BUFFER_ARG_NAME),
+        num_processes=getattr(INPUT_ARG_OBJECT, NUM_PROCESSES_ARG_NAME)
     )
@@ -6,6 +6,8 @@ convolutional neural network (CNN).
 
 import os.path
 import argparse
+import resource
+import numpy
 import sklearn.metrics
 from gewittergefahr.deep_learning import cnn
 from gewittergefahr.deep_learning import gradient_boosting
@@ -13,6 +15,8 @@ from gewittergefahr.deep_learning import gradient_boosting
 SEPARATOR_STRING = '\n\n' + '*' * 50 + '\n\n'
 
 TRAINING_FILE_ARG_NAME = 'input_training_file_name'
+MEMMAP_FILE_ARG_NAME = 'training_memmap_file_name'
+KEEP_FRACTIONS_ARG_NAME = 'keep_fraction_by_class'
 VALIDATION_FILE_ARG_NAME = 'input_validation_file_name'
 MODEL_FILE_ARG_NAME = 'output_model_file_name'
 NUM_TREES_ARG_NAME = 'num_trees'
@@ -24,7 +28,20 @@ L2_WEIGHT_ARG_NAME = 'l2_weight'
 NUM_ITERS_FOR_EARLY_STOPPING_ARG_NAME = 'num_iters_for_early_stopping'
 
 TRAINING_FILE_HELP_STRING = (
-    'Path to file with training data (readable by `cnn.read_features`).')
+    'Path to file with training data (readable by `cnn.read_features`).  If '
+    '`{0:s}` is specified, this may be a list of paths.'
+).format(MEMMAP_FILE_ARG_NAME)
+MEMMAP_FILE_HELP_STRING = (
+    'Path to memory-mapped file for training data.  If specified, training '
+    'files will be streamed into this file (by '
+    '`gradient_boosting.stream_features_to_memmap`), rather than read into '
+    'memory all at once.  To read training data into memory, leave this '
+    'argument alone.')
+KEEP_FRACTIONS_HELP_STRING = (
+    '[used only if `{0:s}` is specified] List of keep fractions, one per '
+    'class.  While streaming, will keep this fraction of training examples '
+    'from each class.  To keep all examples, leave this argument alone.'
+).format(MEMMAP_FILE_ARG_NAME)
 VALIDATION_FILE_HELP_STRING = (
     'Path to file with validation data (readable by `cnn.read_features`).  In '
     'this context, "validation" means on-the-fly validation.  Specifically, '
@@ -55,9 +72,17 @@ NUM_ITERS_FOR_EARLY_STOPPING_HELP_STRING = (
 
 INPUT_ARG_PARSER = argparse.ArgumentParser()
 INPUT_ARG_PARSER.add_argument(
-    '--' + TRAINING_FILE_ARG_NAME, type=str, required=True,
+    '--' + TRAINING_FILE_ARG_NAME, type=str, nargs='+', required=True,
     help=TRAINING_FILE_HELP_STRING)
 
+INPUT_ARG_PARSER.add_argument(
+    '--' + MEMMAP_FILE_ARG_NAME, type=str, required=False, default='',
+    help=MEMMAP_FILE_HELP_STRING)
+
+INPUT_ARG_PARSER.add_argument(
+    '--' + KEEP_FRACTIONS_ARG_NAME, type=float, nargs='+', required=False,
+    default=[-1.], help=KEEP_FRACTIONS_HELP_STRING)
+
 INPUT_ARG_PARSER.add_argument(
     '--' + VALIDATION_FILE_ARG_NAME, type=str, required=False, default='None',
     help=VALIDATION_FILE_HELP_STRING)
@@ -99,14 +124,24 @@ INPUT_ARG_PARSER.add_argument(
     default=-1, help=NUM_ITERS_FOR_EARLY_STOPPING_HELP_STRING)
 
 
+def _print_peak_memory():
+    """Prints peak memory usage (resident set size) of this process."""
+
+    print 'Peak memory usage so far = {0:.1f} MB'.format(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.)
+
+
 def _train_model(
-        input_training_file_name, input_validation_file_name,
+        input_training_file_names, training_memmap_file_name,
+        keep_fraction_by_class, input_validation_file_name,
         output_model_file_name, num_trees, learning_rate, max_tree_depth,
         fraction_of_examples_per_tree, fraction_of_features_per_split,
         l2_weight, num_iters_for_early_stopping):
     """Trains ensemble of gradient-boosted trees.
 
-    :param input_training_file_name: See documentation at top of file.
+    :param input_training_file_names: See documentation at top of file.
+    :param training_memmap_file_name: Same.
+    :param keep_fraction_by_class: Same.
     :param input_validation_file_name: Same.
     :param output_model_file_name: Same.
     :param num_trees: Same.
@@ -118,10 +153,34 @@ def _train_model(
     :param num_iters_for_early_stopping: Same.
     """
 
-    print 'Reading training data from: "{0:s}"...'.format(
-        input_training_file_name)
-    (training_feature_matrix, training_target_values, num_classes
-    ) = cnn.read_features(input_training_file_name)
+    if training_memmap_file_name == '':
+        if len(input_training_file_names) > 1:
+            error_string = (
+                'To train with {0:d} files, `{1:s}` must be specified.'
+            ).format(len(input_training_file_names), MEMMAP_FILE_ARG_NAME)
+
+            raise ValueError(error_string)
+
+        input_training_file_name = input_training_file_names[0]
+
+        print 'Reading training data from: "{0:s}"...'.format(
+            input_training_file_name)
+        (training_feature_matrix, training_target_values, num_classes
+        ) = cnn.read_features(input_training_file_name)
+    else:
+        input_training_file_name = input_training_file_names
+        if len(keep_fraction_by_class) == 1 and keep_fraction_by_class[0] < 0:
+            keep_fraction_by_class = None
+        else:
+            keep_fraction_by_class = numpy.array(keep_fraction_by_class)
+
+        (training_feature_matrix, training_target_values, num_classes
+        ) = gradient_boosting.stream_features_to_memmap(
+            feature_file_names=input_training_file_names,
+            memmap_file_name=training_memmap_file_name,
+            keep_fraction_by_class=keep_fraction_by_class)
+
+    _print_peak_memory()
 
     if input_validation_file_name == 'None':
         input_validation_file_name = None
@@ -172,6 +231,7 @@ def _train_model(
             validation_target_values=validation_target_values)
 
     print SEPARATOR_STRING
+    _print_peak_memory()
 
     if input_validation_file_name is not None and num_classes == 2:
         print 'Applying model to validation examples...'
@@ -192,8 +252,12 @@ if __name__ == '__main__':
     INPUT_ARG_OBJECT = INPUT_ARG_PARSER.parse_args()
 
     _train_model(
-        input_training_file_name=getattr(
+        input_training_file_names=getattr(
             INPUT_ARG_OBJECT, TRAINING_FILE_ARG_NAME),
+        training_memmap_file_name=getattr(
+            INPUT_ARG_OBJECT, MEMMAP_FILE_ARG_NAME),
+        keep_fraction_by_class=getattr(
+            INPUT_ARG_OBJECT, KEEP_FRACTIONS_ARG_NAME),
         input_validation_file_name=getattr(
             INPUT_ARG_OBJECT, VALIDATION_FILE_ARG_NAME),
         output_model_file_name=getattr(INPUT_ARG_OBJECT, MODEL_FILE_ARG_NAME),